@@ -1,4 +1,14 @@
 from .common import CharacterDTO, GameAccountDTO, StoreAccountDTO
+from .status_maps import DayStatusMap, DayVersionMap, WeekStatusMap, WEEK_KEYS
+from .matrix import StatusMatrixDTO
 from .fishing import FishingActivityDTO, FishingCharacterDTO
 from .alchemy import AlchemyEventDTO, AlchemyCharacterDTO, AlchemyDashboardDTO
 from .tombola import TombolaEventDTO, TombolaCharacterDTO, TombolaDashboardDTO
+from .changes import ChangeDTO, ChangeSetDTO, BatchWriteResultDTO
+from .aggregates import EventTotalsDTO
+from .analytics import EventChartDataDTO
+from .timer import TimerRecordDTO, TimerPageDTO, TimerStatsDTO
+from .countdown import CountdownTimerDTO, CountdownPresetDTO
+from .prefetch import PrefetchedDashboardDTO
+from .export import ExportResultDTO
+from .overview import FeatureOverviewDTO, ServerOverviewDTO, OverviewDTO
@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+@dataclass(slots=True)
+class EventTotalsDTO:
+    """Totales materializados de un evento (o de un dia / tienda dentro de el)."""
+    completed: int = 0
+    failed: int = 0
+    cords: int = 0
@@ -1,23 +1,35 @@
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import List, Optional
 from datetime import date
 from .common import CharacterDTO, StoreAccountDTO, GameAccountDTO
+from .status_maps import DayStatusMap, DayVersionMap
 
-@dataclass
+@dataclass(slots=True)
 class AlchemyEventDTO:
     id: int
     server_id: int
     name: str
     total_days: int
     created_at: date
+    # Compactado en el archivo: solo lectura
+    archived: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class AlchemyCharacterDTO(CharacterDTO):
     """Extiende CharacterDTO para Alquimia."""
     # Mapa de dia -> estado (1, -1, 0)
-    daily_status_map: Dict[int, int] = field(default_factory=dict)
+    daily_status_map: DayStatusMap = field(default_factory=DayStatusMap)
+    # Mapa de dia -> version de la fila (0 = sin registro), para escrituras compare-and-swap
+    daily_version_map: DayVersionMap = field(default_factory=DayVersionMap)
+
+    def __post_init__(self):
+        # Acepta dicts (tests, archivo) y los compacta
+        if not isinstance(self.daily_status_map, DayStatusMap):
+            self.daily_status_map = DayStatusMap(self.daily_status_map)
+        if not isinstance(self.daily_version_map, DayVersionMap):
+            self.daily_version_map = DayVersionMap(self.daily_version_map)
     
-@dataclass
+@dataclass(slots=True)
 class AlchemyDashboardDTO:
     """Contenedor de datos para el dashboard de Alquimia."""
     # Lista de tiendas con sus cuentas y personajes (AlchemyCharacterDTO)
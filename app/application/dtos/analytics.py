@@ -0,0 +1,20 @@
+from dataclasses import dataclass, field
+from typing import Dict
+from .aggregates import EventTotalsDTO
+
+@dataclass(slots=True)
+class EventChartDataDTO:
+    """Datos de los graficos de un evento, leidos de los agregados y contadores."""
+    feature: str
+    event_id: int
+    # Version del journal del evento con la que se leyeron (clave de la cache de imagenes)
+    version: int
+    name: str = ""
+    total_days: int = 30
+    # Personajes del servidor: base de la tasa de completado diaria
+    participants: int = 0
+    days: Dict[int, EventTotalsDTO] = field(default_factory=dict)
+    # email de la tienda -> totales
+    stores: Dict[str, EventTotalsDTO] = field(default_factory=dict)
+    # tipo de alquimia / item de tombola -> cantidad
+    counters: Dict[str, int] = field(default_factory=dict)
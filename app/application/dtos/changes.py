@@ -0,0 +1,26 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+@dataclass(slots=True)
+class ChangeDTO:
+    """Una celda modificada segun el journal de cambios."""
+    entity: str
+    owner_id: Optional[int]
+    scope_id: int
+    slot: str
+    value: int
+    version: Optional[int] = None
+
+@dataclass(slots=True)
+class ChangeSetDTO:
+    """Cambios posteriores a una version y la nueva version a consultar."""
+    version: int = 0
+    changes: List[ChangeDTO] = field(default_factory=list)
+
+@dataclass(slots=True)
+class BatchWriteResultDTO:
+    """Resultado de una escritura en lote con compare-and-swap."""
+    # (owner_id, dia) -> nueva version de la fila
+    versions: Dict[Tuple[int, int], int] = field(default_factory=dict)
+    # Claves no escritas porque otro puesto las modifico antes
+    conflicts: List[Tuple[int, int]] = field(default_factory=list)
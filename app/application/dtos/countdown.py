@@ -0,0 +1,18 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+from datetime import datetime
+
+@dataclass(slots=True)
+class CountdownTimerDTO:
+    duration_seconds: int
+    remaining_ms: int
+    # Vencimiento en UTC si el temporizador esta corriendo
+    deadline_at: Optional[datetime] = None
+    position: int = 0
+    id: Optional[int] = None
+
+@dataclass(slots=True)
+class CountdownPresetDTO:
+    id: int
+    name: str
+    durations: List[int] = field(default_factory=list)
@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+@dataclass(slots=True)
+class ExportResultDTO:
+    path: str
+    # Filas de datos escritas (estados + cords + contadores)
+    rows: int = 0
+    cancelled: bool = False
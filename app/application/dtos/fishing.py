@@ -1,15 +1,20 @@
 from dataclasses import dataclass, field
-from typing import Dict
 from .common import CharacterDTO
+from .status_maps import WeekStatusMap
 
-@dataclass
+@dataclass(slots=True)
 class FishingActivityDTO:
     year: int
     month: int
     week: int
     status_code: int
 
-@dataclass
+@dataclass(slots=True)
 class FishingCharacterDTO(CharacterDTO):
     """Extiende CharacterDTO con mapa de actividad de pesca."""
-    fishing_activity_map: Dict[str, int] = field(default_factory=dict)
+    # Clave "mes_semana" -> estado
+    fishing_activity_map: WeekStatusMap = field(default_factory=WeekStatusMap)
+
+    def __post_init__(self):
+        if not isinstance(self.fishing_activity_map, WeekStatusMap):
+            self.fishing_activity_map = WeekStatusMap(self.fishing_activity_map)
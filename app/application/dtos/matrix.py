@@ -0,0 +1,16 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+@dataclass(slots=True)
+class StatusMatrixDTO:
+    """Estados de un dashboard como matriz densa int8 de NumPy (1, -1, 0)."""
+    # filas = personajes, columnas = dias del evento o semanas de pesca
+    values: Any
+    # id de personaje de cada fila
+    row_ids: List[int] = field(default_factory=list)
+    # dia (int) o "mes_semana" de cada columna
+    columns: List[Any] = field(default_factory=list)
+    row_index: Dict[int, int] = field(default_factory=dict)
+    column_index: Dict[Any, int] = field(default_factory=dict)
+    # store_id -> (fila inicial, fila final): las filas de una tienda son contiguas
+    store_rows: Dict[int, Tuple[int, int]] = field(default_factory=dict)
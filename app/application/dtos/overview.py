@@ -0,0 +1,35 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+@dataclass(slots=True)
+class FeatureOverviewDTO:
+    """Totales de una feature en un servidor: evento activo (o año de pesca)."""
+    feature: str
+    # event_id, o año en pesca; None si el servidor no tiene evento activo
+    scope_id: Optional[int] = None
+    name: str = ""
+    total_days: int = 0
+    characters: int = 0
+    completed: int = 0
+    failed: int = 0
+    # Celdas sin marcar: personajes x dias - completados - fallidos
+    pending: int = 0
+    cords: int = 0
+    # tipo de alquimia / item de tombola -> cantidad
+    counters: Dict[str, int] = field(default_factory=dict)
+
+@dataclass(slots=True)
+class ServerOverviewDTO:
+    server_id: int
+    name: str
+    accounts: int = 0
+    characters: int = 0
+    # feature -> totales (solo las features habilitadas en el servidor)
+    features: Dict[str, FeatureOverviewDTO] = field(default_factory=dict)
+
+@dataclass(slots=True)
+class OverviewDTO:
+    """Resumen de todos los servidores, leido con la version del journal indicada."""
+    version: int = 0
+    year: int = 0
+    servers: List[ServerOverviewDTO] = field(default_factory=list)
@@ -0,0 +1,13 @@
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+@dataclass(slots=True)
+class PrefetchedDashboardDTO:
+    feature: str
+    server_id: int
+    # Evento (o anio, en pesca) del dashboard precargado
+    scope_id: Optional[int]
+    # Version del journal tomada antes de leer: el poller sigue desde aca
+    version: int
+    events: List[Any] = field(default_factory=list)
+    dashboard: Any = None
@@ -0,0 +1,117 @@
+from abc import abstractmethod
+from array import array
+from collections.abc import MutableMapping
+
+
+class _SlotMap(MutableMapping):
+    """Mapa clave -> entero guardado en un array de enteros por posicion.
+
+    Se comporta como el dict que reemplaza (get, [], in, items, == contra dicts) pero cada
+    valor ocupa 1-8 bytes en lugar de una entrada de dict. Las posiciones sin registro
+    guardan MISSING, asi que "sin registro" y "estado 0" siguen siendo distintos.
+
+    Clase abstracta (MutableMapping ya usa ABCMeta): cada subclase define como se traducen
+    sus claves a posiciones.
+    """
+    __slots__ = ('_values',)
+    TYPECODE = 'b'
+    MISSING = -128
+
+    def __init__(self, data=None):
+        self._values = array(self.TYPECODE)
+        if data:
+            self.update(data)
+
+    @abstractmethod
+    def _index(self, key):
+        """Posicion de la clave en el array, o None si no es una clave valida."""
+
+    @abstractmethod
+    def _key(self, index):
+        """Clave que corresponde a la posicion."""
+
+    def __getitem__(self, key):
+        index = self._index(key)
+        if index is None or index >= len(self._values) or self._values[index] == self.MISSING:
+            raise KeyError(key)
+        return self._values[index]
+
+    def __setitem__(self, key, value):
+        index = self._index(key)
+        if index is None:
+            raise KeyError(key)
+        missing = index + 1 - len(self._values)
+        if missing > 0:
+            self._values.extend([self.MISSING] * missing)
+        self._values[index] = value
+
+    def __delitem__(self, key):
+        index = self._index(key)
+        if index is None or index >= len(self._values) or self._values[index] == self.MISSING:
+            raise KeyError(key)
+        self._values[index] = self.MISSING
+
+    def __iter__(self):
+        missing = self.MISSING
+        for index, value in enumerate(self._values):
+            if value != missing:
+                yield self._key(index)
+
+    def __len__(self):
+        return len(self._values) - self._values.count(self.MISSING)
+
+    def get(self, key, default=None):
+        # Camino caliente del paint de las grillas: sin pasar por KeyError
+        index = self._index(key)
+        if index is None or index >= len(self._values):
+            return default
+        value = self._values[index]
+        return default if value == self.MISSING else value
+
+    def position(self, key):
+        """Posicion de la clave en el array, o None si no es una clave valida."""
+        return self._index(key)
+
+    def buffer(self):
+        """Array crudo por posicion (MISSING = sin registro), para copiarlo en bloque."""
+        return self._values
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class DayStatusMap(_SlotMap):
+    """Dia (1..N) -> estado (1, -1, 0), un byte por dia."""
+    __slots__ = ()
+
+    def _index(self, key):
+        return key if isinstance(key, int) and key >= 0 else None
+
+    def _key(self, index):
+        return index
+
+
+class DayVersionMap(DayStatusMap):
+    """Dia -> version de la fila, para escrituras compare-and-swap."""
+    __slots__ = ()
+    TYPECODE = 'q'
+    MISSING = -1
+
+
+# Orden de las 48 semanas de pesca del anio (posicion = (mes - 1) * 4 + semana - 1)
+WEEK_KEYS = [f"{month}_{week}" for month in range(1, 13) for week in range(1, 5)]
+_WEEK_INDEX = {key: index for index, key in enumerate(WEEK_KEYS)}
+
+
+class WeekStatusMap(_SlotMap):
+    """Clave "mes_semana" de pesca (12 x 4) -> estado, un byte por semana."""
+    __slots__ = ()
+
+    def _index(self, key):
+        return _WEEK_INDEX.get(key)
+
+    def _key(self, index):
+        return WEEK_KEYS[index]
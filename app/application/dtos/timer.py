@@ -0,0 +1,26 @@
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+from datetime import datetime
+
+@dataclass(slots=True)
+class TimerRecordDTO:
+    id: int
+    name: str
+    elapsed_seconds: int
+    created_at: datetime
+
+@dataclass(slots=True)
+class TimerPageDTO:
+    """Pagina del historial (mas nuevo primero) y cursor para pedir la siguiente."""
+    records: List[TimerRecordDTO] = field(default_factory=list)
+    # (created_at, id) del ultimo registro; None si no hay mas paginas
+    next_cursor: Optional[Tuple[datetime, int]] = None
+
+@dataclass(slots=True)
+class TimerStatsDTO:
+    """Agregados por nombre de cronometro."""
+    name: str
+    count: int
+    best_seconds: int
+    average_seconds: float
+    total_seconds: int
@@ -1,22 +1,29 @@
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import List
 from datetime import date
 from .common import CharacterDTO, StoreAccountDTO, GameAccountDTO
+from .status_maps import DayStatusMap
 
-@dataclass
+@dataclass(slots=True)
 class TombolaEventDTO:
     id: int
     server_id: int
     name: str
     total_days: int
     created_at: date
+    # Compactado en el archivo: solo lectura
+    archived: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class TombolaCharacterDTO(CharacterDTO):
     """Extiende CharacterDTO para Tómbola."""
-    daily_status_map: Dict[int, int] = field(default_factory=dict)
+    daily_status_map: DayStatusMap = field(default_factory=DayStatusMap)
+
+    def __post_init__(self):
+        if not isinstance(self.daily_status_map, DayStatusMap):
+            self.daily_status_map = DayStatusMap(self.daily_status_map)
     
-@dataclass
+@dataclass(slots=True)
 class TombolaDashboardDTO:
     """Contenedor de datos para el dashboard de Tómbola."""
     store_accounts: List[StoreAccountDTO] = field(default_factory=list)
@@ -0,0 +1,275 @@
+"""
+Agregados materializados por evento: completados, fallidos y cords por dia y por tienda.
+
+Los write paths aplican deltas dentro de su propia transaccion; rebuild() los
+recalcula desde cero (python -m scripts.rebuild_aggregates).
+"""
+from collections import defaultdict
+from sqlalchemy import and_, case, delete, func, insert, or_, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.domain.models import (
+    EventDayTotal, EventStoreTotal, Character, GameAccount, AlchemyEvent, TombolaEvent,
+    DailyCorActivity, DailyCorRecord, TombolaActivity, FishingActivity
+)
+
+ALCHEMY = 'alchemy'
+TOMBOLA = 'tombola'
+FISHING = 'fishing'
+
+_COUNTERS = ('completed', 'failed', 'cords')
+
+
+def fishing_day(month, week):
+    """Indice de semana del año usado como 'dia' en los agregados de pesca."""
+    return (month - 1) * 4 + week
+
+
+def store_for_character(session, char_id):
+    return session.query(GameAccount.store_account_id).join(Character).filter(Character.id == char_id).scalar()
+
+
+def store_for_account(session, game_account_id):
+    return session.query(GameAccount.store_account_id).filter(GameAccount.id == game_account_id).scalar()
+
+
+def stores_for_characters(session, char_ids):
+    return dict(session.query(Character.id, GameAccount.store_account_id).join(GameAccount).filter(
+        Character.id.in_(char_ids)
+    ).all())
+
+
+def _bump(session, table, key, deltas):
+    """Suma los deltas a la fila `key`, creandola si no existe (upsert atomico)."""
+    dialect = session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        stmt = sqlite_insert(table).values(**key, **deltas)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={c: table.c[c] + stmt.excluded[c] for c in deltas}
+        ))
+    elif dialect == 'mysql':
+        stmt = mysql_insert(table).values(**key, **deltas)
+        session.execute(stmt.on_duplicate_key_update({c: table.c[c] + stmt.inserted[c] for c in deltas}))
+    else:
+        result = session.execute(
+            update(table).where(*[table.c[k] == v for k, v in key.items()])
+            .values({c: table.c[c] + d for c, d in deltas.items()})
+        )
+        if result.rowcount == 0:
+            session.execute(insert(table).values(**key, **deltas))
+
+
+def _apply(session, feature, server_id, scope_id, day_index, store_id, deltas):
+    deltas = {c: d for c, d in deltas.items() if d}
+    if not deltas:
+        return
+    _bump(session, EventDayTotal.__table__,
+          dict(feature=feature, server_id=server_id, scope_id=scope_id, day_index=day_index), deltas)
+    _bump(session, EventStoreTotal.__table__,
+          dict(feature=feature, server_id=server_id, scope_id=scope_id, store_account_id=store_id or 0), deltas)
+
+
+def record_status(session, feature, server_id, scope_id, day_index, store_id, old_status, new_status):
+    """Aplica el cambio de estado de una celda (0 / 1 / -1) a los agregados."""
+    old_status, new_status = old_status or 0, new_status or 0
+    _apply(session, feature, server_id, scope_id, day_index, store_id, {
+        'completed': (new_status == 1) - (old_status == 1),
+        'failed': (new_status == -1) - (old_status == -1),
+    })
+
+
+def record_cords(session, server_id, event_id, day_index, store_id, old_count, new_count):
+    _apply(session, ALCHEMY, server_id, event_id, day_index, store_id,
+           {'cords': (new_count or 0) - (old_count or 0)})
+
+
+def forget_character(session, char_id, store_id):
+    """Descuenta de los agregados todos los estados de un personaje que se va a borrar."""
+    for activity, event_model, feature in ((DailyCorActivity, AlchemyEvent, ALCHEMY),
+                                           (TombolaActivity, TombolaEvent, TOMBOLA)):
+        rows = session.query(
+            event_model.server_id, activity.event_id, activity.day_index, *_status_sums(activity.status_code)
+        ).join(event_model, event_model.id == activity.event_id).filter(
+            activity.character_id == char_id
+        ).group_by(event_model.server_id, activity.event_id, activity.day_index)
+        for server_id, event_id, day, completed, failed in rows:
+            _apply(session, feature, server_id, event_id, day, store_id,
+                   {'completed': -(completed or 0), 'failed': -(failed or 0)})
+
+    rows = session.query(
+        GameAccount.server_id, FishingActivity.year, FishingActivity.month, FishingActivity.week,
+        *_status_sums(FishingActivity.status_code)
+    ).join(Character, Character.id == FishingActivity.character_id) \
+     .join(GameAccount, GameAccount.id == Character.game_account_id) \
+     .filter(FishingActivity.character_id == char_id) \
+     .group_by(GameAccount.server_id, FishingActivity.year, FishingActivity.month, FishingActivity.week)
+    for server_id, year, month, week, completed, failed in rows:
+        _apply(session, FISHING, server_id, year, fishing_day(month, week), store_id,
+               {'completed': -(completed or 0), 'failed': -(failed or 0)})
+
+
+def _account_totals(session, game_account_id):
+    """Aporte de una cuenta a los totales por tienda: {(feature, server, scope): dict}."""
+    totals = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+    for activity, event_model, feature in ((DailyCorActivity, AlchemyEvent, ALCHEMY),
+                                           (TombolaActivity, TombolaEvent, TOMBOLA)):
+        rows = session.query(
+            event_model.server_id, activity.event_id, *_status_sums(activity.status_code)
+        ).join(event_model, event_model.id == activity.event_id) \
+         .join(Character, Character.id == activity.character_id) \
+         .filter(Character.game_account_id == game_account_id) \
+         .group_by(event_model.server_id, activity.event_id)
+        for server_id, event_id, completed, failed in rows:
+            totals[(feature, server_id, event_id)]['completed'] += completed or 0
+            totals[(feature, server_id, event_id)]['failed'] += failed or 0
+
+    rows = session.query(
+        AlchemyEvent.server_id, DailyCorRecord.event_id, func.sum(DailyCorRecord.cords_count)
+    ).join(AlchemyEvent, AlchemyEvent.id == DailyCorRecord.event_id) \
+     .filter(DailyCorRecord.game_account_id == game_account_id) \
+     .group_by(AlchemyEvent.server_id, DailyCorRecord.event_id)
+    for server_id, event_id, cords in rows:
+        totals[(ALCHEMY, server_id, event_id)]['cords'] += cords or 0
+
+    rows = session.query(
+        GameAccount.server_id, FishingActivity.year, *_status_sums(FishingActivity.status_code)
+    ).join(Character, Character.id == FishingActivity.character_id) \
+     .join(GameAccount, GameAccount.id == Character.game_account_id) \
+     .filter(GameAccount.id == game_account_id) \
+     .group_by(GameAccount.server_id, FishingActivity.year)
+    for server_id, year, completed, failed in rows:
+        totals[(FISHING, server_id, year)]['completed'] += completed or 0
+        totals[(FISHING, server_id, year)]['failed'] += failed or 0
+    return totals
+
+
+def move_account_store(session, game_account_id, old_store_id, new_store_id):
+    """Pasa los totales por tienda de una cuenta (estados de sus personajes y cords) a otra tienda.
+
+    Los totales por dia no dependen de la tienda y no se tocan.
+    """
+    if (old_store_id or 0) == (new_store_id or 0):
+        return
+    table = EventStoreTotal.__table__
+    for (feature, server_id, scope_id), values in _account_totals(session, game_account_id).items():
+        deltas = {c: v for c, v in values.items() if v}
+        if not deltas:
+            continue
+        key = dict(feature=feature, server_id=server_id, scope_id=scope_id)
+        _bump(session, table, dict(key, store_account_id=old_store_id or 0), {c: -v for c, v in deltas.items()})
+        _bump(session, table, dict(key, store_account_id=new_store_id or 0), deltas)
+
+
+# --- Lectura ---
+
+def read_totals(session, feature, scope_id, server_id=None, by=None):
+    """Totales de un evento. by=None -> dict, by='day' / 'store' -> {clave: dict}."""
+    model = EventStoreTotal if by != 'day' else EventDayTotal
+    query = session.query(model).filter(model.feature == feature, model.scope_id == scope_id)
+    if server_id is not None:
+        query = query.filter(model.server_id == server_id)
+
+    grouped = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+    for row in query.all():
+        key = row.day_index if by == 'day' else row.store_account_id if by == 'store' else None
+        for c in _COUNTERS:
+            grouped[key][c] += getattr(row, c)
+    if by is None:
+        return grouped[None]
+    return dict(grouped)
+
+
+# --- Reconstruccion ---
+
+def _status_sums(status_col):
+    return (func.sum(case((status_col == 1, 1), else_=0)),
+            func.sum(case((status_col == -1, 1), else_=0)))
+
+
+def _collect(session):
+    """Recalcula los agregados desde las tablas de actividad: {(feature, server, scope, dia, tienda): dict}."""
+    totals = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+
+    def add(key, completed=0, failed=0, cords=0):
+        row = totals[key]
+        row['completed'] += completed or 0
+        row['failed'] += failed or 0
+        row['cords'] += cords or 0
+
+    for activity, event_model, feature in ((DailyCorActivity, AlchemyEvent, ALCHEMY),
+                                           (TombolaActivity, TombolaEvent, TOMBOLA)):
+        rows = session.query(
+            event_model.server_id, activity.event_id, activity.day_index, GameAccount.store_account_id,
+            *_status_sums(activity.status_code)
+        ).join(event_model, event_model.id == activity.event_id) \
+         .join(Character, Character.id == activity.character_id) \
+         .join(GameAccount, GameAccount.id == Character.game_account_id) \
+         .group_by(event_model.server_id, activity.event_id, activity.day_index, GameAccount.store_account_id)
+        for server_id, event_id, day, store_id, completed, failed in rows:
+            add((feature, server_id, event_id, day, store_id or 0), completed, failed)
+
+    rows = session.query(
+        AlchemyEvent.server_id, DailyCorRecord.event_id, DailyCorRecord.day_index, GameAccount.store_account_id,
+        func.sum(DailyCorRecord.cords_count)
+    ).join(AlchemyEvent, AlchemyEvent.id == DailyCorRecord.event_id) \
+     .join(GameAccount, GameAccount.id == DailyCorRecord.game_account_id) \
+     .group_by(AlchemyEvent.server_id, DailyCorRecord.event_id, DailyCorRecord.day_index, GameAccount.store_account_id)
+    for server_id, event_id, day, store_id, cords in rows:
+        add((ALCHEMY, server_id, event_id, day, store_id or 0), cords=cords)
+
+    rows = session.query(
+        GameAccount.server_id, FishingActivity.year, FishingActivity.month, FishingActivity.week,
+        GameAccount.store_account_id, *_status_sums(FishingActivity.status_code)
+    ).join(Character, Character.id == FishingActivity.character_id) \
+     .join(GameAccount, GameAccount.id == Character.game_account_id) \
+     .group_by(GameAccount.server_id, FishingActivity.year, FishingActivity.month, FishingActivity.week,
+               GameAccount.store_account_id)
+    for server_id, year, month, week, store_id, completed, failed in rows:
+        add((FISHING, server_id, year, fishing_day(month, week), store_id or 0), completed, failed)
+
+    return totals
+
+
+def _archived_scopes(session):
+    """Eventos archivados: sus filas calientes ya no existen y sus totales se conservan tal cual."""
+    return {
+        ALCHEMY: {e for (e,) in session.query(AlchemyEvent.id).filter(AlchemyEvent.archived == True)},
+        TOMBOLA: {e for (e,) in session.query(TombolaEvent.id).filter(TombolaEvent.archived == True)},
+    }
+
+
+def _write(session, model, rows, archived):
+    stmt = delete(model)
+    kept = [and_(model.feature == f, model.scope_id.in_(ids)) for f, ids in archived.items() if ids]
+    if kept:
+        stmt = stmt.where(~or_(*kept))
+    session.execute(stmt)
+    if rows:
+        session.execute(insert(model), rows)
+
+
+def rebuild(session, stores_only=False):
+    """Borra y recalcula los agregados (salvo eventos archivados). Retorna las filas por tienda escritas."""
+    totals = _collect(session)
+    archived = _archived_scopes(session)
+
+    per_store = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+    per_day = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+    for (feature, server_id, scope_id, day, store_id), values in totals.items():
+        if scope_id in archived.get(feature, ()):
+            continue
+        for c in _COUNTERS:
+            per_store[(feature, server_id, scope_id, store_id)][c] += values[c]
+            per_day[(feature, server_id, scope_id, day)][c] += values[c]
+
+    _write(session, EventStoreTotal, [
+        dict(feature=f, server_id=srv, scope_id=sc, store_account_id=st, **v)
+        for (f, srv, sc, st), v in per_store.items()
+    ], archived)
+    if not stores_only:
+        _write(session, EventDayTotal, [
+            dict(feature=f, server_id=srv, scope_id=sc, day_index=d, **v)
+            for (f, srv, sc, d), v in per_day.items()
+        ], archived)
+    return len(per_store)
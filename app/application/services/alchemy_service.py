@@ -1,17 +1,26 @@
 from app.application.dtos import (
     StoreAccountDTO, GameAccountDTO, AlchemyCharacterDTO, 
-    AlchemyEventDTO, AlchemyDashboardDTO
+    AlchemyEventDTO, AlchemyDashboardDTO, BatchWriteResultDTO,
+    DayStatusMap, DayVersionMap
 )
 from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.exc import StaleDataError
 from app.application.services.base_service import BaseService
 from app.domain.models import (
     Server, StoreAccount, GameAccount, Character, CharacterType,
-    AlchemyEvent, DailyCorActivity, DailyCorRecord, AlchemyCounter
+    AlchemyEvent, DailyCorActivity, DailyCorRecord, AlchemyCounter, TombolaActivity, FishingActivity
 )
+from app.application.services import change_log, aggregates, archive
 from collections import defaultdict
 import datetime
-from app.utils.logger import logger
+from app.utils.config import Config
+from app.utils.logger import get_logger
+from app.utils import perf_log
+
+# Logger propio: su nivel se ajusta aparte con LOG_LEVELS=MetinForge.alchemy=...
+logger = get_logger('alchemy')
 
 class AlchemyService(BaseService):
 
@@ -25,6 +34,8 @@ class AlchemyService(BaseService):
             return []
 
     def create_server(self, name, flags=None):
+        if self._blocked_on_replica("Crear servidor"):
+            return False
         try:
             with self.session_scope() as session:
                 if not name or not name.strip():
@@ -61,6 +72,8 @@ class AlchemyService(BaseService):
             return {}
 
     def update_server_feature(self, server_id, feature_key, state):
+        if self._blocked_on_replica("Cambiar features del servidor"):
+            return False
         try:
             with self.session_scope() as session:
                 server = session.query(Server).get(server_id)
@@ -70,13 +83,15 @@ class AlchemyService(BaseService):
                 elif feature_key == 'fishing': server.has_fishing = state
                 elif feature_key == 'tombola': server.has_tombola = state
                 
-                logger.info(f"Updated Server {server.name} feature {feature_key} to {state}")
+                logger.info("Updated Server %s feature %s to %s", server.name, feature_key, state)
                 return True
         except Exception as e:
             logger.error(f"Error updating server feature: {e}")
             return False
 
     def create_store_email(self, email):
+        if self._blocked_on_replica("Crear tienda"):
+            return False
         try:
             with self.session_scope() as session:
                 from app.domain.models import StoreAccount
@@ -92,16 +107,18 @@ class AlchemyService(BaseService):
                 
                 new_store = StoreAccount(email=email)
                 session.add(new_store)
-                logger.info(f"Create Email: Created '{email}'")
+                logger.info("Create Email: Created '%s'", email)
                 return True
         except Exception as e:
             logger.error(f"Error al crear email: {e}")
             return False
 
     def create_game_account(self, server_id, username, slots=5, store_email=None, pj_name="PJ"):
+        if self._blocked_on_replica("Crear cuenta"):
+            return False
         try:
             with self.session_scope() as session:
-                logger.info(f"Trying to create account: User={username}, Server={server_id}, Email={store_email}")
+                logger.info("Trying to create account: User=%s, Server=%s, Email=%s", username, server_id, store_email)
                 if not username or not store_email: 
                     logger.error("Create Account: Missing fields")
                     return False
@@ -131,16 +148,24 @@ class AlchemyService(BaseService):
             logger.error(f"Error al crear cuenta: {e}")
             return False
 
-    def update_game_account(self, account_id, new_username, new_slots, new_email=None):
+    def update_game_account(self, account_id, new_username, new_slots, new_email=None, expected_version=None):
+        """Edita la cuenta. Con expected_version falla (False) si otro puesto la modifico antes."""
+        if self._blocked_on_replica("Editar cuenta"):
+            return False
         try:
             with self.session_scope() as session:
                 account = session.query(GameAccount).get(account_id)
                 if not account:
                     return False
                 
+                if expected_version is not None and account.version != expected_version:
+                    logger.warning(f"Conflicto de version en cuenta {account_id}: {expected_version} != {account.version}")
+                    return False
+                
                 if new_username and account.username != new_username:
                     account.username = new_username
                 
+                old_store_id = new_store_id = account.store_account_id
                 if new_email and account.store_account.email != new_email:
                     store = session.query(StoreAccount).filter_by(email=new_email).first()
                     if not store:
@@ -148,6 +173,7 @@ class AlchemyService(BaseService):
                         session.add(store)
                         session.flush()
                     account.store_account = store
+                    new_store_id = store.id
                 
                 current_chars = sorted(account.characters, key=lambda x: x.id)
                 current_count = len(current_chars)
@@ -162,10 +188,21 @@ class AlchemyService(BaseService):
                     to_remove = current_count - new_slots
                     chars_to_delete = current_chars[-to_remove:]
                     for char in chars_to_delete:
-                        session.query(DailyCorActivity).filter_by(character_id=char.id).delete()
+                        # Descontar de los agregados los estados que se borran (alquimia, tombola y pesca)
+                        aggregates.forget_character(session, char.id, old_store_id)
+                        for activity in (DailyCorActivity, TombolaActivity, FishingActivity):
+                            session.query(activity).filter_by(character_id=char.id).delete()
                         session.delete(char)
                 
+                if new_store_id != old_store_id:
+                    # Solo se mueve el aporte de esta cuenta entre las dos tiendas
+                    session.flush()
+                    aggregates.move_account_store(session, account.id, old_store_id, new_store_id)
+                
                 return True
+        except StaleDataError as e:
+            logger.warning(f"Conflicto de version en cuenta {account_id}: {e}")
+            return False
         except Exception as e:
             logger.error(f"Error al actualizar cuenta: {e}")
             return False
@@ -173,6 +210,8 @@ class AlchemyService(BaseService):
     # --- EVENTOS ALQUIMIA ---
 
     def create_alchemy_event(self, server_id, name, days):
+        if self._blocked_on_replica("Crear evento"):
+            return None
         try:
             with self.session_scope() as session:
                 from app.domain.models import AlchemyEvent
@@ -195,24 +234,30 @@ class AlchemyService(BaseService):
             logger.error(f"Error creating event: {e}")
             return None
 
-    def get_alchemy_events(self, server_id):
+    def get_alchemy_events(self, server_id, include_archived=False):
+        """Eventos del servidor; los archivados solo si se piden explicitamente."""
         try:
             with self.session_scope() as session:
                 from app.domain.models import AlchemyEvent
-                events = session.query(AlchemyEvent).filter_by(server_id=server_id).order_by(AlchemyEvent.id.desc()).all()
+                query = session.query(AlchemyEvent).filter_by(server_id=server_id)
+                if not include_archived:
+                    query = query.filter(AlchemyEvent.archived == False)
+                events = query.order_by(AlchemyEvent.id.desc()).all()
                 return [
                     AlchemyEventDTO(
                         id=e.id, 
                         server_id=e.server_id, 
                         name=e.name, 
                         total_days=e.total_days, 
-                        created_at=e.created_at
+                        created_at=e.created_at,
+                        archived=bool(e.archived)
                     ) for e in events
                 ]
         except Exception as e:
             logger.error(f"Error getting events: {e}")
             return []
 
+    @perf_log.timed('alchemy.dashboard', ids=('server_id', 'event_id'), rows=perf_log.count_accounts)
     def get_alchemy_dashboard_data(self, server_id, store_email=None, event_id=None):
         if not server_id: return AlchemyDashboardDTO()
         try:
@@ -229,7 +274,11 @@ class AlchemyService(BaseService):
                 
                 # 2. Obtener actividades de alquimia
                 activity_map = {}
-                if event_id:
+                version_map = {}
+                payload = archive.load(session, aggregates.ALCHEMY, event_id) if event_id else None
+                if payload is not None:
+                    activity_map = archive.statuses(payload)
+                elif event_id:
                     all_char_ids = [c.id for ga in game_accounts for c in ga.characters]
                     if all_char_ids:
                         activities = session.query(DailyCorActivity).filter(
@@ -237,8 +286,10 @@ class AlchemyService(BaseService):
                             DailyCorActivity.character_id.in_(all_char_ids)
                         ).all()
                         for act in activities:
-                            if act.character_id not in activity_map: activity_map[act.character_id] = {}
+                            if act.character_id not in activity_map: activity_map[act.character_id] = DayStatusMap()
                             activity_map[act.character_id][act.day_index] = act.status_code
+                            if act.character_id not in version_map: version_map[act.character_id] = DayVersionMap()
+                            version_map[act.character_id][act.day_index] = act.version
                 
                 # 3. Agrupar por StoreAccount para DTOs
                 stores_map = {}
@@ -253,11 +304,13 @@ class AlchemyService(BaseService):
                     char_dtos = [
                         AlchemyCharacterDTO(
                             id=c.id, name=c.name, 
-                            daily_status_map=activity_map.get(c.id, {})
+                            daily_status_map=activity_map.get(c.id) or DayStatusMap(),
+                            daily_version_map=version_map.get(c.id) or DayVersionMap()
                         ) for c in ga.characters
                     ]
                     
-                    ga_dto = GameAccountDTO(id=ga.id, username=ga.username, server_id=ga.server_id, characters=char_dtos)
+                    ga_dto = GameAccountDTO(id=ga.id, username=ga.username, server_id=ga.server_id,
+                                            characters=char_dtos, version=ga.version)
                     stores_map[store.id]['dto'].game_accounts.append(ga_dto)
                 
                 return AlchemyDashboardDTO(store_accounts=[s['dto'] for s in stores_map.values()])
@@ -266,34 +319,97 @@ class AlchemyService(BaseService):
             logger.exception(f"Error en get_alchemy_dashboard_data: {e}")
             return AlchemyDashboardDTO()
 
-    def update_daily_status(self, char_id, day_index, new_status, event_id):
-        """Actualiza el estado para (char_id, event_id, day_index)."""
+    def update_daily_status(self, char_id, day_index, new_status, event_id, expected_version=None):
+        """Actualiza el estado para (char_id, event_id, day_index). False si hubo conflicto o error."""
         if not event_id: return
+        result = self.update_daily_status_batch(event_id, [(char_id, day_index, new_status, expected_version)])
+        return (char_id, day_index) in result.versions
+
+    @perf_log.timed('alchemy.status_batch', ids=('event_id',), rows=lambda result: len(result.versions))
+    def update_daily_status_batch(self, event_id, updates):
+        """Escribe varios estados con compare-and-swap por version de fila.
+
+        updates: lista de (char_id, day_index, status, expected_version). expected_version 0
+        significa "sin registro previo" y None escribe sin control. Las claves en conflicto no
+        se escriben y se reportan para que la UI refresque solo esas celdas.
+        """
+        result = BatchWriteResultDTO()
+        if not event_id or not updates: return result
         try:
             with self.session_scope() as session:
-                activity = session.query(DailyCorActivity).filter_by(
-                    character_id=char_id,
-                    event_id=event_id,
-                    day_index=day_index
-                ).first()
-    
-                if activity:
-                    activity.status_code = new_status
-                else:
-                    new_activity = DailyCorActivity(
-                        character_id=char_id,
-                        event_id=event_id,
-                        day_index=day_index,
-                        status_code=new_status
+                if archive.is_archived(session, aggregates.ALCHEMY, event_id):
+                    logger.warning(f"Evento {event_id} archivado: estados de solo lectura")
+                    return BatchWriteResultDTO(conflicts=[(u[0], u[1]) for u in updates])
+                activities = session.query(DailyCorActivity).filter(
+                    DailyCorActivity.event_id == event_id,
+                    DailyCorActivity.character_id.in_({u[0] for u in updates})
+                ).all()
+                rows = {(a.character_id, a.day_index): a for a in activities}
+
+                written, inserted = [], {}
+                for char_id, day_index, new_status, expected_version in updates:
+                    key = (char_id, day_index)
+                    activity = rows.get(key)
+                    current_version = activity.version if activity else 0
+                    if expected_version is not None and current_version != expected_version:
+                        result.conflicts.append(key)
+                        continue
+
+                    old_status = activity.status_code if activity else 0
+                    if Config.SPARSE_ACTIVITIES and new_status == 0:
+                        # Pendiente = sin fila; el DELETE versionado tambien detecta conflictos
+                        if activity:
+                            session.delete(activity)
+                            del rows[key]
+                        activity = None
+                    elif activity:
+                        activity.status_code = new_status
+                    else:
+                        activity = DailyCorActivity(
+                            character_id=char_id,
+                            event_id=event_id,
+                            day_index=day_index,
+                            status_code=new_status
+                        )
+                        session.add(activity)
+                        rows[key] = activity
+                        inserted[(char_id, str(day_index))] = activity
+                    written.append((key, activity, old_status, new_status))
+
+                # El UPDATE versionado falla si otro puesto escribio entre la lectura y el flush
+                session.flush()
+                if Config.SPARSE_ACTIVITIES:
+                    change_log.resume_versions(session, change_log.ALCHEMY_STATUS, event_id, inserted)
+
+                server_id = change_log.server_for_event(session, AlchemyEvent, event_id)
+                stores = aggregates.stores_for_characters(session, {key[0] for key, _, _, _ in written})
+                for (char_id, day_index), activity, old_status, new_status in written:
+                    version = activity.version if activity is not None else 0
+                    change_log.record_change(
+                        session, change_log.ALCHEMY_STATUS, server_id,
+                        char_id, event_id, day_index, new_status,
+                        row_version=version
                     )
-                    session.add(new_activity)
-                
-                logger.info(f"Updated Char {char_id} Event {event_id} Day {day_index} -> {new_status}")
+                    aggregates.record_status(
+                        session, aggregates.ALCHEMY, server_id, event_id, day_index,
+                        stores.get(char_id), old_status, new_status
+                    )
+                    result.versions[(char_id, day_index)] = version
+                logger.info("Updated Event %s: %d estados, %d conflictos", event_id, len(written), len(result.conflicts))
+            return result
+        except (StaleDataError, IntegrityError) as e:
+            # IntegrityError: otro puesto dio de alta la misma celda (ambos esperaban version 0)
+            logger.warning(f"Conflicto de version al guardar estados: {e}")
+            return BatchWriteResultDTO(conflicts=[(u[0], u[1]) for u in updates])
         except Exception as e:
             logger.error(f"Error al guardar estado: {e}")
+            return BatchWriteResultDTO()
 
+    @perf_log.timed('alchemy.import', ids=('server_id',))
     def bulk_import_accounts(self, server_id, import_data):
         """Crea cuentas y personajes desde datos importados. Soporta Dict o List[Dict]."""
+        if self._blocked_on_replica("Importar cuentas"):
+            return False, "Importacion no disponible sobre la replica local"
         if isinstance(import_data, list):
             # Recurse for lists (inefficient but safe with session_scope per item)
             success_count = 0
@@ -377,21 +493,46 @@ class AlchemyService(BaseService):
             logger.error(f"Error calculando pending day: {e}")
             return 1
 
+    def get_changes_since(self, server_id, version):
+        """Estados, cords y contadores modificados desde `version` (refresco incremental)."""
+        return self._get_changes_since_generic(server_id, version, (
+            change_log.ALCHEMY_STATUS, change_log.ALCHEMY_CORDS, change_log.ALCHEMY_COUNTER
+        ))
+
     # --- CORDS ---
 
-    def update_daily_cords(self, game_account_id, event_id, day_index, cords_count):
-        """Actualiza o crea el registro de cords para una cuenta en un dia."""
+    @staticmethod
+    def _archived_cords(session, event_id):
+        """Cords del evento desde el archivo, o None si el evento sigue en las tablas calientes."""
+        payload = archive.load(session, aggregates.ALCHEMY, event_id)
+        return archive.cords(payload) if payload is not None else None
+
+    @perf_log.timed('alchemy.cords', ids=('event_id', 'game_account_id'))
+    def update_daily_cords(self, game_account_id, event_id, day_index, cords_count, expected_version=None):
+        """Actualiza o crea el registro de cords para una cuenta en un dia.
+
+        Con expected_version (0 = sin registro) falla si otro puesto lo modifico antes.
+        """
         if not event_id or not game_account_id:
             return False
             
         try:
             with self.session_scope() as session:
+                if archive.is_archived(session, aggregates.ALCHEMY, event_id):
+                    logger.warning(f"Evento {event_id} archivado: cords de solo lectura")
+                    return False
                 record = session.query(DailyCorRecord).filter_by(
                     game_account_id=game_account_id,
                     event_id=event_id,
                     day_index=day_index
                 ).first()
                 
+                current_version = record.version if record else 0
+                if expected_version is not None and current_version != expected_version:
+                    logger.warning(f"Conflicto de version en cords: Account {game_account_id}, Day {day_index}")
+                    return False
+                
+                old_count = record.cords_count if record else 0
                 if record:
                     record.cords_count = cords_count
                 else:
@@ -402,9 +543,24 @@ class AlchemyService(BaseService):
                         cords_count=cords_count
                     )
                     session.add(new_record)
+                    record = new_record
+                session.flush()
                 
-                logger.info(f"Cords actualizado: Account {game_account_id}, Day {day_index} -> {cords_count}")
+                server_id = change_log.server_for_event(session, AlchemyEvent, event_id)
+                change_log.record_change(
+                    session, change_log.ALCHEMY_CORDS, server_id,
+                    game_account_id, event_id, day_index, cords_count,
+                    row_version=record.version
+                )
+                aggregates.record_cords(
+                    session, server_id, event_id, day_index,
+                    aggregates.store_for_account(session, game_account_id), old_count, cords_count
+                )
+                logger.info("Cords actualizado: Account %s, Day %s -> %s", game_account_id, day_index, cords_count)
                 return True
+        except (StaleDataError, IntegrityError) as e:
+            logger.warning(f"Conflicto de version en cords: {e}")
+            return False
         except Exception as e:
             logger.error(f"Error al guardar cords: {e}")
             return False
@@ -416,6 +572,9 @@ class AlchemyService(BaseService):
             
         try:
             with self.session_scope() as session:
+                archived = self._archived_cords(session, event_id)
+                if archived is not None:
+                    return archived.get(game_account_id, {})
                 records = session.query(DailyCorRecord).filter_by(
                     game_account_id=game_account_id,
                     event_id=event_id
@@ -432,6 +591,9 @@ class AlchemyService(BaseService):
             
         try:
             with self.session_scope() as session:
+                archived = self._archived_cords(session, event_id)
+                if archived is not None:
+                    return sum(archived.get(game_account_id, {}).values())
                 result = session.query(func.sum(DailyCorRecord.cords_count)).filter_by(
                     game_account_id=game_account_id,
                     event_id=event_id
@@ -447,6 +609,9 @@ class AlchemyService(BaseService):
             
         try:
             with self.session_scope() as session:
+                archived = self._archived_cords(session, event_id)
+                if archived is not None:
+                    return {acc_id: sum(days.values()) for acc_id, days in archived.items()}
                 results = session.query(
                     DailyCorRecord.game_account_id,
                     func.sum(DailyCorRecord.cords_count).label('total')
@@ -458,11 +623,19 @@ class AlchemyService(BaseService):
             logger.error(f"Error al obtener resumen de cords: {e}")
             return {}
 
+    def get_event_totals(self, event_id, by=None):
+        """Completados, fallidos y cords del evento desde los agregados (by='day' / 'store')."""
+        return self._get_totals_generic(aggregates.ALCHEMY, event_id, by=by)
+
+    @perf_log.timed('alchemy.all_cords', ids=('event_id',), rows=len)
     def get_all_daily_cords(self, event_id):
         """Obtiene todos los registros diarios de cords para un evento, agrupados por cuenta."""
         if not event_id: return {}
         try:
             with self.session_scope() as session:
+                archived = self._archived_cords(session, event_id)
+                if archived is not None:
+                    return archived
                 records = session.query(DailyCorRecord).filter_by(event_id=event_id).all()
                 result = {}
                 for r in records:
@@ -488,6 +661,7 @@ class AlchemyService(BaseService):
             logger.error(f"Error al obtener contadores: {e}")
             return {}
 
+    @perf_log.timed('alchemy.counter', ids=('event_id',))
     def update_alchemy_count(self, event_id, alchemy_type, count):
         """Actualiza el contador de un tipo de alquimia."""
         if not event_id or not alchemy_type: return False
@@ -497,17 +671,25 @@ class AlchemyService(BaseService):
                 counter = session.query(AlchemyCounter).filter_by(
                     event_id=event_id, alchemy_type=alchemy_type
                 ).first()
+                previous = 0
                 if counter:
+                    previous = counter.count or 0
                     counter.count = count
                 else:
                     new_counter = AlchemyCounter(event_id=event_id, alchemy_type=alchemy_type, count=count)
                     session.add(new_counter)
                 
+                # El journal guarda el delta: la sincronizacion suma los cambios de cada puesto
+                change_log.record_change(
+                    session, change_log.ALCHEMY_COUNTER,
+                    change_log.server_for_event(session, AlchemyEvent, event_id),
+                    None, event_id, alchemy_type, count - previous
+                )
                 # Commit handleado por session_scope, pero para escritura explicita quizas requerimos commit
                 # SI session_scope ve session inyectada (tests), NO hace commit final.
                 # SI estamos en prod, SÍ hace commit.
                 # Lo dejare asi.
-                logger.info(f"Alquimia actualizada: {alchemy_type} -> {count}")
+                logger.info("Alquimia actualizada: %s -> %s", alchemy_type, count)
                 return True
         except Exception as e:
             logger.error(f"Error al actualizar alquimia: {e}")
@@ -528,6 +710,11 @@ class AlchemyService(BaseService):
                 else:
                     new_counter = AlchemyCounter(event_id=event_id, alchemy_type=alchemy_type, count=amount)
                     session.add(new_counter)
+                change_log.record_change(
+                    session, change_log.ALCHEMY_COUNTER,
+                    change_log.server_for_event(session, AlchemyEvent, event_id),
+                    None, event_id, alchemy_type, amount
+                )
                 return True
         except Exception as e:
             logger.error(f"Error al incrementar alquimia: {e}")
@@ -0,0 +1,72 @@
+from sqlalchemy import distinct, func
+from app.application.dtos import EventChartDataDTO, EventTotalsDTO
+from app.application.services.base_service import BaseService
+from app.application.services import aggregates, change_log
+from app.domain.models import (
+    AlchemyEvent, TombolaEvent, TOMBOLA_DAYS, AlchemyCounter, TombolaItemCounter,
+    Character, GameAccount, StoreAccount
+)
+from app.utils.logger import logger
+
+# feature -> (modelo del evento, modelo del contador, columna del nombre)
+_EVENTS = {
+    aggregates.ALCHEMY: (AlchemyEvent, AlchemyCounter, AlchemyCounter.alchemy_type),
+    aggregates.TOMBOLA: (TombolaEvent, TombolaItemCounter, TombolaItemCounter.item_name),
+}
+
+
+class AnalyticsService(BaseService):
+    """Datos para los graficos por evento (Alquimia y Tombola), desde los agregados materializados."""
+
+    def get_data_version(self, feature, event_id):
+        """Version del journal del evento: si no cambia, los graficos cacheados siguen validos."""
+        if feature not in _EVENTS or not event_id:
+            return 0
+        try:
+            with self.session_scope() as session:
+                return change_log.scope_version(session, change_log.EVENT_ENTITIES[feature], event_id)
+        except Exception as e:
+            logger.error(f"Error al leer la version de {feature} {event_id}: {e}")
+            return 0
+
+    def get_chart_data(self, feature, event_id):
+        """Totales por dia y por tienda, contadores y participantes del evento. None si no existe."""
+        if feature not in _EVENTS or not event_id:
+            return None
+        event_model, counter_model, counter_name = _EVENTS[feature]
+        try:
+            with self.session_scope() as session:
+                # La version se toma antes de leer: un cambio concurrente fuerza un nuevo render
+                version = change_log.scope_version(session, change_log.EVENT_ENTITIES[feature], event_id)
+                event = session.get(event_model, event_id)
+                if event is None:
+                    return None
+
+                by_day = aggregates.read_totals(session, feature, event_id, by='day')
+                by_store = aggregates.read_totals(session, feature, event_id, by='store')
+                emails = dict(session.query(StoreAccount.id, StoreAccount.email).filter(
+                    StoreAccount.id.in_([store_id for store_id in by_store if store_id])
+                ).all()) if by_store else {}
+                counters = dict(session.query(counter_name, counter_model.count).filter(
+                    counter_model.event_id == event_id
+                ).all())
+                # Una fila por cuenta (su primer personaje), igual que las grillas del evento
+                participants = session.query(func.count(distinct(Character.game_account_id))).join(GameAccount).filter(
+                    GameAccount.server_id == event.server_id
+                ).scalar() or 0
+
+                return EventChartDataDTO(
+                    feature=feature,
+                    event_id=event_id,
+                    version=version,
+                    name=event.name,
+                    total_days=getattr(event, 'total_days', None) or TOMBOLA_DAYS,
+                    participants=participants,
+                    days={day: EventTotalsDTO(**values) for day, values in by_day.items()},
+                    stores={emails.get(store_id, "Sin tienda"): EventTotalsDTO(**values)
+                            for store_id, values in by_store.items()},
+                    counters={name: count or 0 for name, count in counters.items()},
+                )
+        except Exception as e:
+            logger.error(f"Error al obtener datos de graficos de {feature} {event_id}: {e}")
+            return None
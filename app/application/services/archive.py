@@ -0,0 +1,62 @@
+"""
+Archivo de eventos finalizados: sus filas de actividad se compactan en un payload comprimido.
+
+Cada personaje queda como un vector de estados (un caracter por dia) y cada cuenta como una
+lista de cords por dia. Los totales finales siguen en los agregados materializados.
+"""
+import json
+import zlib
+from app.application.dtos import DayStatusMap
+from app.domain.models import EventArchive
+
+# 0 = pendiente, 1 = completado, -1 = fallido
+_STATUS_CHARS = {0: '0', 1: '1', -1: '2'}
+_CHAR_STATUS = {c: s for s, c in _STATUS_CHARS.items()}
+
+
+def pack_statuses(day_map, total_days):
+    return ''.join(_STATUS_CHARS[day_map.get(day, 0)] for day in range(1, total_days + 1))
+
+
+def unpack_statuses(vector):
+    return DayStatusMap({day: _CHAR_STATUS[c] for day, c in enumerate(vector, start=1) if c != '0'})
+
+
+def pack_counts(day_map, total_days):
+    return [day_map.get(day, 0) for day in range(1, total_days + 1)]
+
+
+def unpack_counts(counts):
+    return {day: count for day, count in enumerate(counts, start=1) if count}
+
+
+def encode(payload):
+    return zlib.compress(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+
+
+def decode(blob):
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+
+def is_archived(session, feature, event_id):
+    return session.query(EventArchive.id).filter(
+        EventArchive.feature == feature, EventArchive.event_id == event_id
+    ).first() is not None
+
+
+def load(session, feature, event_id):
+    """Payload descomprimido del evento, o None si sigue en las tablas calientes."""
+    blob = session.query(EventArchive.payload).filter(
+        EventArchive.feature == feature, EventArchive.event_id == event_id
+    ).scalar()
+    return decode(blob) if blob is not None else None
+
+
+def statuses(payload):
+    """{char_id: {dia: estado}} con el mismo formato que los dashboards."""
+    return {int(char_id): unpack_statuses(vector) for char_id, vector in payload['statuses'].items()}
+
+
+def cords(payload):
+    """{game_account_id: {dia: cords}}."""
+    return {int(acc_id): unpack_counts(counts) for acc_id, counts in payload.get('cords', {}).items()}
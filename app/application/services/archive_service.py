@@ -0,0 +1,126 @@
+from app.application.services.base_service import BaseService
+from app.application.services import aggregates, archive
+from app.domain.models import (
+    AlchemyEvent, TombolaEvent, TOMBOLA_DAYS, DailyCorActivity, DailyCorRecord, TombolaActivity, FishingActivity,
+    EventArchive
+)
+from app.utils.config import Config
+from app.utils.logger import logger
+import datetime
+
+class ArchiveService(BaseService):
+    """Mantenimiento de las tablas de actividad: archivo de eventos finalizados y compactacion."""
+
+    _FEATURES = {
+        aggregates.ALCHEMY: (AlchemyEvent, DailyCorActivity, (DailyCorActivity, DailyCorRecord)),
+        aggregates.TOMBOLA: (TombolaEvent, TombolaActivity, (TombolaActivity,)),
+    }
+
+    def _event_days(self, feature, event):
+        if feature == aggregates.ALCHEMY:
+            return event.total_days or 30
+        return TOMBOLA_DAYS
+
+    def get_due_events(self, today=None):
+        """Eventos no archivados cuyo ultimo dia (mas los dias de gracia) ya paso: [(feature, event_id)]."""
+        today = today or datetime.date.today()
+        due = []
+        try:
+            with self.session_scope() as session:
+                for feature, (event_model, _, _) in self._FEATURES.items():
+                    for event in session.query(event_model).filter(event_model.archived == False):
+                        if not event.created_at:
+                            continue
+                        end = event.created_at + datetime.timedelta(
+                            days=self._event_days(feature, event) + Config.ARCHIVE_GRACE_DAYS)
+                        if end <= today:
+                            due.append((feature, event.id))
+            return due
+        except Exception as e:
+            logger.error(f"Error buscando eventos a archivar: {e}")
+            return []
+
+    def _compact(self, session, feature, event):
+        """Escribe el payload del evento y lo marca archivado (misma transaccion)."""
+        _, activity_model, _ = self._FEATURES[feature]
+        rows = session.query(
+            activity_model.character_id, activity_model.day_index, activity_model.status_code
+        ).filter(activity_model.event_id == event.id).all()
+
+        cords_rows = []
+        if feature == aggregates.ALCHEMY:
+            cords_rows = session.query(
+                DailyCorRecord.game_account_id, DailyCorRecord.day_index, DailyCorRecord.cords_count
+            ).filter(DailyCorRecord.event_id == event.id).all()
+
+        total_days = max([self._event_days(feature, event)] + [r[1] for r in rows] + [r[1] for r in cords_rows])
+        by_char, by_account = {}, {}
+        for char_id, day, status in rows:
+            by_char.setdefault(char_id, {})[day] = status or 0
+        for acc_id, day, count in cords_rows:
+            by_account.setdefault(acc_id, {})[day] = count or 0
+
+        payload = {
+            'total_days': total_days,
+            'statuses': {str(c): archive.pack_statuses(days, total_days) for c, days in by_char.items()},
+            'cords': {str(a): archive.pack_counts(days, total_days) for a, days in by_account.items()},
+        }
+        session.add(EventArchive(
+            feature=feature, event_id=event.id, server_id=event.server_id, total_days=total_days,
+            completed=sum(1 for r in rows if r[2] == 1),
+            failed=sum(1 for r in rows if r[2] == -1),
+            cords=sum(r[2] or 0 for r in cords_rows),
+            payload=archive.encode(payload)
+        ))
+        event.archived = True
+
+    def _purge(self, feature, event_id, chunk_size):
+        """Borra las filas calientes del evento en lotes."""
+        _, _, hot_models = self._FEATURES[feature]
+        return sum(self._delete_in_chunks(model, [model.event_id == event_id], chunk_size) for model in hot_models)
+
+    def archive_event(self, feature, event_id, chunk_size=None):
+        """Archiva un evento y purga sus filas. Idempotente: reanuda purgas interrumpidas."""
+        if self._blocked_on_replica("Archivar evento"):
+            return False
+        chunk_size = chunk_size or Config.ARCHIVE_CHUNK_SIZE
+        try:
+            event_model = self._FEATURES[feature][0]
+            with self.session_scope() as session:
+                event = session.get(event_model, event_id)
+                if event is None:
+                    return False
+                if not event.archived:
+                    self._compact(session, feature, event)
+            deleted = self._purge(feature, event_id, chunk_size)
+            logger.info(f"Evento {feature} {event_id} archivado ({deleted} filas purgadas)")
+            return True
+        except Exception as e:
+            logger.error(f"Error archivando evento {feature} {event_id}: {e}")
+            return False
+
+    def archive_finished_events(self, today=None, chunk_size=None):
+        """Archiva todos los eventos vencidos. Retorna [(feature, event_id)] archivados."""
+        archived = []
+        for feature, event_id in self.get_due_events(today):
+            if self.archive_event(feature, event_id, chunk_size):
+                archived.append((feature, event_id))
+        return archived
+
+    def compact_pending_rows(self, chunk_size=None):
+        """Borra las filas con estado 0 que quedaron de antes del modo disperso. Retorna {tabla: filas}.
+
+        Solo con SPARSE_ACTIVITIES: sin el modo disperso las filas en 0 son parte del estado normal.
+        """
+        if not Config.SPARSE_ACTIVITIES:
+            logger.warning("Compactacion omitida: SPARSE_ACTIVITIES no esta activo")
+            return {}
+        chunk_size = chunk_size or Config.ARCHIVE_CHUNK_SIZE
+        deleted = {}
+        for model in (DailyCorActivity, TombolaActivity, FishingActivity):
+            try:
+                deleted[model.__tablename__] = self._delete_in_chunks(
+                    model, [model.status_code == 0], chunk_size)
+            except Exception as e:
+                logger.error(f"Error compactando {model.__tablename__}: {e}")
+        return deleted
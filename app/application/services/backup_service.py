@@ -0,0 +1,292 @@
+"""
+Backup y restauracion de un servidor completo en un archivo NDJSON comprimido con gzip.
+
+Formato: una linea de cabecera, luego por cada tabla una linea {"table", "columns"} seguida de
+una fila por linea (lista de valores en el orden de columns), y una linea final {"end", "rows"}.
+El backup lee cada tabla por lotes (yield_per) y el restore inserta por lotes (executemany),
+asignando ids nuevos y remapeando las claves foraneas, todo en una sola transaccion.
+"""
+import base64
+import datetime
+import enum
+import gzip
+import json
+from sqlalchemy import insert, select
+from sqlalchemy.types import Date, DateTime, LargeBinary
+from app.application.services.base_service import BaseService
+from app.application.services import aggregates, archive
+from app.domain.models import (
+    Server, StoreAccount, GameAccount, Character, FishingActivity,
+    AlchemyEvent, DailyCorActivity, DailyCorRecord, AlchemyCounter,
+    TombolaEvent, TombolaActivity, TombolaItemCounter,
+    EventArchive, EventDayTotal, EventStoreTotal
+)
+from app.utils.config import Config
+from app.utils.logger import logger
+from app.utils import perf_log
+
+FORMAT = 'metinforge-server'
+FORMAT_VERSION = 1
+
+# Clave foranea que depende del feature de la fila (eventos de alquimia o tombola)
+_EVENT = 'event'
+_EVENT_TABLES = {aggregates.ALCHEMY: 'alchemy_events', aggregates.TOMBOLA: 'tombola_events'}
+
+
+def _server_filter(model):
+    return lambda server_id: model.server_id == server_id
+
+
+def _in(column, query):
+    return lambda server_id: column.in_(query(server_id))
+
+
+def _accounts(server_id):
+    return select(GameAccount.id).where(GameAccount.server_id == server_id)
+
+
+def _characters(server_id):
+    return select(Character.id).where(Character.game_account_id.in_(_accounts(server_id)))
+
+
+def _alchemy_events(server_id):
+    return select(AlchemyEvent.id).where(AlchemyEvent.server_id == server_id)
+
+
+def _tombola_events(server_id):
+    return select(TombolaEvent.id).where(TombolaEvent.server_id == server_id)
+
+
+def _stores(server_id):
+    return select(GameAccount.store_account_id).where(GameAccount.server_id == server_id)
+
+
+# Orden de dependencias: (modelo, filtro por servidor, {columna: tabla cuyo id se remapea})
+_TABLES = [
+    (Server, lambda server_id: Server.id == server_id, {'id': 'servers'}),
+    (StoreAccount, _in(StoreAccount.id, _stores), {'id': 'store_accounts'}),
+    (GameAccount, _server_filter(GameAccount),
+     {'id': 'game_accounts', 'store_account_id': 'store_accounts', 'server_id': 'servers'}),
+    (Character, _in(Character.game_account_id, _accounts), {'id': 'characters', 'game_account_id': 'game_accounts'}),
+    (FishingActivity, _in(FishingActivity.character_id, _characters), {'character_id': 'characters'}),
+    (AlchemyEvent, _server_filter(AlchemyEvent), {'id': 'alchemy_events', 'server_id': 'servers'}),
+    (DailyCorActivity, _in(DailyCorActivity.event_id, _alchemy_events),
+     {'character_id': 'characters', 'event_id': 'alchemy_events'}),
+    (DailyCorRecord, _in(DailyCorRecord.event_id, _alchemy_events),
+     {'game_account_id': 'game_accounts', 'event_id': 'alchemy_events'}),
+    (AlchemyCounter, _in(AlchemyCounter.event_id, _alchemy_events), {'event_id': 'alchemy_events'}),
+    (TombolaEvent, _server_filter(TombolaEvent), {'id': 'tombola_events', 'server_id': 'servers'}),
+    (TombolaActivity, _in(TombolaActivity.event_id, _tombola_events),
+     {'character_id': 'characters', 'event_id': 'tombola_events'}),
+    (TombolaItemCounter, _in(TombolaItemCounter.event_id, _tombola_events), {'event_id': 'tombola_events'}),
+    (EventArchive, _server_filter(EventArchive), {'server_id': 'servers', 'event_id': _EVENT}),
+    (EventDayTotal, _server_filter(EventDayTotal), {'server_id': 'servers', 'scope_id': _EVENT}),
+    (EventStoreTotal, _server_filter(EventStoreTotal),
+     {'server_id': 'servers', 'scope_id': _EVENT, 'store_account_id': 'store_accounts'}),
+]
+_MODELS = {model.__tablename__: (model, remaps) for model, _, remaps in _TABLES}
+
+
+def _encode_value(value):
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode('ascii')
+    return value
+
+
+def _decoder(column):
+    """Funcion que vuelve el valor del archivo al tipo de la columna (None si no hace falta)."""
+    if isinstance(column.type, DateTime):
+        return datetime.datetime.fromisoformat
+    if isinstance(column.type, Date):
+        return datetime.date.fromisoformat
+    if isinstance(column.type, LargeBinary):
+        return base64.b64decode
+    return None
+
+
+def _remap_payload(blob, id_maps):
+    """Las claves del payload archivado son ids de personajes y cuentas: se traducen a los nuevos."""
+    payload = archive.decode(blob)
+    characters, accounts = id_maps['characters'], id_maps['game_accounts']
+    payload['statuses'] = {str(characters[int(k)]): v for k, v in payload['statuses'].items()
+                           if int(k) in characters}
+    payload['cords'] = {str(accounts[int(k)]): v for k, v in payload.get('cords', {}).items()
+                        if int(k) in accounts}
+    return archive.encode(payload)
+
+
+class BackupService(BaseService):
+    """Backup por servidor (tiendas, cuentas, personajes, eventos, actividades, registros y contadores)."""
+
+    @perf_log.timed('backup.server', ids=('server_id',), rows=lambda rows: rows)
+    def backup_server(self, server_id, file_path):
+        """Escribe el servidor en file_path (.ndjson.gz). Retorna la cantidad de filas, o None si fallo."""
+        try:
+            with self.session_scope() as session:
+                server = session.get(Server, server_id)
+                if server is None:
+                    return None
+                rows = 0
+                with gzip.open(file_path, 'wt', encoding='utf-8', compresslevel=Config.BACKUP_COMPRESS_LEVEL) as out:
+                    self._write_line(out, {
+                        'format': FORMAT, 'version': FORMAT_VERSION, 'server': server.name,
+                        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+                    })
+                    for model, criteria, _ in _TABLES:
+                        columns = [c.name for c in model.__table__.columns]
+                        self._write_line(out, {'table': model.__tablename__, 'columns': columns})
+                        query = session.execute(
+                            select(*model.__table__.columns).where(criteria(server_id)).order_by(model.__table__.c.id)
+                            .execution_options(yield_per=Config.BACKUP_CHUNK_SIZE)
+                        )
+                        for row in query:
+                            self._write_line(out, [_encode_value(v) for v in row])
+                            rows += 1
+                    self._write_line(out, {'end': True, 'rows': rows})
+                logger.info(f"Backup del servidor {server.name}: {rows} filas -> {file_path}")
+                return rows
+        except Exception as e:
+            logger.error(f"Error en backup del servidor {server_id}: {e}")
+            return None
+
+    @staticmethod
+    def _write_line(out, data):
+        out.write(json.dumps(data, separators=(',', ':'), ensure_ascii=False))
+        out.write('\n')
+
+    @perf_log.timed('backup.restore')
+    def restore_server(self, file_path, server_name=None):
+        """Restaura un backup como servidor nuevo (ids nuevos). Retorna el id del servidor, o None si fallo.
+
+        Las tiendas se reutilizan por email. Si `server_name` no se indica se usa el del backup,
+        que no debe existir en la base destino. Todo ocurre en una transaccion: un archivo
+        incompleto o un error no deja filas a medias.
+        """
+        if self._blocked_on_replica("Restaurar backup"):
+            return None
+        try:
+            with self.session_scope() as session, gzip.open(file_path, 'rt', encoding='utf-8') as source:
+                header = json.loads(source.readline() or 'null')
+                if not isinstance(header, dict) or header.get('format') != FORMAT:
+                    raise ValueError("El archivo no es un backup de servidor")
+                if header.get('version', 0) > FORMAT_VERSION:
+                    raise ValueError(f"Version de backup no soportada: {header['version']}")
+                server_name = server_name or header['server']
+                if session.query(Server.id).filter(Server.name == server_name).first() is not None:
+                    raise ValueError(f"Ya existe un servidor llamado '{server_name}'")
+
+                id_maps = {name: {} for name in ('servers', 'store_accounts', 'game_accounts', 'characters',
+                                                 'alchemy_events', 'tombola_events')}
+                table, batch, rows, finished = None, [], 0, False
+                for line in source:
+                    data = json.loads(line)
+                    if isinstance(data, list):
+                        if table is None:
+                            raise ValueError("Fila fuera de una tabla")
+                        batch.append(dict(zip(table['columns'], data)))
+                        if len(batch) >= Config.BACKUP_CHUNK_SIZE:
+                            rows += self._insert(session, table, batch, id_maps, server_name)
+                            batch = []
+                        continue
+                    if batch:
+                        rows += self._insert(session, table, batch, id_maps, server_name)
+                        batch = []
+                    if data.get('end'):
+                        if data.get('rows') != rows:
+                            raise ValueError(f"Backup incompleto: {rows} de {data.get('rows')} filas")
+                        finished = True
+                        break
+                    table = self._table_section(data)
+                if not finished:
+                    raise ValueError("Backup incompleto: falta el cierre del archivo")
+
+                server_id = next(iter(id_maps['servers'].values()), None)
+                logger.info(f"Servidor '{server_name}' restaurado desde {file_path}: {rows} filas (id {server_id})")
+                return server_id
+        except Exception as e:
+            logger.error(f"Error restaurando backup {file_path}: {e}")
+            return None
+
+    @staticmethod
+    def _table_section(data):
+        name = data.get('table')
+        if name not in _MODELS:
+            raise ValueError(f"Tabla desconocida en el backup: {name}")
+        model, remaps = _MODELS[name]
+        table = model.__table__
+        # Columnas que ya no existen en el esquema actual se ignoran
+        columns = [c for c in data['columns'] if c in table.c]
+        decoders = {c: d for c in columns if (d := _decoder(table.c[c])) is not None}
+        return {'name': name, 'model': model, 'remaps': remaps, 'columns': data['columns'],
+                'keep': columns, 'decoders': decoders}
+
+    def _insert(self, session, table, batch, id_maps, server_name):
+        """Inserta un lote con ids nuevos y claves foraneas remapeadas. Retorna las filas leidas."""
+        name, model, remaps = table['name'], table['model'], table['remaps']
+        rows = []
+        for raw in batch:
+            row = {c: raw[c] for c in table['keep']}
+            for column, decode in table['decoders'].items():
+                if row[column] is not None:
+                    row[column] = decode(row[column])
+            rows.append(row)
+
+        if name == 'store_accounts':
+            rows = self._reuse_stores(session, rows, id_maps['store_accounts'])
+        if name == 'servers':
+            for row in rows:
+                row['name'] = server_name
+
+        # Los ids los asigna la base: otro puesto puede estar insertando en las mismas tablas
+        old_ids = []
+        for row in rows:
+            old_ids.append(row.pop('id', None))
+            for column, target in remaps.items():
+                if column == 'id' or row.get(column) is None:
+                    continue
+                if target == _EVENT:
+                    target = _EVENT_TABLES.get(row['feature'])
+                    if target is None:
+                        continue  # pesca: el scope es el año, no un id
+                # 0 = cuenta sin tienda en los totales por tienda
+                if target == 'store_accounts' and row[column] == 0:
+                    continue
+                row[column] = id_maps[target][row[column]]
+            if name == 'event_archives':
+                row['payload'] = _remap_payload(row['payload'], id_maps)
+
+        own = id_maps.get(name)
+        if rows and own is None:
+            session.execute(insert(model.__table__), rows)
+        elif rows:
+            for old_id, new_id in zip(old_ids, self._insert_returning_ids(session, model.__table__, rows)):
+                if old_id is not None:
+                    own[old_id] = new_id
+        return len(batch)
+
+    @staticmethod
+    def _insert_returning_ids(session, table, rows):
+        """Inserta las filas y retorna los ids que asigno la base, en el orden de rows."""
+        if session.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+            result = session.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True), rows)
+            return list(result.scalars())
+        # Sin RETURNING (MySQL): una fila por vez, el id sale de lastrowid
+        return [session.execute(insert(table), row).inserted_primary_key[0] for row in rows]
+
+    @staticmethod
+    def _reuse_stores(session, rows, store_map):
+        """Las tiendas son globales (email unico): las existentes se mapean y no se insertan."""
+        existing = dict(session.query(StoreAccount.email, StoreAccount.id).filter(
+            StoreAccount.email.in_([row['email'] for row in rows])
+        ).all())
+        missing = []
+        for row in rows:
+            if row['email'] in existing:
+                store_map[row['id']] = existing[row['email']]
+            else:
+                missing.append(row)
+        return missing
@@ -1,6 +1,11 @@
-from sqlalchemy import create_engine
+from sqlalchemy import delete, func
 from sqlalchemy.orm import sessionmaker
+from app.application.dtos import ChangeDTO, ChangeSetDTO, EventTotalsDTO
+from app.application.services import aggregates
+from app.domain.models import ChangeLog
 from app.utils.config import Config
+from app.utils.db_engine import create_db_engine
+from app.utils.logger import logger
 import contextlib
 
 class BaseService:
@@ -15,9 +20,17 @@ class BaseService:
     @classmethod
     def _init_engine(cls):
         if cls._engine is None:
-            cls._engine = create_engine(Config.get_db_url(), pool_recycle=3600)
+            cls._engine = create_db_engine(Config.get_db_url())
             cls._SessionFactory = sessionmaker(bind=cls._engine, expire_on_commit=False)
 
+    @classmethod
+    def bound_to(cls, engine):
+        """Retorna una subclase del servicio ligada a un engine propio (benchmarks, scripts)."""
+        return type(cls.__name__, (cls,), {
+            '_engine': engine,
+            '_SessionFactory': sessionmaker(bind=engine, expire_on_commit=False),
+        })
+
     @contextlib.contextmanager
     def session_scope(self):
         """Provide a transactional scope around a series of operations."""
@@ -42,6 +55,31 @@ class BaseService:
         return self._SessionFactory()
 
 
+    @staticmethod
+    def _blocked_on_replica(action):
+        """True (y avisa) si la escritura estructural no puede hacerse sobre la replica local.
+
+        Servidores, tiendas, cuentas, personajes y eventos no pasan por el journal: escritos en
+        la replica nunca llegarian a MySQL y sus ids chocarian con los creados alli. Se
+        administran con conexion directa a MySQL (DB_BACKEND=mysql).
+        """
+        if not Config.uses_local_replica():
+            return False
+        logger.warning(f"{action}: no disponible sobre la replica local, usar conexion directa a MySQL")
+        return True
+
+    def _delete_in_chunks(self, model, criteria, chunk_size):
+        """Borra las filas que cumplen `criteria` en lotes, una transaccion por lote. Retorna cuantas."""
+        deleted = 0
+        while True:
+            with self.session_scope() as session:
+                ids = [row_id for (row_id,) in session.query(model.id).filter(*criteria).limit(chunk_size)]
+                if ids:
+                    session.execute(delete(model).where(model.id.in_(ids)))
+            if not ids:
+                return deleted
+            deleted += len(ids)
+
     def _get_next_pending_day_generic(self, char_id, event_id, activity_model, max_days=31):
         """Retorna el proximo dia pendiente (status == 0 o sin registro)."""
         session = self.get_session()
@@ -63,3 +101,51 @@ class BaseService:
         finally:
             if not self._injected_session:
                 session.close()
+
+    def _get_changes_since_generic(self, server_id, version, entities, limit=1000):
+        """Cambios del journal posteriores a `version` para el servidor.
+
+        Con version None solo retorna la version actual (punto de partida tras una carga completa).
+        """
+        session = self.get_session()
+        try:
+            if version is None:
+                return ChangeSetDTO(version=session.query(func.max(ChangeLog.id)).scalar() or 0)
+
+            entries = session.query(ChangeLog).filter(
+                ChangeLog.server_id == server_id,
+                ChangeLog.id > version,
+                ChangeLog.entity.in_(entities)
+            ).order_by(ChangeLog.id).limit(limit).all()
+
+            return ChangeSetDTO(
+                version=entries[-1].id if entries else version,
+                changes=[
+                    ChangeDTO(entity=e.entity, owner_id=e.owner_id, scope_id=e.scope_id,
+                              slot=e.slot, value=e.value, version=e.row_version)
+                    for e in entries
+                ]
+            )
+        except Exception as e:
+            logger.error(f"Error obteniendo cambios desde la version {version}: {e}")
+            return ChangeSetDTO(version=version or 0)
+        finally:
+            if not self._injected_session:
+                session.close()
+
+    def _get_totals_generic(self, feature, scope_id, server_id=None, by=None):
+        """Lee los agregados materializados. by='day' / 'store' retorna {clave: EventTotalsDTO}."""
+        if not scope_id:
+            return EventTotalsDTO() if by is None else {}
+        session = self.get_session()
+        try:
+            totals = aggregates.read_totals(session, feature, scope_id, server_id, by)
+            if by is None:
+                return EventTotalsDTO(**totals)
+            return {key: EventTotalsDTO(**values) for key, values in totals.items()}
+        except Exception as e:
+            logger.error(f"Error leyendo agregados de {feature} {scope_id}: {e}")
+            return EventTotalsDTO() if by is None else {}
+        finally:
+            if not self._injected_session:
+                session.close()
@@ -0,0 +1,173 @@
+"""Journal de cambios compartido por los write paths y el motor de sincronizacion."""
+import datetime
+from sqlalchemy import func, insert
+from app.domain.models import (
+    ChangeLog, Character, GameAccount, AlchemyEvent, TombolaEvent,
+    DailyCorActivity, TombolaActivity, FishingActivity, DailyCorRecord,
+    AlchemyCounter, TombolaItemCounter
+)
+from app.application.services import aggregates
+from app.utils.config import Config
+
+# Entidades journaladas
+ALCHEMY_STATUS = 'alchemy_status'
+TOMBOLA_STATUS = 'tombola_status'
+FISHING_STATUS = 'fishing_status'
+ALCHEMY_CORDS = 'alchemy_cords'
+ALCHEMY_COUNTER = 'alchemy_counter'
+TOMBOLA_COUNTER = 'tombola_counter'
+
+# Los contadores se journalan como delta (value = cuanto se sumo), no como valor absoluto:
+# dos puestos que incrementan offline el mismo contador suman ambos incrementos al sincronizar
+COUNTER_ENTITIES = (ALCHEMY_COUNTER, TOMBOLA_COUNTER)
+
+
+# Entidades que afectan los datos de un evento de cada feature
+EVENT_ENTITIES = {
+    aggregates.ALCHEMY: (ALCHEMY_STATUS, ALCHEMY_CORDS, ALCHEMY_COUNTER),
+    aggregates.TOMBOLA: (TOMBOLA_STATUS, TOMBOLA_COUNTER),
+}
+
+
+def scope_version(session, entities, scope_id):
+    """Id de la ultima entrada del journal para esas entidades en el evento (0 si no hay)."""
+    return session.query(func.max(ChangeLog.id)).filter(
+        ChangeLog.scope_id == scope_id, ChangeLog.entity.in_(entities)
+    ).scalar() or 0
+
+
+def server_for_event(session, event_model, event_id):
+    return session.query(event_model.server_id).filter(event_model.id == event_id).scalar()
+
+
+def server_for_character(session, char_id):
+    return session.query(GameAccount.server_id).join(Character).filter(Character.id == char_id).scalar()
+
+
+def server_for_account(session, game_account_id):
+    return session.query(GameAccount.server_id).filter(GameAccount.id == game_account_id).scalar()
+
+
+def record_change(session, entity, server_id, owner_id, scope_id, slot, value,
+                  origin=None, changed_at=None, row_version=None):
+    """Agrega una entrada al journal dentro de la transaccion del write."""
+    session.execute(insert(ChangeLog).values(
+        entity=entity,
+        server_id=server_id,
+        owner_id=owner_id,
+        scope_id=scope_id,
+        slot=str(slot),
+        value=value,
+        row_version=row_version,
+        origin=origin or Config.CLIENT_ID,
+        changed_at=changed_at or datetime.datetime.utcnow(),
+    ))
+
+
+def resume_versions(session, entity, scope_id, rows):
+    """Continua la version de las celdas recien insertadas desde la ultima del journal.
+
+    rows: {(owner_id, slot): fila insertada}. En modo disperso un pendiente borra la fila; sin
+    esto al recrearla volveria a la version 1 y un puesto que leyo la version previa al borrado
+    podria sobrescribirla (ABA).
+    """
+    if not rows:
+        return
+    last = session.query(ChangeLog.owner_id, ChangeLog.slot, func.max(ChangeLog.row_version)).filter(
+        ChangeLog.entity == entity, ChangeLog.scope_id == scope_id,
+        ChangeLog.owner_id.in_({owner_id for owner_id, _ in rows})
+    ).group_by(ChangeLog.owner_id, ChangeLog.slot)
+    resumed = False
+    for owner_id, slot, version in last:
+        row = rows.get((owner_id, slot))
+        if row is not None and version and row.version <= version:
+            row.version = version + 1
+            resumed = True
+    if resumed:
+        session.flush()
+
+
+def _upsert(session, model, filters, field, value):
+    """Upsert de un campo. Retorna (fila, valor anterior)."""
+    row = session.query(model).filter_by(**filters).first()
+    old = None
+    if row:
+        old = getattr(row, field)
+        setattr(row, field, value)
+    else:
+        row = model(**filters, **{field: value})
+        session.add(row)
+    session.flush()
+    return row, old
+
+
+def _add(session, model, filters, field, delta):
+    """Suma `delta` al campo, creando la fila si no existe."""
+    row = session.query(model).filter_by(**filters).first()
+    if row:
+        setattr(row, field, (getattr(row, field) or 0) + delta)
+    else:
+        row = model(**filters, **{field: delta})
+        session.add(row)
+    session.flush()
+    return row
+
+
+def _store_status(session, model, filters, value):
+    """Como _upsert para estados; en modo disperso un 0 borra la fila. Retorna (fila o None, anterior)."""
+    if not (Config.SPARSE_ACTIVITIES and value == 0):
+        return _upsert(session, model, filters, 'status_code', value)
+    row = session.query(model).filter_by(**filters).first()
+    if row is None:
+        return None, None
+    old = row.status_code
+    session.delete(row)
+    session.flush()
+    return None, old
+
+
+def apply_change(session, entity, owner_id, scope_id, slot, value, server_id=None):
+    """Aplica una entrada del journal sobre la tabla de la entidad (upsert) y sus agregados.
+
+    En contadores la entrada es un delta y se suma al valor actual.
+
+    Retorna la version de la fila.
+    """
+    if entity == ALCHEMY_STATUS:
+        row, old = _store_status(session, DailyCorActivity,
+                                 dict(character_id=owner_id, event_id=scope_id, day_index=int(slot)), value)
+        if Config.SPARSE_ACTIVITIES and row is not None and old is None:
+            resume_versions(session, ALCHEMY_STATUS, scope_id, {(owner_id, str(slot)): row})
+        aggregates.record_status(
+            session, aggregates.ALCHEMY, server_id or server_for_event(session, AlchemyEvent, scope_id),
+            scope_id, int(slot), aggregates.store_for_character(session, owner_id), old, value)
+    elif entity == TOMBOLA_STATUS:
+        row, old = _store_status(session, TombolaActivity,
+                                 dict(character_id=owner_id, event_id=scope_id, day_index=int(slot)), value)
+        aggregates.record_status(
+            session, aggregates.TOMBOLA, server_id or server_for_event(session, TombolaEvent, scope_id),
+            scope_id, int(slot), aggregates.store_for_character(session, owner_id), old, value)
+    elif entity == FISHING_STATUS:
+        month, week = (int(p) for p in slot.split('_'))
+        row, old = _store_status(session, FishingActivity,
+                                 dict(character_id=owner_id, year=scope_id, month=month, week=week), value)
+        aggregates.record_status(
+            session, aggregates.FISHING, server_id or server_for_character(session, owner_id),
+            scope_id, aggregates.fishing_day(month, week), aggregates.store_for_character(session, owner_id),
+            old, value)
+    elif entity == ALCHEMY_CORDS:
+        row, old = _upsert(session, DailyCorRecord,
+                           dict(game_account_id=owner_id, event_id=scope_id, day_index=int(slot)), 'cords_count', value)
+        aggregates.record_cords(
+            session, server_id or server_for_event(session, AlchemyEvent, scope_id),
+            scope_id, int(slot), aggregates.store_for_account(session, owner_id), old, value)
+    elif entity == ALCHEMY_COUNTER:
+        row = _add(session, AlchemyCounter, dict(event_id=scope_id, alchemy_type=slot), 'count', value)
+    elif entity == TOMBOLA_COUNTER:
+        row = _add(session, TombolaItemCounter, dict(event_id=scope_id, item_name=slot), 'count', value)
+    else:
+        raise ValueError(f"Entidad de journal desconocida: {entity}")
+    if row is None:
+        # Fila borrada en modo disperso: version 0 = sin registro
+        return 0 if entity == ALCHEMY_STATUS else None
+    return getattr(row, 'version', None)
@@ -0,0 +1,133 @@
+from app.application.dtos import CountdownTimerDTO, CountdownPresetDTO
+from app.application.services.base_service import BaseService
+from app.application.services.timer_service import TimerService
+from app.domain.models import CountdownTimer, CountdownPreset, CountdownPresetItem
+from app.utils.config import Config
+from app.utils.logger import logger
+
+class CountdownService(BaseService):
+    """Estado de los temporizadores flotantes (por puesto) y grupos de presets con nombre.
+
+    Los deadlines se guardan en UTC de reloj de pared: al reabrir, el restante sale de
+    deadline - ahora, sin reproducir ticks.
+    """
+
+    def __init__(self, session=None, owner=None):
+        super().__init__(session)
+        self.owner = owner or Config.CLIENT_ID
+
+    @staticmethod
+    def _to_dto(row):
+        return CountdownTimerDTO(id=row.id, duration_seconds=row.duration_seconds,
+                                 remaining_ms=row.remaining_ms, deadline_at=row.deadline_at,
+                                 position=row.position)
+
+    def get_timers(self):
+        try:
+            with self.session_scope() as session:
+                rows = session.query(CountdownTimer).filter(
+                    CountdownTimer.owner == self.owner
+                ).order_by(CountdownTimer.position, CountdownTimer.id).all()
+                return [self._to_dto(r) for r in rows]
+        except Exception as e:
+            logger.error(f"Error al obtener temporizadores: {e}")
+            return []
+
+    def _replace_timers(self, session, timers):
+        """Reemplaza los temporizadores del puesto con un DELETE y un INSERT masivo."""
+        session.query(CountdownTimer).filter(CountdownTimer.owner == self.owner).delete(
+            synchronize_session=False)
+        session.bulk_insert_mappings(CountdownTimer, [
+            {
+                'owner': self.owner,
+                'position': position,
+                'duration_seconds': t.duration_seconds,
+                'remaining_ms': t.remaining_ms,
+                'deadline_at': t.deadline_at,
+            }
+            for position, t in enumerate(timers)
+        ])
+
+    def save_timers(self, timers):
+        """Guarda la lista completa de temporizadores del puesto en una sola transaccion."""
+        try:
+            with self.session_scope() as session:
+                self._replace_timers(session, timers)
+                return True
+        except Exception as e:
+            logger.error(f"Error al guardar temporizadores: {e}")
+            return False
+
+    def save_timers_async(self, timers):
+        """Encola save_timers en el worker de guardados de cronometros (mismo orden, fuera de la UI)."""
+        return TimerService._get_executor().submit(self.save_timers, list(timers))
+
+    def get_presets(self):
+        try:
+            with self.session_scope() as session:
+                presets = session.query(CountdownPreset).order_by(CountdownPreset.name).all()
+                return [
+                    CountdownPresetDTO(id=p.id, name=p.name,
+                                       durations=[item.duration_seconds for item in p.items])
+                    for p in presets
+                ]
+        except Exception as e:
+            logger.error(f"Error al obtener presets de temporizadores: {e}")
+            return []
+
+    def save_preset(self, name, durations):
+        """Crea o reemplaza un preset con las duraciones (segundos) dadas. Retorna su DTO o None."""
+        if not name or not name.strip() or not durations:
+            return None
+        try:
+            with self.session_scope() as session:
+                preset = session.query(CountdownPreset).filter(CountdownPreset.name == name.strip()).first()
+                if preset:
+                    preset.items.clear()
+                else:
+                    preset = CountdownPreset(name=name.strip())
+                    session.add(preset)
+                preset.items.extend(
+                    CountdownPresetItem(position=position, duration_seconds=int(seconds))
+                    for position, seconds in enumerate(durations)
+                )
+                session.flush()
+                return CountdownPresetDTO(id=preset.id, name=preset.name, durations=[int(s) for s in durations])
+        except Exception as e:
+            logger.error(f"Error al guardar preset '{name}': {e}")
+            return None
+
+    def delete_preset(self, preset_id):
+        try:
+            with self.session_scope() as session:
+                preset = session.get(CountdownPreset, preset_id)
+                if not preset:
+                    return False
+                session.delete(preset)
+                return True
+        except Exception as e:
+            logger.error(f"Error al eliminar preset {preset_id}: {e}")
+            return False
+
+    def load_preset(self, preset_id):
+        """Reemplaza los temporizadores del puesto por los del preset (pausados, a duracion completa).
+
+        Es una sola operacion masiva, sin importar cuantos temporizadores tenga el grupo.
+        Retorna los temporizadores resultantes, o None si el preset no existe o fallo.
+        """
+        try:
+            with self.session_scope() as session:
+                durations = [row.duration_seconds for row in session.query(CountdownPresetItem.duration_seconds).filter(
+                    CountdownPresetItem.preset_id == preset_id
+                ).order_by(CountdownPresetItem.position)]
+                if not durations:
+                    return None
+                timers = [
+                    CountdownTimerDTO(duration_seconds=seconds, remaining_ms=seconds * 1000, position=position)
+                    for position, seconds in enumerate(durations)
+                ]
+                self._replace_timers(session, timers)
+                return timers
+        except Exception as e:
+            logger.error(f"Error al cargar preset {preset_id}: {e}")
+            return None
@@ -0,0 +1,225 @@
+"""
+Exportacion de un evento completo (Alquimia o Tombola) a .xlsx o .csv.
+
+Las filas se leen con cursores por lotes (yield_per) y se escriben a medida que llegan:
+openpyxl en modo write_only o csv. Nunca se arma el evento completo en memoria.
+"""
+import csv
+import os
+from itertools import groupby
+from sqlalchemy import and_, func
+from app.application.dtos import ExportResultDTO
+from app.application.services.base_service import BaseService
+from app.application.services import aggregates, archive
+from app.domain.models import (
+    AlchemyEvent, TombolaEvent, TOMBOLA_DAYS, DailyCorActivity, TombolaActivity, DailyCorRecord,
+    AlchemyCounter, TombolaItemCounter, Character, GameAccount, StoreAccount
+)
+from app.utils.config import Config
+from app.utils.logger import logger
+from app.utils import perf_log
+
+try:
+    import openpyxl
+    HAS_OPENPYXL = True
+except ImportError:
+    HAS_OPENPYXL = False
+
+STATUS_LABELS = {1: "Hecho", -1: "Fallido"}
+
+# feature -> (evento, actividad, contador, columna del nombre del contador)
+_FEATURES = {
+    aggregates.ALCHEMY: (AlchemyEvent, DailyCorActivity, AlchemyCounter, AlchemyCounter.alchemy_type),
+    aggregates.TOMBOLA: (TombolaEvent, TombolaActivity, TombolaItemCounter, TombolaItemCounter.item_name),
+}
+
+
+class _CsvWriter:
+    """Un solo archivo: cada hoja es una seccion con su titulo, separada por una linea vacia."""
+
+    def __init__(self, path):
+        self._file = open(path, 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.writer(self._file)
+        self._first = True
+
+    def sheet(self, title, header):
+        if not self._first:
+            self._writer.writerow([])
+        self._first = False
+        self._writer.writerow([f"# {title}"])
+        self._writer.writerow(header)
+
+    def row(self, values):
+        self._writer.writerow(values)
+
+    def close(self):
+        self._file.close()
+
+
+class _XlsxWriter:
+    """Workbook write_only: las filas se vuelcan a disco al agregarlas."""
+
+    def __init__(self, path):
+        self._path = path
+        self._workbook = openpyxl.Workbook(write_only=True)
+        self._sheet = None
+
+    def sheet(self, title, header):
+        self._sheet = self._workbook.create_sheet(title)
+        self._sheet.append(header)
+
+    def row(self, values):
+        self._sheet.append(values)
+
+    def close(self):
+        self._workbook.save(self._path)
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class ExportService(BaseService):
+    """Exporta la grilla de estados, los cords diarios y los contadores de un evento."""
+
+    def _open_writer(self, file_path):
+        ext = os.path.splitext(file_path)[1].lower()
+        tmp_path = f"{file_path}.tmp{ext}"
+        if ext == '.csv':
+            return _CsvWriter(tmp_path), tmp_path
+        if ext == '.xlsx':
+            if not HAS_OPENPYXL:
+                raise ImportError("openpyxl es necesario para exportar .xlsx. Instale o use .csv")
+            return _XlsxWriter(tmp_path), tmp_path
+        raise ValueError(f"Formato no soportado: {ext}")
+
+    @perf_log.timed('export.event', ids=('feature', 'event_id'), rows=lambda result: result.rows if result else None)
+    def export_event(self, feature, event_id, file_path, progress=None, cancel=None):
+        """Escribe el evento en file_path (.xlsx o .csv) y retorna un ExportResultDTO, o None si fallo.
+
+        `progress(hechas, total)` se llama cada lote de filas; si `cancel` (threading.Event) se activa,
+        se corta en el lote siguiente y no queda archivo parcial.
+        """
+        if feature not in _FEATURES or not event_id:
+            return None
+        event_model, activity, counter_model, counter_name = _FEATURES[feature]
+        tmp_path = None
+        try:
+            with self.session_scope() as session:
+                event = session.get(event_model, event_id)
+                if event is None:
+                    return None
+                total_days = getattr(event, 'total_days', None) or TOMBOLA_DAYS
+                payload = archive.load(session, feature, event_id)
+
+                total = session.query(func.count(Character.id)).join(GameAccount).filter(
+                    GameAccount.server_id == event.server_id).scalar() or 0
+                if feature == aggregates.ALCHEMY:
+                    total += session.query(func.count(GameAccount.id)).filter(
+                        GameAccount.server_id == event.server_id).scalar() or 0
+
+                writer, tmp_path = self._open_writer(file_path)
+                try:
+                    days = list(range(1, total_days + 1))
+                    day_headers = [f"Dia {d}" for d in days]
+                    writer.sheet("Estados", ["Tienda", "Cuenta", "Personaje"] + day_headers)
+                    done = self._write_rows(writer, self._status_rows(session, activity, event, days, payload),
+                                            0, total, progress, cancel)
+                    if feature == aggregates.ALCHEMY:
+                        writer.sheet("Cords", ["Tienda", "Cuenta"] + day_headers + ["Total"])
+                        done = self._write_rows(writer, self._cords_rows(session, event, days, payload),
+                                                done, total, progress, cancel)
+
+                    writer.sheet("Contadores", ["Tipo", "Cantidad"])
+                    for name, count in session.query(counter_name, counter_model.count).filter(
+                        counter_model.event_id == event_id
+                    ).order_by(counter_name):
+                        writer.row([name, count or 0])
+                        done += 1
+                finally:
+                    writer.close()
+
+                os.replace(tmp_path, file_path)
+                if progress:
+                    progress(total, total)
+                logger.info("Evento exportado: %s %s -> %s (%s filas)", feature, event_id, file_path, done)
+                return ExportResultDTO(path=file_path, rows=done)
+        except ExportCancelled:
+            self._discard(tmp_path)
+            logger.info("Exportacion cancelada: %s %s", feature, event_id)
+            return ExportResultDTO(path=file_path, cancelled=True)
+        except Exception as e:
+            self._discard(tmp_path)
+            logger.error(f"Error al exportar {feature} {event_id}: {e}")
+            return None
+
+    @staticmethod
+    def _write_rows(writer, rows, done, total, progress, cancel):
+        """Escribe las filas; cada lote informa progreso y revisa la cancelacion. Retorna el acumulado."""
+        for values in rows:
+            writer.row(values)
+            done += 1
+            if done % Config.EXPORT_BATCH_SIZE == 0:
+                if cancel is not None and cancel.is_set():
+                    raise ExportCancelled()
+                if progress:
+                    progress(done, total)
+        return done
+
+    @staticmethod
+    def _discard(tmp_path):
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    @staticmethod
+    def _accounts_query(session, *columns):
+        return session.query(StoreAccount.email, GameAccount.username, *columns) \
+            .select_from(GameAccount).outerjoin(StoreAccount, StoreAccount.id == GameAccount.store_account_id)
+
+    def _status_rows(self, session, activity, event, days, payload):
+        """[tienda, cuenta, personaje, estado dia 1..N] por personaje, leyendo por lotes."""
+        if payload is not None:
+            vectors = payload['statuses']
+            query = self._accounts_query(session, Character.id, Character.name).join(
+                Character, Character.game_account_id == GameAccount.id
+            ).filter(GameAccount.server_id == event.server_id).order_by(
+                StoreAccount.email, GameAccount.username, Character.id
+            ).yield_per(Config.EXPORT_BATCH_SIZE)
+            for email, username, char_id, name in query:
+                statuses = archive.unpack_statuses(vectors.get(str(char_id), ''))
+                yield [email or "", username, name] + [STATUS_LABELS.get(statuses.get(d), "") for d in days]
+            return
+
+        # Una fila por (personaje, dia con registro); los personajes sin registros vienen con dia NULL
+        query = self._accounts_query(session, Character.id, Character.name, activity.day_index,
+                                     activity.status_code).join(
+            Character, Character.game_account_id == GameAccount.id
+        ).outerjoin(activity, and_(activity.character_id == Character.id, activity.event_id == event.id)).filter(
+            GameAccount.server_id == event.server_id
+        ).order_by(StoreAccount.email, GameAccount.username, Character.id).yield_per(Config.EXPORT_BATCH_SIZE)
+        for (email, username, _, name), group in groupby(query, key=lambda r: tuple(r[:4])):
+            statuses = {day: status for *_, day, status in group if day is not None}
+            yield [email or "", username, name] + [STATUS_LABELS.get(statuses.get(d), "") for d in days]
+
+    def _cords_rows(self, session, event, days, payload):
+        """[tienda, cuenta, cords dia 1..N, total] por cuenta del servidor."""
+        if payload is not None:
+            archived = archive.cords(payload)
+            query = self._accounts_query(session, GameAccount.id).filter(
+                GameAccount.server_id == event.server_id
+            ).order_by(StoreAccount.email, GameAccount.username, GameAccount.id).yield_per(Config.EXPORT_BATCH_SIZE)
+            for email, username, account_id in query:
+                counts = archived.get(account_id, {})
+                yield [email or "", username] + [counts.get(d, 0) for d in days] + [sum(counts.values())]
+            return
+
+        query = self._accounts_query(session, GameAccount.id, DailyCorRecord.day_index,
+                                     DailyCorRecord.cords_count).outerjoin(
+            DailyCorRecord, and_(DailyCorRecord.game_account_id == GameAccount.id,
+                                 DailyCorRecord.event_id == event.id)
+        ).filter(GameAccount.server_id == event.server_id).order_by(
+            StoreAccount.email, GameAccount.username, GameAccount.id
+        ).yield_per(Config.EXPORT_BATCH_SIZE)
+        for (email, username, _), group in groupby(query, key=lambda r: tuple(r[:3])):
+            counts = {day: count or 0 for *_, day, count in group if day is not None}
+            yield [email or "", username] + [counts.get(d, 0) for d in days] + [sum(counts.values())]
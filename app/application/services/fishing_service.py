@@ -4,13 +4,18 @@ from app.utils.config import Config
 from app.domain.models import Server, StoreAccount, GameAccount, Character, CharacterType, FishingActivity
 from app.application.dtos import StoreAccountDTO, GameAccountDTO, FishingCharacterDTO
 from sqlalchemy import extract
+from sqlalchemy.exc import IntegrityError
 
 from app.application.services.base_service import BaseService
+from app.application.services import change_log, aggregates, status_matrix
 from app.utils.logger import logger
+from app.utils import perf_log
 
 class FishingService(BaseService):
 
-    def get_fishing_data(self, server_id, year):
+    @perf_log.timed('fishing.dashboard', ids=('server_id', 'year'), rows=perf_log.count_accounts)
+    def get_fishing_data(self, server_id, year, with_matrix=False):
+        """Tiendas con sus cuentas del anio; con with_matrix retorna (tiendas, matriz personajes x 48 semanas)."""
         with self.session_scope() as session:
             stores = session.query(StoreAccount).join(GameAccount).filter(GameAccount.server_id == server_id).distinct().all()
             
@@ -53,6 +58,8 @@ class FishingService(BaseService):
                     store_dto.game_accounts = valid_accounts
                     result_dtos.append(store_dto)
             
+            if with_matrix:
+                return result_dtos, status_matrix.build(result_dtos, status_matrix.week_columns(), 'fishing_activity_map')
             return result_dtos
 
     def get_last_filled_week(self, char_id, year):
@@ -82,8 +89,11 @@ class FishingService(BaseService):
             logger.error(f"Import Error: {e}")
             raise e
 
+    @perf_log.timed('fishing.import', ids=('server_id',))
     def bulk_import_accounts(self, server_id, import_data):
         """Crea cuentas y personajes a partir de datos importados."""
+        if self._blocked_on_replica("Importar cuentas"):
+            return 0
         from app.domain.models import StoreAccount, GameAccount, Character, CharacterType
         
         if isinstance(import_data, list):
@@ -156,6 +166,7 @@ class FishingService(BaseService):
                 logger.error(f"Bulk Import Error: {e}")
                 raise e
 
+    @perf_log.timed('fishing.status', ids=('char_id', 'year'))
     def update_fishing_status(self, char_id, year, month, week, new_status):
         try:
             with self.session_scope() as session:
@@ -166,7 +177,11 @@ class FishingService(BaseService):
                     FishingActivity.week == week
                 ).first()
                 
-                if activity:
+                old_status = activity.status_code if activity else 0
+                if Config.SPARSE_ACTIVITIES and new_status == 0:
+                    if activity:
+                        session.delete(activity)
+                elif activity:
                     activity.status_code = new_status
                 else:
                     activity = FishingActivity(
@@ -177,12 +192,32 @@ class FishingService(BaseService):
                         status_code=new_status
                     )
                     session.add(activity)
+                server_id = change_log.server_for_character(session, char_id)
+                change_log.record_change(
+                    session, change_log.FISHING_STATUS, server_id,
+                    char_id, year, f"{month}_{week}", new_status
+                )
+                aggregates.record_status(
+                    session, aggregates.FISHING, server_id, year, aggregates.fishing_day(month, week),
+                    aggregates.store_for_character(session, char_id), old_status, new_status
+                )
                 # Commit handled by session_scope
                 return True
+        except IntegrityError as e:
+            logger.warning(f"Conflicto al guardar semana de pesca: {e}")
+            return False
         except Exception as e:
             logger.error(f"Error updating fishing status: {e}")
             return False
 
+    def get_year_totals(self, server_id, year, by=None):
+        """Semanas completadas y fallidas del año en el servidor desde los agregados."""
+        return self._get_totals_generic(aggregates.FISHING, year, server_id=server_id, by=by)
+
+    def get_changes_since(self, server_id, version):
+        """Semanas de pesca modificadas desde `version` (refresco incremental)."""
+        return self._get_changes_since_generic(server_id, version, (change_log.FISHING_STATUS,))
+
     def get_next_pending_week(self, char_id, year):
         """Retorna el primer (month, week) pendiente (0) o faltante."""
         with self.session_scope() as session:
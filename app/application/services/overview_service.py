@@ -0,0 +1,163 @@
+"""
+Resumen de todos los servidores: evento activo de Alquimia y Tombola y año de pesca en curso.
+
+Se arma con una cantidad fija de consultas agrupadas (no depende de la cantidad de servidores)
+sobre los agregados materializados. El resultado queda cacheado con la version del journal:
+si hubo cambios solo se recalculan los servidores que aparecen en change_log desde entonces.
+Lo que no pasa por el journal (cuentas o eventos nuevos, archivados) se toma en la recarga
+completa cada OVERVIEW_TTL_SECONDS.
+"""
+import datetime
+import threading
+import time
+from sqlalchemy import and_, distinct, func, or_, select
+from app.application.dtos import FeatureOverviewDTO, ServerOverviewDTO, OverviewDTO
+from app.application.services.base_service import BaseService
+from app.application.services import aggregates
+from app.domain.models import (
+    Server, GameAccount, Character, AlchemyEvent, TombolaEvent, TOMBOLA_DAYS,
+    AlchemyCounter, TombolaItemCounter, EventDayTotal, ChangeLog
+)
+from app.utils import perf_log
+from app.utils.config import Config
+from app.utils.logger import logger
+
+FISHING_WEEKS = 48
+
+# feature -> (flag del servidor, modelo del evento, modelo del contador, columna del nombre)
+_EVENTS = {
+    aggregates.ALCHEMY: ('has_dailies', AlchemyEvent, AlchemyCounter, AlchemyCounter.alchemy_type),
+    aggregates.TOMBOLA: ('has_tombola', TombolaEvent, TombolaItemCounter, TombolaItemCounter.item_name),
+}
+
+
+class OverviewService(BaseService):
+    """Totales por servidor y feature para la pantalla de resumen."""
+
+    def __init__(self, session=None, clock=time.monotonic):
+        super().__init__(session)
+        self._clock = clock
+        self._cached = None
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def get_overview(self, year=None):
+        """OverviewDTO vigente; recalcula solo los servidores con cambios desde la ultima lectura."""
+        year = year or datetime.date.today().year
+        try:
+            with self._lock, self.session_scope() as session:
+                version = session.query(func.max(ChangeLog.id)).scalar() or 0
+                cached = self._cached
+                expired = (cached is None or cached.year != year
+                           or self._clock() - self._loaded_at > Config.OVERVIEW_TTL_SECONDS)
+                if expired:
+                    overview = OverviewDTO(version=version, year=year, servers=self._load(session, year))
+                    self._loaded_at = self._clock()
+                elif version == cached.version:
+                    return cached
+                else:
+                    changed = {server_id for (server_id,) in session.query(distinct(ChangeLog.server_id)).filter(
+                        ChangeLog.id > cached.version, ChangeLog.id <= version
+                    )}
+                    # Entradas sin servidor: no se sabe que recalcular
+                    servers = None if None in changed else self._load(session, year, changed)
+                    overview = OverviewDTO(version=version, year=year,
+                                           servers=self._load(session, year) if servers is None
+                                           else _merge(cached.servers, servers, changed))
+                self._cached = overview
+                return overview
+        except Exception as e:
+            logger.error(f"Error al obtener el resumen de servidores: {e}")
+            return self._cached or OverviewDTO(year=year)
+
+    def invalidate_overview(self):
+        """Descarta la cache: la proxima lectura recarga todo."""
+        with self._lock:
+            self._cached = None
+
+    @perf_log.timed('overview.load', rows=len)
+    def _load(self, session, year, server_ids=None):
+        """Arma el resumen de los servidores indicados (o de todos) con consultas agrupadas."""
+        def only(column):
+            return (column.in_(server_ids),) if server_ids is not None else ()
+
+        servers = session.query(Server).filter(*only(Server.id)).order_by(Server.name).all()
+        if not servers:
+            return []
+
+        # Cuentas y personajes por servidor; las grillas (y sus pendientes) solo llevan el
+        # primer personaje de cada cuenta: una fila por cuenta con personajes
+        population = {server_id: (accounts, characters, rows)
+                      for server_id, accounts, characters, rows in session.query(
+            GameAccount.server_id, func.count(distinct(GameAccount.id)), func.count(Character.id),
+            func.count(distinct(Character.game_account_id))
+        ).outerjoin(Character, Character.game_account_id == GameAccount.id).filter(
+            *only(GameAccount.server_id)
+        ).group_by(GameAccount.server_id)}
+
+        # Evento activo de cada feature: el ultimo no archivado del servidor
+        active = {}
+        for feature, (_flag, event_model, _counter, _name) in _EVENTS.items():
+            latest = select(func.max(event_model.id)).where(
+                event_model.archived == False, *only(event_model.server_id)
+            ).group_by(event_model.server_id)
+            active[feature] = {event.server_id: event
+                               for event in session.query(event_model).filter(event_model.id.in_(latest))}
+
+        # Totales de los eventos activos y del año de pesca, en una sola consulta
+        scopes = [and_(EventDayTotal.feature == feature, EventDayTotal.scope_id.in_([e.id for e in events.values()]))
+                  for feature, events in active.items() if events]
+        scopes.append(and_(EventDayTotal.feature == aggregates.FISHING, EventDayTotal.scope_id == year))
+        totals = {(feature, server_id, scope_id): (completed or 0, failed or 0, cords or 0)
+                  for feature, server_id, scope_id, completed, failed, cords in session.query(
+                      EventDayTotal.feature, EventDayTotal.server_id, EventDayTotal.scope_id,
+                      func.sum(EventDayTotal.completed), func.sum(EventDayTotal.failed), func.sum(EventDayTotal.cords)
+                  ).filter(or_(*scopes), *only(EventDayTotal.server_id)).group_by(
+                      EventDayTotal.feature, EventDayTotal.server_id, EventDayTotal.scope_id)}
+
+        counters = {}
+        for feature, (_flag, _event, counter_model, counter_name) in _EVENTS.items():
+            event_ids = [e.id for e in active[feature].values()]
+            if not event_ids:
+                continue
+            for event_id, name, count in session.query(
+                counter_model.event_id, counter_name, func.sum(counter_model.count)
+            ).filter(counter_model.event_id.in_(event_ids)).group_by(counter_model.event_id, counter_name):
+                counters.setdefault((feature, event_id), {})[name] = count or 0
+
+        result = []
+        for server in servers:
+            accounts, characters, rows = population.get(server.id, (0, 0, 0))
+            item = ServerOverviewDTO(server_id=server.id, name=server.name, accounts=accounts, characters=characters)
+            for feature, (flag, *_rest) in _EVENTS.items():
+                if not getattr(server, flag):
+                    continue
+                event = active[feature].get(server.id)
+                if event is None:
+                    item.features[feature] = FeatureOverviewDTO(feature=feature, characters=rows)
+                    continue
+                total_days = getattr(event, 'total_days', None) or TOMBOLA_DAYS
+                item.features[feature] = _feature(feature, event.id, event.name, total_days, rows,
+                                                  totals.get((feature, server.id, event.id)),
+                                                  counters.get((feature, event.id), {}))
+            if server.has_fishing:
+                item.features[aggregates.FISHING] = _feature(aggregates.FISHING, year, str(year), FISHING_WEEKS,
+                                                             rows, totals.get((aggregates.FISHING, server.id, year)))
+            result.append(item)
+        return result
+
+
+def _feature(feature, scope_id, name, total_days, characters, totals, counters=None):
+    completed, failed, cords = totals or (0, 0, 0)
+    return FeatureOverviewDTO(
+        feature=feature, scope_id=scope_id, name=name, total_days=total_days, characters=characters,
+        completed=completed, failed=failed, pending=max(characters * total_days - completed - failed, 0),
+        cords=cords, counters=counters or {},
+    )
+
+
+def _merge(cached, fresh, changed):
+    """Reemplaza en el resumen cacheado los servidores recalculados, manteniendo el orden por nombre."""
+    servers = {server.server_id: server for server in cached if server.server_id not in changed}
+    servers.update((server.server_id, server) for server in fresh)
+    return sorted(servers.values(), key=lambda server: server.name)
@@ -0,0 +1,108 @@
+import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.application.dtos import PrefetchedDashboardDTO
+from app.utils.config import Config
+from app.utils.logger import logger
+
+DAILIES = 'dailies'
+FISHING = 'fishing'
+TOMBOLA = 'tombola'
+
+class DashboardPrefetcher:
+    """Precarga en segundo plano los eventos y el dashboard por defecto de cada feature habilitada.
+
+    Los resultados quedan en una cache de vida corta y se consumen una sola vez al abrir la vista;
+    los cambios posteriores a la precarga los trae el poller desde la version guardada.
+    """
+
+    def __init__(self, services, ttl_seconds=None, clock=None):
+        # feature -> factory del servicio; se invoca recien al precargar esa feature
+        self._services = services
+        self.ttl_seconds = Config.PREFETCH_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._clock = clock or time.monotonic
+        self._cache = {}  # (server_id, feature) -> (vence, dto)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            # Un solo worker: la precarga no compite con la UI por conexiones
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prefetch')
+        return self._executor
+
+    def shutdown(self, wait=False):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def prefetch(self, server_id, flags):
+        """Encola la precarga de las features habilitadas en `flags`. Retorna los Futures encolados."""
+        futures = []
+        for feature in self._services:
+            if not flags.get(f'has_{feature}'):
+                continue
+            key = (server_id, feature)
+            with self._lock:
+                if key in self._pending or self._fresh(key):
+                    continue
+                self._pending.add(key)
+            futures.append(self._get_executor().submit(self._run, server_id, feature))
+        return futures
+
+    def take(self, server_id, feature):
+        """Retorna y quita de la cache la precarga vigente, o None."""
+        key = (server_id, feature)
+        with self._lock:
+            if not self._fresh(key):
+                self._cache.pop(key, None)
+                return None
+            return self._cache.pop(key)[1]
+
+    def invalidate(self, server_id=None):
+        with self._lock:
+            for key in [k for k in self._cache if server_id is None or k[0] == server_id]:
+                del self._cache[key]
+
+    def _fresh(self, key):
+        entry = self._cache.get(key)
+        return entry is not None and entry[0] > self._clock()
+
+    def _run(self, server_id, feature):
+        try:
+            dto = self.load(server_id, feature)
+            with self._lock:
+                self._cache[(server_id, feature)] = (self._clock() + self.ttl_seconds, dto)
+            return dto
+        except Exception as e:
+            logger.warning(f"No se pudo precargar {feature} del servidor {server_id}: {e}")
+            return None
+        finally:
+            with self._lock:
+                self._pending.discard((server_id, feature))
+
+    def load(self, server_id, feature):
+        """Lee eventos y dashboard por defecto de una feature (lo mismo que haria la vista al abrirse)."""
+        service = self._services[feature]()
+        if feature == FISHING:
+            year = datetime.date.today().year
+            version = service.get_changes_since(server_id, None).version
+            return PrefetchedDashboardDTO(feature, server_id, year, version,
+                                          dashboard=service.get_fishing_data(server_id, year))
+
+        version = service.get_changes_since(server_id, None).version
+        if feature == DAILIES:
+            events = service.get_alchemy_events(server_id)
+        else:
+            events = service.get_tombola_events(server_id)
+        if not events:
+            return PrefetchedDashboardDTO(feature, server_id, None, version, events=events)
+        # Las vistas abren con el primer evento de la lista
+        event_id = events[0].id
+        if feature == DAILIES:
+            dashboard = service.get_alchemy_dashboard_data(server_id, event_id=event_id)
+        else:
+            dashboard = service.get_tombola_dashboard_data(server_id, event_id)
+        return PrefetchedDashboardDTO(feature, server_id, event_id, version, events=events, dashboard=dashboard)
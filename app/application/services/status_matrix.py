@@ -0,0 +1,161 @@
+"""
+Matriz densa de estados de un dashboard (personajes x dias, o x 48 semanas de pesca).
+
+Las estadisticas (totales, completado y fallo por dia o por tienda, rachas) se calculan
+con operaciones vectorizadas de NumPy en lugar de recorrer los mapas de cada personaje.
+"""
+import numpy as np
+from app.application.dtos import EventTotalsDTO, StatusMatrixDTO, WEEK_KEYS
+
+
+def day_columns(total_days):
+    return list(range(1, total_days + 1))
+
+
+def week_columns():
+    return list(WEEK_KEYS)
+
+
+def _positions(status_map, columns):
+    return np.array([status_map.position(c) for c in columns], dtype=np.intp)
+
+
+def _copy_row(values, row, status_map, positions):
+    raw = np.frombuffer(status_map.buffer(), dtype=np.int8)
+    present = positions < len(raw)
+    values[row] = 0
+    values[row, present] = raw[positions[present]]
+    values[row, values[row] == status_map.MISSING] = 0
+
+
+def build(store_accounts, columns, attr):
+    """Arma la matriz con el mapa `attr` de los personajes que muestran las grillas de las tiendas dadas.
+
+    Una fila por cuenta, su primer personaje, igual que los modelos del dashboard. Cada fila
+    se copia en bloque desde el array del mapa compacto (sin iterar por dia).
+    """
+    characters, store_rows = [], {}
+    for store in store_accounts:
+        start = len(characters)
+        for account in store.game_accounts:
+            characters.extend(account.characters[:1])
+        store_rows[store.id] = (start, len(characters))
+
+    values = np.zeros((len(characters), len(columns)), dtype=np.int8)
+    positions = None
+    for row, char in enumerate(characters):
+        status_map = getattr(char, attr)
+        if positions is None:
+            positions = _positions(status_map, columns)
+        _copy_row(values, row, status_map, positions)
+
+    return StatusMatrixDTO(
+        values=values,
+        row_ids=[c.id for c in characters],
+        columns=list(columns),
+        row_index={c.id: row for row, c in enumerate(characters)},
+        column_index={c: col for col, c in enumerate(columns)},
+        store_rows=store_rows,
+    )
+
+
+def refresh_row(matrix, char, attr):
+    """Vuelve a copiar la fila del personaje desde su mapa (tras un cambio en el DTO)."""
+    row = matrix.row_index.get(char.id)
+    if row is None:
+        return False
+    status_map = getattr(char, attr)
+    _copy_row(matrix.values, row, status_map, _positions(status_map, matrix.columns))
+    return True
+
+
+def set_status(matrix, char_id, column, value):
+    """Actualiza una celda; retorna False si el personaje o la columna no estan en la matriz."""
+    row = matrix.row_index.get(char_id)
+    col = matrix.column_index.get(column)
+    if row is None or col is None:
+        return False
+    matrix.values[row, col] = value
+    return True
+
+
+def apply_changes(matrix, changes, entity, scope_id):
+    """Aplica cambios del journal (mismo formato de slot que los mapas). Retorna cuantos aplico."""
+    day_slots = bool(matrix.columns) and isinstance(matrix.columns[0], int)
+    applied = 0
+    for change in changes:
+        if change.entity != entity or change.scope_id != scope_id:
+            continue
+        column = int(change.slot) if day_slots else change.slot
+        applied += set_status(matrix, change.owner_id, column, change.value)
+    return applied
+
+
+def totals(matrix, rows=None):
+    """Completados y fallidos (EventTotalsDTO) de toda la matriz o de un rango de filas."""
+    values = matrix.values if rows is None else matrix.values[rows[0]:rows[1]]
+    return EventTotalsDTO(completed=int(np.count_nonzero(values == 1)),
+                          failed=int(np.count_nonzero(values == -1)))
+
+
+def pending(matrix):
+    done = totals(matrix)
+    return matrix.values.size - done.completed - done.failed
+
+
+def by_column(matrix):
+    """{'completed', 'failed', 'completion', 'failure_rate'} por columna (arrays alineados con columns)."""
+    values = matrix.values
+    completed = np.count_nonzero(values == 1, axis=0)
+    failed = np.count_nonzero(values == -1, axis=0)
+    rows = max(values.shape[0], 1)
+    decided = completed + failed
+    return {
+        'completed': completed,
+        'failed': failed,
+        'completion': completed / rows,
+        'failure_rate': np.divide(failed, decided, out=np.zeros(len(decided)), where=decided > 0),
+    }
+
+
+def by_store(matrix):
+    """{store_id: {'completed', 'failed', 'completion', 'failure_rate'}} con sumas por bloque de filas."""
+    if not matrix.store_rows:
+        return {}
+    completed_rows = np.count_nonzero(matrix.values == 1, axis=1)
+    failed_rows = np.count_nonzero(matrix.values == -1, axis=1)
+    # Prefijos acumulados: la suma de cada tienda es una resta, sin recorrer sus filas
+    completed_acc = np.concatenate(([0], np.cumsum(completed_rows)))
+    failed_acc = np.concatenate(([0], np.cumsum(failed_rows)))
+    width = matrix.values.shape[1]
+    result = {}
+    for store_id, (start, stop) in matrix.store_rows.items():
+        completed = int(completed_acc[stop] - completed_acc[start])
+        failed = int(failed_acc[stop] - failed_acc[start])
+        cells = (stop - start) * width
+        result[store_id] = {
+            'completed': completed,
+            'failed': failed,
+            'completion': completed / cells if cells else 0.0,
+            'failure_rate': failed / (completed + failed) if completed + failed else 0.0,
+        }
+    return result
+
+
+def streaks(matrix):
+    """(actual, maxima) por fila: completados seguidos desde la primera columna y la racha mas larga."""
+    done = matrix.values == 1
+    rows, width = done.shape
+    if rows == 0 or width == 0:
+        empty = np.zeros(rows, dtype=np.int64)
+        return empty, empty.copy()
+    current = np.where(done.all(axis=1), width, np.argmin(done, axis=1))
+    # Bordes de cada tramo de completados: +1 donde empieza, -1 donde termina
+    padded = np.zeros((rows, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = done
+    edges = np.diff(padded, axis=1)
+    starts = np.argwhere(edges == 1)
+    ends = np.argwhere(edges == -1)
+    longest = np.zeros(rows, dtype=np.int64)
+    np.maximum.at(longest, starts[:, 0], ends[:, 1] - starts[:, 1])
+    return current.astype(np.int64), longest
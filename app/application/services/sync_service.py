@@ -0,0 +1,237 @@
+"""
+Motor de sincronizacion de la replica local (SQLite) contra el MySQL compartido.
+
+La UI lee y escribe la replica local. Cada write deja una entrada en el journal
+(change_log); el motor empuja las entradas propias a MySQL en lotes y trae las
+de otros puestos de forma incremental. Los conflictos se resuelven por
+last-writer-wins sobre la clave (entidad, personaje/cuenta, evento, dia),
+ordenando por (changed_at, origin) para que todos los puestos converjan.
+Los contadores viajan como deltas y se suman: no hay conflicto que resolver.
+Servidores, cuentas, personajes y eventos no pasan por el journal: en la replica son de
+solo lectura y se administran con conexion directa a MySQL.
+"""
+import threading
+from sqlalchemy import select, delete, insert, func, and_, or_
+from sqlalchemy.orm import sessionmaker
+from app.domain.base import Base
+from app.domain.models import ChangeLog, SyncState
+from app.application.services.change_log import apply_change, COUNTER_ENTITIES
+from app.utils.config import Config
+from app.utils.logger import logger
+
+PUSHED_UPTO = 'pushed_upto'
+PULLED_UPTO = 'pulled_upto'
+
+# Tablas que no se copian en el snapshot inicial
+_LOCAL_ONLY_TABLES = {ChangeLog.__tablename__, SyncState.__tablename__}
+
+
+class SyncService:
+    def __init__(self, local_engine, remote_engine, origin=None, batch_size=None):
+        self.local_engine = local_engine
+        self.remote_engine = remote_engine
+        self.origin = origin or Config.CLIENT_ID
+        self.batch_size = batch_size or Config.SYNC_BATCH_SIZE
+        self._LocalSession = sessionmaker(bind=local_engine, expire_on_commit=False)
+        self._RemoteSession = sessionmaker(bind=remote_engine, expire_on_commit=False)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- Estado ---
+
+    def _get_state(self, session, key):
+        row = session.get(SyncState, key)
+        return int(row.value) if row and row.value else 0
+
+    def _set_state(self, session, key, value):
+        row = session.get(SyncState, key)
+        if row:
+            row.value = str(value)
+        else:
+            session.add(SyncState(key=key, value=str(value)))
+
+    # --- Snapshot inicial ---
+
+    def needs_bootstrap(self):
+        Base.metadata.create_all(self.local_engine)
+        with self._LocalSession() as session:
+            return session.get(SyncState, PULLED_UPTO) is None
+
+    def unpushed_count(self, session=None):
+        """Entradas propias del journal local que todavia no llegaron a MySQL."""
+        if session is None:
+            with self._LocalSession() as session:
+                return self.unpushed_count(session)
+        return session.query(func.count(ChangeLog.id)).filter(
+            ChangeLog.id > self._get_state(session, PUSHED_UPTO), ChangeLog.origin == self.origin
+        ).scalar() or 0
+
+    def bootstrap(self):
+        """Copia el estado completo de MySQL a la replica local.
+
+        Se niega (RuntimeError) si la replica tiene cambios sin enviar: la copia los borraria.
+        """
+        Base.metadata.create_all(self.local_engine)
+        tables = [t for t in Base.metadata.sorted_tables if t.name not in _LOCAL_ONLY_TABLES]
+        with self._lock:
+            pending = self.unpushed_count()
+            if pending:
+                raise RuntimeError(f"La replica tiene {pending} cambios sin enviar a MySQL: no se sobrescribe")
+            return self._copy_remote(tables)
+
+    def _copy_remote(self, tables):
+        with self.remote_engine.connect() as remote, self.local_engine.begin() as local:
+            # El cursor de pull se fija antes de copiar: lo que entre durante la copia se vuelve a traer
+            last_remote = remote.execute(select(func.max(ChangeLog.id))).scalar() or 0
+            for table in reversed(tables):
+                local.execute(delete(table))
+            copied = 0
+            for table in tables:
+                result = remote.execution_options(yield_per=self.batch_size).execute(select(table))
+                for rows in result.partitions():
+                    local.execute(insert(table), [dict(r._mapping) for r in rows])
+                    copied += len(rows)
+            local.execute(delete(SyncState.__table__))
+            # Sin cambios propios pendientes (ver bootstrap): todo el journal local ya esta en MySQL
+            local.execute(insert(SyncState.__table__), [
+                {'key': PULLED_UPTO, 'value': str(last_remote)},
+                {'key': PUSHED_UPTO, 'value': str(local.execute(select(func.max(ChangeLog.id))).scalar() or 0)},
+            ])
+        logger.info(f"SYNC | bootstrap | {copied} filas copiadas desde MySQL")
+        return copied
+
+    # --- Push / Pull ---
+
+    @staticmethod
+    def _newer_exists(session, entry):
+        """True si hay una entrada posterior (LWW) para la misma clave en esta base."""
+        return session.query(ChangeLog.id).filter(
+            ChangeLog.entity == entry.entity,
+            ChangeLog.owner_id == entry.owner_id if entry.owner_id is not None else ChangeLog.owner_id.is_(None),
+            ChangeLog.scope_id == entry.scope_id,
+            ChangeLog.slot == entry.slot,
+            or_(
+                ChangeLog.changed_at > entry.changed_at,
+                and_(ChangeLog.changed_at == entry.changed_at, ChangeLog.origin > entry.origin),
+            )
+        ).first() is not None
+
+    @staticmethod
+    def _already_applied(session, entry):
+        """True si la misma entrada (mismo puesto e instante) ya esta en el journal de esta base."""
+        return session.query(ChangeLog.id).filter(
+            ChangeLog.entity == entry.entity,
+            ChangeLog.scope_id == entry.scope_id,
+            ChangeLog.slot == entry.slot,
+            ChangeLog.origin == entry.origin,
+            ChangeLog.changed_at == entry.changed_at,
+        ).first() is not None
+
+    @staticmethod
+    def _replay(session, entry):
+        """Aplica la entrada y la copia al journal destino, salvo que pierda por LWW."""
+        if entry.entity in COUNTER_ENTITIES:
+            # Deltas: se suman todos, pero una sola vez (un push reintentado no duplica)
+            if SyncService._already_applied(session, entry):
+                return False
+        # Las entradas perdedoras no se journalan: el refresco incremental de las
+        # vistas lee el journal y no debe reaplicar valores viejos
+        elif SyncService._newer_exists(session, entry):
+            return False
+        # Las versiones de fila son propias de cada base: se journala la version local
+        row_version = apply_change(session, entry.entity, entry.owner_id, entry.scope_id, entry.slot, entry.value,
+                                   server_id=entry.server_id)
+        session.execute(insert(ChangeLog).values(
+            entity=entry.entity, server_id=entry.server_id, owner_id=entry.owner_id,
+            scope_id=entry.scope_id, slot=entry.slot, value=entry.value, row_version=row_version,
+            origin=entry.origin, changed_at=entry.changed_at,
+        ))
+        session.flush()
+        return True
+
+    def push(self):
+        """Empuja a MySQL las entradas locales de este puesto. Retorna cuantas se enviaron."""
+        total = 0
+        while True:
+            with self._LocalSession() as local:
+                cursor = self._get_state(local, PUSHED_UPTO)
+                batch = local.query(ChangeLog).filter(
+                    ChangeLog.id > cursor, ChangeLog.origin == self.origin
+                ).order_by(ChangeLog.id).limit(self.batch_size).all()
+                if not batch:
+                    return total
+
+                with self._RemoteSession() as remote:
+                    try:
+                        for entry in batch:
+                            self._replay(remote, entry)
+                        remote.commit()
+                    except Exception:
+                        remote.rollback()
+                        raise
+
+                self._set_state(local, PUSHED_UPTO, batch[-1].id)
+                local.commit()
+                total += len(batch)
+
+    def pull(self):
+        """Trae de MySQL los cambios de otros puestos. Retorna cuantos se aplicaron."""
+        applied = 0
+        while True:
+            with self._LocalSession() as local:
+                cursor = self._get_state(local, PULLED_UPTO)
+                with self._RemoteSession() as remote:
+                    batch = remote.query(ChangeLog).filter(
+                        ChangeLog.id > cursor
+                    ).order_by(ChangeLog.id).limit(self.batch_size).all()
+                if not batch:
+                    return applied
+
+                try:
+                    for entry in batch:
+                        if entry.origin == self.origin:
+                            continue
+                        if self._replay(local, entry):
+                            applied += 1
+                    self._set_state(local, PULLED_UPTO, batch[-1].id)
+                    local.commit()
+                except Exception:
+                    local.rollback()
+                    raise
+
+    def sync_once(self):
+        """Un ciclo completo: push y luego pull. Retorna (enviados, aplicados)."""
+        with self._lock:
+            pushed = self.push()
+            pulled = self.pull()
+        if pushed or pulled:
+            logger.info(f"SYNC | push {pushed} | pull {pulled}")
+        return pushed, pulled
+
+    # --- Worker en segundo plano ---
+
+    def _run(self, interval):
+        while not self._stop.is_set():
+            try:
+                self.sync_once()
+            except Exception as e:
+                # MySQL inaccesible: se reintenta en el siguiente ciclo, la UI sigue sobre la replica
+                logger.warning(f"SYNC | ciclo fallido: {e}")
+            self._stop.wait(interval)
+
+    def start(self, interval=None):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval or Config.SYNC_INTERVAL_SECONDS,),
+            name="metinforge-sync", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
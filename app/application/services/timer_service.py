@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import and_, func, or_
+from app.application.dtos import TimerRecordDTO, TimerPageDTO, TimerStatsDTO
+from app.application.services.base_service import BaseService
+from app.domain.models import TimerRecord
+from app.utils.logger import logger
+
+class TimerService(BaseService):
+    """Historial de cronometros: paginacion keyset sobre (created_at, id) y agregados por nombre."""
+
+    PAGE_SIZE = 100
+
+    # Un solo worker compartido: los guardados salen del hilo de la UI y respetan el orden
+    _executor = None
+
+    @classmethod
+    def _get_executor(cls):
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='timer-writes')
+        return cls._executor
+
+    @classmethod
+    def shutdown(cls, wait=True):
+        """Espera (o descarta) los guardados pendientes al cerrar la aplicacion."""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=wait)
+            cls._executor = None
+
+    @staticmethod
+    def _to_dto(record):
+        return TimerRecordDTO(id=record.id, name=record.name,
+                              elapsed_seconds=record.elapsed_seconds, created_at=record.created_at)
+
+    def get_records_page(self, cursor=None, limit=None):
+        """Registros mas nuevos primero, posteriores (en orden) al cursor (created_at, id) recibido."""
+        limit = limit or self.PAGE_SIZE
+        try:
+            with self.session_scope() as session:
+                query = session.query(TimerRecord)
+                if cursor is not None:
+                    created_at, record_id = cursor
+                    query = query.filter(or_(
+                        TimerRecord.created_at < created_at,
+                        and_(TimerRecord.created_at == created_at, TimerRecord.id < record_id)
+                    ))
+                # Se pide uno extra para saber si hay otra pagina sin un COUNT
+                rows = query.order_by(TimerRecord.created_at.desc(), TimerRecord.id.desc()).limit(limit + 1).all()
+                records = [self._to_dto(r) for r in rows[:limit]]
+                next_cursor = (records[-1].created_at, records[-1].id) if len(rows) > limit else None
+                return TimerPageDTO(records=records, next_cursor=next_cursor)
+        except Exception as e:
+            logger.error(f"Error al obtener historial de cronometros: {e}")
+            return TimerPageDTO()
+
+    def get_stats_by_name(self):
+        """Cantidad, mejor, promedio y total de segundos por nombre, calculados en SQL."""
+        try:
+            with self.session_scope() as session:
+                rows = session.query(
+                    TimerRecord.name,
+                    func.count(TimerRecord.id),
+                    func.min(TimerRecord.elapsed_seconds),
+                    func.avg(TimerRecord.elapsed_seconds),
+                    func.sum(TimerRecord.elapsed_seconds)
+                ).group_by(TimerRecord.name).order_by(TimerRecord.name).all()
+                return [
+                    TimerStatsDTO(name=name, count=count, best_seconds=best or 0,
+                                  average_seconds=float(avg or 0), total_seconds=total or 0)
+                    for name, count, best, avg, total in rows
+                ]
+        except Exception as e:
+            logger.error(f"Error al calcular estadisticas de cronometros: {e}")
+            return []
+
+    def save_record(self, name, elapsed_seconds):
+        """Guarda un registro. Retorna su DTO o None si fallo."""
+        if not name or not name.strip():
+            return None
+        try:
+            with self.session_scope() as session:
+                record = TimerRecord(name=name.strip(), elapsed_seconds=elapsed_seconds)
+                session.add(record)
+                session.flush()
+                return self._to_dto(record)
+        except Exception as e:
+            logger.error(f"Error al guardar registro de cronometro: {e}")
+            return None
+
+    def save_record_async(self, name, elapsed_seconds):
+        """Encola save_record en segundo plano. Retorna un Future con el DTO (o None si fallo)."""
+        return self._get_executor().submit(self.save_record, name, elapsed_seconds)
+
+    def delete_record(self, record_id):
+        try:
+            with self.session_scope() as session:
+                deleted = session.query(TimerRecord).filter(TimerRecord.id == record_id).delete()
+                return deleted > 0
+        except Exception as e:
+            logger.error(f"Error al eliminar registro de cronometro {record_id}: {e}")
+            return False
@@ -1,15 +1,19 @@
 from app.application.dtos import (
     StoreAccountDTO, GameAccountDTO, TombolaCharacterDTO, 
-    TombolaEventDTO, TombolaDashboardDTO
+    TombolaEventDTO, TombolaDashboardDTO, DayStatusMap
 )
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload
 from app.application.services.base_service import BaseService
 from app.domain.models import (
     Server, StoreAccount, GameAccount, Character, CharacterType,
-    TombolaEvent, TombolaActivity, TombolaItemCounter
+    TombolaEvent, TombolaActivity, TombolaItemCounter, TOMBOLA_DAYS
 )
+from app.application.services import change_log, aggregates, archive
 import datetime
+from app.utils.config import Config
 from app.utils.logger import logger
+from app.utils import perf_log
 
 class TombolaService(BaseService):
 
@@ -33,39 +37,55 @@ class TombolaService(BaseService):
                 counter = session.query(TombolaItemCounter).filter_by(
                     event_id=event_id, item_name=item_name
                 ).first()
-                if counter: counter.count = count
+                previous = 0
+                if counter:
+                    previous = counter.count or 0
+                    counter.count = count
                 else:
                     new_counter = TombolaItemCounter(
                         event_id=event_id, item_name=item_name, count=count
                     )
                     session.add(new_counter)
+                # Delta, como en alquimia: los incrementos offline de varios puestos se suman
+                change_log.record_change(
+                    session, change_log.TOMBOLA_COUNTER,
+                    change_log.server_for_event(session, TombolaEvent, event_id),
+                    None, event_id, item_name, count - previous
+                )
                 return True
         except Exception as e:
             logger.error(f"Error al actualizar item tombola {item_name}: {e}")
             return False
     
-    def get_tombola_events(self, server_id):
+    def get_tombola_events(self, server_id, include_archived=False):
         if not server_id: return []
         try:
             with self.session_scope() as session:
-                events = session.query(TombolaEvent).filter_by(server_id=server_id).order_by(TombolaEvent.created_at.desc()).all()
-                return [TombolaEventDTO(id=e.id, server_id=e.server_id, name=e.name, total_days=30, created_at=e.created_at) for e in events]
+                query = session.query(TombolaEvent).filter_by(server_id=server_id)
+                if not include_archived:
+                    query = query.filter(TombolaEvent.archived == False)
+                events = query.order_by(TombolaEvent.created_at.desc()).all()
+                return [TombolaEventDTO(id=e.id, server_id=e.server_id, name=e.name, total_days=TOMBOLA_DAYS,
+                                        created_at=e.created_at, archived=bool(e.archived)) for e in events]
         except Exception as e:
             logger.error(f"Error fetching tombola events: {e}")
             return []
     
     def create_tombola_event(self, server_id, event_name):
+        if self._blocked_on_replica("Crear evento"):
+            return None
         if not event_name or not event_name.strip(): return None
         try:
             with self.session_scope() as session:
                 event = TombolaEvent(server_id=server_id, name=event_name.strip())
                 session.add(event)
                 session.flush()
-                return TombolaEventDTO(id=event.id, server_id=event.server_id, name=event.name, total_days=30, created_at=event.created_at)
+                return TombolaEventDTO(id=event.id, server_id=event.server_id, name=event.name, total_days=TOMBOLA_DAYS, created_at=event.created_at)
         except Exception as e:
             logger.error(f"Error creating tombola event: {e}")
             return None
     
+    @perf_log.timed('tombola.dashboard', ids=('server_id', 'event_id'), rows=perf_log.count_accounts)
     def get_tombola_dashboard_data(self, server_id, event_id=None):
         if not server_id or not event_id: return TombolaDashboardDTO()
         try:
@@ -81,14 +101,17 @@ class TombolaService(BaseService):
                 
                 # 2. Obtener actividades de tómbola
                 activity_map = {}
+                payload = archive.load(session, aggregates.TOMBOLA, event_id)
                 all_char_ids = [c.id for ga in game_accounts for c in ga.characters]
-                if all_char_ids:
+                if payload is not None:
+                    activity_map = archive.statuses(payload)
+                elif all_char_ids:
                     activities = session.query(TombolaActivity).filter(
                         TombolaActivity.event_id == event_id,
                         TombolaActivity.character_id.in_(all_char_ids)
                     ).all()
                     for act in activities:
-                        if act.character_id not in activity_map: activity_map[act.character_id] = {}
+                        if act.character_id not in activity_map: activity_map[act.character_id] = DayStatusMap()
                         activity_map[act.character_id][act.day_index] = act.status_code
 
                 # 3. Agrupar por StoreAccount para DTOs
@@ -103,7 +126,7 @@ class TombolaService(BaseService):
                     char_dtos = [
                         TombolaCharacterDTO(
                             id=c.id, name=c.name,
-                            daily_status_map=activity_map.get(c.id, {})
+                            daily_status_map=activity_map.get(c.id) or DayStatusMap()
                         ) for c in ga.characters
                     ]
                     
@@ -115,23 +138,56 @@ class TombolaService(BaseService):
             logger.error(f"Error en get_tombola_dashboard_data: {e}")
             return TombolaDashboardDTO()
     
+    @perf_log.timed('tombola.status', ids=('character_id', 'event_id'))
     def update_daily_status(self, character_id, day, status, event_id):
         if not event_id: return False
+        return self.update_daily_status_batch(event_id, [(character_id, day, status)]) == 1
+
+    @perf_log.timed('tombola.status_batch', ids=('event_id',), rows=lambda written: written)
+    def update_daily_status_batch(self, event_id, updates):
+        """Escribe varios estados [(character_id, dia, estado)] en una transaccion. Retorna cuantos escribio."""
+        if not event_id or not updates: return 0
         try:
             with self.session_scope() as session:
-                activity = session.query(TombolaActivity).filter_by(
-                    character_id=character_id, event_id=event_id, day_index=day
-                ).first()
-                if activity: activity.status_code = status
-                else:
-                    new_act = TombolaActivity(
-                        character_id=character_id, event_id=event_id, day_index=day, status_code=status
+                if archive.is_archived(session, aggregates.TOMBOLA, event_id):
+                    logger.warning(f"Evento tombola {event_id} archivado: estados de solo lectura")
+                    return 0
+                char_ids = {u[0] for u in updates}
+                rows = {(a.character_id, a.day_index): a for a in session.query(TombolaActivity).filter(
+                    TombolaActivity.event_id == event_id, TombolaActivity.character_id.in_(char_ids)
+                )}
+                server_id = change_log.server_for_event(session, TombolaEvent, event_id)
+                stores = aggregates.stores_for_characters(session, char_ids)
+                for character_id, day, status in updates:
+                    key = (character_id, day)
+                    activity = rows.get(key)
+                    old_status = activity.status_code if activity else 0
+                    if Config.SPARSE_ACTIVITIES and status == 0:
+                        if activity:
+                            session.delete(activity)
+                            del rows[key]
+                    elif activity: activity.status_code = status
+                    else:
+                        rows[key] = TombolaActivity(
+                            character_id=character_id, event_id=event_id, day_index=day, status_code=status
+                        )
+                        session.add(rows[key])
+                    change_log.record_change(
+                        session, change_log.TOMBOLA_STATUS, server_id,
+                        character_id, event_id, day, status
                     )
-                    session.add(new_act)
-                return True
+                    aggregates.record_status(
+                        session, aggregates.TOMBOLA, server_id, event_id, day,
+                        stores.get(character_id), old_status, status
+                    )
+                return len(updates)
+        except IntegrityError as e:
+            # Otro puesto creo la misma celda entre la lectura y el commit: no se escribe nada
+            logger.warning(f"Conflicto al guardar estados de tombola: {e}")
+            return 0
         except Exception as e:
             logger.error(f"Error updating tombola status: {e}")
-            return False
+            return 0
 
     def get_next_pending_day(self, char_id, event_id):
         if not event_id: return 1
@@ -146,6 +202,16 @@ class TombolaService(BaseService):
                 return 1
         except Exception: return 1
 
+    def get_event_totals(self, event_id, by=None):
+        """Completados y fallidos del evento desde los agregados (by='day' / 'store')."""
+        return self._get_totals_generic(aggregates.TOMBOLA, event_id, by=by)
+
+    def get_changes_since(self, server_id, version):
+        """Estados y contadores modificados desde `version` (refresco incremental)."""
+        return self._get_changes_since_generic(server_id, version, (
+            change_log.TOMBOLA_STATUS, change_log.TOMBOLA_COUNTER
+        ))
+
     def get_last_filled_day(self, char_id, event_id):
         if not event_id: return None
         try:
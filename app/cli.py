@@ -0,0 +1,252 @@
+"""
+Linea de comandos sobre la capa de servicios. No importa Qt: sirve para cron y scripts.
+
+Uso:
+    python -m app.cli import --server <servidor> archivo.xlsx [archivo2.csv ...] [--feature fishing]
+    python -m app.cli export --server <servidor> --feature alchemy [--event <evento>] salida.xlsx
+    python -m app.cli mark --server <servidor> --feature alchemy --day 5 [--store email] [--status -1]
+    python -m app.cli report --server <servidor> --feature alchemy [--event <evento>] [--by day|store] [--json]
+    python -m app.cli report --server <servidor> --feature fishing --year 2025
+    python -m app.cli archive [--feature alchemy --event <id>]
+    python -m app.cli benchmark [--accounts 500 --memory ...]
+
+<servidor> y <evento> aceptan nombre o id; sin --event se usa el evento activo mas reciente.
+"""
+import argparse
+import dataclasses
+import datetime
+import json
+import sys
+from app.application.services import aggregates
+from app.utils.config import Config
+
+FEATURES = (aggregates.ALCHEMY, aggregates.TOMBOLA, aggregates.FISHING)
+EVENT_FEATURES = (aggregates.ALCHEMY, aggregates.TOMBOLA)
+
+
+class CommandError(Exception):
+    """Argumentos que no se pueden resolver (servidor, evento, tienda inexistentes)."""
+
+
+def _services():
+    from app.container import ServiceContainer
+    return ServiceContainer
+
+
+def _find_server(services, value):
+    for server in services.alchemy_service().get_servers():
+        if value == server.name or value == str(server.id):
+            return server.id
+    raise CommandError(f"Servidor no encontrado: {value}")
+
+
+def _find_event(services, feature, server_id, value=None):
+    if feature == aggregates.ALCHEMY:
+        events = services.alchemy_service().get_alchemy_events(server_id, include_archived=value is not None)
+    else:
+        events = services.tombola_service().get_tombola_events(server_id, include_archived=value is not None)
+    if value is None:
+        if not events:
+            raise CommandError(f"El servidor no tiene eventos activos de {feature}")
+        return events[0]
+    for event in events:
+        if value == event.name or value == str(event.id):
+            return event
+    raise CommandError(f"Evento no encontrado: {value}")
+
+
+def _local(services):
+    """Servicio siempre local (nunca el adaptador del demonio) para las consultas auxiliares."""
+    return services.archive_service()
+
+
+def _first_character_ids(service, server_id, store_email=None):
+    """Primer personaje de cada cuenta: el unico que muestran (y marcan) las grillas."""
+    from sqlalchemy import func
+    from app.domain.models import Character, GameAccount, StoreAccount
+    with service.session_scope() as session:
+        query = session.query(func.min(Character.id)).join(GameAccount).filter(GameAccount.server_id == server_id)
+        if store_email:
+            query = query.join(StoreAccount, StoreAccount.id == GameAccount.store_account_id) \
+                .filter(StoreAccount.email == store_email)
+        return sorted(char_id for (char_id,) in query.group_by(Character.game_account_id))
+
+
+def _store_emails(service, store_ids):
+    from app.domain.models import StoreAccount
+    with service.session_scope() as session:
+        return dict(session.query(StoreAccount.id, StoreAccount.email).filter(StoreAccount.id.in_(store_ids)).all())
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def cmd_import(args, services, out):
+    from app.utils.excel_importer import parse_account_file
+    server_id = _find_server(services, args.server)
+    service = services.fishing_service() if args.feature == aggregates.FISHING else services.alchemy_service()
+    failed = 0
+    for file_path in args.files:
+        try:
+            ok, message = service.bulk_import_accounts(server_id, parse_account_file(file_path))
+        except Exception as e:
+            ok, message = False, str(e)
+        failed += not ok
+        print(f"{'OK ' if ok else 'ERR'} {file_path}: {message}", file=out)
+    return 1 if failed else 0
+
+
+def cmd_export(args, services, out):
+    server_id = _find_server(services, args.server)
+    event = _find_event(services, args.feature, server_id, args.event)
+
+    def progress(done, total):
+        print(f"\r{done:,} / {total:,} filas", end='', file=sys.stderr, flush=True)
+
+    result = services.export_service().export_event(args.feature, event.id, args.file,
+                                                    progress=None if args.quiet else progress)
+    if not args.quiet:
+        print(file=sys.stderr)
+    if result is None:
+        print(f"No se pudo exportar {event.name}", file=out)
+        return 1
+    print(f"{event.name} -> {result.path} ({result.rows} filas)", file=out)
+    return 0
+
+
+def cmd_mark(args, services, out):
+    """Marca un dia para cada cuenta del servidor (o de una tienda), en su primer personaje, por lotes."""
+    server_id = _find_server(services, args.server)
+    event = _find_event(services, args.feature, server_id, args.event)
+    if not 1 <= args.day <= event.total_days:
+        raise CommandError(f"Dia fuera del evento: {args.day} (1-{event.total_days})")
+    service = services.alchemy_service() if args.feature == aggregates.ALCHEMY else services.tombola_service()
+    char_ids = _first_character_ids(_local(services), server_id, args.store)
+    if args.store and not char_ids:
+        raise CommandError(f"La tienda no tiene personajes en el servidor: {args.store}")
+
+    written = 0
+    for chunk in _chunks(char_ids, Config.CLI_BATCH_SIZE):
+        if args.feature == aggregates.ALCHEMY:
+            result = service.update_daily_status_batch(event.id, [(c, args.day, args.status, None) for c in chunk])
+            written += len(result.versions)
+        else:
+            written += service.update_daily_status_batch(event.id, [(c, args.day, args.status) for c in chunk])
+    print(f"{event.name}: dia {args.day} = {args.status} en {written} de {len(char_ids)} personajes", file=out)
+    return 0 if written == len(char_ids) else 1
+
+
+def cmd_report(args, services, out):
+    server_id = _find_server(services, args.server)
+    if args.feature == aggregates.FISHING:
+        scope = args.year or datetime.date.today().year
+        name = f"Pesca {scope}"
+        totals = services.fishing_service().get_year_totals(server_id, scope, by=args.by)
+    else:
+        event = _find_event(services, args.feature, server_id, args.event)
+        service = services.alchemy_service() if args.feature == aggregates.ALCHEMY else services.tombola_service()
+        name = event.name
+        totals = service.get_event_totals(event.id, by=args.by)
+
+    if args.by is None:
+        rows = {"total": totals}
+    elif args.by == 'store':
+        emails = _store_emails(_local(services), [k for k in totals if k])
+        rows = {emails.get(k, "Sin tienda"): v for k, v in totals.items()}
+    else:
+        rows = dict(sorted(totals.items()))
+
+    if args.json:
+        json.dump({'name': name, 'totals': {str(k): dataclasses.asdict(v) for k, v in rows.items()}}, out)
+        print(file=out)
+        return 0
+    print(name, file=out)
+    print(f"{'':<24}{'completados':>12}{'fallidos':>10}{'cords':>10}", file=out)
+    for key, value in rows.items():
+        print(f"{str(key):<24}{value.completed:>12}{value.failed:>10}{value.cords:>10}", file=out)
+    return 0
+
+
+def cmd_archive(args, services, out):
+    service = services.archive_service()
+    if args.event is not None:
+        if args.feature not in EVENT_FEATURES:
+            raise CommandError("--event requiere --feature alchemy o tombola")
+        ok = service.archive_event(args.feature, args.event)
+        print(f"{args.feature} {args.event}: {'archivado' if ok else 'no se pudo archivar'}", file=out)
+        return 0 if ok else 1
+    archived = service.archive_finished_events()
+    print(f"Eventos archivados: {len(archived)}", file=out)
+    for feature, event_id in archived:
+        print(f"  {feature} {event_id}", file=out)
+    return 0
+
+
+def cmd_benchmark(args, services, out):
+    from app.utils import benchmark
+    benchmark.main(args.options)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="MetinForge sin interfaz grafica")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    cmd = commands.add_parser('import', help="Importa cuentas desde archivos .xlsx/.csv")
+    cmd.add_argument('--server', required=True)
+    cmd.add_argument('--feature', choices=(aggregates.ALCHEMY, aggregates.FISHING), default=aggregates.ALCHEMY)
+    cmd.add_argument('files', nargs='+')
+    cmd.set_defaults(handler=cmd_import)
+
+    cmd = commands.add_parser('export', help="Exporta un evento a .xlsx/.csv")
+    cmd.add_argument('--server', required=True)
+    cmd.add_argument('--feature', choices=EVENT_FEATURES, required=True)
+    cmd.add_argument('--event')
+    cmd.add_argument('--quiet', action='store_true')
+    cmd.add_argument('file')
+    cmd.set_defaults(handler=cmd_export)
+
+    cmd = commands.add_parser('mark', help="Marca un dia del evento para todo el servidor o una tienda")
+    cmd.add_argument('--server', required=True)
+    cmd.add_argument('--feature', choices=EVENT_FEATURES, required=True)
+    cmd.add_argument('--event')
+    cmd.add_argument('--day', type=int, required=True)
+    cmd.add_argument('--status', type=int, choices=(1, -1, 0), default=1)
+    cmd.add_argument('--store')
+    cmd.set_defaults(handler=cmd_mark)
+
+    cmd = commands.add_parser('report', help="Totales del evento (o del año de pesca)")
+    cmd.add_argument('--server', required=True)
+    cmd.add_argument('--feature', choices=FEATURES, required=True)
+    cmd.add_argument('--event')
+    cmd.add_argument('--year', type=int)
+    cmd.add_argument('--by', choices=('day', 'store'))
+    cmd.add_argument('--json', action='store_true')
+    cmd.set_defaults(handler=cmd_report)
+
+    cmd = commands.add_parser('archive', help="Archiva eventos finalizados (o uno puntual)")
+    cmd.add_argument('--feature', choices=EVENT_FEATURES)
+    cmd.add_argument('--event', type=int)
+    cmd.set_defaults(handler=cmd_archive)
+
+    cmd = commands.add_parser('benchmark', help="Benchmark de la capa de datos (mismas opciones)")
+    cmd.add_argument('options', nargs=argparse.REMAINDER)
+    cmd.set_defaults(handler=cmd_benchmark)
+    return parser
+
+
+def main(argv=None, services=None, out=None):
+    """Ejecuta el subcomando. `services` expone las mismas factories que ServiceContainer."""
+    args = build_parser().parse_args(argv)
+    out = out or sys.stdout
+    try:
+        return args.handler(args, services or _services(), out)
+    except CommandError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
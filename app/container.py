@@ -1,26 +1,131 @@
-from app.application.services.fishing_service import FishingService
-from app.application.services.alchemy_service import AlchemyService
-from app.application.services.tombola_service import TombolaService
+import sys
+from app.application.services.base_service import BaseService
+from app.utils.config import Config
+from app.utils.db_engine import create_db_engine
 
 class ServiceContainer:
     _fishing_service = None
     _alchemy_service = None
     _tombola_service = None
+    _timer_service = None
+    _countdown_service = None
+    _sync_service = None
+    _prefetcher = None
+    _chart_renderer = None
+    _export_service = None
+    _archive_service = None
+    _overview_service = None
+    _service_client = None
+
+    @classmethod
+    def _feature_service(cls, name, service_class):
+        """Servicio local, o su adaptador remoto si hay demonio configurado (SERVICE_URL)."""
+        if not Config.SERVICE_URL:
+            return service_class()
+        from app.service_api.client import RemoteService, ServiceClient
+        if not cls._service_client:
+            cls._service_client = ServiceClient(Config.SERVICE_URL)
+        # Si el demonio no responde, las llamadas van directo a la base
+        return RemoteService(name, service_class, cls._service_client, fallback=service_class)
 
     @classmethod
     def fishing_service(cls):
         if not cls._fishing_service:
-            cls._fishing_service = FishingService()
+            from app.application.services.fishing_service import FishingService
+            cls._fishing_service = cls._feature_service('fishing', FishingService)
         return cls._fishing_service
 
     @classmethod
     def alchemy_service(cls):
         if not cls._alchemy_service:
-            cls._alchemy_service = AlchemyService()
+            from app.application.services.alchemy_service import AlchemyService
+            cls._alchemy_service = cls._feature_service('alchemy', AlchemyService)
         return cls._alchemy_service
 
     @classmethod
     def tombola_service(cls):
         if not cls._tombola_service:
-            cls._tombola_service = TombolaService()
+            from app.application.services.tombola_service import TombolaService
+            cls._tombola_service = cls._feature_service('tombola', TombolaService)
         return cls._tombola_service
+
+    @classmethod
+    def overview_service(cls):
+        """Resumen de todos los servidores (cacheado por version del journal)."""
+        if not cls._overview_service:
+            from app.application.services.overview_service import OverviewService
+            cls._overview_service = cls._feature_service('overview', OverviewService)
+        return cls._overview_service
+
+    @classmethod
+    def timer_service(cls):
+        if not cls._timer_service:
+            from app.application.services.timer_service import TimerService
+            cls._timer_service = TimerService()
+        return cls._timer_service
+
+    @classmethod
+    def countdown_service(cls):
+        if not cls._countdown_service:
+            from app.application.services.countdown_service import CountdownService
+            cls._countdown_service = CountdownService()
+        return cls._countdown_service
+
+    @classmethod
+    def prefetcher(cls):
+        """Precarga de dashboards compartiendo los servicios del contenedor."""
+        if not cls._prefetcher:
+            from app.application.services.prefetcher import DashboardPrefetcher
+            # Los servicios se piden recien al precargar su feature
+            cls._prefetcher = DashboardPrefetcher({
+                'dailies': cls.alchemy_service,
+                'fishing': cls.fishing_service,
+                'tombola': cls.tombola_service,
+            })
+        return cls._prefetcher
+
+    @classmethod
+    def chart_renderer(cls):
+        """Render de graficos de eventos en segundo plano, con cache por version de datos."""
+        if not cls._chart_renderer:
+            from app.application.services.analytics_service import AnalyticsService
+            from app.presentation.chart_renderer import ChartRenderer
+            # Servicio propio del worker: su sesion no se comparte con el hilo de la UI
+            cls._chart_renderer = ChartRenderer(AnalyticsService)
+        return cls._chart_renderer
+
+    @classmethod
+    def export_service(cls):
+        """Exportacion de eventos a .xlsx/.csv (sin estado: cada llamada abre su propia sesion)."""
+        if not cls._export_service:
+            from app.application.services.export_service import ExportService
+            cls._export_service = ExportService()
+        return cls._export_service
+
+    @classmethod
+    def archive_service(cls):
+        if not cls._archive_service:
+            from app.application.services.archive_service import ArchiveService
+            cls._archive_service = ArchiveService()
+        return cls._archive_service
+
+    @classmethod
+    def sync_service(cls):
+        """Motor de sincronizacion replica local <-> MySQL (solo con DB_BACKEND=replica)."""
+        if not cls._sync_service:
+            from app.application.services.sync_service import SyncService
+            BaseService._init_engine()
+            cls._sync_service = SyncService(BaseService._engine, create_db_engine(Config.get_mysql_url()))
+        return cls._sync_service
+
+    @classmethod
+    def shutdown(cls):
+        """Cierra los workers en segundo plano al salir, sin crear los que no se llegaron a usar."""
+        timer_module = sys.modules.get('app.application.services.timer_service')
+        if timer_module is not None:
+            # Los guardados de cronometros en curso terminan antes de salir
+            timer_module.TimerService.shutdown()
+        if cls._prefetcher:
+            cls._prefetcher.shutdown()
+        if cls._chart_renderer:
+            cls._chart_renderer.shutdown()
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Boolean, Enum, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Boolean, Enum, DateTime, UniqueConstraint, Index, LargeBinary
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import relationship
 from .base import Base
 import datetime
@@ -37,10 +38,13 @@ class GameAccount(Base):
     username = Column(String(50), nullable=False)
     store_account_id = Column(Integer, ForeignKey('store_accounts.id'))
     server_id = Column(Integer, ForeignKey('servers.id'))
+    # Control de concurrencia optimista: el UPDATE exige la version leida
+    version = Column(Integer, nullable=False, default=1, server_default='1')
     
     __table_args__ = (
         UniqueConstraint('username', 'server_id', name='uq_game_account_username_server'),
     )
+    __mapper_args__ = {'version_id_col': version}
 
     
     store_account = relationship("StoreAccount", back_populates="game_accounts")
@@ -74,6 +78,10 @@ class FishingActivity(Base):
     character_id = Column(Integer, ForeignKey('characters.id'))
     character = relationship("Character", back_populates="fishing_activities")
 
+    __table_args__ = (
+        UniqueConstraint('character_id', 'year', 'month', 'week', name='uq_fishing_activity'),
+    )
+
 class AlchemyEvent(Base):
     __tablename__ = 'alchemy_events'
 
@@ -82,6 +90,8 @@ class AlchemyEvent(Base):
     name = Column(String(100), nullable=False)
     total_days = Column(Integer, default=30)
     created_at = Column(Date, default=datetime.date.today)
+    # Evento compactado en event_archives: sus filas de actividad ya no estan en las tablas calientes
+    archived = Column(Boolean, nullable=False, default=False, server_default='0')
 
     server = relationship("Server", back_populates="alchemy_events")
     daily_activities = relationship("DailyCorActivity", back_populates="event")
@@ -97,6 +107,13 @@ class DailyCorActivity(Base):
     
     character_id = Column(Integer, ForeignKey('characters.id'))
     event_id = Column(Integer, ForeignKey('alchemy_events.id'))
+    version = Column(Integer, nullable=False, default=1, server_default='1')
+    
+    # Una fila por celda: dos altas concurrentes con expected_version 0 no pueden duplicarla
+    __table_args__ = (
+        UniqueConstraint('character_id', 'event_id', 'day_index', name='uq_daily_cor_activity'),
+    )
+    __mapper_args__ = {'version_id_col': version}
     
     character = relationship("Character", back_populates="daily_cors")
     event = relationship("AlchemyEvent", back_populates="daily_activities")
@@ -108,11 +125,15 @@ class TombolaEvent(Base):
     server_id = Column(Integer, ForeignKey('servers.id'))
     name = Column(String(100), nullable=False)
     created_at = Column(Date, default=datetime.date.today)
+    archived = Column(Boolean, nullable=False, default=False, server_default='0')
 
     server = relationship("Server", back_populates="tombola_events")
     tombola_activities = relationship("TombolaActivity", back_populates="event")
     item_counters = relationship("TombolaItemCounter", back_populates="event")
 
+# TombolaEvent no guarda duracion: todos los eventos tienen los dias que muestra la grilla
+TOMBOLA_DAYS = 31
+
 class TombolaActivity(Base):
     __tablename__ = 'tombola_activities'
     
@@ -123,6 +144,10 @@ class TombolaActivity(Base):
     character_id = Column(Integer, ForeignKey('characters.id'))
     event_id = Column(Integer, ForeignKey('tombola_events.id'))
     
+    __table_args__ = (
+        UniqueConstraint('character_id', 'event_id', 'day_index', name='uq_tombola_activity'),
+    )
+    
     character = relationship("Character", back_populates="tombola_activities")
     event = relationship("TombolaEvent", back_populates="tombola_activities")
 
@@ -145,6 +170,47 @@ class TimerRecord(Base):
     elapsed_seconds = Column(Integer, nullable=False)  # Total time in seconds
     created_at = Column(DateTime, default=datetime.datetime.now)
 
+    __table_args__ = (
+        # Paginacion keyset del historial: (created_at, id) descendente
+        Index('ix_timer_records_created', 'created_at', 'id'),
+        Index('ix_timer_records_name', 'name'),
+    )
+
+class CountdownTimer(Base):
+    """Temporizador de la ventana flotante, persistido por puesto para sobrevivir reinicios."""
+    __tablename__ = 'countdown_timers'
+
+    id = Column(Integer, primary_key=True)
+    owner = Column(String(64), nullable=False)  # CLIENT_ID del puesto
+    position = Column(Integer, nullable=False, default=0)
+    duration_seconds = Column(Integer, nullable=False)
+    remaining_ms = Column(Integer, nullable=False)  # vigente si esta pausado
+    deadline_at = Column(DateTime)  # UTC; solo si esta corriendo
+
+    __table_args__ = (
+        Index('ix_countdown_timers_owner', 'owner', 'position'),
+    )
+
+class CountdownPreset(Base):
+    """Grupo de temporizadores guardado con nombre (compartido entre puestos)."""
+    __tablename__ = 'countdown_presets'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), unique=True, nullable=False)
+
+    items = relationship("CountdownPresetItem", back_populates="preset",
+                         cascade="all, delete-orphan", order_by="CountdownPresetItem.position")
+
+class CountdownPresetItem(Base):
+    __tablename__ = 'countdown_preset_items'
+
+    id = Column(Integer, primary_key=True)
+    preset_id = Column(Integer, ForeignKey('countdown_presets.id'), nullable=False)
+    position = Column(Integer, nullable=False, default=0)
+    duration_seconds = Column(Integer, nullable=False)
+
+    preset = relationship("CountdownPreset", back_populates="items")
+
 class DailyCorRecord(Base):
     """Registro de cords por cuenta por día dentro de un evento"""
     __tablename__ = 'daily_cor_records'
@@ -154,6 +220,12 @@ class DailyCorRecord(Base):
     event_id = Column(Integer, ForeignKey('alchemy_events.id'))
     day_index = Column(Integer, nullable=False)  # Día del evento (1-based)
     cords_count = Column(Integer, default=0)  # Cantidad de cords ese día
+    version = Column(Integer, nullable=False, default=1, server_default='1')
+    
+    __table_args__ = (
+        UniqueConstraint('game_account_id', 'event_id', 'day_index', name='uq_daily_cor_record'),
+    )
+    __mapper_args__ = {'version_id_col': version}
     
     game_account = relationship("GameAccount", back_populates="daily_cor_records")
     event = relationship("AlchemyEvent", back_populates="daily_cor_records")
@@ -169,3 +241,89 @@ class AlchemyCounter(Base):
     
     event = relationship("AlchemyEvent", back_populates="alchemy_counters")
 
+
+class EventDayTotal(Base):
+    """Totales materializados por dia de un evento (o semana del año en pesca)."""
+    __tablename__ = 'event_day_totals'
+
+    id = Column(Integer, primary_key=True)
+    feature = Column(String(10), nullable=False)  # alchemy | tombola | fishing
+    server_id = Column(Integer, nullable=False)
+    scope_id = Column(Integer, nullable=False)  # event_id, o año en pesca
+    day_index = Column(Integer, nullable=False)  # en pesca: (mes - 1) * 4 + semana
+    completed = Column(Integer, nullable=False, default=0, server_default='0')
+    failed = Column(Integer, nullable=False, default=0, server_default='0')
+    cords = Column(Integer, nullable=False, default=0, server_default='0')
+
+    __table_args__ = (
+        UniqueConstraint('feature', 'scope_id', 'server_id', 'day_index', name='uq_event_day_total'),
+    )
+
+class EventStoreTotal(Base):
+    """Totales materializados por tienda dentro de un evento (o año en pesca)."""
+    __tablename__ = 'event_store_totals'
+
+    id = Column(Integer, primary_key=True)
+    feature = Column(String(10), nullable=False)
+    server_id = Column(Integer, nullable=False)
+    scope_id = Column(Integer, nullable=False)
+    store_account_id = Column(Integer, nullable=False)  # 0 = cuenta sin tienda
+    completed = Column(Integer, nullable=False, default=0, server_default='0')
+    failed = Column(Integer, nullable=False, default=0, server_default='0')
+    cords = Column(Integer, nullable=False, default=0, server_default='0')
+
+    __table_args__ = (
+        UniqueConstraint('feature', 'scope_id', 'server_id', 'store_account_id', name='uq_event_store_total'),
+    )
+
+
+class EventArchive(Base):
+    """Evento finalizado compactado: vectores de estado y cords comprimidos mas totales finales."""
+    __tablename__ = 'event_archives'
+
+    id = Column(Integer, primary_key=True)
+    feature = Column(String(10), nullable=False)  # alchemy | tombola
+    event_id = Column(Integer, nullable=False)
+    server_id = Column(Integer, nullable=False)
+    total_days = Column(Integer, nullable=False)
+    completed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    cords = Column(Integer, nullable=False, default=0)
+    payload = Column(LargeBinary().with_variant(mysql.LONGBLOB(), 'mysql'), nullable=False)  # JSON + zlib
+    archived_at = Column(DateTime, default=datetime.datetime.now)
+
+    __table_args__ = (
+        UniqueConstraint('feature', 'event_id', name='uq_event_archive'),
+    )
+
+
+class ChangeLog(Base):
+    """Journal append-only de cambios sobre actividades, cords y contadores."""
+    __tablename__ = 'change_log'
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String(30), nullable=False)  # ver app.application.services.change_log
+    server_id = Column(Integer)
+    owner_id = Column(Integer)  # character_id / game_account_id (None en contadores)
+    scope_id = Column(Integer, nullable=False)  # event_id, o año en pesca
+    slot = Column(String(50), nullable=False)  # dia, "mes_semana" o nombre del contador
+    value = Column(Integer, nullable=False)
+    row_version = Column(Integer)  # version de la fila tras el write (None si no es versionada)
+    origin = Column(String(64), nullable=False)  # puesto que origino el cambio
+    # Precision de microsegundos en MySQL para resolver last-writer-wins
+    changed_at = Column(DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql'),
+                        default=datetime.datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('ix_change_log_key', 'entity', 'owner_id', 'scope_id', 'slot'),
+        Index('ix_change_log_server', 'server_id', 'id'),
+        # Ultima version de un evento (cache de graficos)
+        Index('ix_change_log_scope', 'scope_id', 'entity', 'id'),
+    )
+
+class SyncState(Base):
+    """Estado local del motor de sincronizacion (cursores de push/pull)."""
+    __tablename__ = 'sync_state'
+
+    key = Column(String(50), primary_key=True)
+    value = Column(String(100))
@@ -0,0 +1,163 @@
+"""
+Graficos de eventos renderizados fuera del hilo de la UI.
+
+matplotlib se usa con el canvas Agg (sin pyplot ni backend Qt), asi que es seguro renderizar
+en un worker. Cada imagen PNG se cachea por (feature, evento, version del journal, grafico):
+mientras la version no cambie no se vuelve a leer ni a renderizar nada.
+"""
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from app.application.services import aggregates
+from app.utils.config import Config
+from app.utils.logger import logger
+
+COMPLETION = 'completion'
+CORDS_BY_DAY = 'cords_by_day'
+STORES = 'stores'
+COUNTERS = 'counters'
+
+# Graficos de cada feature, en el orden en que se muestran
+CHARTS = {
+    aggregates.ALCHEMY: (COMPLETION, CORDS_BY_DAY, STORES, COUNTERS),
+    aggregates.TOMBOLA: (COMPLETION, STORES, COUNTERS),
+}
+
+TITLES = {
+    COMPLETION: "Completado diario",
+    CORDS_BY_DAY: "Cords por dia",
+    STORES: "Por tienda",
+    COUNTERS: "Contadores",
+}
+
+_GOLD, _RED, _BLUE, _GREY = "#d4af37", "#ef5350", "#4fc3f7", "#b0bec5"
+_BG, _AXES_BG = "#102027", "#1a1a1a"
+
+
+def _new_figure(size):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=size, dpi=Config.CHART_DPI, facecolor=_BG)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111, facecolor=_AXES_BG)
+    ax.tick_params(colors=_GREY, labelsize=8)
+    for spine in ax.spines.values():
+        spine.set_color("#455a64")
+    return fig, ax
+
+
+def _draw_completion(ax, data):
+    days = list(range(1, data.total_days + 1))
+    base = max(data.participants, 1)
+    completed = [data.days[d].completed / base * 100 if d in data.days else 0 for d in days]
+    failed = [data.days[d].failed / base * 100 if d in data.days else 0 for d in days]
+    ax.bar(days, completed, color=_GOLD, label="Completado")
+    ax.bar(days, failed, bottom=completed, color=_RED, label="Fallido")
+    ax.set_ylim(0, 100)
+    ax.set_ylabel("% personajes", color=_GREY, fontsize=8)
+    ax.legend(fontsize=7, facecolor=_AXES_BG, labelcolor=_GREY, edgecolor="#455a64")
+
+
+def _draw_cords_by_day(ax, data):
+    days = list(range(1, data.total_days + 1))
+    ax.plot(days, [data.days[d].cords if d in data.days else 0 for d in days], color=_BLUE, marker="o",
+            markersize=3)
+    ax.set_ylabel("cords", color=_GREY, fontsize=8)
+
+
+def _draw_stores(ax, data):
+    stores = sorted(data.stores)
+    if data.feature == aggregates.ALCHEMY:
+        values, label = [data.stores[s].cords for s in stores], "cords"
+    else:
+        values, label = [data.stores[s].completed for s in stores], "completados"
+    ax.barh([s.split('@')[0] for s in stores], values, color=_GOLD)
+    ax.set_xlabel(label, color=_GREY, fontsize=8)
+
+
+def _draw_counters(ax, data):
+    names = sorted(data.counters)
+    ax.bar(names, [data.counters[n] for n in names], color=_BLUE)
+    ax.tick_params(axis='x', labelrotation=45)
+
+
+_DRAW = {
+    COMPLETION: _draw_completion,
+    CORDS_BY_DAY: _draw_cords_by_day,
+    STORES: _draw_stores,
+    COUNTERS: _draw_counters,
+}
+
+
+def render_chart(chart, data, size=(5, 3)):
+    """PNG (bytes) del grafico. Solo usa Figure + canvas Agg: no toca Qt ni pyplot."""
+    fig, ax = _new_figure(size)
+    _DRAW[chart](ax, data)
+    ax.set_title(TITLES[chart], color=_GOLD, fontsize=10)
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", facecolor=fig.get_facecolor())
+    return buffer.getvalue()
+
+
+class ChartRenderer:
+    """Renderiza los graficos de un evento en un worker y cachea los PNG por version de datos."""
+
+    def __init__(self, service_factory, cache_size=None):
+        # Factory del AnalyticsService; se invoca en el worker
+        self._service_factory = service_factory
+        self.cache_size = Config.CHART_CACHE_SIZE if cache_size is None else cache_size
+        self._cache = OrderedDict()  # (feature, event_id, version, chart) -> png
+        self._lock = threading.Lock()
+        self._executor = None
+        self.renders = 0  # graficos efectivamente renderizados (no servidos de cache)
+
+    def _get_executor(self):
+        if self._executor is None:
+            # Un solo worker: matplotlib no se usa en paralelo y la UI nunca espera
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='charts')
+        return self._executor
+
+    def shutdown(self, wait=False):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def submit(self, feature, event_id):
+        """Encola el render del evento. El Future retorna (version, {grafico: png}) o None."""
+        return self._get_executor().submit(self.render, feature, event_id)
+
+    def cached(self, feature, event_id, version):
+        """Graficos ya renderizados para esa version, o None si falta alguno."""
+        keys = [(feature, event_id, version, chart) for chart in CHARTS.get(feature, ())]
+        with self._lock:
+            if not keys or any(key not in self._cache for key in keys):
+                return None
+            for key in keys:
+                self._cache.move_to_end(key)
+            return {key[3]: self._cache[key] for key in keys}
+
+    def render(self, feature, event_id):
+        """Version actual -> cache; si cambio, lee los agregados y renderiza (en el hilo que llama)."""
+        try:
+            service = self._service_factory()
+            version = service.get_data_version(feature, event_id)
+            images = self.cached(feature, event_id, version)
+            if images is not None:
+                return version, images
+
+            data = service.get_chart_data(feature, event_id)
+            if data is None:
+                return None
+            images = {chart: render_chart(chart, data) for chart in CHARTS[feature]}
+            with self._lock:
+                self.renders += len(images)
+                for chart, png in images.items():
+                    self._cache[(feature, event_id, data.version, chart)] = png
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            return data.version, images
+        except Exception as e:
+            logger.warning(f"No se pudieron renderizar los graficos de {feature} {event_id}: {e}")
+            return None
@@ -1,7 +1,8 @@
 from PyQt6.QtWidgets import QStyledItemDelegate, QStyle
-from PyQt6.QtCore import Qt, QRect, QPoint, QSize
+from PyQt6.QtCore import Qt, QRect, QPoint, QSize, pyqtSignal
 from PyQt6.QtGui import QColor, QPainter, QBrush, QPen
 from app.presentation.models.alchemy_model import AlchemyModel
+from app.utils import perf_log
 
 class DailyGridDelegate(QStyledItemDelegate):
     """Delegado grafico para renderizar la grilla de dias."""
@@ -9,6 +10,9 @@ class DailyGridDelegate(QStyledItemDelegate):
     CELL_SIZE = 22
     SPACING = 2
     
+    # Claves (char_id, dia) rechazadas por compare-and-swap
+    conflictsDetected = pyqtSignal(list)
+    
     def __init__(self, parent=None, total_days=30, controller=None, model=None):
         super().__init__(parent)
         self.total_days = total_days
@@ -19,6 +23,7 @@ class DailyGridDelegate(QStyledItemDelegate):
         self.border_pen = QPen(QColor("#5d4d2b"))
         self.text_pen = QPen(QColor("#ffffff"))
 
+    @perf_log.timed('paint.daily_grid')
     def paint(self, painter, option, index):
         item_type = index.data(AlchemyModel.TypeRole)
         
@@ -123,7 +128,8 @@ class DailyGridDelegate(QStyledItemDelegate):
                     account = index.data(AlchemyModel.RawDataRole)
                     if not account: return False
 
-                    activity = getattr(account, 'current_event_activity', {})
+                    char = account.characters[0] if account.characters else None
+                    activity = char.daily_status_map if char else {}
                     current_status = activity.get(day, 0)
                     
                     # Validacion secuencial: no modificar dia N si dia N-1 no esta hecho
@@ -138,13 +144,17 @@ class DailyGridDelegate(QStyledItemDelegate):
                     elif current_status == 1: new_status = -1
                     else: new_status = 0
                     
-                    if account.characters:
-                        char_id = account.characters[0].id
-                        if self.controller:
-                            event_id = model._event_id
-                            if event_id:
-                                self.controller.update_daily_status(char_id, day, new_status, event_id)
-                                model.update_daily_status(index, day, new_status)
+                    if char and self.controller:
+                        event_id = model._event_id
+                        if event_id:
+                            expected = char.daily_version_map.get(day, 0)
+                            result = self.controller.update_daily_status_batch(
+                                event_id, [(char.id, day, new_status, expected)]
+                            )
+                            if (char.id, day) in result.versions:
+                                model.update_daily_status(index, day, new_status, result.versions[(char.id, day)])
+                            elif result.conflicts:
+                                self.conflictsDetected.emit(result.conflicts)
                                 
                     return True
                     
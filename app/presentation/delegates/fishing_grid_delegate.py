@@ -2,6 +2,7 @@ from PyQt6.QtWidgets import QStyledItemDelegate
 from PyQt6.QtCore import Qt, QRect, QSize
 from PyQt6.QtGui import QColor, QPainter, QBrush, QPen
 from app.presentation.models.fishing_model import FishingModel
+from app.utils import perf_log
 from app.presentation.styles import AppColors, AppDims
 
 class FishingGridDelegate(QStyledItemDelegate):
@@ -21,6 +22,7 @@ class FishingGridDelegate(QStyledItemDelegate):
         self.color_fail = AppColors.FAIL
         self.border_pen = QPen(AppColors.BORDER)
 
+    @perf_log.timed('paint.fishing_grid')
     def paint(self, painter, option, index):
         if not index.isValid():
             return
@@ -2,6 +2,8 @@ from PyQt6.QtWidgets import QStyledItemDelegate
 from PyQt6.QtCore import Qt, QRect, QSize
 from PyQt6.QtGui import QColor, QBrush, QPen
 from app.presentation.models.tombola_model import TombolaModel
+from app.domain.models import TOMBOLA_DAYS
+from app.utils import perf_log
 
 class TombolaGridDelegate(QStyledItemDelegate):
     """
@@ -12,7 +14,7 @@ class TombolaGridDelegate(QStyledItemDelegate):
     # Constants for Density
     CELL_SIZE = 22
     SPACING = 2
-    TOTAL_DAYS = 31
+    TOTAL_DAYS = TOMBOLA_DAYS
     
     def __init__(self, parent=None, controller=None, model=None):
         super().__init__(parent)
@@ -25,6 +27,7 @@ class TombolaGridDelegate(QStyledItemDelegate):
         self.border_pen = QPen(QColor("#5d4d2b"))
         self.text_pen = QPen(QColor("#ffffff"))
 
+    @perf_log.timed('paint.tombola_grid')
     def paint(self, painter, option, index):
         item_type = index.data(TombolaModel.TypeRole)
         
@@ -0,0 +1,49 @@
+"""Registro de features: cada una declara su vista, su servicio y el flag del servidor que la habilita.
+
+El modulo de la vista se importa recien la primera vez que se abre la feature.
+"""
+import importlib
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    key: str        # identificador emitido por FeatureSelectionView
+    flag: str       # columna Server.has_* que la habilita
+    title: str      # texto de la tarjeta
+    image: str      # imagen de la tarjeta en assets/images
+    view: str       # "modulo:Clase", con firma (server_id, server_name, controller=, prefetched=)
+    service: str    # nombre del factory en ServiceContainer
+
+    def load_view_class(self):
+        module_name, class_name = self.view.split(':')
+        return getattr(importlib.import_module(module_name), class_name)
+
+
+_REGISTRY = {}
+
+
+def register(spec):
+    _REGISTRY[spec.key] = spec
+    return spec
+
+
+def get(key):
+    return _REGISTRY.get(key)
+
+
+def all_features():
+    return list(_REGISTRY.values())
+
+
+def enabled_features(flags):
+    """Features habilitadas segun los flags del servidor (sin flag se asume habilitada)."""
+    return [spec for spec in _REGISTRY.values() if flags.get(spec.flag, True)]
+
+
+register(FeatureSpec('dailies', 'has_dailies', "Diarias\n(Alquimia, Cors)", "cor.png",
+                     'app.presentation.views.alchemy_view:AlchemyView', 'alchemy_service'))
+register(FeatureSpec('fishing', 'has_fishing', "Pesca", "enchanted.png",
+                     'app.presentation.views.fishing_view:FishingView', 'fishing_service'))
+register(FeatureSpec('tombola', 'has_tombola', "Tómbola", "talisman.png",
+                     'app.presentation.views.tombola_view:TombolaView', 'tombola_service'))
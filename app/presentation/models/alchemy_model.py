@@ -2,6 +2,7 @@ from PyQt6.QtCore import QAbstractItemModel, QModelIndex, Qt, QVariant
 from app.utils.logger import logger
 
 from app.application.dtos import StoreAccountDTO, GameAccountDTO, AlchemyCharacterDTO
+from app.application.services import change_log
 
 class AlchemyModel(QAbstractItemModel):
     """Modelo jerarquico para AlchemyView: Root -> Store -> GameAccount."""
@@ -34,7 +35,7 @@ class AlchemyModel(QAbstractItemModel):
             total += sum(daily_records.values())
         return total
 
-    def update_daily_status(self, index, day, status):
+    def update_daily_status(self, index, day, status, version=None):
         """Actualiza el estado de un dia en la UI (optimistic update)."""
         if not index.isValid(): return
         
@@ -52,6 +53,8 @@ class AlchemyModel(QAbstractItemModel):
             char = account.characters[0]
             if isinstance(char, AlchemyCharacterDTO):
                 char.daily_status_map[day] = status
+                if version is not None:
+                    char.daily_version_map[day] = version
         
         if account.id not in self._cords_summary:
              self._cords_summary[account.id] = {}
@@ -63,6 +66,42 @@ class AlchemyModel(QAbstractItemModel):
         self.dataChanged.emit(index, index, [self.GridDataRole])
         self.dataChanged.emit(cords_index, cords_index, [self.CordsRole, Qt.ItemDataRole.DisplayRole])
 
+    def _account_positions(self):
+        """Mapas account_id / char_id -> (fila tienda, fila cuenta, cuenta)."""
+        by_account, by_char = {}, {}
+        for store_row, store in enumerate(self._data):
+            for row, account in enumerate(store.game_accounts):
+                by_account[account.id] = (store_row, row, account)
+                if account.characters:
+                    by_char[account.characters[0].id] = (store_row, row, account)
+        return by_account, by_char
+
+    def apply_changes(self, changes):
+        """Parchea solo las celdas afectadas por cambios del journal. Retorna cuantas se tocaron."""
+        by_account, by_char = self._account_positions()
+        touched = 0
+        for change in changes:
+            if change.scope_id != self._event_id:
+                continue
+            if change.entity == change_log.ALCHEMY_STATUS and change.owner_id in by_char:
+                store_row, row, account = by_char[change.owner_id]
+                char = account.characters[0]
+                char.daily_status_map[int(change.slot)] = change.value
+                if change.version is not None:
+                    char.daily_version_map[int(change.slot)] = change.version
+                cell = self.index(row, 3, self.index(store_row, 0))
+                self.dataChanged.emit(cell, cell, [self.GridDataRole])
+                touched += 1
+            elif change.entity == change_log.ALCHEMY_CORDS:
+                # El resumen cubre todas las cuentas del evento, aunque esten filtradas
+                self._cords_summary.setdefault(change.owner_id, {})[int(change.slot)] = change.value
+                if change.owner_id in by_account:
+                    store_row, row, _ = by_account[change.owner_id]
+                    cell = self.index(row, 4, self.index(store_row, 0))
+                    self.dataChanged.emit(cell, cell, [self.CordsRole, Qt.ItemDataRole.DisplayRole])
+                    touched += 1
+        return touched
+
     def index(self, row, column, parent=QModelIndex()):
         if not self.hasIndex(row, column, parent):
             return QModelIndex()
@@ -1,6 +1,7 @@
 from PyQt6.QtCore import QAbstractItemModel, QModelIndex, Qt
 from app.utils.logger import logger
 from app.application.dtos import StoreAccountDTO, GameAccountDTO
+from app.application.services import change_log
 
 class FishingModel(QAbstractItemModel):
     """Modelo jerarquico para FishingView: Root -> Store -> GameAccount."""
@@ -40,6 +41,32 @@ class FishingModel(QAbstractItemModel):
         grid_index = self.index(index.row(), 2, index.parent())
         self.dataChanged.emit(grid_index, grid_index, [self.GridDataRole])
 
+    def _char_positions(self):
+        """Mapa char_id -> (fila tienda, fila cuenta, cuenta)."""
+        positions = {}
+        for store_row, store_dto in enumerate(self._data):
+            for row, account_dto in enumerate(store_dto.game_accounts):
+                if account_dto.characters:
+                    positions[account_dto.characters[0].id] = (store_row, row, account_dto)
+        return positions
+
+    def apply_changes(self, changes):
+        """Parchea solo las celdas afectadas por cambios del journal. Retorna cuantas se tocaron."""
+        positions = self._char_positions()
+        touched = 0
+        for change in changes:
+            if change.entity != change_log.FISHING_STATUS or change.scope_id != self._year:
+                continue
+            if change.owner_id not in positions:
+                continue
+            store_row, row, account_dto = positions[change.owner_id]
+            # El slot del journal usa el mismo formato "mes_semana" que el mapa
+            account_dto.characters[0].fishing_activity_map[change.slot] = change.value
+            cell = self.index(row, 2, self.index(store_row, 0))
+            self.dataChanged.emit(cell, cell, [self.GridDataRole])
+            touched += 1
+        return touched
+
     def index(self, row, column, parent=QModelIndex()):
         if not self.hasIndex(row, column, parent):
             return QModelIndex()
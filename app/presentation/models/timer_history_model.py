@@ -0,0 +1,100 @@
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QColor
+
+class TimerHistoryModel(QAbstractTableModel):
+    """Historial de cronometros paginado: la vista pide paginas con fetchMore al hacer scroll."""
+
+    RecordIdRole = Qt.ItemDataRole.UserRole + 1
+    DELETE_COLUMN = 3
+
+    def __init__(self, controller, page_size=None):
+        super().__init__()
+        self._controller = controller
+        self._page_size = page_size
+        self._records = []
+        self._cursor = None
+        self._exhausted = False
+        self._headers = ["Nombre", "Tiempo", "Fecha", "Acciones"]
+
+    def reload(self):
+        """Descarta lo cargado y trae la primera pagina."""
+        self.beginResetModel()
+        self._records = []
+        self._cursor = None
+        self._exhausted = False
+        self.endResetModel()
+        self.fetchMore()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        page = self._controller.get_records_page(self._cursor, self._page_size)
+        self._exhausted = page.next_cursor is None
+        self._cursor = page.next_cursor
+        if not page.records:
+            return
+        start = len(self._records)
+        self.beginInsertRows(QModelIndex(), start, start + len(page.records) - 1)
+        self._records.extend(page.records)
+        self.endInsertRows()
+
+    def remove_record(self, record_id):
+        """Quita la fila ya borrada en la base sin recargar las paginas."""
+        for row, record in enumerate(self._records):
+            if record.id == record_id:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._records[row]
+                self.endRemoveRows()
+                return True
+        return False
+
+    @staticmethod
+    def format_time(seconds):
+        hours = seconds // 3600
+        minutes = (seconds % 3600) // 60
+        secs = seconds % 60
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self._headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self._records[index.row()]
+        column = index.column()
+
+        if role == self.RecordIdRole:
+            return record.id
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return record.name
+            elif column == 1:
+                return self.format_time(record.elapsed_seconds)
+            elif column == 2:
+                return record.created_at.strftime("%Y-%m-%d %H:%M:%S") if record.created_at else ""
+            elif column == self.DELETE_COLUMN:
+                return "🗑 Eliminar"
+
+        if column == self.DELETE_COLUMN:
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return Qt.AlignmentFlag.AlignCenter
+            if role == Qt.ItemDataRole.BackgroundRole:
+                return QColor(Qt.GlobalColor.darkRed)
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return QColor(Qt.GlobalColor.white)
+
+        return None
+
+    def headerData(self, section, orientation, role):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            if 0 <= section < len(self._headers):
+                return self._headers[section]
+        return None
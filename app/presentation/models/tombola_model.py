@@ -2,6 +2,7 @@ from PyQt6.QtCore import QAbstractItemModel, QModelIndex, Qt
 from app.utils.logger import logger
 
 from app.application.dtos import StoreAccountDTO, GameAccountDTO, TombolaCharacterDTO
+from app.application.services import change_log
 
 class TombolaModel(QAbstractItemModel):
     """Modelo jerarquico para TombolaView: Root -> Store -> GameAccount."""
@@ -41,6 +42,31 @@ class TombolaModel(QAbstractItemModel):
         grid_index = self.index(index.row(), 2, index.parent())
         self.dataChanged.emit(grid_index, grid_index, [self.GridDataRole])
 
+    def _char_positions(self):
+        """Mapa char_id -> (fila tienda, fila cuenta, cuenta)."""
+        positions = {}
+        for store_row, store in enumerate(self._data):
+            for row, account in enumerate(store.game_accounts):
+                if account.characters:
+                    positions[account.characters[0].id] = (store_row, row, account)
+        return positions
+
+    def apply_changes(self, changes):
+        """Parchea solo las celdas afectadas por cambios del journal. Retorna cuantas se tocaron."""
+        positions = self._char_positions()
+        touched = 0
+        for change in changes:
+            if change.entity != change_log.TOMBOLA_STATUS or change.scope_id != self._event_id:
+                continue
+            if change.owner_id not in positions:
+                continue
+            store_row, row, account = positions[change.owner_id]
+            account.characters[0].daily_status_map[int(change.slot)] = change.value
+            cell = self.index(row, 2, self.index(store_row, 0))
+            self.dataChanged.emit(cell, cell, [self.GridDataRole])
+            touched += 1
+        return touched
+
     def index(self, row, column, parent=QModelIndex()):
         if not self.hasIndex(row, column, parent):
             return QModelIndex()
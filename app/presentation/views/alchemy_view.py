@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTreeView, 
                              QSplitter, QPushButton, QInputDialog, QMessageBox, QComboBox,
-                             QHeaderView, QAbstractItemView, QApplication, QAbstractSpinBox, QLineEdit)
+                             QHeaderView, QAbstractItemView, QCheckBox, QApplication, QAbstractSpinBox, QLineEdit)
 from PyQt6.QtGui import QAction, QStandardItemModel, QStandardItem, QIcon, QCursor
 from PyQt6.QtCore import Qt, QModelIndex, QEvent, QTimer, pyqtSignal, QItemSelectionModel
 from app.utils.logger import logger
@@ -11,17 +11,26 @@ from app.presentation.delegates.store_header_delegate import StoreHeaderDelegate
 from app.presentation.delegates.cords_delegate import CordsDelegate
 from app.presentation.views.widgets.alchemy_counters_widget import AlchemyCountersWidget
 from app.utils.shortcuts import register_shortcuts
+from app.utils.change_poller import ChangePoller
+from app.utils import perf_log
+from app.application.services import change_log, aggregates
+from app.application.dtos import AlchemyDashboardDTO
+from app.presentation.views.feature_view_mixin import EventFeatureViewMixin
 from app.presentation.styles import AppStyles, AppColors
 import datetime
 
-class AlchemyView(QWidget):
+class AlchemyView(EventFeatureViewMixin, QWidget):
     backRequested = pyqtSignal()
+    FEATURE = aggregates.ALCHEMY
+    DASHBOARD_DTO = AlchemyDashboardDTO
 
-    def __init__(self, server_id, server_name, controller=None):
+    def __init__(self, server_id, server_name, controller=None, prefetched=None):
         super().__init__()
         self.server_id = server_id
         self.server_name = server_name
         self.controller = controller if controller else AlchemyService()
+        # Dashboard precargado desde la seleccion de feature (se consume una vez)
+        self.prefetched = prefetched
         
         self.events_cache = []
         self.current_event = None
@@ -29,10 +38,20 @@ class AlchemyView(QWidget):
         
         self.tree_view = None
         self.model = None
+        # Ventana de graficos del evento (se crea al abrirla)
+        self.analytics_panel = None
+        self.export_dialog = None
+        
+        # Refresco incremental: solo las celdas que cambiaron en otros puestos
+        self.change_poller = ChangePoller(
+            self, lambda version: self.controller.get_changes_since(self.server_id, version),
+            self.on_remote_changes
+        )
         
         self.init_ui()
         self.setup_shortcuts()
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.change_poller.start()
 
     def init_ui(self):
         main_layout = QHBoxLayout()
@@ -110,11 +129,27 @@ class AlchemyView(QWidget):
         self.combo_events.currentIndexChanged.connect(self.on_event_changed)
         header_right.addWidget(self.combo_events)
         
+        # Eventos archivados: se cargan bajo demanda y son de solo lectura
+        self.chk_archived = QCheckBox("Archivados")
+        self.chk_archived.setStyleSheet("color: #b0bec5;")
+        self.chk_archived.toggled.connect(self.load_events)
+        header_right.addWidget(self.chk_archived)
+        
         self.btn_new_event = QPushButton("➕ Nueva Jornada")
         self.btn_new_event.clicked.connect(self.prompt_create_event)
         self.btn_new_event.setStyleSheet(AppStyles.BUTTON_ACCENT)
         header_right.addWidget(self.btn_new_event)
         
+        self.btn_charts = QPushButton("📈 Gráficos")
+        self.btn_charts.clicked.connect(self.show_analytics)
+        self.btn_charts.setStyleSheet(AppStyles.BUTTON_ACCENT)
+        header_right.addWidget(self.btn_charts)
+        
+        self.btn_export = QPushButton("💾 Exportar")
+        self.btn_export.clicked.connect(self.export_event)
+        self.btn_export.setStyleSheet(AppStyles.BUTTON_SECONDARY)
+        header_right.addWidget(self.btn_export)
+        
         right_layout.addLayout(header_right)
         
         # --- QTREEVIEW ---
@@ -163,6 +198,7 @@ class AlchemyView(QWidget):
         
         # Delegates
         self.grid_delegate = DailyGridDelegate(self.tree_view, total_days=30, controller=self.controller, model=self.model)
+        self.grid_delegate.conflictsDetected.connect(self.on_write_conflicts)
         self.store_header_delegate = StoreHeaderDelegate(self.tree_view)
         self.cords_delegate = CordsDelegate(self.tree_view)
         
@@ -242,6 +278,7 @@ class AlchemyView(QWidget):
             self.move_selection_next()
             return
 
+        updates, targets = [], {}
         for index in account_indexes:
             account = index.data(AlchemyModel.RawDataRole)
             char = account.characters[0] if account.characters else None
@@ -260,8 +297,17 @@ class AlchemyView(QWidget):
                     if prev_status == 0:
                         continue
                 
-                self.controller.update_daily_status(char.id, day_to_update, status, self.current_event.id)
-                self.model.update_daily_status(index, day_to_update, status)
+                expected = char.daily_version_map.get(day_to_update, 0)
+                updates.append((char.id, day_to_update, status, expected))
+                targets[(char.id, day_to_update)] = index
+        
+        if updates:
+            # Un solo write con compare-and-swap; solo se refrescan las celdas en conflicto
+            result = self.controller.update_daily_status_batch(self.current_event.id, updates)
+            for key, version in result.versions.items():
+                self.model.update_daily_status(targets[key], key[1], status, version)
+            if result.conflicts:
+                self.on_write_conflicts(result.conflicts)
         
         if len(account_indexes) == 1:
              self.move_selection_next()
@@ -270,9 +316,9 @@ class AlchemyView(QWidget):
         """Refrescar contadores cuando cambian datos."""
         if AlchemyModel.CordsRole in roles or AlchemyModel.GridDataRole in roles or Qt.ItemDataRole.EditRole in roles:
              if self.alchemy_counters_widget and self.current_event:
+                 # Recarga contadores y el total de cords desde los agregados materializados
                  self.alchemy_counters_widget.update_counts()
-                 total = self.model.get_total_event_cords()
-                 self.alchemy_counters_widget.set_total_cords(total)
+             self.refresh_analytics()
 
     def move_selection_next(self):
         """Mueve la seleccion a la siguiente fila visible, saltando Stores."""
@@ -285,7 +331,11 @@ class AlchemyView(QWidget):
                  self.move_selection_next()
 
     def load_events(self):
-        self.events_cache = self.controller.get_alchemy_events(self.server_id)
+        if self.prefetched and not self.chk_archived.isChecked():
+            self.events_cache = self.prefetched.events
+        else:
+            self.events_cache = self.controller.get_alchemy_events(
+                self.server_id, include_archived=self.chk_archived.isChecked())
         self.combo_events.blockSignals(True)
         self.combo_events.clear()
         
@@ -294,9 +344,14 @@ class AlchemyView(QWidget):
             self.current_event = None
         else:
             for ev in self.events_cache:
-                self.combo_events.addItem(ev.name, ev)
-            self.combo_events.setCurrentIndex(0)
-            self.current_event = self.events_cache[0]
+                self.combo_events.addItem(f"{ev.name} (archivado)" if ev.archived else ev.name, ev)
+            # Al reanudar se abre el evento precargado, si sigue en la lista
+            selected = 0
+            if self.prefetched:
+                selected = next((i for i, ev in enumerate(self.events_cache)
+                                 if ev.id == self.prefetched.scope_id), 0)
+            self.combo_events.setCurrentIndex(selected)
+            self.current_event = self.events_cache[selected]
             
         self.combo_events.blockSignals(False)
         self.load_data()
@@ -316,6 +371,8 @@ class AlchemyView(QWidget):
         self.current_event = self.combo_events.itemData(index)
         if self.alchemy_counters_widget:
             self.alchemy_counters_widget.set_event(self.current_event.id if self.current_event else None)
+        if self.analytics_panel:
+            self.analytics_panel.set_event(self.current_event.id if self.current_event else None)
         self.load_data()
 
     def prompt_add_email(self):
@@ -358,12 +415,22 @@ class AlchemyView(QWidget):
                  logger.error(f"Error al importar archivo: {e}")
                  QMessageBox.critical(self, "Error", f"Error al procesar el archivo:\n{e}")
 
+    @perf_log.timed('view.alchemy.load_data', ids=('server_id',))
     def load_data(self):
         if not self.current_event:
+            self.prefetched = None
             self.model.set_data([], None)
             return
 
-        dto = self.controller.get_alchemy_dashboard_data(self.server_id, event_id=self.current_event.id)
+        prefetched = self._take_prefetched(self.current_event.id)
+        if prefetched:
+            self.change_poller.version = prefetched.version
+            dto = prefetched.dashboard
+            # Se pinta lo precargado y enseguida se reconcilia con el journal
+            QTimer.singleShot(0, self.change_poller.poll)
+        else:
+            self.change_poller.reset()
+            dto = self.controller.get_alchemy_dashboard_data(self.server_id, event_id=self.current_event.id)
         self.all_data = dto.store_accounts
         
         # Populate Filter
@@ -383,6 +450,18 @@ class AlchemyView(QWidget):
         self.combo_store.blockSignals(False)
         self.apply_filter_and_set_model()
 
+    def on_write_conflicts(self, conflicts):
+        """Otro puesto escribio esas celdas antes: se traen sus valores sin recargar todo."""
+        logger.warning(f"{len(conflicts)} celdas en conflicto, refrescando desde el journal")
+        self.change_poller.poll()
+
+    def on_remote_changes(self, changes):
+        """Aplica cambios de otros puestos sin recargar todo el dashboard."""
+        self.model.apply_changes(changes)
+        self.refresh_analytics()
+        if self.alchemy_counters_widget and any(c.entity == change_log.ALCHEMY_COUNTER for c in changes):
+            self.alchemy_counters_widget.refresh()
+
     def on_store_filter_changed(self, index):
         self.apply_filter_and_set_model()
 
@@ -0,0 +1,72 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtWidgets import QProgressDialog
+from PyQt6.QtCore import Qt, pyqtSignal
+
+
+class ExportDialog(QProgressDialog):
+    """Progreso de una exportacion que corre en un worker; la UI sigue respondiendo.
+
+    El worker informa por señales (encoladas al hilo de la UI) y "Cancelar" activa un
+    threading.Event que el servicio revisa en cada lote.
+    """
+    progressed = pyqtSignal(int, int)
+    finished_export = pyqtSignal(object)  # ExportResultDTO o None
+
+    def __init__(self, service, feature, event_id, file_path, parent=None):
+        super().__init__("Exportando evento...", "Cancelar", 0, 0, parent)
+        self.setWindowTitle("Exportar")
+        self.setWindowModality(Qt.WindowModality.WindowModal)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.setMinimumDuration(0)
+        self.service = service
+        self.feature = feature
+        self.event_id = event_id
+        self.file_path = file_path
+        self.result = None
+        self._cancel = threading.Event()
+        self._executor = None
+        self._future = None
+
+        self.progressed.connect(self._on_progress)
+        self.finished_export.connect(self._on_finished)
+        self.canceled.connect(self._cancel.set)
+
+    def start(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='export')
+        self._future = self._executor.submit(self._run)
+        self._executor.shutdown(wait=False)
+        self.show()
+
+    def wait(self, timeout=None):
+        """Espera al worker (tests y cierre de la app)."""
+        if self._future is not None:
+            self._future.exception(timeout)
+
+    def _run(self):
+        # El fin se emite desde el worker: llega a la UI despues del ultimo progreso encolado
+        result = None
+        try:
+            result = self.service.export_event(self.feature, self.event_id, self.file_path,
+                                               self.progressed.emit, self._cancel)
+        finally:
+            try:
+                self.finished_export.emit(result)
+            except RuntimeError:
+                pass  # el dialogo se destruyo antes de terminar
+        return result
+
+    def _on_progress(self, done, total):
+        if self._cancel.is_set():
+            return
+        self.setMaximum(max(total, 1))
+        self.setValue(min(done, max(total, 1)))
+        self.setLabelText(f"Exportando evento... {done:,} / {total:,} filas")
+
+    def _on_finished(self, result):
+        self.result = result
+        if self.maximum() == 0:
+            self.setMaximum(1)
+        self.setValue(self.maximum())
+        self.done(0 if result is None or result.cancelled else 1)
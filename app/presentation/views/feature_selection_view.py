@@ -1,15 +1,16 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel
 from PyQt6.QtCore import Qt, pyqtSignal
 from app.presentation.views.widgets.feature_card_button import FeatureCardButton
+from app.presentation import feature_registry
 import os
 
 class FeatureSelectionView(QWidget):
-    featureSelected = pyqtSignal(str) # "dailies", "fishing", "tombola"
+    featureSelected = pyqtSignal(str) # clave del feature_registry
     backRequested = pyqtSignal()
 
     def __init__(self, server_name, flags):
         super().__init__()
-        self.flags = flags # {'dailies': bool, 'fishing': bool, 'tombola': bool}
+        self.flags = flags # {'has_dailies': bool, ...}, ver feature_registry
         
         main_layout = QVBoxLayout()
         self.setLayout(main_layout)
@@ -26,26 +27,10 @@ class FeatureSelectionView(QWidget):
         base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
         assets_dir = os.path.join(base_dir, "app", "presentation", "assets", "images")
         
-        # Boton Diarias
-        if self.flags.get('has_dailies', True):
-            cor_image = os.path.join(assets_dir, "cor.png")
-            btn_dailies = FeatureCardButton("Diarias\n(Alquimia, Cors)", cor_image)
-            btn_dailies.clicked.connect(lambda: self.featureSelected.emit("dailies"))
-            cards_layout.addWidget(btn_dailies)
-            
-        # Boton Pesca
-        if self.flags.get('has_fishing', True):
-            enchanted_image = os.path.join(assets_dir, "enchanted.png")
-            btn_fishing = FeatureCardButton("Pesca", enchanted_image)
-            btn_fishing.clicked.connect(lambda: self.featureSelected.emit("fishing"))
-            cards_layout.addWidget(btn_fishing)
-
-        # Boton Tombola
-        if self.flags.get('has_tombola', True):
-            talisman_image = os.path.join(assets_dir, "talisman.png")
-            btn_tombola = FeatureCardButton("Tómbola", talisman_image)
-            btn_tombola.clicked.connect(lambda: self.featureSelected.emit("tombola"))
-            cards_layout.addWidget(btn_tombola)
+        for spec in feature_registry.enabled_features(self.flags):
+            card = FeatureCardButton(spec.title, os.path.join(assets_dir, spec.image))
+            card.clicked.connect(lambda checked=False, key=spec.key: self.featureSelected.emit(key))
+            cards_layout.addWidget(card)
 
         main_layout.addLayout(cards_layout)
 
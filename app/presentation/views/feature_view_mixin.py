@@ -0,0 +1,103 @@
+from PyQt6.QtWidgets import QMessageBox
+from app.utils.logger import logger
+from app.application.dtos import PrefetchedDashboardDTO
+
+
+class FeatureViewMixin:
+    """Comportamiento comun de las vistas de feature: precarga, filtro de tienda y journal.
+
+    La vista debe definir prefetched, change_poller y combo_store.
+    """
+
+    def _take_prefetched(self, scope_id):
+        """Consume la precarga si corresponde a lo que se va a mostrar."""
+        prefetched, self.prefetched = self.prefetched, None
+        if prefetched and prefetched.scope_id == scope_id and prefetched.dashboard is not None:
+            return prefetched
+        return None
+
+    def select_store(self, store_id):
+        idx = self.combo_store.findData(store_id)
+        if idx >= 0:
+            self.combo_store.setCurrentIndex(idx)
+
+    def suspend(self):
+        """Vista oculta en la cache de navegacion: deja de consultar el journal."""
+        self.change_poller.stop()
+
+    def resume(self):
+        """Al volver a la vista se aplica solo lo que cambio mientras estuvo oculta."""
+        self.change_poller.poll()
+        self.change_poller.start()
+
+
+class EventFeatureViewMixin(FeatureViewMixin):
+    """Vistas organizadas por evento (alquimia, tombola): snapshot, graficos y exportacion.
+
+    FEATURE es la constante de aggregates y DASHBOARD_DTO la clase del dashboard;
+    la vista debe definir ademas events_cache, current_event, combo_events,
+    all_data, analytics_panel y export_dialog.
+    """
+    FEATURE = None
+    DASHBOARD_DTO = None
+
+    def select_scope(self, event_id):
+        """Selecciona el evento dado si no es el actual (al reanudar sin snapshot)."""
+        if self.current_event and self.current_event.id == event_id:
+            return
+        idx = next((i for i, ev in enumerate(self.events_cache) if ev.id == event_id), -1)
+        if idx >= 0:
+            self.combo_events.setCurrentIndex(idx)
+
+    def session_snapshot(self, feature):
+        """(dashboard actual o None si no hay evento, tienda filtrada) para reanudar la proxima sesion."""
+        store_id = self.combo_store.currentData()
+        if not self.current_event or self.change_poller.version is None:
+            return None, store_id
+        return PrefetchedDashboardDTO(feature, self.server_id, self.current_event.id, self.change_poller.version,
+                                      events=[ev for ev in self.events_cache if not ev.archived],
+                                      dashboard=self.DASHBOARD_DTO(store_accounts=self.all_data)), store_id
+
+    def show_analytics(self):
+        """Abre (o trae al frente) los graficos del evento actual; se renderizan en segundo plano."""
+        if self.analytics_panel is None:
+            from app.container import ServiceContainer
+            from app.presentation.views.widgets.analytics_panel import AnalyticsPanel
+            self.analytics_panel = AnalyticsPanel(self.FEATURE, ServiceContainer.chart_renderer(), self)
+        self.analytics_panel.set_event(self.current_event.id if self.current_event else None)
+        self.analytics_panel.show()
+        self.analytics_panel.raise_()
+
+    def export_event(self, file_path=None):
+        """Exporta el evento actual (estados, cords y contadores) en segundo plano."""
+        if not self.current_event:
+            QMessageBox.warning(self, "Exportar", "Seleccione un evento.")
+            return None
+        if self.export_dialog is not None:
+            self.export_dialog.raise_()
+            return self.export_dialog
+        if not file_path:
+            from PyQt6.QtWidgets import QFileDialog
+            default = f"{self.current_event.name}.xlsx"
+            file_path, _ = QFileDialog.getSaveFileName(self, "Exportar evento", default, "Excel (*.xlsx);;CSV (*.csv)")
+            if not file_path:
+                return None
+        from app.container import ServiceContainer
+        from app.presentation.views.dialogs.export_dialog import ExportDialog
+        self.export_dialog = ExportDialog(ServiceContainer.export_service(), self.FEATURE,
+                                          self.current_event.id, file_path, self)
+        self.export_dialog.finished_export.connect(self.on_export_finished)
+        self.export_dialog.start()
+        return self.export_dialog
+
+    def on_export_finished(self, result):
+        self.export_dialog = None
+        if result is None:
+            QMessageBox.warning(self, "Exportar", "No se pudo exportar el evento. Revise el log.")
+        elif not result.cancelled:
+            logger.info(f"Exportacion terminada: {result.path} ({result.rows} filas)")
+
+    def refresh_analytics(self, *args):
+        """Algo cambio en el evento: los graficos revisan su version (sin render si no cambio)."""
+        if self.analytics_panel:
+            self.analytics_panel.schedule_refresh()
@@ -1,32 +1,48 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTreeView, QFrame,
                              QSplitter, QPushButton, QComboBox, QHeaderView, QAbstractItemView, QMessageBox, QInputDialog)
 from PyQt6.QtGui import QStandardItemModel
-from PyQt6.QtCore import Qt, QModelIndex, QEvent, pyqtSignal, QItemSelectionModel
+from PyQt6.QtCore import Qt, QModelIndex, QEvent, QTimer, pyqtSignal, QItemSelectionModel
 from app.application.services.fishing_service import FishingService
+from app.application.services import status_matrix
+from app.application.dtos import PrefetchedDashboardDTO
 from app.presentation.models.fishing_model import FishingModel
+from app.presentation.views.feature_view_mixin import FeatureViewMixin
 from app.presentation.delegates.fishing_grid_delegate import FishingGridDelegate
 from app.utils.feedback import FeedbackManager
 from app.utils.shortcuts import register_shortcuts
+from app.utils.change_poller import ChangePoller
+from app.utils import perf_log
 from app.utils.logger import logger
 from app.presentation.styles import AppStyles, AppColors
 import datetime
 
 
-class FishingView(QWidget):
+class FishingView(FeatureViewMixin, QWidget):
     backRequested = pyqtSignal()
 
-    def __init__(self, server_id, server_name, controller=None):
+    def __init__(self, server_id, server_name, controller=None, prefetched=None):
         super().__init__()
         self.server_id = server_id
         self.server_name = server_name
         self.controller = controller if controller else FishingService()
+        # Dashboard precargado desde la seleccion de feature (se consume una vez)
+        self.prefetched = prefetched
         self.feedback = FeedbackManager.instance()
-        self.current_year = datetime.date.today().year
+        self.current_year = prefetched.scope_id if prefetched else datetime.date.today().year
         self.all_data = [] 
+        # Estados del anio como matriz densa: el panel de progreso se calcula sobre ella
+        self.status_matrix = None
+        
+        # Refresco incremental: solo las celdas que cambiaron en otros puestos
+        self.change_poller = ChangePoller(
+            self, lambda version: self.controller.get_changes_since(self.server_id, version),
+            self.on_remote_changes
+        )
         
         self.init_ui()
         self.setup_shortcuts()
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.change_poller.start()
 
     def init_ui(self):
         main_layout = QHBoxLayout()
@@ -161,6 +177,7 @@ class FishingView(QWidget):
         
         self.model = FishingModel([], year=self.current_year, controller=self.controller)
         self.tree_view.setModel(self.model)
+        self.model.dataChanged.connect(self.on_model_data_changed)
         
         self.grid_delegate = FishingGridDelegate(self.tree_view, controller=self.controller, model=self.model)
         self.tree_view.setItemDelegateForColumn(2, self.grid_delegate)
@@ -264,8 +281,20 @@ class FishingView(QWidget):
             if next_idx.data(FishingModel.TypeRole) == "store":
                  self.move_selection_next()
 
+    @perf_log.timed('view.fishing.load_data', ids=('server_id',))
     def load_data(self):
-        self.all_data = self.controller.get_fishing_data(self.server_id, self.current_year)
+        prefetched = self._take_prefetched(self.current_year)
+        if prefetched:
+            self.change_poller.version = prefetched.version
+            self.all_data = prefetched.dashboard
+            self.status_matrix = status_matrix.build(self.all_data, status_matrix.week_columns(),
+                                                     'fishing_activity_map')
+            # Se pinta lo precargado y enseguida se reconcilia con el journal
+            QTimer.singleShot(0, self.change_poller.poll)
+        else:
+            self.change_poller.reset()
+            self.all_data, self.status_matrix = self.controller.get_fishing_data(
+                self.server_id, self.current_year, with_matrix=True)
         
         self.combo_store.blockSignals(True)
         current_store_id = self.combo_store.currentData()
@@ -283,6 +312,33 @@ class FishingView(QWidget):
         self.combo_store.blockSignals(False)
         self.apply_filter_and_set_model()
 
+    def select_scope(self, year):
+        if year != self.current_year:
+            self.combo_year.setCurrentText(str(year))
+
+    def session_snapshot(self, feature):
+        """(dashboard actual, tienda filtrada) para reanudar la proxima sesion."""
+        store_id = self.combo_store.currentData()
+        if self.change_poller.version is None:
+            return None, store_id
+        return PrefetchedDashboardDTO(feature, self.server_id, self.current_year, self.change_poller.version,
+                                      dashboard=self.all_data), store_id
+
+    def on_remote_changes(self, changes):
+        """Aplica cambios de otros puestos sin recargar todo el dashboard."""
+        self.model.apply_changes(changes)
+
+    def on_model_data_changed(self, top_left, bottom_right, roles):
+        """Cada celda que cambia en el modelo (click, burst o journal) refresca su fila de la matriz."""
+        if self.status_matrix is None:
+            return
+        parent = top_left.parent()
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            account = self.model.index(row, 0, parent).data(FishingModel.RawDataRole)
+            if account is not None and getattr(account, 'characters', None):
+                status_matrix.refresh_row(self.status_matrix, account.characters[0], 'fishing_activity_map')
+        self.update_progress_stats()
+
     def on_store_filter_changed(self, index):
         self.apply_filter_and_set_model()
         
@@ -324,25 +380,14 @@ class FishingView(QWidget):
         self.update_progress_stats()
 
     def update_progress_stats(self):
-        """Calcula y actualiza las estadísticas de progreso en el panel izquierdo."""
-        total_accounts = 0
-        completed = 0
-        failed = 0
-        pending = 0
-        
-        for store_dto in self.all_data:
-            accounts = store_dto.game_accounts
-            for acc in accounts:
-                if not acc.characters: continue
-                total_accounts += 1
-                char_dto = acc.characters[0]
-                activity = char_dto.fishing_activity_map
-                for m in range(1, 13):
-                    for w in range(1, 5):
-                        status = activity.get(f"{m}_{w}", 0)
-                        if status == 1: completed += 1
-                        elif status == -1: failed += 1
-                        else: pending += 1
+        """Actualiza las estadísticas de progreso del panel izquierdo desde la matriz del año."""
+        if self.status_matrix is None:
+            return
+        total_accounts = len(self.status_matrix.row_ids)
+        totals = status_matrix.totals(self.status_matrix)
+        completed = totals.completed
+        failed = totals.failed
+        pending = status_matrix.pending(self.status_matrix)
         
         self.lbl_total_accounts.setText(f"Cuentas: {total_accounts}")
         self.lbl_completed.setText(f"✓ Completadas: {completed}")
@@ -4,11 +4,15 @@ from PyQt6.QtCore import Qt, pyqtSignal
 class MainMenuView(QWidget):
     # Señales para navegación
     navigate_to_servers = pyqtSignal()
+    open_overview = pyqtSignal()
     open_timer = pyqtSignal()
     open_countdown = pyqtSignal()
+    resume_requested = pyqtSignal()
 
-    def __init__(self):
+    def __init__(self, resume_label=None):
         super().__init__()
+        # Texto de la ultima vista abierta; si hay, se ofrece un boton para volver directo
+        self.resume_label = resume_label
         self.init_ui()
 
     def init_ui(self):
@@ -47,6 +51,9 @@ class MainMenuView(QWidget):
         btn_servers = self.create_main_button("GESTIONAR SERVIDORES")
         btn_servers.clicked.connect(self.navigate_to_servers.emit)
         
+        btn_overview = self.create_main_button("📊 RESUMEN DE SERVIDORES")
+        btn_overview.clicked.connect(self.open_overview.emit)
+        
         
         # Tools Layout (Stopwatch + Countdown)
         tools_layout = QHBoxLayout()
@@ -61,7 +68,13 @@ class MainMenuView(QWidget):
         tools_layout.addWidget(btn_timer)
         tools_layout.addWidget(btn_countdown)
         
+        if self.resume_label:
+            btn_resume = self.create_main_button(f"▶ CONTINUAR: {self.resume_label}")
+            btn_resume.clicked.connect(self.resume_requested.emit)
+            container_layout.addWidget(btn_resume)
+        
         container_layout.addWidget(btn_servers)
+        container_layout.addWidget(btn_overview)
         container_layout.addLayout(tools_layout)
         
         layout.addWidget(container)
@@ -0,0 +1,166 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QGridLayout, QLabel, QPushButton, QTreeWidget,
+                             QTreeWidgetItem, QHeaderView)
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from app.presentation.styles import AppStyles
+from app.utils.config import Config
+
+_FEATURE_LABELS = {'alchemy': "Alquimia", 'tombola': "Tómbola", 'fishing': "Pesca"}
+_HEADERS = ["Servidor / Evento", "Cuentas", "Personajes", "Completadas", "Fallidas",
+            "Pendientes", "Progreso", "Cords", "Contadores"]
+
+
+def _progress(completed, failed, pending):
+    total = completed + failed + pending
+    return f"{completed * 100 / total:.0f}%" if total else "-"
+
+
+class OverviewView(QWidget):
+    """Resumen de todos los servidores; se refresca solo con lo que cambio."""
+    serverSelected = pyqtSignal(int, str)  # id, name
+    backRequested = pyqtSignal()
+
+    def __init__(self, controller=None, interval_ms=None):
+        super().__init__()
+        if controller is None:
+            from app.container import ServiceContainer
+            controller = ServiceContainer.overview_service()
+        self.controller = controller
+        self.overview = None
+        self.items = {}  # server_id -> (item de primer nivel, ServerOverviewDTO pintado)
+        self.init_ui()
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms or Config.CHANGE_POLL_INTERVAL_MS)
+        self.timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        self.setLayout(layout)
+
+        header_layout = QGridLayout()
+        btn_back = QPushButton("← Volver")
+        btn_back.setStyleSheet("""
+            QPushButton {
+                 background-color: transparent; color: #b0bec5;
+                 font-size: 14px; border: none; text-align: left;
+            }
+            QPushButton:hover { color: white; }
+        """)
+        btn_back.clicked.connect(self.backRequested.emit)
+
+        title = QLabel("Resumen de Servidores")
+        title.setStyleSheet("font-size: 24px; color: #d4af37; font-weight: bold;")
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.btn_refresh = QPushButton("⟳ Actualizar")
+        self.btn_refresh.setFixedWidth(110)
+        self.btn_refresh.setStyleSheet(AppStyles.BUTTON_SECONDARY)
+        self.btn_refresh.clicked.connect(self.refresh)
+
+        header_layout.addWidget(btn_back, 0, 0)
+        header_layout.addWidget(title, 0, 1)
+        header_layout.addWidget(self.btn_refresh, 0, 2)
+        layout.addLayout(header_layout)
+
+        self.lbl_status = QLabel("")
+        self.lbl_status.setStyleSheet("color: #78909c; font-size: 12px;")
+        layout.addWidget(self.lbl_status)
+
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(len(_HEADERS))
+        self.tree.setHeaderLabels(_HEADERS)
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.tree.setStyleSheet("""
+            QTreeWidget {
+                background-color: #1a1a1a;
+                border: 2px solid #5d4d2b;
+                color: #e0e0e0;
+            }
+            QHeaderView::section {
+                background-color: #2b1d0e;
+                color: #d4af37;
+                padding: 6px;
+                border: 1px solid #5d4d2b;
+                font-weight: bold;
+            }
+        """)
+        # Doble click en un servidor: abrir sus features
+        self.tree.itemDoubleClicked.connect(self.on_item_double_clicked)
+        layout.addWidget(self.tree)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.timer.start()
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        """Pide el resumen (cacheado en el servicio) y repinta solo los servidores que cambiaron."""
+        overview = self.controller.get_overview()
+        if overview is None or overview == self.overview:
+            return
+        self.overview = overview
+
+        current = {server.server_id for server in overview.servers}
+        for server_id in list(self.items):
+            if server_id not in current:
+                item, _ = self.items.pop(server_id)
+                self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(item))
+
+        for position, server in enumerate(overview.servers):
+            item, painted = self.items.get(server.server_id, (None, None))
+            if item is None:
+                item = QTreeWidgetItem()
+                item.setData(0, Qt.ItemDataRole.UserRole, server.server_id)
+                self.tree.insertTopLevelItem(position, item)
+                item.setExpanded(True)
+            elif self.tree.indexOfTopLevelItem(item) != position:
+                expanded = item.isExpanded()
+                self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(item))
+                self.tree.insertTopLevelItem(position, item)
+                item.setExpanded(expanded)
+            if painted != server:
+                self.paint_server(item, server)
+            self.items[server.server_id] = (item, server)
+
+        self.lbl_status.setText(f"{len(overview.servers)} servidores · pesca {overview.year} · "
+                                f"versión {overview.version}")
+
+    def paint_server(self, item, server):
+        features = server.features.values()
+        completed = sum(f.completed for f in features)
+        failed = sum(f.failed for f in features)
+        pending = sum(f.pending for f in features)
+        self._set_row(item, server.name, server.accounts, server.characters, completed, failed, pending,
+                      sum(f.cords for f in features), "")
+        font = item.font(0)
+        font.setBold(True)
+        item.setFont(0, font)
+
+        item.takeChildren()
+        for feature in server.features.values():
+            label = _FEATURE_LABELS.get(feature.feature, feature.feature)
+            name = f"{label}: {feature.name}" if feature.scope_id is not None else f"{label}: sin evento activo"
+            counters = ", ".join(f"{key} {value}" for key, value in sorted(feature.counters.items()))
+            child = QTreeWidgetItem()
+            self._set_row(child, name, "", feature.characters, feature.completed, feature.failed,
+                          feature.pending, feature.cords if feature.feature == 'alchemy' else "", counters)
+            item.addChild(child)
+
+    @staticmethod
+    def _set_row(item, name, accounts, characters, completed, failed, pending, cords, counters):
+        values = [name, accounts, characters, completed, failed, pending,
+                  _progress(completed, failed, pending), cords, counters]
+        for column, value in enumerate(values):
+            item.setText(column, str(value))
+            if column:
+                item.setTextAlignment(column, Qt.AlignmentFlag.AlignCenter)
+        item.setToolTip(8, counters)
+
+    def on_item_double_clicked(self, item, _column):
+        while item.parent() is not None:
+            item = item.parent()
+        self.serverSelected.emit(item.data(0, Qt.ItemDataRole.UserRole), item.text(0))
@@ -1,18 +1,15 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QTableWidget, QTableWidgetItem, QPushButton, QHeaderView, QMessageBox)
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableView,
+                             QTableWidget, QTableWidgetItem, QPushButton, QHeaderView, QMessageBox,
+                             QAbstractItemView)
 from PyQt6.QtCore import Qt
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
-from app.utils.config import Config
-from app.domain.models import TimerRecord
+from app.application.services.timer_service import TimerService
+from app.presentation.models.timer_history_model import TimerHistoryModel
 
 class TimerHistoryView(QWidget):
-    def __init__(self):
+    def __init__(self, controller=None):
         super().__init__()
-        
-        # Database setup
-        engine = create_engine(Config.get_db_url())
-        self.Session = sessionmaker(bind=engine)
+        self.controller = controller if controller else TimerService()
+        self.model = TimerHistoryModel(self.controller)
         
         self.init_ui()
         self.load_history()
@@ -38,24 +35,17 @@ class TimerHistoryView(QWidget):
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title)
         
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Nombre", "Tiempo", "Fecha", "Acciones"])
-        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
-        self.table.setStyleSheet("""
-            QTableWidget {
+        table_style = """
+            QTableView {
                 background-color: #1a1a1a;
                 border: 2px solid #5d4d2b;
                 color: #e0e0e0;
                 gridline-color: #3a3a3a;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #3d2b1f;
                 color: #d4af37;
             }
@@ -66,10 +56,33 @@ class TimerHistoryView(QWidget):
                 border: 1px solid #5d4d2b;
                 font-weight: bold;
             }
-        """)
+        """
+        
+        # Resumen por nombre (agregados calculados en SQL)
+        self.stats_table = QTableWidget()
+        self.stats_table.setColumnCount(5)
+        self.stats_table.setHorizontalHeaderLabels(["Nombre", "Veces", "Mejor", "Promedio", "Total"])
+        self.stats_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.stats_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.stats_table.verticalHeader().setVisible(False)
+        self.stats_table.setMaximumHeight(150)
+        self.stats_table.setStyleSheet(table_style)
+        layout.addWidget(self.stats_table)
+        
+        # Historial paginado: el modelo trae mas registros al llegar al final del scroll
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
+        self.table.setStyleSheet(table_style)
         layout.addWidget(self.table)
         
-        self.table.itemClicked.connect(self.on_table_item_clicked)
+        self.table.clicked.connect(self.on_table_clicked)
         
         btn_close = QPushButton("Cerrar")
         btn_close.setFixedHeight(35)
@@ -98,50 +111,32 @@ class TimerHistoryView(QWidget):
         """)
     
     def load_history(self):
-        session = self.Session()
-        try:
-            records = session.query(TimerRecord).order_by(TimerRecord.created_at.desc()).all()
-            
-            self.table.setRowCount(len(records))
-            
-            for row, record in enumerate(records):
-                name_item = QTableWidgetItem(record.name)
-                name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 0, name_item)
-                
-                time_str = self.format_time(record.elapsed_seconds)
-                time_item = QTableWidgetItem(time_str)
-                time_item.setFlags(time_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 1, time_item)
-                
-                date_str = record.created_at.strftime("%Y-%m-%d %H:%M:%S")
-                date_item = QTableWidgetItem(date_str)
-                date_item.setFlags(date_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 2, date_item)
-                
-                action_item = QTableWidgetItem("🗑 Eliminar")
-                action_item.setFlags(action_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                action_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                action_item.setForeground(Qt.GlobalColor.white)
-                action_item.setBackground(Qt.GlobalColor.darkRed)
-                action_item.setData(Qt.ItemDataRole.UserRole, record.id)
-                self.table.setItem(row, 3, action_item)
-        
-        finally:
-            session.close()
+        self.model.reload()
+        self.load_stats()
+    
+    def load_stats(self):
+        stats = self.controller.get_stats_by_name()
+        self.stats_table.setRowCount(len(stats))
+        for row, item in enumerate(stats):
+            values = [
+                item.name,
+                str(item.count),
+                self.format_time(item.best_seconds),
+                self.format_time(int(round(item.average_seconds))),
+                self.format_time(item.total_seconds),
+            ]
+            for column, value in enumerate(values):
+                self.stats_table.setItem(row, column, QTableWidgetItem(value))
     
-    def on_table_item_clicked(self, item):
-        # Check if clicked on delete column (column 3)
-        if item.column() == 3:
-            record_id = item.data(Qt.ItemDataRole.UserRole)
+    def on_table_clicked(self, index):
+        # Check if clicked on delete column
+        if index.column() == TimerHistoryModel.DELETE_COLUMN:
+            record_id = index.data(TimerHistoryModel.RecordIdRole)
             if record_id:
                 self.delete_record(record_id)
     
     def format_time(self, seconds):
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        secs = seconds % 60
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+        return TimerHistoryModel.format_time(seconds)
     
     def delete_record(self, record_id):
         # Custom styled question dialog
@@ -176,31 +171,22 @@ class TimerHistoryView(QWidget):
         """)
         
         if msg_box.exec() == QMessageBox.StandardButton.Yes:
-            session = self.Session()
-            try:
-                record = session.query(TimerRecord).filter(TimerRecord.id == record_id).first()
-                if record:
-                    session.delete(record)
-                    session.commit()
-                    
-                    # Success message
-                    success_box = QMessageBox(self)
-                    success_box.setWindowTitle("Eliminado")
-                    success_box.setText("Registro eliminado exitosamente.")
-                    success_box.setIcon(QMessageBox.Icon.Information)
-                    success_box.setStyleSheet(msg_box.styleSheet())
-                    success_box.exec()
-                    
-                    self.load_history()  # Refresh
-            except Exception as e:
-                session.rollback()
+            if self.controller.delete_record(record_id):
+                self.model.remove_record(record_id)
+                self.load_stats()
                 
+                # Success message
+                success_box = QMessageBox(self)
+                success_box.setWindowTitle("Eliminado")
+                success_box.setText("Registro eliminado exitosamente.")
+                success_box.setIcon(QMessageBox.Icon.Information)
+                success_box.setStyleSheet(msg_box.styleSheet())
+                success_box.exec()
+            else:
                 # Error message
                 error_box = QMessageBox(self)
                 error_box.setWindowTitle("Error")
-                error_box.setText(f"No se pudo eliminar: {e}")
+                error_box.setText("No se pudo eliminar el registro.")
                 error_box.setIcon(QMessageBox.Icon.Warning)
                 error_box.setStyleSheet(msg_box.styleSheet())
                 error_box.exec()
-            finally:
-                session.close()
@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTreeView, 
                              QSplitter, QPushButton, QInputDialog, QMessageBox, QComboBox,
-                             QHeaderView, QAbstractItemView, QApplication)
+                             QHeaderView, QAbstractItemView, QCheckBox, QApplication)
 from PyQt6.QtGui import QAction, QStandardItemModel, QStandardItem, QIcon, QCursor
 from PyQt6.QtCore import Qt, QModelIndex, QEvent, QTimer, pyqtSignal, QItemSelectionModel
 from app.utils.logger import logger
@@ -9,17 +9,26 @@ from app.presentation.models.tombola_model import TombolaModel
 from app.presentation.delegates.tombola_grid_delegate import TombolaGridDelegate
 from app.utils.feedback import FeedbackManager
 from app.utils.shortcuts import register_shortcuts
+from app.utils.change_poller import ChangePoller
+from app.utils import perf_log
+from app.application.services import change_log, aggregates
+from app.application.dtos import TombolaDashboardDTO
+from app.presentation.views.feature_view_mixin import EventFeatureViewMixin
 from app.presentation.styles import AppStyles
 import datetime
 
-class TombolaView(QWidget):
+class TombolaView(EventFeatureViewMixin, QWidget):
     backRequested = pyqtSignal()
+    FEATURE = aggregates.TOMBOLA
+    DASHBOARD_DTO = TombolaDashboardDTO
 
-    def __init__(self, server_id, server_name, controller=None):
+    def __init__(self, server_id, server_name, controller=None, prefetched=None):
         super().__init__()
         self.server_id = server_id
         self.server_name = server_name
         self.controller = controller if controller else TombolaService()
+        # Dashboard precargado desde la seleccion de feature (se consume una vez)
+        self.prefetched = prefetched
         self.feedback = FeedbackManager.instance()
         
         self.events_cache = []
@@ -28,10 +37,20 @@ class TombolaView(QWidget):
         
         self.tree_view = None
         self.model = None
+        # Ventana de graficos del evento (se crea al abrirla)
+        self.analytics_panel = None
+        self.export_dialog = None
+        
+        # Refresco incremental: solo las celdas que cambiaron en otros puestos
+        self.change_poller = ChangePoller(
+            self, lambda version: self.controller.get_changes_since(self.server_id, version),
+            self.on_remote_changes
+        )
         
         self.init_ui()
         self.setup_shortcuts()
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.change_poller.start()
 
     def init_ui(self):
         main_layout = QHBoxLayout()
@@ -91,11 +110,27 @@ class TombolaView(QWidget):
         self.combo_events.currentIndexChanged.connect(self.on_event_changed)
         header_right.addWidget(self.combo_events)
         
+        # Eventos archivados: se cargan bajo demanda y son de solo lectura
+        self.chk_archived = QCheckBox("Archivados")
+        self.chk_archived.setStyleSheet("color: #b0bec5;")
+        self.chk_archived.toggled.connect(self.load_events)
+        header_right.addWidget(self.chk_archived)
+        
         self.btn_new_event = QPushButton("Nueva Jornada")
         self.btn_new_event.clicked.connect(self.prompt_create_event)
         self.btn_new_event.setStyleSheet(AppStyles.BUTTON_ACCENT)
         header_right.addWidget(self.btn_new_event)
         
+        self.btn_charts = QPushButton("📈 Gráficos")
+        self.btn_charts.clicked.connect(self.show_analytics)
+        self.btn_charts.setStyleSheet(AppStyles.BUTTON_ACCENT)
+        header_right.addWidget(self.btn_charts)
+        
+        self.btn_export = QPushButton("💾 Exportar")
+        self.btn_export.clicked.connect(self.export_event)
+        self.btn_export.setStyleSheet(AppStyles.BUTTON_SECONDARY)
+        header_right.addWidget(self.btn_export)
+        
         right_layout.addLayout(header_right)
         
         # TreeView
@@ -135,6 +170,7 @@ class TombolaView(QWidget):
         
         self.model = TombolaModel([], event_id=None, controller=self.controller)
         self.tree_view.setModel(self.model)
+        self.model.dataChanged.connect(self.refresh_analytics)
         
         self.grid_delegate = TombolaGridDelegate(self.tree_view, controller=self.controller, model=self.model)
         self.tree_view.setItemDelegateForColumn(2, self.grid_delegate)
@@ -235,7 +271,11 @@ class TombolaView(QWidget):
                  self.move_selection_next()
 
     def load_events(self):
-        self.events_cache = self.controller.get_tombola_events(self.server_id)
+        if self.prefetched and not self.chk_archived.isChecked():
+            self.events_cache = self.prefetched.events
+        else:
+            self.events_cache = self.controller.get_tombola_events(
+                self.server_id, include_archived=self.chk_archived.isChecked())
         self.combo_events.blockSignals(True)
         self.combo_events.clear()
         
@@ -244,9 +284,14 @@ class TombolaView(QWidget):
             self.current_event = None
         else:
             for ev in self.events_cache:
-                self.combo_events.addItem(ev.name, ev)
-            self.combo_events.setCurrentIndex(0)
-            self.current_event = self.events_cache[0]
+                self.combo_events.addItem(f"{ev.name} (archivado)" if ev.archived else ev.name, ev)
+            # Al reanudar se abre el evento precargado, si sigue en la lista
+            selected = 0
+            if self.prefetched:
+                selected = next((i for i, ev in enumerate(self.events_cache)
+                                 if ev.id == self.prefetched.scope_id), 0)
+            self.combo_events.setCurrentIndex(selected)
+            self.current_event = self.events_cache[selected]
             if self.dashboard:
                  self.dashboard.set_event_id(self.current_event.id)
             
@@ -264,14 +309,26 @@ class TombolaView(QWidget):
         self.current_event = self.combo_events.itemData(index)
         if self.dashboard:
              self.dashboard.set_event_id(self.current_event.id if self.current_event else None)
+        if self.analytics_panel:
+            self.analytics_panel.set_event(self.current_event.id if self.current_event else None)
         self.load_data()
 
+    @perf_log.timed('view.tombola.load_data', ids=('server_id',))
     def load_data(self):
         if not self.current_event:
+            self.prefetched = None
             self.model.set_data([], None)
             return
 
-        dto = self.controller.get_tombola_dashboard_data(self.server_id, self.current_event.id)
+        prefetched = self._take_prefetched(self.current_event.id)
+        if prefetched:
+            self.change_poller.version = prefetched.version
+            dto = prefetched.dashboard
+            # Se pinta lo precargado y enseguida se reconcilia con el journal
+            QTimer.singleShot(0, self.change_poller.poll)
+        else:
+            self.change_poller.reset()
+            dto = self.controller.get_tombola_dashboard_data(self.server_id, self.current_event.id)
         self.all_data = dto.store_accounts
         
         self.combo_store.blockSignals(True)
@@ -290,6 +347,13 @@ class TombolaView(QWidget):
         self.combo_store.blockSignals(False)
         self.apply_filter_and_set_model()
 
+    def on_remote_changes(self, changes):
+        """Aplica cambios de otros puestos sin recargar todo el dashboard."""
+        self.model.apply_changes(changes)
+        self.refresh_analytics()
+        if self.dashboard and any(c.entity == change_log.TOMBOLA_COUNTER for c in changes):
+            self.dashboard.update_stats()
+
     def on_store_filter_changed(self, index):
         self.apply_filter_and_set_model()
 
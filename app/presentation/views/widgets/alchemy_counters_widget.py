@@ -256,15 +256,14 @@ class AlchemyCountersWidget(QFrame):
         self.lbl_total_cords.setText(str(total))
 
     def _update_cords_total(self):
-        """Actualiza el label de total de cords de la jornada (Legacy: Database Fetch)"""
+        """Actualiza el label de total de cords de la jornada desde los agregados"""
         if not self.controller or not self.event_id:
             self.lbl_total_cords.setText("0")
             return
             
-        # Obtener la suma de todos los cords de todas las cuentas del evento
-        cords_summary = self.controller.get_event_cords_summary(self.event_id)
-        total_cords = sum(cords_summary.values())
-        self.lbl_total_cords.setText(str(total_cords))
+        # Total materializado: lee unas pocas filas de agregados en lugar de sumar todos los registros
+        totals = self.controller.get_event_totals(self.event_id)
+        self.lbl_total_cords.setText(str(totals.cords))
 
     def load_data(self):
         """Carga los datos del evento actual"""
@@ -0,0 +1,100 @@
+from PyQt6.QtWidgets import QDialog, QGridLayout, QLabel
+from PyQt6.QtGui import QPixmap
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from app.presentation.chart_renderer import CHARTS, TITLES
+from app.utils.config import Config
+
+
+class AnalyticsPanel(QDialog):
+    """Ventana no modal con los graficos del evento.
+
+    El render ocurre en el worker del ChartRenderer; aca solo se cargan los PNG terminados.
+    Mientras esta visible se consulta la version de datos del evento y se redibuja solo si cambio.
+    """
+    rendered = pyqtSignal(object, object)  # (event_id, (version, {grafico: png}) o None)
+
+    def __init__(self, feature, renderer, parent=None, poll_interval_ms=None, debounce_ms=300):
+        super().__init__(parent)
+        self.feature = feature
+        self.renderer = renderer
+        self.event_id = None
+        self.version = None
+        self._pending = None
+        self._dirty = False
+
+        self.setWindowTitle("📈 Gráficos del evento")
+        self.setStyleSheet("background-color: #102027; color: #b0bec5;")
+        layout = QGridLayout(self)
+        self.labels = {}
+        for i, chart in enumerate(CHARTS[feature]):
+            label = QLabel(f"{TITLES[chart]}\n(cargando...)")
+            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            label.setMinimumSize(320, 200)
+            layout.addWidget(label, i // 2, i % 2)
+            self.labels[chart] = label
+
+        # Llega encolado al hilo de la UI aunque se emita desde el worker
+        self.rendered.connect(self._on_rendered)
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self.refresh)
+        self._watch = QTimer(self)
+        self._watch.setInterval(poll_interval_ms or Config.CHANGE_POLL_INTERVAL_MS)
+        self._watch.timeout.connect(self.refresh)
+
+    def set_event(self, event_id):
+        if event_id == self.event_id:
+            return
+        self.event_id = event_id
+        self.version = None
+        for chart, label in self.labels.items():
+            label.setPixmap(QPixmap())
+            label.setText(f"{TITLES[chart]}\n(cargando...)" if event_id else "Sin evento")
+        self.refresh()
+
+    def schedule_refresh(self):
+        """Hubo cambios en el evento: se revisa la version en breve (agrupa rafagas de clicks)."""
+        if self.isVisible():
+            self._debounce.start()
+
+    def refresh(self):
+        """Encola la consulta de version (y el render si hace falta). Nunca bloquea la UI."""
+        if not self.event_id:
+            return
+        if self._pending is not None and not self._pending.done():
+            self._dirty = True
+            return
+        event_id = self.event_id
+        self._pending = self.renderer.submit(self.feature, event_id)
+        self._pending.add_done_callback(lambda future: self._emit_result(event_id, future))
+
+    def _emit_result(self, event_id, future):
+        result = None if future.cancelled() or future.exception() else future.result()
+        try:
+            self.rendered.emit(event_id, result)
+        except RuntimeError:
+            pass  # el panel se cerro y se destruyo mientras renderizaba
+
+    def _on_rendered(self, event_id, result):
+        self._pending = None
+        if result is not None and event_id == self.event_id:
+            version, images = result
+            if version != self.version:
+                self.version = version
+                for chart, png in images.items():
+                    pixmap = QPixmap()
+                    pixmap.loadFromData(png, "PNG")
+                    self.labels[chart].setPixmap(pixmap)
+        if self._dirty:
+            self._dirty = False
+            self.refresh()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._watch.start()
+        self.refresh()
+
+    def hideEvent(self, event):
+        self._watch.stop()
+        super().hideEvent(event)
@@ -1,7 +1,11 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QPushButton, QScrollArea, QDialog, QTimeEdit, QFrame)
-from PyQt6.QtCore import Qt, QTimer, QPoint, QTime
+                             QPushButton, QScrollArea, QDialog, QTimeEdit, QFrame,
+                             QMenu, QInputDialog)
+from PyQt6.QtCore import Qt, QPoint, QTime, QTimer
 from PyQt6.QtGui import QMouseEvent, QColor
+from datetime import datetime, timedelta
+from app.application.dtos import CountdownTimerDTO
+from app.utils.tick_scheduler import TickScheduler
 import sys
 import os
 import logging
@@ -25,22 +29,21 @@ else:
 
 
 class SingleTimerWidget(QFrame):
-    def __init__(self, parent_manager, initial_seconds=300):
+    BLINK_MS = 500 # Blink every 500ms
+
+    def __init__(self, parent_manager, initial_seconds=300, scheduler=None):
         super().__init__()
         self.manager = parent_manager
+        self.scheduler = scheduler or TickScheduler.instance()
         self.initial_duration_ms = initial_seconds * 1000
         self.remaining_ms = self.initial_duration_ms
         self.is_running = False
         self.blink_state = False
         
-        # Timer for countdown
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_display)
-        
-        # Timer for blinking alarm
-        self.blink_timer = QTimer()
-        self.blink_timer.timeout.connect(self.blink_action)
-        self.blink_timer.setInterval(500) # Blink every 500ms
+        # Deadline en el reloj monotonico mientras corre; alarm_started_at mientras suena
+        self.deadline_ms = None
+        self.alarm_started_at = None
+        self._rendered_text = None
         
         self.init_ui()
         self.render_time()
@@ -167,44 +170,94 @@ class SingleTimerWidget(QFrame):
             self.initial_duration_ms = total_seconds * 1000
             self.remaining_ms = self.initial_duration_ms
             self.stop_alarm() # Stop any alarm if currently ringing
+            self.deadline_ms = None
             self.render_time()
+            self.notify_changed()
+
+    def notify_changed(self):
+        """Avisa al manager para que persista el estado (no se llama en cada tick)."""
+        if self.manager is not None:
+            self.manager.timer_state_changed()
+
+    def snapshot(self, now_utc=None):
+        """Estado persistible: el deadline monotonico se traduce a UTC de reloj de pared."""
+        remaining = 0 if self.is_alarming() else self.current_remaining_ms()
+        deadline_at = None
+        if self.is_running and remaining > 0:
+            now_utc = now_utc or datetime.utcnow()
+            deadline_at = now_utc + timedelta(milliseconds=remaining)
+        return CountdownTimerDTO(duration_seconds=self.initial_duration_ms // 1000,
+                                 remaining_ms=remaining, deadline_at=deadline_at)
+
+    def restore(self, dto, now_utc=None):
+        """Retoma un estado guardado; si corria, el restante sale de deadline - ahora."""
+        self.initial_duration_ms = dto.duration_seconds * 1000
+        self.remaining_ms = dto.remaining_ms
+        if dto.deadline_at is not None:
+            now_utc = now_utc or datetime.utcnow()
+            # Si vencio mientras estaba cerrado queda en 0 sin alarma (play lo recarga)
+            self.remaining_ms = max(0, int((dto.deadline_at - now_utc).total_seconds() * 1000))
+            if self.remaining_ms > 0:
+                self.deadline_ms = self.scheduler.now() + self.remaining_ms
+                self.is_running = True
+                self.scheduler.subscribe(self.on_tick, self)
+                self.btn_play.setText("⏸")
+        self.render_time()
+
+    def is_alarming(self):
+        return self.alarm_started_at is not None
 
     def toggle_play_pause(self):
-        if self.remaining_ms <= 0 and not self.blink_timer.isActive():
+        if self.remaining_ms <= 0 and not self.is_alarming():
             # If finished but not alarming (stopped manually at 0?), restart
             self.reload_timer()
             return
 
-        if self.blink_timer.isActive():
+        if self.is_alarming():
             # If alarming, stop alarm
             self.stop_alarm()
             return
 
         if self.is_running:
-            self.timer.stop()
+            self.remaining_ms = self.current_remaining_ms()
+            self.deadline_ms = None
             self.is_running = False
+            self.scheduler.unsubscribe(self.on_tick)
             self.btn_play.setText("▶")
         else:
-            self.timer.start(100) # Update every 100ms is enough for seconds
+            self.deadline_ms = self.scheduler.now() + self.remaining_ms
             self.is_running = True
+            self.scheduler.subscribe(self.on_tick, self)
             self.btn_play.setText("⏸")
+        self.notify_changed()
+
+    def current_remaining_ms(self, now=None):
+        """Tiempo restante calculado desde el deadline (no se acumulan ticks)."""
+        if not self.is_running or self.deadline_ms is None:
+            return self.remaining_ms
+        now = self.scheduler.now() if now is None else now
+        return max(0, int(self.deadline_ms - now))
 
     def reload_timer(self):
         self.stop_alarm()
-        self.timer.stop()
+        self.scheduler.unsubscribe(self.on_tick)
         self.is_running = False
+        self.deadline_ms = None
         self.remaining_ms = self.initial_duration_ms
         self.render_time()
         self.toggle_play_pause() # Auto start
 
-    def update_display(self):
-        self.remaining_ms -= 100
+    def on_tick(self, now):
+        if self.is_alarming():
+            self.update_blink(now)
+            return
+        self.remaining_ms = self.current_remaining_ms(now)
         if self.remaining_ms <= 0:
-            self.remaining_ms = 0
-            self.timer.stop()
             self.is_running = False
+            self.deadline_ms = None
             self.render_time()
-            self.start_alarm()
+            self.start_alarm(now)
+            self.notify_changed()
         else:
             self.render_time()
 
@@ -213,17 +266,28 @@ class SingleTimerWidget(QFrame):
         hours = total_seconds // 3600
         minutes = (total_seconds % 3600) // 60
         secs = total_seconds % 60
-        self.time_label.setText(f"{hours:02d}:{minutes:02d}:{secs:02d}")
+        text = f"{hours:02d}:{minutes:02d}:{secs:02d}"
+        # Solo se repinta cuando cambia el segundo mostrado
+        if text != self._rendered_text:
+            self._rendered_text = text
+            self.time_label.setText(text)
+
+    def start_alarm(self, now=None):
+        self.alarm_started_at = self.scheduler.now() if now is None else now
+        self.scheduler.subscribe(self.on_tick, self)
+        # Beep every blink
+        self.update_blink(self.alarm_started_at)
 
-    def start_alarm(self):
-        self.blink_timer.start()
-        # Play sound loop logic handled in blink_action to sync or just once
-        # User wants annoying alarm? Or just beep?
-        # Logic: Beep every blink
-        self.blink_action()
+    def update_blink(self, now):
+        """La fase del parpadeo sale del reloj; solo se cambia el estilo al pasar de fase."""
+        phase_on = int((now - self.alarm_started_at) // self.BLINK_MS) % 2 == 0
+        if phase_on != self.blink_state:
+            self.blink_action()
 
     def stop_alarm(self):
-        self.blink_timer.stop()
+        if self.is_alarming():
+            self.alarm_started_at = None
+            self.scheduler.unsubscribe(self.on_tick)
         self.blink_state = False
         
         # STOP SOUND immediately
@@ -282,18 +346,33 @@ class SingleTimerWidget(QFrame):
                 }
             """)
 
-    def delete_timer(self):
+    def halt(self):
+        """Deja de recibir ticks (al borrar el timer o cerrar la ventana)."""
         self.stop_alarm()
-        self.timer.stop()
+        self.scheduler.unsubscribe(self.on_tick)
+
+    def delete_timer(self):
+        self.halt()
         self.manager.remove_timer(self)
 
 
 class FloatingCountdown(QWidget):
-    def __init__(self):
+    # Varios cambios seguidos (agregar, play, pausa) se guardan juntos
+    PERSIST_DELAY_MS = 500
+
+    def __init__(self, controller=None, scheduler=None):
         super().__init__()
+        self.controller = controller
+        self.scheduler = scheduler
         self.timers = []
         self.dragging = False
         self.drag_position = QPoint()
+        # Evita guardar mientras se reconstruye la lista desde la DB
+        self._restoring = False
+        self._persist_timer = QTimer(self)
+        self._persist_timer.setSingleShot(True)
+        self._persist_timer.setInterval(self.PERSIST_DELAY_MS)
+        self._persist_timer.timeout.connect(self.flush_persist)
         
         self.init_ui()
 
@@ -319,6 +398,19 @@ class FloatingCountdown(QWidget):
         lbl_title.setStyleSheet("color: #d4af37; font-weight: bold; font-size: 14px;")
         header.addWidget(lbl_title)
         
+        self.btn_presets = QPushButton("📋")
+        self.btn_presets.setFixedSize(25, 25)
+        self.btn_presets.setToolTip("Presets")
+        self.btn_presets.setStyleSheet("""
+            QPushButton { background-color: transparent; color: #d4af37; font-size: 14px; border: none; }
+            QPushButton:hover { color: #ffcc00; }
+        """)
+        self.presets_menu = QMenu(self)
+        self.presets_menu.aboutToShow.connect(self.populate_presets_menu)
+        self.btn_presets.setMenu(self.presets_menu)
+        self.btn_presets.setEnabled(self.controller is not None)
+        header.addWidget(self.btn_presets)
+        
         btn_close = QPushButton("✕")
         btn_close.setFixedSize(25, 25)
         btn_close.clicked.connect(self.close)
@@ -378,22 +470,102 @@ class FloatingCountdown(QWidget):
         
         self.move_to_top_right()
         
-        # Add initial timer
-        self.add_timer()
+        self.restore_timers()
 
     def move_to_top_right(self):
         screen = self.screen().geometry()
         self.move(screen.width() - self.width() - 20, 150)
 
-    def add_timer(self):
-        timer_widget = SingleTimerWidget(self)
+    def _create_timer(self, initial_seconds=300):
+        timer_widget = SingleTimerWidget(self, initial_seconds, scheduler=self.scheduler)
         self.timers.append(timer_widget)
         self.timers_layout.addWidget(timer_widget)
+        return timer_widget
+
+    def add_timer(self):
+        timer_widget = self._create_timer()
+        self.persist()
+        return timer_widget
+
+    def _rebuild(self, dtos):
+        """Reemplaza todos los temporizadores visibles por los estados dados, sin guardar uno por uno."""
+        self._restoring = True
+        self.container.setUpdatesEnabled(False)
+        try:
+            for timer_widget in self.timers:
+                timer_widget.halt()
+                timer_widget.deleteLater()
+            self.timers = []
+            now_utc = datetime.utcnow()
+            for dto in dtos:
+                self._create_timer(dto.duration_seconds).restore(dto, now_utc)
+        finally:
+            self.container.setUpdatesEnabled(True)
+            self._restoring = False
+
+    def restore_timers(self):
+        """Reconstruye los temporizadores guardados; si no hay ninguno, arranca con uno por defecto."""
+        dtos = self.controller.get_timers() if self.controller else []
+        if dtos:
+            self._rebuild(dtos)
+        else:
+            self.add_timer()
+
+    def timer_state_changed(self):
+        self.persist()
+
+    def persist(self):
+        """Programa el guardado del estado; la escritura corre en segundo plano."""
+        if self.controller is None or self._restoring:
+            return
+        self._persist_timer.start()
+
+    def flush_persist(self):
+        """Guarda ya el estado actual fuera del hilo de la UI. Retorna el Future (o None)."""
+        self._persist_timer.stop()
+        if self.controller is None or self._restoring:
+            return None
+        # La foto se toma aca, en el hilo de la UI; el worker solo escribe
+        now_utc = datetime.utcnow()
+        return self.controller.save_timers_async([t.snapshot(now_utc) for t in self.timers])
+
+    def populate_presets_menu(self):
+        self.presets_menu.clear()
+        self.presets_menu.addAction("Guardar como preset...", self.save_preset)
+        presets = self.controller.get_presets() if self.controller else []
+        if presets:
+            self.presets_menu.addSeparator()
+            delete_menu = QMenu("Eliminar", self.presets_menu)
+            for preset in presets:
+                label = f"{preset.name} ({len(preset.durations)})"
+                self.presets_menu.addAction(label, lambda pid=preset.id: self.load_preset(pid))
+                delete_menu.addAction(label, lambda pid=preset.id: self.controller.delete_preset(pid))
+            self.presets_menu.addMenu(delete_menu)
+
+    def save_preset(self):
+        name, ok = QInputDialog.getText(self, "Guardar preset", "Nombre del grupo:")
+        if ok and name.strip():
+            self.controller.save_preset(name, [t.initial_duration_ms // 1000 for t in self.timers])
+
+    def load_preset(self, preset_id):
+        """Carga un grupo completo: una operacion masiva en la DB y una sola reconstruccion de la UI."""
+        if self.controller is None:
+            return
+        dtos = self.controller.load_preset(preset_id)
+        if dtos:
+            self._rebuild(dtos)
+
+    def closeEvent(self, event):
+        self.flush_persist()
+        for timer_widget in self.timers:
+            timer_widget.halt()
+        super().closeEvent(event)
 
     def remove_timer(self, timer_widget):
         if timer_widget in self.timers:
             self.timers.remove(timer_widget)
             timer_widget.deleteLater()
+            self.persist()
 
     # Dragging logic
     def mousePressEvent(self, event: QMouseEvent):
@@ -1,27 +1,31 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QInputDialog, QMessageBox, QDialog)
-from PyQt6.QtCore import Qt, QTimer, QPoint
+from PyQt6.QtCore import Qt, QPoint, pyqtSignal
 from PyQt6.QtGui import QMouseEvent
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
-from app.utils.config import Config
-from app.domain.models import TimerRecord
+from app.application.services.timer_service import TimerService
+from app.utils.tick_scheduler import TickScheduler
+from app.utils.logger import logger
 
 class FloatingTimer(QWidget):
-    def __init__(self):
+    # (nombre, ok): emitida desde el hilo de guardado, Qt la entrega en el hilo de la UI
+    recordSaveFinished = pyqtSignal(str, bool)
+
+    def __init__(self, controller=None, scheduler=None):
         super().__init__()
         
-        # Database setup
-        engine = create_engine(Config.get_db_url())
-        self.Session = sessionmaker(bind=engine)
+        # Persistencia via service layer (engine y pool compartidos)
+        self.controller = controller if controller else TimerService()
+        self.history_window = None
+        self.recordSaveFinished.connect(self.on_record_saved)
         
         # Timer state
         self.elapsed_ms = 0  # Track milliseconds
         self.is_running = False
         
-        # QTimer for updates
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_display)
+        # Ticks compartidos; el tiempo sale del reloj monotonico, no de contar ticks
+        self.scheduler = scheduler or TickScheduler.instance()
+        self.started_at = None
+        self._rendered_text = None
         
         # Dragging
         self.dragging = False
@@ -147,15 +151,21 @@ class FloatingTimer(QWidget):
     def toggle_play_pause(self):
         if self.is_running:
             # Pause
-            self.timer.stop()
-            self.is_running = False
-            self.btn_play.setText("▶")
+            self.pause()
         else:
             # Play
-            self.timer.start(10)  # Update every 10 milliseconds
+            self.started_at = self.scheduler.now() - self.elapsed_ms
+            self.scheduler.subscribe(self.update_display, self)
             self.is_running = True
             self.btn_play.setText("⏸")
     
+    def pause(self):
+        if self.is_running:
+            self.elapsed_ms = int(self.scheduler.now() - self.started_at)
+        self.scheduler.unsubscribe(self.update_display)
+        self.is_running = False
+        self.btn_play.setText("▶")
+    
     def stop_timer(self):
         if self.elapsed_ms == 0:
             msg_box = QMessageBox(self)
@@ -184,9 +194,8 @@ class FloatingTimer(QWidget):
             return
         
         # Stop timer
-        self.timer.stop()
-        self.is_running = False
-        self.btn_play.setText("▶")
+        self.pause()
+        self.render_elapsed()
         
         # Ask for name with custom dialog
         from app.presentation.views.dialogs.save_record_dialog import SaveRecordDialog
@@ -204,13 +213,12 @@ class FloatingTimer(QWidget):
         if dialog.exec() == QDialog.DialogCode.Accepted:
             name = dialog.get_name()
             if name:
+                # El mensaje se muestra cuando termina el guardado en segundo plano
                 self.save_record(name)
-                # Custom styled message box
-                self.show_success_message(f"Registro '{name}' guardado exitosamente.")
         
         # Reset
         self.elapsed_ms = 0
-        self.update_display()
+        self.render_elapsed()
     
     def show_success_message(self, message):
         """Show a styled success message"""
@@ -249,30 +257,45 @@ class FloatingTimer(QWidget):
         msg_box.exec()
     
     def save_record(self, name):
-        session = self.Session()
+        """Guarda el registro sin bloquear la UI."""
+        future = self.controller.save_record_async(name, self.elapsed_ms // 1000)  # Convert ms to seconds
+        future.add_done_callback(lambda f: self._emit_saved(name, f))
+
+    def _emit_saved(self, name, future):
+        ok = not future.cancelled() and future.exception() is None and future.result() is not None
         try:
-            record = TimerRecord(
-                name=name,
-                elapsed_seconds=self.elapsed_ms // 1000  # Convert ms to seconds
-            )
-            session.add(record)
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            print(f"Error saving timer record: {e}")
-        finally:
-            session.close()
+            self.recordSaveFinished.emit(name, ok)
+        except RuntimeError:
+            pass  # el cronometro se cerro y se destruyo mientras guardaba
+    
+    def on_record_saved(self, name, ok):
+        if not ok:
+            logger.error(f"No se pudo guardar el registro de cronometro '{name}'")
+            QMessageBox.warning(self, "Error", f"No se pudo guardar el registro '{name}'.")
+            return
+        if self.history_window is not None and self.history_window.isVisible():
+            self.history_window.load_history()
+        # Custom styled message box
+        self.show_success_message(f"Registro '{name}' guardado exitosamente.")
     
-    def update_display(self):
-        self.elapsed_ms += 10  # Increment by 10ms
+    def update_display(self, now=None):
+        now = self.scheduler.now() if now is None else now
+        if self.is_running:
+            self.elapsed_ms = int(now - self.started_at)
+        self.render_elapsed()
+    
+    def render_elapsed(self):
         total_seconds = self.elapsed_ms // 1000
         ms = (self.elapsed_ms % 1000) // 10  # Get centiseconds (10ms units)
         hours = total_seconds // 3600
         minutes = (total_seconds % 3600) // 60
         secs = total_seconds % 60
         
-        # Update single label
-        self.time_label.setText(f"{hours:02d}:{minutes:02d}:{secs:02d}.{ms:02d}")
+        # Update single label (solo si cambio el texto)
+        text = f"{hours:02d}:{minutes:02d}:{secs:02d}.{ms:02d}"
+        if text != self._rendered_text:
+            self._rendered_text = text
+            self.time_label.setText(text)
     
     def format_time(self, milliseconds):
         total_seconds = milliseconds // 1000
@@ -285,9 +308,13 @@ class FloatingTimer(QWidget):
     def show_history(self):
         from app.presentation.views.timer_history_view import TimerHistoryView
         # Keep reference to prevent garbage collection
-        self.history_window = TimerHistoryView()
+        self.history_window = TimerHistoryView(controller=self.controller)
         self.history_window.show()
     
+    def closeEvent(self, event):
+        self.scheduler.unsubscribe(self.update_display)
+        super().closeEvent(event)
+    
     # Drag and drop
     def mousePressEvent(self, event: QMouseEvent):
         if event.button() == Qt.MouseButton.LeftButton:
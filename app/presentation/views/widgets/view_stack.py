@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from PyQt6.QtWidgets import QStackedWidget
+from app.utils.config import Config
+from app.utils.logger import logger
+
+
+class ViewStack(QStackedWidget):
+    """Navegador de vistas: mantiene vivas las ultimas N vistas de feature con desalojo LRU.
+
+    Las vistas con clave se reutilizan al volver (sin reconstruir estilos, delegates ni
+    dashboard); las transitorias (menu, seleccion de servidor/feature) se descartan al salir.
+    Si la vista define suspend()/resume(), se llaman al ocultarla y al reactivarla.
+    """
+
+    def __init__(self, capacity=None, parent=None):
+        super().__init__(parent)
+        self.capacity = max(1, capacity or Config.VIEW_CACHE_SIZE)
+        self._cached = OrderedDict()  # clave -> vista, la mas reciente al final
+        self._transient = None
+
+    def show_view(self, key, factory):
+        """Muestra la vista de `key`, creandola con `factory()` solo si no esta en cache."""
+        view = self._cached.get(key)
+        if view is not None:
+            self._cached.move_to_end(key)
+            self._activate(view, resumed=True)
+            return view
+        view = factory()
+        self.addWidget(view)
+        self._cached[key] = view
+        self._activate(view)
+        self._evict()
+        return view
+
+    def show_transient(self, view):
+        """Muestra una vista que no se cachea; se destruye al navegar a otra."""
+        self.addWidget(view)
+        self._activate(view)
+        return view
+
+    def current_view(self):
+        return self.currentWidget()
+
+    def cached_keys(self):
+        return list(self._cached)
+
+    def _activate(self, view, resumed=False):
+        previous = self.currentWidget()
+        if previous is not None and previous is not view:
+            self._suspend(previous)
+        self.setCurrentWidget(view)
+        if previous is self._transient and previous is not view:
+            self._dispose(previous)
+        self._transient = None if view in self._cached.values() else view
+        if resumed and hasattr(view, 'resume'):
+            view.resume()
+
+    def _suspend(self, view):
+        if hasattr(view, 'suspend'):
+            view.suspend()
+
+    def _evict(self):
+        while len(self._cached) > self.capacity:
+            key, view = self._cached.popitem(last=False)
+            logger.info(f"Vista {key} desalojada de la cache")
+            self._suspend(view)
+            self._dispose(view)
+
+    def _dispose(self, view):
+        self.removeWidget(view)
+        view.deleteLater()
@@ -0,0 +1,2 @@
+from .daemon import ServiceDaemon, ResponseCache
+from .client import ServiceClient, RemoteService, RpcError, ServiceUnavailable
@@ -0,0 +1,25 @@
+"""Demonio local de servicios.
+
+Uso:
+    python -m app.service_api [--host 127.0.0.1] [--port 8765]
+
+Los puestos lo usan con SERVICE_URL=http://<host>:<puerto> en su .env.
+"""
+import argparse
+from app.service_api.daemon import ServiceDaemon
+from app.utils.config import Config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Demonio local de servicios (JSON-RPC)")
+    parser.add_argument("--host", default=Config.SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=Config.SERVICE_PORT)
+    args = parser.parse_args(argv)
+    try:
+        ServiceDaemon(host=args.host, port=args.port).serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Cliente del demonio de servicios y adaptador que reemplaza a los servicios locales en ServiceContainer.
+"""
+import http.client
+import inspect
+import itertools
+import json
+import select
+import threading
+from urllib.parse import urlsplit
+from app.service_api import codec
+from app.service_api.daemon import READ_PREFIX, TOKEN_HEADER, service_methods
+from app.utils.config import Config
+from app.utils.logger import logger
+
+
+class RpcError(Exception):
+    """El demonio respondio con un error JSON-RPC."""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class ServiceUnavailable(ConnectionError):
+    """No se pudo hablar con el demonio (caido, puerto equivocado, timeout).
+
+    `refused`: la conexion fue rechazada, asi que la llamada seguro no llego al demonio.
+    """
+
+    def __init__(self, message, refused=False):
+        super().__init__(message)
+        self.refused = refused
+
+
+class ServiceClient:
+    """JSON-RPC sobre HTTP con una conexion keep-alive por hilo."""
+
+    def __init__(self, url=None, timeout=None, token=None):
+        parts = urlsplit(url or Config.SERVICE_URL)
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or Config.SERVICE_PORT
+        self.timeout = Config.SERVICE_TIMEOUT_SECONDS if timeout is None else timeout
+        self.token = Config.SERVICE_TOKEN if token is None else token
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and conn.sock is not None and self._closed_by_peer(conn.sock):
+            # El demonio cerro la conexion inactiva: se abre otra antes de enviar nada
+            self._drop_connection()
+            conn = None
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    @staticmethod
+    def _closed_by_peer(sock):
+        """Un socket keep-alive legible sin haber pedido nada esta cerrado (EOF) o roto."""
+        try:
+            return bool(select.select([sock], [], [], 0)[0])
+        except (OSError, ValueError):
+            return True
+
+    def _drop_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _request(self, method, path, body=None, retry=False):
+        """Envia la peticion; con retry (solo lecturas) reintenta una vez si se corto la conexion.
+
+        Una escritura cortada pudo haberse aplicado en el demonio, asi que no se repite.
+        """
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers[TOKEN_HEADER] = self.token
+        for attempt in range(2 if retry else 1):
+            try:
+                conn = self._connection()
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+                if response.status != 200:
+                    raise RpcError(response.status, data.decode('utf-8', 'replace'))
+                return data
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                self._drop_connection()
+                if attempt or not retry:
+                    raise ServiceUnavailable(str(e)) from e
+            except OSError as e:
+                self._drop_connection()
+                raise ServiceUnavailable(str(e), refused=isinstance(e, ConnectionRefusedError)) from e
+
+    def call(self, method, params=None):
+        body = json.dumps({'jsonrpc': '2.0', 'id': next(self._ids), 'method': method,
+                           'params': codec.encode(params if params is not None else [])}).encode('utf-8')
+        response = json.loads(self._request('POST', '/rpc', body,
+                                            retry=method.rpartition('.')[2].startswith(READ_PREFIX)))
+        if 'error' in response:
+            raise RpcError(response['error']['code'], response['error']['message'])
+        return codec.decode(response['result'])
+
+    def health(self):
+        return json.loads(self._request('GET', '/health', retry=True))
+
+    def close(self):
+        self._drop_connection()
+
+
+class RemoteService:
+    """Misma interfaz publica que el servicio local; cada llamada va al demonio.
+
+    Si el demonio no responde y hay `fallback` (factory del servicio local), la llamada se
+    resuelve localmente contra la base: la app sigue funcionando sin el demonio. Las escrituras
+    solo se repiten localmente si la conexion fue rechazada; tras un timeout o un corte pudieron
+    haberse aplicado, asi que se propaga el ServiceUnavailable.
+    """
+
+    def __init__(self, name, service_class, client, fallback=None):
+        self._name = name
+        self._service_class = service_class
+        self._client = client
+        self._fallback = fallback
+        self._local = None
+        self._methods = service_methods(service_class)
+        self._warned = False
+
+    def _local_service(self):
+        if self._local is None:
+            self._local = self._fallback()
+        return self._local
+
+    def __getattr__(self, attr):
+        if attr.startswith('_') or attr not in self._methods:
+            raise AttributeError(attr)
+        signature = inspect.signature(getattr(self._service_class, attr))
+        method = f"{self._name}.{attr}"
+
+        def call(*args, **kwargs):
+            params = signature.bind(None, *args, **kwargs).arguments
+            params.pop(next(iter(signature.parameters)))  # self
+            try:
+                return self._client.call(method, dict(params))
+            except ServiceUnavailable as e:
+                if self._fallback is None or not (e.refused or attr.startswith(READ_PREFIX)):
+                    raise
+                if not self._warned:
+                    logger.warning(f"Demonio de servicios no disponible ({e}); usando la base directamente")
+                    self._warned = True
+                return getattr(self._local_service(), attr)(*args, **kwargs)
+
+        call.__name__ = attr
+        call.__doc__ = getattr(self._service_class, attr).__doc__
+        setattr(self, attr, call)
+        return call
@@ -0,0 +1,116 @@
+"""
+Codificacion JSON de argumentos y resultados de los servicios.
+
+Los DTOs, mapas compactos, tuplas, dicts con claves no texto, fechas, enums, matrices NumPy
+y filas ORM viajan como objetos etiquetados ({"__dto__": ...}) y se reconstruyen del otro lado.
+Solo se reconstruyen clases conocidas (DTOs del paquete dtos y enums del dominio).
+"""
+import base64
+import dataclasses
+import datetime
+import enum
+import json
+from types import SimpleNamespace
+import numpy as np
+from sqlalchemy import inspect as sa_inspect
+from app.application import dtos
+from app.domain.models import CharacterType
+
+_MAPS = (dtos.DayStatusMap, dtos.DayVersionMap, dtos.WeekStatusMap)
+_DTOS = {name: cls for name, cls in vars(dtos).items()
+         if isinstance(cls, type) and (dataclasses.is_dataclass(cls) or cls in _MAPS)}
+_ENUMS = {cls.__name__: cls for cls in (CharacterType,)}
+
+
+def encode(value):
+    """Valor Python -> estructura serializable con json."""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, enum.Enum):
+        return {'__enum__': type(value).__name__, 'name': value.name}
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, (list, set, frozenset)):
+        return [encode(v) for v in value]
+    if isinstance(value, tuple):
+        return {'__tuple__': [encode(v) for v in value]}
+    if isinstance(value, _MAPS):
+        return {'__map__': type(value).__name__, 'items': [[k, v] for k, v in value.items()]}
+    if isinstance(value, dict):
+        if all(isinstance(k, str) and not k.startswith('__') for k in value):
+            return {k: encode(v) for k, v in value.items()}
+        return {'__dict__': [[encode(k), encode(v)] for k, v in value.items()]}
+    if isinstance(value, datetime.datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {'__date__': value.isoformat()}
+    if dataclasses.is_dataclass(value) and type(value).__name__ in _DTOS:
+        return {'__dto__': type(value).__name__,
+                'fields': {f.name: encode(getattr(value, f.name)) for f in dataclasses.fields(value)}}
+    if isinstance(value, np.ndarray):
+        data = np.ascontiguousarray(value)
+        return {'__ndarray__': data.dtype.str, 'shape': list(data.shape),
+                'data': base64.b64encode(data.tobytes()).decode('ascii')}
+    if isinstance(value, np.generic):
+        return value.item()
+    state = sa_inspect(value, raiseerr=False)
+    if state is not None and getattr(state, 'mapper', None) is not None:
+        # Fila ORM (p. ej. get_servers): solo las columnas ya cargadas, sin lazy loads
+        loaded = state.dict
+        return {'__row__': type(value).__name__,
+                'fields': {attr.key: encode(loaded[attr.key]) for attr in state.mapper.column_attrs
+                           if attr.key in loaded}}
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def decode(value):
+    """Inversa de encode."""
+    if isinstance(value, list):
+        return [decode(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if '__tuple__' in value:
+        return tuple(decode(v) for v in value['__tuple__'])
+    if '__dict__' in value:
+        return {_hashable(decode(k)): decode(v) for k, v in value['__dict__']}
+    if '__map__' in value:
+        return _known(value['__map__'])({k: v for k, v in value['items']})
+    if '__dto__' in value:
+        cls = _known(value['__dto__'])
+        # Sin pasar por __init__: los campos ya llegan con su tipo final
+        obj = cls.__new__(cls)
+        for name, field_value in value['fields'].items():
+            object.__setattr__(obj, name, decode(field_value))
+        return obj
+    if '__date__' in value:
+        return datetime.date.fromisoformat(value['__date__'])
+    if '__datetime__' in value:
+        return datetime.datetime.fromisoformat(value['__datetime__'])
+    if '__enum__' in value:
+        if value['__enum__'] not in _ENUMS:
+            raise ValueError(f"Enum desconocido: {value['__enum__']}")
+        return _ENUMS[value['__enum__']][value['name']]
+    if '__ndarray__' in value:
+        data = np.frombuffer(base64.b64decode(value['data']), dtype=np.dtype(value['__ndarray__']))
+        return data.reshape(value['shape']).copy()
+    if '__row__' in value:
+        return SimpleNamespace(**{k: decode(v) for k, v in value['fields'].items()})
+    return {k: decode(v) for k, v in value.items()}
+
+
+def _known(name):
+    if name not in _DTOS:
+        raise ValueError(f"Tipo desconocido: {name}")
+    return _DTOS[name]
+
+
+def _hashable(key):
+    return tuple(_hashable(k) for k in key) if isinstance(key, (list, tuple)) else key
+
+
+def dumps(value):
+    return json.dumps(encode(value), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def loads(data):
+    return decode(json.loads(data))
@@ -0,0 +1,260 @@
+"""
+Demonio local de servicios: AlchemyService, FishingService, TombolaService y OverviewService por JSON-RPC 2.0 sobre HTTP.
+
+Todos los puestos comparten un solo proceso: un engine (un pool de conexiones) y una cache de
+respuestas de lectura. Una lectura cacheada vale mientras no cambie la version del journal
+(max id de change_log) ni venza el TTL; cualquier escritura que pasa por el demonio la vacia.
+Lecturas identicas simultaneas se resuelven con una sola consulta.
+"""
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from sqlalchemy import func
+from app.application.services.base_service import BaseService
+from app.domain.models import ChangeLog
+from app.service_api import codec
+from app.utils.config import Config
+from app.utils.logger import logger
+
+READ_PREFIX = 'get_'
+TOKEN_HEADER = 'X-Service-Token'
+
+# Codigos de error JSON-RPC
+PARSE_ERROR, INVALID_REQUEST, METHOD_NOT_FOUND, INVALID_PARAMS, SERVER_ERROR = -32700, -32600, -32601, -32602, -32000
+
+
+def default_services():
+    from app.application.services.alchemy_service import AlchemyService
+    from app.application.services.fishing_service import FishingService
+    from app.application.services.overview_service import OverviewService
+    from app.application.services.tombola_service import TombolaService
+    return {'alchemy': AlchemyService(), 'fishing': FishingService(), 'tombola': TombolaService(),
+            'overview': OverviewService()}
+
+
+def service_methods(service_class):
+    """Metodos publicos propios del servicio (sin session_scope ni el resto de BaseService)."""
+    base = set(dir(BaseService))
+    return {name for name in dir(service_class)
+            if not name.startswith('_') and name not in base and callable(getattr(service_class, name))}
+
+
+class RpcFailure(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class ResponseCache:
+    """LRU de respuestas ya codificadas, etiquetadas con la version del journal."""
+
+    def __init__(self, size=None, ttl=None, clock=time.monotonic):
+        self.size = Config.SERVICE_CACHE_SIZE if size is None else size
+        self.ttl = Config.SERVICE_CACHE_TTL_SECONDS if ttl is None else ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # clave -> (version, instante, bytes)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version or self._clock() - entry[1] > self.ttl:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key, version, data):
+        if self.size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (version, self._clock(), data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ServiceDaemon:
+    """Despacha llamadas "servicio.metodo" a las instancias compartidas y cachea las lecturas."""
+
+    def __init__(self, services=None, host=None, port=None, cache=None, token=None):
+        self.services = services if services is not None else default_services()
+        self.host = host or Config.SERVICE_HOST
+        self.port = Config.SERVICE_PORT if port is None else port
+        self.cache = cache if cache is not None else ResponseCache()
+        self.token = Config.SERVICE_TOKEN if token is None else token
+        self._methods = {f"{name}.{method}": (service, method)
+                         for name, service in self.services.items()
+                         for method in service_methods(type(service))}
+        self._inflight = {}  # clave -> Future de la primera lectura en curso
+        self._inflight_lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.calls = 0  # llamadas que llegaron a un servicio (no servidas de cache)
+
+    def data_version(self):
+        """Ultimo id del journal: si no cambio, las lecturas cacheadas siguen validas."""
+        service = next(iter(self.services.values()))
+        with service.session_scope() as session:
+            return session.query(func.max(ChangeLog.id)).scalar() or 0
+
+    def call(self, method, params):
+        """Ejecuta el metodo y retorna el resultado ya codificado (bytes JSON)."""
+        if method not in self._methods:
+            raise RpcFailure(METHOD_NOT_FOUND, f"Metodo desconocido: {method}")
+        service, name = self._methods[method]
+        raw = params if params is not None else []
+        params = codec.decode(raw)
+        args, kwargs = (params, {}) if isinstance(params, list) else ([], params)
+        try:
+            inspect.signature(getattr(service, name)).bind(*args, **kwargs)
+        except TypeError as e:
+            raise RpcFailure(INVALID_PARAMS, str(e))
+
+        if not name.startswith(READ_PREFIX):
+            result = self._invoke(service, name, args, kwargs)
+            self.cache.clear()
+            return result
+
+        key = (method, json.dumps(raw, sort_keys=True))
+        version = self.data_version()
+        cached = self.cache.get(key, version)
+        if cached is not None:
+            return cached
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._inflight[key] = Future()
+        if not owner:
+            return pending.result()
+        try:
+            result = self._invoke(service, name, args, kwargs)
+            self.cache.put(key, version, result)
+            pending.set_result(result)
+            return result
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _invoke(self, service, name, args, kwargs):
+        self.calls += 1
+        return codec.dumps(getattr(service, name)(*args, **kwargs))
+
+    def handle(self, body):
+        """Request JSON-RPC (bytes) -> respuesta JSON-RPC (bytes)."""
+        request_id = None
+        try:
+            try:
+                request = json.loads(body)
+            except ValueError:
+                raise RpcFailure(PARSE_ERROR, "JSON invalido")
+            if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+                raise RpcFailure(INVALID_REQUEST, "Request invalido")
+            request_id = request.get('id')
+            result = self.call(request['method'], request.get('params'))
+            return b''.join((b'{"jsonrpc":"2.0","id":', json.dumps(request_id).encode('utf-8'),
+                             b',"result":', result, b'}'))
+        except RpcFailure as e:
+            code, message = e.code, str(e)
+        except Exception as e:
+            logger.error(f"Error en el demonio de servicios: {e}")
+            code, message = SERVER_ERROR, str(e)
+        return json.dumps({'jsonrpc': '2.0', 'id': request_id,
+                           'error': {'code': code, 'message': message}}).encode('utf-8')
+
+    def health(self):
+        return {'status': 'ok', 'methods': len(self._methods), 'calls': self.calls,
+                'cache': {'entries': len(self.cache), 'hits': self.cache.hits, 'misses': self.cache.misses}}
+
+    def _build_server(self):
+        server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        server.daemon_threads = True
+        server.service_daemon = self
+        self.port = server.server_address[1]
+        return server
+
+    def start(self):
+        """Sirve en un hilo de fondo (tests, o embebido en otra app). Retorna la URL."""
+        self._server = self._build_server()
+        self._thread = threading.Thread(target=self._server.serve_forever, name='service-daemon', daemon=True)
+        self._thread.start()
+        logger.info(f"Demonio de servicios escuchando en {self.url}")
+        return self.url
+
+    def serve_forever(self):
+        self._server = self._build_server()
+        logger.info(f"Demonio de servicios escuchando en {self.url}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive: cada puesto reutiliza su conexion
+
+    def _reply(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self, daemon):
+        if daemon.token and self.headers.get(TOKEN_HEADER) != daemon.token:
+            self._reply(403, b'{"error":"token invalido"}')
+            return False
+        return True
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        daemon = self.server.service_daemon
+        if not self._authorized(daemon):
+            return
+        if self.path != '/rpc':
+            self._reply(404, b'{"error":"no encontrado"}')
+            return
+        self._reply(200, daemon.handle(body))
+
+    def do_GET(self):
+        daemon = self.server.service_daemon
+        if not self._authorized(daemon):
+            return
+        if self.path != '/health':
+            self._reply(404, b'{"error":"no encontrado"}')
+            return
+        self._reply(200, json.dumps(daemon.health()).encode('utf-8'))
+
+    def log_message(self, format, *args):
+        logger.debug("service_api %s - %s", self.address_string(), format % args)
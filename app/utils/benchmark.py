@@ -0,0 +1,245 @@
+"""
+Benchmarks de backend de base de datos.
+
+Uso:
+    python -m app.utils.benchmark [--accounts N] [--mysql-url URL]
+    python -m app.utils.benchmark --logging [--clicks N]
+    python -m app.utils.benchmark --memory
+
+Compara el backend SQLite embebido contra MySQL ejecutando las mismas
+operaciones del service layer (clicks de grilla, cords, carga del dashboard).
+La URL de MySQL debe apuntar a una base de datos de pruebas: el esquema se
+crea y se elimina al terminar.
+
+Con --logging mide el costo por click de la linea de log del hot path: handlers
+sincronicos con f-string (esquema anterior) contra la cola con argumentos diferidos.
+
+Con --memory mide con tracemalloc los bytes por cuenta del grafo de DTOs de un dashboard
+de Alquimia (1k/10k/50k cuentas), junto al costo que tendrian los mapas como dicts.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from app.domain.base import Base
+from app.domain.models import Server, StoreAccount, GameAccount, Character, CharacterType, AlchemyEvent
+from app.utils.db_engine import create_db_engine
+from app.utils.logger import logger
+
+
+def _seed(engine, accounts):
+    from sqlalchemy.orm import sessionmaker
+    session = sessionmaker(bind=engine)()
+    try:
+        server = Server(name="BenchServer")
+        store = StoreAccount(email="bench@store.com")
+        session.add_all([server, store])
+        session.flush()
+        event = AlchemyEvent(server_id=server.id, name="Bench", total_days=30)
+        session.add(event)
+        char_ids, account_ids = [], []
+        for i in range(accounts):
+            ga = GameAccount(username=f"bench_{i}", store_account_id=store.id, server_id=server.id)
+            session.add(ga)
+            session.flush()
+            char = Character(name=f"PJ_{i}", char_type=CharacterType.ALCHEMIST, game_account_id=ga.id)
+            session.add(char)
+            session.flush()
+            char_ids.append(char.id)
+            account_ids.append(ga.id)
+        session.commit()
+        return server.id, event.id, char_ids, account_ids
+    finally:
+        session.close()
+
+
+def _timed(fn, repeat):
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _summary(samples):
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return {"mean_ms": statistics.mean(samples), "p95_ms": p95, "n": len(samples)}
+
+
+def run_backend(url, accounts=200, clicks=200):
+    """Ejecuta el set de operaciones contra la URL dada y retorna métricas por operación."""
+    from app.application.services.alchemy_service import AlchemyService
+
+    engine = create_db_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    try:
+        server_id, event_id, char_ids, account_ids = _seed(engine, accounts)
+        service = AlchemyService.bound_to(engine)()
+
+        results = {}
+        results["update_daily_status"] = _summary(_timed(
+            lambda i: service.update_daily_status(char_ids[i % len(char_ids)], (i // len(char_ids)) + 1, 1, event_id),
+            clicks))
+        results["update_daily_cords"] = _summary(_timed(
+            lambda i: service.update_daily_cords(account_ids[i % len(account_ids)], event_id, 1, i),
+            clicks))
+        results["get_alchemy_dashboard_data"] = _summary(_timed(
+            lambda i: service.get_alchemy_dashboard_data(server_id, event_id=event_id), 10))
+        results["get_all_daily_cords"] = _summary(_timed(
+            lambda i: service.get_all_daily_cords(event_id), 10))
+        return results
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+def run_logging(clicks=2000):
+    """Costo por llamada de log en el hilo que loguea: handlers sincronicos vs cola."""
+    import io
+    import logging
+    import logging.handlers
+    import queue
+    from app.utils.logger import DeferredQueueHandler, build_handlers
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        handlers = build_handlers(os.path.join(tmp, "sync.log"), io.StringIO())
+        sync_logger = logging.getLogger("bench.sync")
+        sync_logger.propagate = False
+        for h in handlers:
+            sync_logger.addHandler(h)
+        sync_logger.setLevel(logging.INFO)
+        results["sync f-string"] = _summary(_timed(
+            lambda i: sync_logger.info(f"Cords actualizado: Account {i}, Day {i % 30} -> {i}"), clicks))
+
+        q = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(
+            q, *build_handlers(os.path.join(tmp, "queue.log"), io.StringIO()), respect_handler_level=True)
+        listener.start()
+        queue_logger = logging.getLogger("bench.queue")
+        queue_logger.propagate = False
+        queue_logger.addHandler(DeferredQueueHandler(q))
+        queue_logger.setLevel(logging.INFO)
+        results["cola %-args"] = _summary(_timed(
+            lambda i: queue_logger.info("Cords actualizado: Account %s, Day %s -> %s", i, i % 30, i), clicks))
+        # Nivel deshabilitado (LOG_LEVELS=...=WARNING): no se formatea nada
+        queue_logger.setLevel(logging.WARNING)
+        results["cola nivel apagado"] = _summary(_timed(
+            lambda i: queue_logger.info("Cords actualizado: Account %s, Day %s -> %s", i, i % 30, i), clicks))
+        listener.stop()
+
+        for lg in (sync_logger, queue_logger):
+            for h in list(lg.handlers):
+                lg.removeHandler(h)
+                h.close()
+        for h in listener.handlers:
+            h.close()
+    return results
+
+
+def build_alchemy_dashboard(accounts, days=30, accounts_per_store=50, compact=True):
+    """Grafo de DTOs de un dashboard de Alquimia con todos los dias marcados (sin base de datos).
+
+    Con compact=False los personajes guardan los mapas como dicts comunes (linea base de memoria).
+    """
+    from app.application.dtos import (
+        AlchemyDashboardDTO, AlchemyCharacterDTO, DayStatusMap, DayVersionMap,
+        GameAccountDTO, StoreAccountDTO,
+    )
+    dashboard = AlchemyDashboardDTO()
+    store = None
+    for i in range(accounts):
+        if i % accounts_per_store == 0:
+            store = StoreAccountDTO(id=len(dashboard.store_accounts) + 1, email=f"store_{i}@bench.com")
+            dashboard.store_accounts.append(store)
+        statuses, versions = (DayStatusMap(), DayVersionMap()) if compact else ({}, {})
+        for day in range(1, days + 1):
+            statuses[day] = (1, -1, 0)[(i + day) % 3]
+            versions[day] = 1 + (i + day) % 3
+        ga = GameAccountDTO(id=i + 1, username=f"bench_{i}", server_id=1, version=1)
+        character = AlchemyCharacterDTO(id=i + 1, name=f"PJ_{i}")
+        # Se asignan despues de crear el DTO para que __post_init__ no compacte los dicts
+        character.daily_status_map, character.daily_version_map = statuses, versions
+        ga.characters.append(character)
+        store.game_accounts.append(ga)
+    return dashboard
+
+
+def _traced_bytes(build):
+    """Bytes vivos que deja `build()` segun tracemalloc (el resultado se retiene durante la medicion)."""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        size = tracemalloc.get_traced_memory()[0] - before
+        del result
+        return size
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def run_memory(sizes=(1000, 10000, 50000), days=30):
+    """Bytes por cuenta del dashboard compacto y del mismo grafo con los mapas como dicts."""
+    results = {}
+    for accounts in sizes:
+        dto_bytes = _traced_bytes(lambda: build_alchemy_dashboard(accounts, days))
+        dict_bytes = _traced_bytes(lambda: build_alchemy_dashboard(accounts, days, compact=False))
+        results[accounts] = {"dto": dto_bytes / accounts, "dict_maps": dict_bytes / accounts}
+    return results
+
+
+def print_memory_report(results):
+    print("\n== memoria del dashboard (bytes por cuenta) ==")
+    print(f"{'cuentas':>10}{'DTOs':>14}{'mapas dict':>14}")
+    for accounts, m in results.items():
+        print(f"{accounts:>10}{m['dto']:>14.0f}{m['dict_maps']:>14.0f}")
+
+
+def print_report(name, results):
+    print(f"\n== {name} ==")
+    print(f"{'operacion':<30}{'media (ms)':>12}{'p95 (ms)':>12}{'n':>6}")
+    for op, m in results.items():
+        print(f"{op:<30}{m['mean_ms']:>12.2f}{m['p95_ms']:>12.2f}{m['n']:>6}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark SQLite vs MySQL")
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument("--clicks", type=int, default=200)
+    parser.add_argument("--mysql-url", default=os.getenv("BENCH_MYSQL_URL"),
+                        help="URL de una base MySQL de pruebas (o env BENCH_MYSQL_URL)")
+    parser.add_argument("--logging", action="store_true",
+                        help="Medir solo el costo de logging por click")
+    parser.add_argument("--memory", action="store_true",
+                        help="Medir solo la memoria por cuenta del grafo de DTOs")
+    args = parser.parse_args(argv)
+
+    if args.memory:
+        print_memory_report(run_memory())
+        return
+
+    if args.logging:
+        print_report("logging por click", run_logging(args.clicks * 10))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        print_report("sqlite (WAL)", run_backend(sqlite_url, args.accounts, args.clicks))
+
+    if args.mysql_url:
+        print_report("mysql", run_backend(args.mysql_url, args.accounts, args.clicks))
+    else:
+        logger.warning("BENCH_MYSQL_URL no configurada, se omite el benchmark de MySQL.")
+
+
+if __name__ == "__main__":
+    main()
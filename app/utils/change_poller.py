@@ -0,0 +1,102 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from app.utils.config import Config
+from app.utils.logger import logger
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """Worker compartido por todos los pollers: las consultas al journal no bloquean la UI."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='change-poller')
+        return _executor
+
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+class ChangePoller(QObject):
+    """Consulta periodicamente el journal de cambios y entrega solo lo nuevo a la vista.
+
+    La consulta corre en un worker; el resultado vuelve encolado al hilo de la UI.
+    """
+    fetched = pyqtSignal(int, object)  # (generacion, ChangeSetDTO o None)
+
+    def __init__(self, parent, fetch_changes, on_changes, interval_ms=None):
+        super().__init__(parent)
+        # fetch_changes(version) -> ChangeSetDTO ; on_changes(list[ChangeDTO])
+        self.fetch_changes = fetch_changes
+        self.on_changes = on_changes
+        self._version = None
+        # Cambia con cada version fijada desde afuera: descarta consultas en vuelo ya viejas
+        self._generation = 0
+        self._pending = None
+        self._dirty = False
+        self.fetched.connect(self._on_fetched)
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms or Config.CHANGE_POLL_INTERVAL_MS)
+        self.timer.timeout.connect(self.poll)
+
+    @property
+    def version(self):
+        return self._version
+
+    @version.setter
+    def version(self, value):
+        self._version = value
+        self._generation += 1
+
+    def start(self):
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def reset(self):
+        """Toma la version actual como punto de partida. Llamar antes de una carga completa.
+
+        Es sincrona: acompaña a la carga completa, que tambien lo es.
+        """
+        self.version = self.fetch_changes(None).version
+
+    def poll(self):
+        """Encola la consulta de lo posterior a la ultima version vista. Nunca bloquea la UI."""
+        if self._pending is not None and not self._pending.done():
+            self._dirty = True
+            return
+        generation, version = self._generation, self._version
+        self._pending = _get_executor().submit(self.fetch_changes, version)
+        self._pending.add_done_callback(lambda future: self._emit_result(generation, future))
+
+    def _emit_result(self, generation, future):
+        result = None
+        if not future.cancelled():
+            if future.exception() is not None:
+                logger.warning(f"No se pudo consultar el journal de cambios: {future.exception()}")
+            else:
+                result = future.result()
+        try:
+            self.fetched.emit(generation, result)
+        except RuntimeError:
+            pass  # la vista se destruyo mientras se consultaba
+
+    def _on_fetched(self, generation, change_set):
+        self._pending = None
+        if change_set is not None and generation == self._generation:
+            had_version = self._version is not None
+            self._version = change_set.version
+            if had_version and change_set.changes:
+                self.on_changes(change_set.changes)
+        if self._dirty:
+            self._dirty = False
+            self.poll()
@@ -1,15 +1,104 @@
 import os
+import socket
 from dotenv import load_dotenv
 
 load_dotenv()
 
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 class Config:
+    # Backend de base de datos: "mysql" (servidor compartido), "sqlite" (embebido, un solo puesto)
+    # o "replica" (SQLite local sincronizado en segundo plano con MySQL)
+    DB_BACKEND = os.getenv('DB_BACKEND', 'mysql').lower()
+
     DB_USER = os.getenv('DB_USER', 'root')
     DB_PASSWORD = os.getenv('DB_PASSWORD')
     DB_HOST = os.getenv('DB_HOST', 'localhost')
     DB_PORT = os.getenv('DB_PORT', '3306')
     DB_NAME = os.getenv('DB_NAME', 'metin_manager_db')
-    
+
+    # SQLite embebido
+    SQLITE_PATH = os.getenv('SQLITE_PATH', os.path.join(_ROOT_DIR, 'data', 'metinforge.db'))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', '65536'))
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+
+    # Sincronizacion de la replica local
+    CLIENT_ID = os.getenv('CLIENT_ID', socket.gethostname())
+    SYNC_INTERVAL_SECONDS = int(os.getenv('SYNC_INTERVAL_SECONDS', '15'))
+    SYNC_BATCH_SIZE = int(os.getenv('SYNC_BATCH_SIZE', '500'))
+
+    # Refresco incremental de las vistas (cambios de otros puestos)
+    CHANGE_POLL_INTERVAL_MS = int(os.getenv('CHANGE_POLL_INTERVAL_MS', '5000'))
+
+    # Logging: nivel base, niveles por logger ("MetinForge.alchemy=DEBUG,sqlalchemy.engine=INFO")
+    # y rotacion de logs/app.log por tamaño
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_LEVELS = os.getenv('LOG_LEVELS', '')
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(5 * 1024 * 1024)))
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '5'))
+
+    # Canal de performance (logs/perf.jsonl): apagado por defecto, fraccion de llamadas muestreadas
+    PERF_LOG_ENABLED = os.getenv('PERF_LOG', '0') == '1'
+    PERF_SAMPLE_RATE = float(os.getenv('PERF_SAMPLE_RATE', '1.0'))
+    PERF_LOG_PATH = os.getenv('PERF_LOG_PATH', '')
+    PERF_LOG_MAX_BYTES = int(os.getenv('PERF_LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+    PERF_LOG_BACKUP_COUNT = int(os.getenv('PERF_LOG_BACKUP_COUNT', '5'))
+
+    # Vistas de features (servidor, feature) que se mantienen vivas al navegar (LRU)
+    VIEW_CACHE_SIZE = int(os.getenv('VIEW_CACHE_SIZE', '4'))
+
+    # Precarga de dashboards desde la seleccion de feature (segundos de validez)
+    PREFETCH_TTL_SECONDS = int(os.getenv('PREFETCH_TTL_SECONDS', '30'))
+
+    # Graficos de eventos: imagenes renderizadas que se mantienen en memoria (LRU) y resolucion
+    CHART_CACHE_SIZE = int(os.getenv('CHART_CACHE_SIZE', '32'))
+    CHART_DPI = int(os.getenv('CHART_DPI', '100'))
+
+    # Exportacion de eventos: filas leidas por lote del cursor (memoria acotada)
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '1000'))
+
+    # Linea de comandos: personajes por transaccion en las marcas masivas
+    CLI_BATCH_SIZE = int(os.getenv('CLI_BATCH_SIZE', '1000'))
+
+    # Backup por servidor: filas por lote al leer/insertar y nivel de gzip (1 = mas rapido)
+    BACKUP_CHUNK_SIZE = int(os.getenv('BACKUP_CHUNK_SIZE', '2000'))
+    BACKUP_COMPRESS_LEVEL = int(os.getenv('BACKUP_COMPRESS_LEVEL', '6'))
+
+    # Resumen de servidores: recarga completa cada tantos segundos (entre medio, solo lo que cambio)
+    OVERVIEW_TTL_SECONDS = int(os.getenv('OVERVIEW_TTL_SECONDS', '60'))
+
+    # Demonio local de servicios (python -m app.service_api). Con SERVICE_URL la app lo usa en lugar
+    # de abrir su propio engine; las lecturas se cachean mientras no cambie el journal (y el TTL)
+    SERVICE_URL = os.getenv('SERVICE_URL', '')
+    SERVICE_HOST = os.getenv('SERVICE_HOST', '127.0.0.1')
+    SERVICE_PORT = int(os.getenv('SERVICE_PORT', '8765'))
+    SERVICE_TOKEN = os.getenv('SERVICE_TOKEN', '')
+    SERVICE_TIMEOUT_SECONDS = float(os.getenv('SERVICE_TIMEOUT_SECONDS', '30'))
+    SERVICE_CACHE_SIZE = int(os.getenv('SERVICE_CACHE_SIZE', '256'))
+    SERVICE_CACHE_TTL_SECONDS = float(os.getenv('SERVICE_CACHE_TTL_SECONDS', '5'))
+
+    # Reanudacion: ultima vista abierta y snapshot local de su dashboard
+    SESSION_STATE_PATH = os.getenv('SESSION_STATE_PATH', os.path.join(_ROOT_DIR, 'data', 'session.json'))
+    SNAPSHOT_PATH = os.getenv('SNAPSHOT_PATH', os.path.join(_ROOT_DIR, 'data', 'last_dashboard.snapshot'))
+    RESUME_ON_START = os.getenv('RESUME_ON_START', '0') == '1'
+
+    # Almacenamiento disperso (opcional): un estado 0 (pendiente) borra la fila en lugar de guardarla
+    SPARSE_ACTIVITIES = os.getenv('SPARSE_ACTIVITIES', '0') == '1'
+
+    # Archivo de eventos finalizados (dias de gracia tras el ultimo dia y filas borradas por lote)
+    ARCHIVE_GRACE_DAYS = int(os.getenv('ARCHIVE_GRACE_DAYS', '7'))
+    ARCHIVE_CHUNK_SIZE = int(os.getenv('ARCHIVE_CHUNK_SIZE', '1000'))
+
+    @staticmethod
+    def uses_local_replica():
+        return Config.DB_BACKEND == 'replica'
+
     @staticmethod
     def get_db_url():
+        if Config.DB_BACKEND in ('sqlite', 'replica'):
+            return f"sqlite:///{Config.SQLITE_PATH}"
+        return Config.get_mysql_url()
+
+    @staticmethod
+    def get_mysql_url():
         return f"mysql+pymysql://{Config.DB_USER}:{Config.DB_PASSWORD}@{Config.DB_HOST}:{Config.DB_PORT}/{Config.DB_NAME}"
@@ -0,0 +1,49 @@
+import os
+from sqlalchemy import create_engine, event
+from app.utils.config import Config
+
+
+def engine_options(url):
+    """Argumentos de create_engine adecuados para el dialecto de la URL."""
+    if url.startswith("sqlite"):
+        # El engine se comparte entre el hilo de la GUI y los workers
+        return {"connect_args": {"check_same_thread": False}}
+    return {"pool_recycle": 3600}
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        # Valor negativo = tamaño en KiB en lugar de paginas
+        cursor.execute(f"PRAGMA cache_size=-{int(Config.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute(f"PRAGMA mmap_size={int(Config.SQLITE_MMAP_SIZE)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA foreign_keys=ON")
+    finally:
+        cursor.close()
+
+
+def configure_engine(engine):
+    """Registra los pragmas de conexion si el engine es SQLite."""
+    if getattr(getattr(engine, "dialect", None), "name", None) == "sqlite":
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+    return engine
+
+
+def _ensure_sqlite_dir(url):
+    path = url.split("///", 1)[1] if "///" in url else ""
+    if path and path != ":memory:":
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+
+def create_db_engine(url=None, **kwargs):
+    """Crea un engine para la URL (por defecto la de Config) con el tuning del dialecto."""
+    url = url or Config.get_db_url()
+    if url.startswith("sqlite"):
+        _ensure_sqlite_dir(url)
+    options = engine_options(url)
+    options.update(kwargs)
+    return configure_engine(create_engine(url, **options))
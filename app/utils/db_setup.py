@@ -1,12 +1,85 @@
-from sqlalchemy import create_engine
-from app.utils.config import Config
+from sqlalchemy import inspect, text, UniqueConstraint
+from app.utils.db_engine import create_db_engine
 from app.domain.base import Base
 from app.domain.models import StoreAccount, GameAccount, Character, DailyCorActivity, DailyCorRecord, AlchemyCounter
 from app.utils.logger import logger
 
+# Tablas de celdas donde un duplicado es una copia de la misma celda: se conserva la ultima fila
+_DEDUPLICATED_TABLES = {'daily_cor_activities', 'tombola_activities', 'fishing_activities', 'daily_cor_records'}
+
+def _drop_duplicates(conn, table, columns):
+    """Borra las filas repetidas por `columns` dejando la de mayor id. Retorna cuantas borro."""
+    cols = ", ".join(columns)
+    # Tabla derivada: MySQL no permite leer en un subquery la tabla de la que se borra
+    return conn.execute(text(
+        f"DELETE FROM {table} WHERE id NOT IN "
+        f"(SELECT id FROM (SELECT MAX(id) AS id FROM {table} GROUP BY {cols}) AS keep)"
+    )).rowcount
+
+def _has_duplicates(conn, table, columns):
+    cols = ", ".join(columns)
+    return conn.execute(text(
+        f"SELECT 1 FROM {table} GROUP BY {cols} HAVING COUNT(*) > 1 LIMIT 1"
+    )).first() is not None
+
+def _create_unique_constraints(conn, inspector, table, present_indexes):
+    """Crea como indice unico cada UniqueConstraint del modelo que falte en la tabla."""
+    present = present_indexes | {u['name'] for u in inspector.get_unique_constraints(table.name)}
+    for constraint in table.constraints:
+        if not isinstance(constraint, UniqueConstraint) or not constraint.name or constraint.name in present:
+            continue
+        columns = [c.name for c in constraint.columns]
+        if table.name in _DEDUPLICATED_TABLES:
+            removed = _drop_duplicates(conn, table.name, columns)
+            if removed:
+                logger.warning(f"{removed} filas duplicadas borradas de {table.name}; "
+                               f"recalcular agregados con python -m scripts.rebuild_aggregates")
+        elif _has_duplicates(conn, table.name, columns):
+            logger.error(f"{table.name} tiene filas repetidas por ({', '.join(columns)}): "
+                         f"no se crea {constraint.name}")
+            continue
+        conn.execute(text(f"CREATE UNIQUE INDEX {constraint.name} ON {table.name} ({', '.join(columns)})"))
+        logger.info(f"Restriccion unica creada: {constraint.name}")
+
+def upgrade_schema(engine):
+    """Agrega a las tablas existentes las columnas, indices y restricciones unicas nuevas del modelo.
+
+    create_all no altera tablas existentes.
+
+    Retorna la cantidad de columnas agregadas.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    added = 0
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            present = {c['name'] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in present:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(engine.dialect)}"
+                if column.server_default is not None:
+                    ddl += f" NOT NULL DEFAULT {column.server_default.arg}"
+                elif not column.nullable:
+                    logger.warning(f"Columna {table.name}.{column.name} sin default, se omite la migracion.")
+                    continue
+                conn.execute(text(ddl))
+                added += 1
+                logger.info(f"Columna agregada: {table.name}.{column.name}")
+            present_indexes = {i['name'] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in present_indexes:
+                    index.create(conn)
+                    logger.info(f"Indice creado: {index.name}")
+            _create_unique_constraints(conn, inspector, table, present_indexes)
+    return added
+
 def init_db():
-    engine = create_engine(Config.get_db_url())
+    engine = create_db_engine()
     Base.metadata.create_all(engine)
+    upgrade_schema(engine)
     logger.info("Base de datos inicializada correctamente.")
 
 if __name__ == "__main__":
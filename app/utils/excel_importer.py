@@ -2,6 +2,7 @@ import csv
 import os
 from typing import Dict, List, Any
 from app.utils.logger import logger
+from app.utils import perf_log
 
 try:
     import openpyxl
@@ -9,6 +10,8 @@ try:
 except ImportError:
     HAS_OPENPYXL = False
 
+@perf_log.timed('import.parse', ids=('file_path',),
+                rows=lambda data: len(data) if isinstance(data, list) else len(data.get('characters', [])))
 def parse_account_file(file_path: str) -> Dict[str, Any]:
     """
     Parsea un archivo Excel (.xlsx) o CSV (.csv) con datos de cuentas y personajes.
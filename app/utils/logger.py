@@ -1,39 +1,125 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 from datetime import datetime
+from app.utils.config import Config
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "logs")
+FORMAT = '%(asctime)s | %(levelname)-8s | [%(name)s] %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Una sola cola y un solo hilo escritor para todos los loggers de la app
+_queue = None
+_listener = None
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Encola el record sin formatear: el %-formato y la escritura ocurren en el hilo del listener.
+
+    La cola es en memoria (no se serializa), asi que no hace falta preparar el record; los
+    argumentos deben ser valores que no cambien despues de la llamada (ids, textos, numeros).
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def build_handlers(log_path=None, stream=None):
+    """Handlers reales (consola + archivo rotado por tamaño) que corren detras de la cola."""
+    formatter = logging.Formatter(FORMAT, datefmt=DATE_FORMAT)
+    handlers = []
+
+    ch = logging.StreamHandler(stream or sys.stdout)
+    ch.setFormatter(formatter)
+    handlers.append(ch)
+
+    try:
+        log_path = log_path or os.path.join(LOG_DIR, "app.log")
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        fh = logging.handlers.RotatingFileHandler(
+            log_path, maxBytes=Config.LOG_MAX_BYTES, backupCount=Config.LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+        fh.setFormatter(formatter)
+        handlers.append(fh)
+
+        fh.stream.write("\n" + "█" * 80 + "\n")
+        fh.stream.write(f"  METINFORGE SESSION STARTED: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        fh.stream.write("█" * 80 + "\n\n")
+
+    except Exception as e:
+        print(f"Failed to setup file logging: {e}")
+
+    return handlers
+
+
+def parse_level(value):
+    """'debug' -> logging.DEBUG; None si no es un nivel valido."""
+    level = logging.getLevelName((value or '').strip().upper())
+    return level if isinstance(level, int) else None
+
+
+def parse_levels(spec, invalid=None):
+    """'MetinForge.alchemy=DEBUG,sqlalchemy.engine=INFO' -> {nombre: nivel}.
+
+    Ignora entradas invalidas; si se pasa la lista invalid, se agregan ahi para avisarlas.
+    """
+    levels = {}
+    for item in (spec or '').split(','):
+        if not item.strip():
+            continue
+        name, _, level = item.partition('=')
+        level = parse_level(level)
+        if name.strip() and level is not None:
+            levels[name.strip()] = level
+        elif invalid is not None:
+            invalid.append(item.strip())
+    return levels
+
+
+def _start_listener(invalid=None):
+    global _queue, _listener
+    if _listener is None:
+        _queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(_queue, *build_handlers(), respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        for name, level in parse_levels(Config.LOG_LEVELS, invalid).items():
+            logging.getLogger(name).setLevel(level)
+    return _queue
+
+
+def shutdown_logging():
+    """Vacia la cola y detiene el hilo escritor (al salir de la aplicacion)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
 def setup_logger(name="MetinForge"):
     logger = logging.getLogger(name)
     if not logger.handlers:
-        logger.setLevel(logging.INFO)
-        formatter = logging.Formatter(
-            '%(asctime)s | %(levelname)-8s | [%(name)s] %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        
-        ch = logging.StreamHandler(sys.stdout)
-        ch.setFormatter(formatter)
-        logger.addHandler(ch)
-        
-        try:
-            log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "logs")
-            os.makedirs(log_dir, exist_ok=True)
-            fh = logging.FileHandler(os.path.join(log_dir, "app.log"), encoding='utf-8')
-            fh.setFormatter(formatter)
-            logger.addHandler(fh)
-            
-            fh.stream.write("\n" + "█" * 80 + "\n")
-            fh.stream.write(f"  METINFORGE SESSION STARTED: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            fh.stream.write("█" * 80 + "\n\n")
-            
-        except Exception as e:
-            print(f"Failed to setup file logging: {e}")
-            
+        # Un nivel mal escrito en el .env no debe impedir que arranque la app
+        level = parse_level(Config.LOG_LEVEL)
+        logger.setLevel(level if level is not None else logging.INFO)
+        invalid = []
+        logger.addHandler(DeferredQueueHandler(_start_listener(invalid)))
+        if level is None:
+            logger.warning(f"LOG_LEVEL invalido ({Config.LOG_LEVEL!r}), se usa INFO")
+        if invalid:
+            logger.warning(f"LOG_LEVELS: entradas invalidas ignoradas: {', '.join(invalid)}")
+
     return logger
 
 
+def get_logger(module):
+    """Logger hijo de MetinForge (hereda sus handlers); su nivel se ajusta con LOG_LEVELS."""
+    return logging.getLogger(f"MetinForge.{module}")
+
+
 logger = setup_logger()
 
 
@@ -0,0 +1,169 @@
+"""Canal estructurado de performance: una linea JSON por operacion medida en logs/perf.jsonl.
+
+Cada registro lleva operacion, ids relevantes, filas, duracion (ms) y cantidad de queries SQL
+ejecutadas en el hilo durante la medicion. Se muestrea con PERF_SAMPLE_RATE y se escribe desde
+un hilo aparte, igual que el log de texto. Analisis offline: python -m scripts.analyze_perf
+"""
+import atexit
+import functools
+import inspect
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+from app.utils.config import Config
+from app.utils.logger import LOG_DIR, DeferredQueueHandler
+
+_local = threading.local()
+_listener = None
+_perf_logger = None
+
+
+class JsonLineFormatter(logging.Formatter):
+    """El record trae un dict en msg; se serializa recien en el hilo escritor."""
+
+    def format(self, record):
+        return json.dumps(record.msg, default=str, ensure_ascii=False)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    _local.queries = getattr(_local, 'queries', 0) + 1
+
+
+def _query_count():
+    return getattr(_local, 'queries', 0)
+
+
+def _get_logger():
+    global _listener, _perf_logger
+    if _perf_logger is None:
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+        event.listen(Engine, "before_cursor_execute", _count_query)
+
+        path = Config.PERF_LOG_PATH or os.path.join(LOG_DIR, "perf.jsonl")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=Config.PERF_LOG_MAX_BYTES, backupCount=Config.PERF_LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+        handler.setFormatter(JsonLineFormatter())
+        perf_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(perf_queue, handler)
+        _listener.start()
+        atexit.register(shutdown)
+
+        perf_logger = logging.getLogger("MetinForge.perf")
+        perf_logger.propagate = False  # no mezclar con app.log
+        perf_logger.setLevel(logging.INFO)
+        perf_logger.addHandler(DeferredQueueHandler(perf_queue))
+        _perf_logger = perf_logger
+    return _perf_logger
+
+
+def shutdown():
+    """Vacia la cola, cierra el archivo y desregistra el contador de queries."""
+    global _listener, _perf_logger
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    if _perf_logger is not None:
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+        event.remove(Engine, "before_cursor_execute", _count_query)
+        for handler in list(_perf_logger.handlers):
+            _perf_logger.removeHandler(handler)
+        _perf_logger = None
+
+
+def _sampled():
+    if not Config.PERF_LOG_ENABLED or random.random() >= Config.PERF_SAMPLE_RATE:
+        return False
+    _get_logger()  # registra el contador de queries antes de la primera medicion
+    return True
+
+
+def record(operation, duration_ms, queries=None, **fields):
+    """Escribe un registro ya medido (sin muestreo)."""
+    entry = {'ts': datetime.now().isoformat(timespec='milliseconds'), 'op': operation,
+             'ms': round(duration_ms, 3)}
+    if queries is not None:
+        entry['queries'] = queries
+    entry.update(fields)
+    _get_logger().info(entry)
+
+
+class measure:
+    """Context manager que mide un bloque. Campos extra (p. ej. rows) se agregan a `fields`.
+
+        with perf_log.measure("import.excel", server_id=1) as fields:
+            fields['rows'] = len(data)
+    """
+
+    def __init__(self, operation, **fields):
+        self.operation = operation
+        self.fields = fields
+        self.active = False
+
+    def __enter__(self):
+        self.active = _sampled()
+        if self.active:
+            self._queries = _query_count()
+            self._start = time.perf_counter()
+        return self.fields
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.active:
+            duration = (time.perf_counter() - self._start) * 1000
+            if exc_type is not None:
+                self.fields['error'] = exc_type.__name__
+            record(self.operation, duration, _query_count() - self._queries, **self.fields)
+        return False
+
+
+def timed(operation, ids=(), rows=None):
+    """Decorador: mide la llamada si toca muestrearla.
+
+    `ids` son nombres de argumentos (o atributos de self) a registrar; `rows(resultado)`
+    retorna la cantidad de filas a registrar.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _sampled():
+                return fn(*args, **kwargs)
+            queries = _query_count()
+            start = time.perf_counter()
+            result = fn(*args, **kwargs)
+            duration = (time.perf_counter() - start) * 1000
+            fields = {}
+            if ids:
+                bound = signature.bind_partial(*args, **kwargs).arguments
+                owner = bound.get('self')
+                for name in ids:
+                    fields[name] = bound[name] if name in bound else getattr(owner, name, None)
+            if rows is not None:
+                try:
+                    fields['rows'] = rows(result)
+                except Exception:
+                    fields['rows'] = None
+            record(operation, duration, _query_count() - queries, **fields)
+            return result
+        return wrapper
+    return decorator
+
+
+def count_accounts(dashboard):
+    """Filas (cuentas) de un dashboard: DTO con store_accounts, lista de tiendas o (tiendas, matriz)."""
+    if isinstance(dashboard, tuple):
+        dashboard = dashboard[0]
+    stores = getattr(dashboard, 'store_accounts', dashboard) or []
+    return sum(len(store.game_accounts) for store in stores)
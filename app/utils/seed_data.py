@@ -1,14 +1,15 @@
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.utils.config import Config
+from app.utils.db_engine import create_db_engine
 from app.domain.models import Base, StoreAccount, GameAccount, Character, DailyCorActivity, DailyCorRecord, CharacterType, Server, AlchemyEvent
 import datetime
 import random
 
 from app.utils.logger import logger
+from app.application.services import aggregates
 
 def seed():
-    engine = create_engine(Config.get_db_url())
+    engine = create_db_engine()
     Session = sessionmaker(bind=engine)
 
     logger.info("Iniciando Seeding (Reset completo)...")
@@ -109,6 +110,9 @@ def seed():
                         ))
 
     try:
+        session.flush()
+        # Los inserts directos no pasan por los services: recalcular agregados
+        aggregates.rebuild(session)
         session.commit()
         logger.info("Datos de prueba insertados exitosamente.")
     except Exception as e:
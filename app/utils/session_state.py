@@ -0,0 +1,83 @@
+"""Estado de la ultima sesion (servidor, feature, evento/anio, filtro de tienda) y snapshot del dashboard.
+
+Ambos son archivos locales del puesto: permiten abrir directo en la ultima vista y pintarla
+antes de tocar la base; los cambios posteriores los trae el poller desde la version del snapshot.
+"""
+import json
+import os
+from dataclasses import dataclass, asdict
+from typing import Optional
+from app.utils.config import Config
+from app.utils.logger import logger
+
+# Se incrementa si cambia la forma de los DTOs: un snapshot viejo simplemente se ignora
+SNAPSHOT_FORMAT = 4
+
+
+@dataclass
+class SessionState:
+    server_id: int
+    server_name: str
+    feature: str
+    # Evento (o anio, en pesca) y tienda filtrada
+    scope_id: Optional[int] = None
+    store_id: Optional[int] = None
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def save_state(state, path=None):
+    try:
+        _write_atomic(path or Config.SESSION_STATE_PATH, json.dumps(asdict(state)).encode('utf-8'))
+    except Exception as e:
+        logger.warning(f"No se pudo guardar el estado de la sesion: {e}")
+
+
+def load_state(path=None):
+    """Retorna el SessionState guardado, o None si no hay (o no se puede leer)."""
+    path = path or Config.SESSION_STATE_PATH
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return SessionState(**json.load(f))
+    except Exception as e:
+        logger.warning(f"Estado de sesion invalido, se ignora: {e}")
+        return None
+
+
+def save_snapshot(dto, path=None):
+    """Guarda el dashboard (PrefetchedDashboardDTO) de la vista activa, en JSON con los DTOs etiquetados."""
+    from app.service_api import codec
+    try:
+        _write_atomic(path or Config.SNAPSHOT_PATH,
+                      json.dumps({'format': SNAPSHOT_FORMAT, 'dashboard': codec.encode(dto)}).encode('utf-8'))
+    except Exception as e:
+        logger.warning(f"No se pudo guardar el snapshot del dashboard: {e}")
+
+
+def load_snapshot(state, path=None):
+    """Retorna el snapshot si corresponde a la sesion (servidor, feature, evento/anio), o None."""
+    from app.service_api import codec
+    path = path or Config.SNAPSHOT_PATH
+    if state is None or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('format') != SNAPSHOT_FORMAT:
+            return None
+        # Solo se reconstruyen DTOs conocidos (ver codec)
+        dto = codec.decode(data['dashboard'])
+    except Exception as e:
+        logger.warning(f"Snapshot del dashboard invalido, se ignora: {e}")
+        return None
+    if (dto.server_id, dto.feature, dto.scope_id) != (state.server_id, state.feature, state.scope_id):
+        return None
+    return dto
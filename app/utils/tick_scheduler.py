@@ -0,0 +1,62 @@
+import time
+from PyQt6.QtCore import QTimer
+
+
+class TickScheduler:
+    """Un unico QTimer que despierta a todos los cronometros y temporizadores abiertos.
+
+    Los suscriptores calculan su tiempo desde deadlines del reloj monotonico (no acumulan
+    ticks), asi que bajar la frecuencia mientras estan ocultos o minimizados no los desfasa.
+    """
+
+    FRAME_MS = 33    # ~30 repintados por segundo mientras algun suscriptor esta visible
+    IDLE_MS = 1000   # oculto o minimizado: alcanza con detectar vencimientos
+
+    _instance = None
+
+    def __init__(self, clock=None):
+        self._clock = clock or (lambda: time.monotonic() * 1000)
+        self._subscribers = {}  # callback -> widget (para saber si esta visible)
+        self.timer = QTimer()
+        self.timer.setInterval(self.FRAME_MS)
+        self.timer.timeout.connect(self.tick)
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def now(self):
+        """Milisegundos del reloj monotonico."""
+        return self._clock()
+
+    def subscribe(self, callback, widget=None):
+        """callback(now_ms) se llama una vez por frame hasta desuscribirse."""
+        self._subscribers[callback] = widget
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def unsubscribe(self, callback):
+        self._subscribers.pop(callback, None)
+        if not self._subscribers:
+            self.timer.stop()
+
+    def is_subscribed(self, callback):
+        return callback in self._subscribers
+
+    @staticmethod
+    def _is_shown(widget):
+        if widget is None:
+            return True
+        window = widget.window()
+        return widget.isVisible() and not window.isMinimized()
+
+    def tick(self):
+        now = self.now()
+        for callback in list(self._subscribers):
+            if callback in self._subscribers:
+                callback(now)
+        interval = self.FRAME_MS if any(self._is_shown(w) for w in self._subscribers.values()) else self.IDLE_MS
+        if self.timer.interval() != interval:
+            self.timer.setInterval(interval)
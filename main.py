@@ -2,13 +2,16 @@ import sys
 from PyQt6.QtWidgets import QApplication, QMainWindow
 from qt_material import apply_stylesheet
 
-from app.presentation.views.alchemy_view import AlchemyView
 from app.presentation.views.server_selection_view import ServerSelectionView
 from app.presentation.views.main_menu_view import MainMenuView
+from app.presentation.views.widgets.view_stack import ViewStack
 import os
 
 from app.utils.logger import logger
+from app.utils.config import Config
 from app.container import ServiceContainer
+from app.presentation import feature_registry
+from app.utils import session_state, change_poller
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -20,65 +23,117 @@ class MainWindow(QMainWindow):
         self.timer_window = None  # Floating timer reference
         self.countdown_window = None # Floating countdown reference
         
+        # Las vistas de feature quedan vivas por (servidor, feature) al navegar
+        self.view_stack = ViewStack()
+        self.setCentralWidget(self.view_stack)
+        
+        # Ultima vista abierta (servidor, feature, evento/anio, tienda), guardada en disco
+        self.session = session_state.load_state()
+        
         self.show_main_menu()
+        if Config.RESUME_ON_START and self.session:
+            self.resume_session()
+    
+    def current_view(self):
+        return self.view_stack.current_view()
     
     
     def show_main_menu(self):
-        self.menu_view = MainMenuView()
+        spec = feature_registry.get(self.session.feature) if self.session else None
+        resume_label = f"{self.session.server_name} · {spec.title.splitlines()[0]}" if spec else None
+        self.menu_view = MainMenuView(resume_label=resume_label)
+        self.menu_view.resume_requested.connect(self.resume_session)
         self.menu_view.navigate_to_servers.connect(self.show_server_selection)
+        self.menu_view.open_overview.connect(self.show_overview)
         self.menu_view.open_timer.connect(self.show_timer)
         self.menu_view.open_countdown.connect(self.show_countdown)
-        self.setCentralWidget(self.menu_view)
+        self.view_stack.show_transient(self.menu_view)
 
     def show_server_selection(self):
         self.selection_view = ServerSelectionView()
         self.selection_view.serverSelected.connect(self.show_feature_selection)
         self.selection_view.backRequested.connect(self.show_main_menu)
-        self.setCentralWidget(self.selection_view)
+        self.view_stack.show_transient(self.selection_view)
+
+    def show_overview(self):
+        from app.presentation.views.overview_view import OverviewView
+        self.overview_view = OverviewView(controller=ServiceContainer.overview_service())
+        self.overview_view.serverSelected.connect(self.show_feature_selection)
+        self.overview_view.backRequested.connect(self.show_main_menu)
+        self.view_stack.show_transient(self.overview_view)
 
     def show_feature_selection(self, server_id, server_name):
+        self.remember_session()
         # Obtener flags del servidor
         service = ServiceContainer.alchemy_service()
         flags = service.get_server_flags(server_id)
+        # El proximo click casi siempre es una feature: se precargan los dashboards no cacheados
+        cached = {feature for sid, feature in self.view_stack.cached_keys() if sid == server_id}
+        ServiceContainer.prefetcher().prefetch(server_id, {
+            spec.flag: True for spec in feature_registry.enabled_features(flags) if spec.key not in cached
+        })
         
         from app.presentation.views.feature_selection_view import FeatureSelectionView
         self.feature_view = FeatureSelectionView(server_name, flags)
         self.feature_view.featureSelected.connect(lambda feature: self.on_feature_selected(feature, server_id, server_name))
         self.feature_view.backRequested.connect(self.show_server_selection)
-        self.setCentralWidget(self.feature_view)
+        self.view_stack.show_transient(self.feature_view)
 
     def on_feature_selected(self, feature, server_id, server_name):
-        if feature == "dailies":
-            self.show_alchemy(server_id, server_name)
-        elif feature == "fishing":
-            self.show_fishing(server_id, server_name)
-        elif feature == "tombola":
-            self.show_tombola(server_id, server_name)
-        else:
+        spec = feature_registry.get(feature)
+        if spec is None:
             logger.warning(f"Feature {feature} not implemented yet.")
+            return
+        self.show_feature(spec, server_id, server_name)
 
-    def show_fishing(self, server_id, server_name):
-        from app.presentation.views.fishing_view import FishingView
-        self.fishing_view = FishingView(server_id, server_name, controller=ServiceContainer.fishing_service())
-        self.fishing_view.backRequested.connect(lambda: self.show_feature_selection(server_id, server_name))
-        self.setCentralWidget(self.fishing_view)
-
-    def show_alchemy(self, server_id, server_name):
-        self.alchemy_view = AlchemyView(server_id, server_name, controller=ServiceContainer.alchemy_service())
-        # Volver al menu de features, no a seleccion de server
-        self.alchemy_view.backRequested.connect(lambda: self.show_feature_selection(server_id, server_name))
-        self.setCentralWidget(self.alchemy_view)
-    
-    def show_tombola(self, server_id, server_name):
-        from app.presentation.views.tombola_view import TombolaView
-        self.tombola_view = TombolaView(server_id, server_name, controller=ServiceContainer.tombola_service())
-        self.tombola_view.backRequested.connect(lambda: self.show_feature_selection(server_id, server_name))
-        self.setCentralWidget(self.tombola_view)
+    def show_feature(self, spec, server_id, server_name, prefetched=None):
+        """Reutiliza la vista cacheada de (servidor, feature) o la crea la primera vez."""
+        def build():
+            view_class = spec.load_view_class()  # import diferido al primer uso
+            view = view_class(server_id, server_name,
+                              controller=getattr(ServiceContainer, spec.service)(),
+                              prefetched=prefetched or ServiceContainer.prefetcher().take(server_id, spec.key))
+            # Volver al menu de features, no a seleccion de server
+            view.backRequested.connect(lambda: self.show_feature_selection(server_id, server_name))
+            return view
+        view = self.view_stack.show_view((server_id, spec.key), build)
+        self.session = session_state.SessionState(server_id, server_name, spec.key)
+        session_state.save_state(self.session)
+        return view
+
+    def resume_session(self):
+        """Abre directo la ultima vista, pintando el snapshot local antes de consultar la base."""
+        state = self.session
+        spec = feature_registry.get(state.feature) if state else None
+        if spec is None:
+            return
+        view = self.show_feature(spec, state.server_id, state.server_name,
+                                 prefetched=session_state.load_snapshot(state))
+        if state.scope_id is not None:
+            view.select_scope(state.scope_id)
+        if state.store_id is not None:
+            view.select_store(state.store_id)
+
+    def remember_session(self):
+        """Guarda evento/anio, tienda y snapshot de la vista de feature activa."""
+        view = self.current_view()
+        if self.session is None or not hasattr(view, 'session_snapshot'):
+            return
+        snapshot, store_id = view.session_snapshot(self.session.feature)
+        self.session.scope_id = snapshot.scope_id if snapshot else None
+        self.session.store_id = store_id
+        session_state.save_state(self.session)
+        if snapshot:
+            session_state.save_snapshot(snapshot)
+
+    def closeEvent(self, event):
+        self.remember_session()
+        super().closeEvent(event)
     
     def show_timer(self):
         from app.presentation.views.widgets.floating_timer import FloatingTimer
         if self.timer_window is None or not self.timer_window.isVisible():
-            self.timer_window = FloatingTimer()
+            self.timer_window = FloatingTimer(controller=ServiceContainer.timer_service())
             self.timer_window.show()
             self.showMinimized()  # Minimize main window
         else:
@@ -89,7 +144,7 @@ class MainWindow(QMainWindow):
     def show_countdown(self):
         from app.presentation.views.widgets.floating_countdown import FloatingCountdown
         if self.countdown_window is None or not self.countdown_window.isVisible():
-            self.countdown_window = FloatingCountdown()
+            self.countdown_window = FloatingCountdown(controller=ServiceContainer.countdown_service())
             self.countdown_window.show()
             self.showMinimized()
         else:
@@ -107,10 +162,27 @@ def main():
     else:
         logger.warning("No se encontro el estilo Metin2, usando default.")
     
+    if Config.uses_local_replica():
+        start_replica_sync(app)
+    
+    app.aboutToQuit.connect(ServiceContainer.shutdown)
+    app.aboutToQuit.connect(change_poller.shutdown)
+    
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
 
+def start_replica_sync(app):
+    """Prepara la replica local y arranca la sincronizacion en segundo plano."""
+    sync = ServiceContainer.sync_service()
+    try:
+        if sync.needs_bootstrap():
+            sync.bootstrap()
+    except Exception as e:
+        logger.error(f"No se pudo inicializar la replica desde MySQL: {e}")
+    sync.start()
+    app.aboutToQuit.connect(sync.stop)
+
 def handle_exception(exc_type, exc_value, exc_traceback):
     if issubclass(exc_type, KeyboardInterrupt):
         sys.__excepthook__(exc_type, exc_value, exc_traceback)
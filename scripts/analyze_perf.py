@@ -0,0 +1,87 @@
+"""Tabla de percentiles por operacion a partir de logs/perf.jsonl (y sus rotaciones).
+
+Uso:
+    python -m scripts.analyze_perf [archivos...] [--op prefijo]
+"""
+import argparse
+import glob
+import json
+import os
+from collections import defaultdict
+
+DEFAULT_LOG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "perf.jsonl")
+
+
+def _percentile(ordered, pct):
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def load_entries(paths, op_prefix=None):
+    """Lee las lineas JSON validas; ignora lineas cortadas por una rotacion o un cierre abrupto."""
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if 'op' in entry and 'ms' in entry and (not op_prefix or entry['op'].startswith(op_prefix)):
+                    yield entry
+
+
+def summarize(entries):
+    """op -> {n, p50, p90, p95, p99, max, queries (media), rows (media)}."""
+    durations, queries, rows = defaultdict(list), defaultdict(list), defaultdict(list)
+    for entry in entries:
+        op = entry['op']
+        durations[op].append(entry['ms'])
+        if entry.get('queries') is not None:
+            queries[op].append(entry['queries'])
+        if entry.get('rows') is not None:
+            rows[op].append(entry['rows'])
+
+    table = {}
+    for op, samples in durations.items():
+        ordered = sorted(samples)
+        table[op] = {
+            'n': len(ordered),
+            'p50': _percentile(ordered, 50),
+            'p90': _percentile(ordered, 90),
+            'p95': _percentile(ordered, 95),
+            'p99': _percentile(ordered, 99),
+            'max': ordered[-1],
+            'queries': sum(queries[op]) / len(queries[op]) if queries[op] else None,
+            'rows': sum(rows[op]) / len(rows[op]) if rows[op] else None,
+        }
+    return table
+
+
+def print_table(table):
+    print(f"{'operacion':<28}{'n':>7}{'p50':>10}{'p90':>10}{'p95':>10}{'p99':>10}{'max':>10}{'queries':>9}{'filas':>8}")
+    # Las operaciones mas caras (p95) primero
+    for op, m in sorted(table.items(), key=lambda item: item[1]['p95'], reverse=True):
+        q = f"{m['queries']:.1f}" if m['queries'] is not None else "-"
+        r = f"{m['rows']:.0f}" if m['rows'] is not None else "-"
+        print(f"{op:<28}{m['n']:>7}{m['p50']:>10.2f}{m['p90']:>10.2f}{m['p95']:>10.2f}"
+              f"{m['p99']:>10.2f}{m['max']:>10.2f}{q:>9}{r:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Percentiles por operacion del canal de performance (ms)")
+    parser.add_argument("paths", nargs="*", help="Archivos perf.jsonl (por defecto logs/perf.jsonl*)")
+    parser.add_argument("--op", help="Filtrar operaciones por prefijo (p. ej. alchemy.)")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or sorted(glob.glob(DEFAULT_LOG + "*"))
+    if not paths:
+        print("No hay registros de performance (activar con PERF_LOG=1).")
+        return
+    print_table(summarize(load_entries(paths, args.op)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+from app.utils.logger import logger
+from app.application.services.archive_service import ArchiveService
+
+def archive_events():
+    logger.info("Buscando eventos finalizados para archivar...")
+    archived = ArchiveService().archive_finished_events()
+    if archived:
+        logger.info(f"Eventos archivados: {', '.join(f'{feature} {event_id}' for feature, event_id in archived)}")
+    else:
+        logger.info("No hay eventos pendientes de archivar.")
+
+if __name__ == "__main__":
+    archive_events()
@@ -0,0 +1,88 @@
+"""Backup y restauracion de un servidor (archivo .ndjson.gz).
+
+Uso:
+    python -m scripts.backup_server backup <servidor> <archivo>
+    python -m scripts.backup_server restore <archivo> [--name nuevo] [--db-url url]
+    python -m scripts.backup_server clone <servidor> --db-url url [--name nuevo]
+
+<servidor> es el nombre o el id. --db-url apunta a otra base (por ejemplo una de pruebas);
+sus tablas se crean si no existen.
+"""
+import argparse
+import os
+import sys
+import tempfile
+from app.domain.base import Base
+from app.domain.models import Server
+from app.utils.db_engine import create_db_engine
+from app.utils.db_setup import upgrade_schema
+from app.utils.logger import logger
+from app.application.services.backup_service import BackupService
+
+
+def _service(db_url=None):
+    if not db_url:
+        return BackupService()
+    engine = create_db_engine(db_url)
+    Base.metadata.create_all(engine)
+    upgrade_schema(engine)
+    return BackupService.bound_to(engine)()
+
+
+def _server_id(service, server):
+    with service.session_scope() as session:
+        query = session.query(Server.id)
+        found = query.filter(Server.id == int(server)).scalar() if server.isdigit() else None
+        return found or query.filter(Server.name == server).scalar()
+
+
+def backup(server, file_path):
+    service = _service()
+    server_id = _server_id(service, server)
+    if server_id is None:
+        logger.error(f"Servidor no encontrado: {server}")
+        return False
+    return service.backup_server(server_id, file_path) is not None
+
+
+def restore(file_path, name=None, db_url=None):
+    return _service(db_url).restore_server(file_path, server_name=name) is not None
+
+
+def clone(server, db_url, name=None):
+    """Backup a un temporal y restauracion en la otra base."""
+    fd, path = tempfile.mkstemp(suffix='.ndjson.gz')
+    os.close(fd)
+    try:
+        return backup(server, path) and restore(path, name, db_url)
+    finally:
+        os.remove(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backup y restauracion por servidor")
+    commands = parser.add_subparsers(dest='command', required=True)
+    cmd = commands.add_parser('backup')
+    cmd.add_argument('server')
+    cmd.add_argument('file')
+    cmd = commands.add_parser('restore')
+    cmd.add_argument('file')
+    cmd.add_argument('--name')
+    cmd.add_argument('--db-url')
+    cmd = commands.add_parser('clone')
+    cmd.add_argument('server')
+    cmd.add_argument('--db-url', required=True)
+    cmd.add_argument('--name')
+    args = parser.parse_args(argv)
+
+    if args.command == 'backup':
+        ok = backup(args.server, args.file)
+    elif args.command == 'restore':
+        ok = restore(args.file, args.name, args.db_url)
+    else:
+        ok = clone(args.server, args.db_url, args.name)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,11 @@
+from app.utils.logger import logger
+from app.application.services.archive_service import ArchiveService
+
+def compact_activities():
+    logger.info("Compactando filas de actividad en estado pendiente...")
+    deleted = ArchiveService().compact_pending_rows()
+    for table, count in deleted.items():
+        logger.info(f"  {table}: {count} filas borradas")
+
+if __name__ == "__main__":
+    compact_activities()
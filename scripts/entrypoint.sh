@@ -1,7 +1,8 @@
 #!/bin/bash
 # ─────────────────────────────────────────────
 # MetinForge — Docker Entrypoint
-# Waits for MySQL, initializes the DB schema,
+# Waits for the database (MySQL or embedded
+# SQLite via DB_BACKEND), initializes the DB schema,
 # seeds data if empty, and starts the app.
 # ─────────────────────────────────────────────
 
@@ -12,9 +13,9 @@ echo "[MetinForge] Waiting for MySQL..."
 MAX_RETRIES=30
 RETRY=0
 until python -c "
-from app.utils.config import Config
-from sqlalchemy import create_engine, text
-engine = create_engine(Config.get_db_url())
+from app.utils.db_engine import create_db_engine
+from sqlalchemy import text
+engine = create_db_engine()
 with engine.connect() as c:
     c.execute(text('SELECT 1'))
 engine.dispose()
@@ -34,11 +35,11 @@ echo "[MetinForge] MySQL is ready."
 # This avoids connection pool leaks between steps.
 echo "[MetinForge] Initializing database..."
 python -c "
-from app.utils.config import Config
+from app.utils.db_engine import create_db_engine
 from app.domain.models import Base
-from sqlalchemy import create_engine, inspect, text
+from sqlalchemy import inspect, text
 
-engine = create_engine(Config.get_db_url())
+engine = create_db_engine()
 inspector = inspect(engine)
 existing = inspector.get_table_names()
 
@@ -52,6 +53,10 @@ if not existing:
     seed()
     print('[MetinForge] Seed completed.')
 else:
+    # Tablas y columnas agregadas en versiones nuevas
+    from app.utils.db_setup import upgrade_schema
+    Base.metadata.create_all(engine)
+    upgrade_schema(engine)
     with engine.connect() as conn:
         count = conn.execute(text('SELECT COUNT(*) FROM servers')).scalar()
     if count == 0:
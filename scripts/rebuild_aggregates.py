@@ -0,0 +1,23 @@
+from app.utils.logger import logger
+from app.utils.db_engine import create_db_engine
+from app.application.services import aggregates
+from sqlalchemy.orm import sessionmaker
+
+def rebuild_aggregates():
+    engine = create_db_engine()
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    try:
+        logger.info("Recalculando agregados por evento...")
+        rows = aggregates.rebuild(session)
+        session.commit()
+        logger.info(f"Agregados recalculados ({rows} filas por tienda).")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error recalculando agregados: {e}")
+    finally:
+        session.close()
+
+if __name__ == "__main__":
+    rebuild_aggregates()
@@ -1,13 +1,12 @@
 from app.utils.db_setup import init_db
 from app.domain.base import Base
-from app.utils.config import Config
 from app.utils.logger import logger
-from sqlalchemy import create_engine
+from app.utils.db_engine import create_db_engine
 import sys
 
 def reset_db():
     logger.info("Conectando a la base de datos...")
-    engine = create_engine(Config.get_db_url())
+    engine = create_db_engine()
     
     logger.warning("Eliminando tablas existentes...")
     Base.metadata.drop_all(engine)
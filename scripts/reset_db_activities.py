@@ -1,11 +1,11 @@
-from app.utils.config import Config
 from app.utils.logger import logger
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+from app.utils.db_engine import create_db_engine
 from sqlalchemy.orm import sessionmaker
+from app.application.services import aggregates
 
 def reset_activities():
-    url = Config.get_db_url()
-    engine = create_engine(url)
+    engine = create_db_engine()
     Session = sessionmaker(bind=engine)
     session = Session()
     
@@ -15,6 +15,7 @@ def reset_activities():
         # Adjust table names if necessary (checking models)
         session.execute(text("DELETE FROM daily_cor_activities"))
         session.execute(text("DELETE FROM tombola_activities"))
+        aggregates.rebuild(session)
         session.commit()
         logger.info("Daily activities reset successfully.")
     except Exception as e:
@@ -8,6 +8,7 @@ from app.domain.models import (
     Server, StoreAccount, GameAccount, Character, 
     AlchemyEvent, DailyCorActivity
 )
+from app.utils.config import Config
 
 @pytest.fixture
 def alchemy_ctrl(test_db):
@@ -157,3 +158,568 @@ def test_daily_cords_records(alchemy_ctrl, test_db, seed_data):
     assert cords_map[1] == 15
     
     assert alchemy_ctrl.get_total_cords(game_acc_id, event_id) == 15
+
+def test_get_changes_since_returns_only_new_changes(alchemy_ctrl, test_db, seed_data):
+    """El journal permite refrescar solo lo modificado desde la ultima version vista."""
+    server_id = seed_data['server'].id
+    char_id = seed_data['character'].id
+    game_acc_id = seed_data['game_account'].id
+    event = alchemy_ctrl.create_alchemy_event(server_id, "Changes Event", 30)
+
+    alchemy_ctrl.update_daily_status(char_id, 1, 1, event.id)
+    version = alchemy_ctrl.get_changes_since(server_id, None).version
+
+    alchemy_ctrl.update_daily_status(char_id, 2, -1, event.id)
+    alchemy_ctrl.update_daily_cords(game_acc_id, event.id, 2, 12)
+
+    change_set = alchemy_ctrl.get_changes_since(server_id, version)
+    assert change_set.version > version
+    assert [(c.entity, c.owner_id, c.slot, c.value) for c in change_set.changes] == [
+        ("alchemy_status", char_id, "2", -1),
+        ("alchemy_cords", game_acc_id, "2", 12),
+    ]
+
+    # Sin cambios nuevos la version no avanza y otro servidor no ve nada
+    assert alchemy_ctrl.get_changes_since(server_id, change_set.version).changes == []
+    assert alchemy_ctrl.get_changes_since(server_id + 1, version).changes == []
+
+class TestOptimisticConcurrency:
+    """Escrituras compare-and-swap por version de fila."""
+
+    def test_batch_reports_conflicts_and_skips_them(self, alchemy_ctrl, test_db, seed_data):
+        char_id = seed_data['character'].id
+        event = alchemy_ctrl.create_alchemy_event(seed_data['server'].id, "CAS Event", 30)
+
+        first = alchemy_ctrl.update_daily_status_batch(event.id, [(char_id, 1, 1, 0), (char_id, 2, 1, 0)])
+        assert first.versions == {(char_id, 1): 1, (char_id, 2): 1}
+        assert first.conflicts == []
+
+        # Otro puesto modifica el dia 1 despues de que lo leimos (version 1 -> 2)
+        assert alchemy_ctrl.update_daily_status(char_id, 1, -1, event.id, expected_version=1) is True
+
+        second = alchemy_ctrl.update_daily_status_batch(event.id, [(char_id, 1, 0, 1), (char_id, 2, -1, 1)])
+        assert second.conflicts == [(char_id, 1)]
+        assert second.versions == {(char_id, 2): 2}
+
+        test_db.expire_all()
+        day1 = test_db.query(DailyCorActivity).filter_by(character_id=char_id, event_id=event.id, day_index=1).one()
+        assert day1.status_code == -1
+
+    def test_new_row_conflicts_when_someone_created_it(self, alchemy_ctrl, test_db, seed_data):
+        char_id = seed_data['character'].id
+        event = alchemy_ctrl.create_alchemy_event(seed_data['server'].id, "CAS New", 30)
+        alchemy_ctrl.update_daily_status(char_id, 1, 1, event.id)
+
+        assert alchemy_ctrl.update_daily_status(char_id, 1, -1, event.id, expected_version=0) is False
+
+    def test_concurrent_inserts_of_the_same_cell_conflict(self, tmp_path):
+        from sqlalchemy import event as sa_event, insert
+        from sqlalchemy.orm import sessionmaker
+        from app.domain.base import Base
+        from app.domain.models import CharacterType, EventDayTotal
+        from app.utils.db_engine import create_db_engine
+
+        engine = create_db_engine(f"sqlite:///{tmp_path / 'cas.db'}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        server = Server(name="Race")
+        session.add(server)
+        session.flush()
+        account = GameAccount(username="RaceUser", server_id=server.id)
+        session.add(account)
+        session.flush()
+        char = Character(name="RaceChar", char_type=CharacterType.ALCHEMIST, game_account_id=account.id)
+        session.add(char)
+        session.commit()
+        server_id, char_id = server.id, char.id
+        session.close()
+        service_class = AlchemyService.bound_to(engine)
+        event = service_class().create_alchemy_event(server_id, "Race", 5)
+
+        # Otro puesto inserta la misma celda entre nuestra lectura y nuestro INSERT
+        raced = []
+
+        def other_seat(session, flush_context, instances):
+            if raced:
+                return
+            raced.append(True)
+            with engine.begin() as conn:
+                conn.execute(insert(DailyCorActivity).values(
+                    character_id=char_id, event_id=event.id, day_index=1, status_code=-1))
+
+        sa_event.listen(service_class._SessionFactory, 'before_flush', other_seat)
+        try:
+            result = service_class().update_daily_status_batch(event.id, [(char_id, 1, 1, 0)])
+        finally:
+            sa_event.remove(service_class._SessionFactory, 'before_flush', other_seat)
+
+        assert result.conflicts == [(char_id, 1)] and result.versions == {}
+        session = sessionmaker(bind=engine)()
+        assert session.query(DailyCorActivity).filter_by(character_id=char_id, day_index=1).count() == 1
+        assert session.query(EventDayTotal).count() == 0  # la celda no se conto dos veces
+        session.close()
+        engine.dispose()
+
+    def test_cords_and_account_compare_and_swap(self, alchemy_ctrl, test_db, seed_data):
+        game_acc = seed_data['game_account']
+        event = alchemy_ctrl.create_alchemy_event(seed_data['server'].id, "CAS Cords", 30)
+
+        assert alchemy_ctrl.update_daily_cords(game_acc.id, event.id, 1, 10, expected_version=0) is True
+        assert alchemy_ctrl.update_daily_cords(game_acc.id, event.id, 1, 20, expected_version=0) is False
+        assert alchemy_ctrl.update_daily_cords(game_acc.id, event.id, 1, 20, expected_version=1) is True
+        assert alchemy_ctrl.get_daily_cords(game_acc.id, event.id)[1] == 20
+
+        version = game_acc.version
+        assert alchemy_ctrl.update_game_account(game_acc.id, "Renamed", 1, expected_version=version + 1) is False
+        assert alchemy_ctrl.update_game_account(game_acc.id, "Renamed", 1, expected_version=version) is True
+
+    def test_reset_to_pending_deletes_row(self, alchemy_ctrl, test_db, seed_data, monkeypatch):
+        monkeypatch.setattr(Config, 'SPARSE_ACTIVITIES', True)
+        char_id = seed_data['character'].id
+        event = alchemy_ctrl.create_alchemy_event(seed_data['server'].id, "CAS Sparse", 30)
+        alchemy_ctrl.update_daily_status(char_id, 1, 1, event.id)
+
+        result = alchemy_ctrl.update_daily_status_batch(event.id, [(char_id, 1, 0, 1)])
+        assert result.versions == {(char_id, 1): 0}
+        assert test_db.query(DailyCorActivity).filter_by(event_id=event.id).count() == 0
+        # Version 0 = sin fila: el siguiente write compare-and-swap la recrea
+        assert alchemy_ctrl.update_daily_status(char_id, 1, -1, event.id, expected_version=0) is True
+
+    def test_recreated_row_keeps_version_increasing(self, alchemy_ctrl, test_db, seed_data, monkeypatch):
+        monkeypatch.setattr(Config, 'SPARSE_ACTIVITIES', True)
+        char_id = seed_data['character'].id
+        event = alchemy_ctrl.create_alchemy_event(seed_data['server'].id, "CAS ABA", 30)
+        # Un puesto lee la celda en version 1 y se queda con esa version
+        stale = alchemy_ctrl.update_daily_status_batch(event.id, [(char_id, 1, 1, 0)]).versions[(char_id, 1)]
+
+        # Otro la pasa a pendiente (borra la fila) y la vuelve a marcar
+        assert alchemy_ctrl.update_daily_status(char_id, 1, 0, event.id, expected_version=stale) is True
+        recreated = alchemy_ctrl.update_daily_status_batch(event.id, [(char_id, 1, -1, 0)]).versions[(char_id, 1)]
+        assert recreated > stale
+
+        result = alchemy_ctrl.update_daily_status_batch(event.id, [(char_id, 1, 1, stale)])
+        assert result.conflicts == [(char_id, 1)]
+        test_db.expire_all()
+        row = test_db.query(DailyCorActivity).filter_by(character_id=char_id, event_id=event.id, day_index=1).one()
+        assert (row.status_code, row.version) == (-1, recreated)
+
+    def test_change_feed_carries_row_version(self, alchemy_ctrl, test_db, seed_data):
+        server_id = seed_data['server'].id
+        char_id = seed_data['character'].id
+        event = alchemy_ctrl.create_alchemy_event(server_id, "CAS Feed", 30)
+        version = alchemy_ctrl.get_changes_since(server_id, None).version
+
+        alchemy_ctrl.update_daily_status(char_id, 1, 1, event.id)
+        alchemy_ctrl.update_daily_status(char_id, 1, -1, event.id)
+
+        changes = alchemy_ctrl.get_changes_since(server_id, version).changes
+        assert [c.version for c in changes] == [1, 2]
+
+
+class TestEventAggregates:
+    """Agregados materializados de completados, fallidos y cords."""
+
+    def test_status_and_cords_deltas(self, alchemy_ctrl, test_db, seed_data):
+        char_id = seed_data['character'].id
+        store_id = seed_data['store'].id
+        event = alchemy_ctrl.create_alchemy_event(seed_data['server'].id, "Totals", 30)
+
+        alchemy_ctrl.update_daily_status(char_id, 1, 1, event.id)
+        alchemy_ctrl.update_daily_status(char_id, 2, -1, event.id)
+        alchemy_ctrl.update_daily_cords(seed_data['game_account'].id, event.id, 1, 7)
+
+        totals = alchemy_ctrl.get_event_totals(event.id)
+        assert (totals.completed, totals.failed, totals.cords) == (1, 1, 7)
+
+        by_day = alchemy_ctrl.get_event_totals(event.id, by='day')
+        assert by_day[1].completed == 1 and by_day[1].cords == 7
+        assert by_day[2].failed == 1
+        assert alchemy_ctrl.get_event_totals(event.id, by='store')[store_id].cords == 7
+
+    def test_toggling_nets_out(self, alchemy_ctrl, test_db, seed_data):
+        char_id = seed_data['character'].id
+        event = alchemy_ctrl.create_alchemy_event(seed_data['server'].id, "Toggle", 30)
+
+        alchemy_ctrl.update_daily_status(char_id, 1, 1, event.id)
+        alchemy_ctrl.update_daily_status(char_id, 1, -1, event.id)
+        alchemy_ctrl.update_daily_status(char_id, 1, 0, event.id)
+
+        totals = alchemy_ctrl.get_event_totals(event.id)
+        assert (totals.completed, totals.failed) == (0, 0)
+
+    def test_rebuild_matches_incremental(self, alchemy_ctrl, test_db, seed_data):
+        from app.application.services import aggregates
+        char_id = seed_data['character'].id
+        event = alchemy_ctrl.create_alchemy_event(seed_data['server'].id, "Rebuild", 30)
+        for day, status in [(1, 1), (2, 1), (3, -1)]:
+            alchemy_ctrl.update_daily_status(char_id, day, status, event.id)
+        alchemy_ctrl.update_daily_cords(seed_data['game_account'].id, event.id, 2, 4)
+
+        incremental = alchemy_ctrl.get_event_totals(event.id, by='day')
+        aggregates.rebuild(test_db)
+        test_db.commit()
+
+        assert alchemy_ctrl.get_event_totals(event.id, by='day') == incremental
+
+
+    def test_account_edits_keep_aggregates_in_sync_without_rebuild(self, alchemy_ctrl, test_db, seed_data,
+                                                                   monkeypatch):
+        from app.application.services import aggregates
+        from app.application.services.fishing_service import FishingService
+        from app.application.services.tombola_service import TombolaService
+        from app.domain.models import EventDayTotal, EventStoreTotal
+        server_id, account = seed_data['server'].id, seed_data['game_account']
+        event = alchemy_ctrl.create_alchemy_event(server_id, "Edits", 5)
+        tombola = TombolaService(test_db)
+        tombola_event = tombola.create_tombola_event(server_id, "Edits")
+        assert alchemy_ctrl.update_game_account(account.id, None, 2) is True
+        first, second = test_db.query(Character).filter_by(game_account_id=account.id).order_by(Character.id).all()
+        for char in (first, second):
+            alchemy_ctrl.update_daily_status(char.id, 1, 1, event.id)
+            tombola.update_daily_status(char.id, 2, -1, tombola_event.id)
+            FishingService(test_db).update_fishing_status(char.id, 2025, 1, 1, 1)
+        alchemy_ctrl.update_daily_cords(account.id, event.id, 1, 6)
+
+        def no_rebuild(*args, **kwargs):
+            raise AssertionError("no se debe recalcular toda la base")
+        monkeypatch.setattr(aggregates, 'rebuild', no_rebuild)
+        test_db.expire_all()
+        # Cambia de tienda y borra el segundo personaje en la misma edicion
+        assert alchemy_ctrl.update_game_account(account.id, None, 1, new_email="otra@store.com") is True
+        monkeypatch.undo()
+
+        def snapshot():
+            test_db.expire_all()
+            return (sorted((r.feature, r.scope_id, r.store_account_id, r.completed, r.failed, r.cords)
+                           for r in test_db.query(EventStoreTotal) if r.completed or r.failed or r.cords),
+                    sorted((r.feature, r.scope_id, r.day_index, r.completed, r.failed, r.cords)
+                           for r in test_db.query(EventDayTotal) if r.completed or r.failed or r.cords))
+
+        incremental = snapshot()
+        aggregates.rebuild(test_db)
+        assert snapshot() == incremental
+        new_store = account.store_account_id
+        assert alchemy_ctrl.get_event_totals(event.id, by='store')[new_store].cords == 6
+        assert tombola.get_event_totals(tombola_event.id).failed == 1
+        assert FishingService(test_db).get_year_totals(server_id, 2025).completed == 1
+
+class TestEventArchive:
+    """Archivo de eventos finalizados: compacta, purga y sigue legible por los mismos DTOs."""
+
+    def _finished_event(self, alchemy_ctrl, test_db, seed_data):
+        import datetime
+        event = alchemy_ctrl.create_alchemy_event(seed_data['server'].id, "Archivable", 10)
+        row = test_db.get(AlchemyEvent, event.id)
+        row.created_at = datetime.date.today() - datetime.timedelta(days=60)
+        test_db.commit()
+        char_id = seed_data['character'].id
+        for day, status in [(1, 1), (2, -1), (4, 1)]:
+            alchemy_ctrl.update_daily_status(char_id, day, status, event.id)
+        alchemy_ctrl.update_daily_cords(seed_data['game_account'].id, event.id, 1, 5)
+        return event
+
+    def test_archive_compacts_and_purges(self, alchemy_ctrl, test_db, seed_data):
+        from app.application.services.archive_service import ArchiveService
+        from app.domain.models import DailyCorRecord
+        event = self._finished_event(alchemy_ctrl, test_db, seed_data)
+        server_id = seed_data['server'].id
+        before = alchemy_ctrl.get_alchemy_dashboard_data(server_id, event_id=event.id)
+
+        archived = ArchiveService(test_db).archive_finished_events(chunk_size=2)
+
+        assert archived == [('alchemy', event.id)]
+        assert test_db.query(DailyCorActivity).filter_by(event_id=event.id).count() == 0
+        assert test_db.query(DailyCorRecord).filter_by(event_id=event.id).count() == 0
+        assert alchemy_ctrl.get_alchemy_events(server_id) == []
+        assert alchemy_ctrl.get_alchemy_events(server_id, include_archived=True)[0].archived is True
+
+        after = alchemy_ctrl.get_alchemy_dashboard_data(server_id, event_id=event.id)
+        char_before = before.store_accounts[0].game_accounts[0].characters[0]
+        char_after = after.store_accounts[0].game_accounts[0].characters[0]
+        assert char_after.daily_status_map == char_before.daily_status_map
+        assert alchemy_ctrl.get_all_daily_cords(event.id) == {seed_data['game_account'].id: {1: 5}}
+        assert alchemy_ctrl.get_event_totals(event.id).completed == 2
+
+    def test_archived_event_is_read_only(self, alchemy_ctrl, test_db, seed_data):
+        from app.application.services.archive_service import ArchiveService
+        event = self._finished_event(alchemy_ctrl, test_db, seed_data)
+        ArchiveService(test_db).archive_event('alchemy', event.id)
+
+        assert alchemy_ctrl.update_daily_status(seed_data['character'].id, 3, 1, event.id) is False
+        assert alchemy_ctrl.update_daily_cords(seed_data['game_account'].id, event.id, 2, 9) is False
+
+    def test_rebuild_keeps_archived_totals(self, alchemy_ctrl, test_db, seed_data):
+        from app.application.services import aggregates
+        from app.application.services.archive_service import ArchiveService
+        event = self._finished_event(alchemy_ctrl, test_db, seed_data)
+        ArchiveService(test_db).archive_event('alchemy', event.id)
+
+        aggregates.rebuild(test_db)
+        totals = alchemy_ctrl.get_event_totals(event.id)
+        assert (totals.completed, totals.failed, totals.cords) == (2, 1, 5)
+
+    def test_running_events_are_not_due(self, alchemy_ctrl, test_db, seed_data):
+        from app.application.services.archive_service import ArchiveService
+        alchemy_ctrl.create_alchemy_event(seed_data['server'].id, "En curso", 30)
+        assert ArchiveService(test_db).get_due_events() == []
+
+
+class TestStatusMatrix:
+    """Estadisticas vectorizadas sobre la matriz personajes x dias."""
+
+    @pytest.fixture
+    def dashboard(self):
+        from app.application.dtos import StoreAccountDTO, GameAccountDTO, AlchemyCharacterDTO
+        rows = [
+            (1, {1: 1, 2: 1, 3: -1, 4: 1}),
+            (1, {1: 1, 2: 1, 3: 1, 4: 1}),
+            (2, {2: -1, 3: 1, 4: 1}),
+        ]
+        stores = {}
+        for i, (store_id, day_map) in enumerate(rows, start=1):
+            store = stores.setdefault(store_id, StoreAccountDTO(id=store_id, email=f"s{store_id}@mail.com"))
+            store.game_accounts.append(GameAccountDTO(id=i, username=f"u{i}", server_id=1, characters=[
+                AlchemyCharacterDTO(id=i, name=f"PJ{i}", daily_status_map=day_map)
+            ]))
+        return list(stores.values())
+
+    def test_stats_match_maps(self, dashboard):
+        from app.application.services import status_matrix
+        matrix = status_matrix.build(dashboard, status_matrix.day_columns(5), 'daily_status_map')
+
+        assert matrix.values.dtype.name == 'int8' and matrix.values.shape == (3, 5)
+        per_day = status_matrix.by_column(matrix)
+        assert per_day['completed'].tolist() == [2, 2, 2, 3, 0]
+        assert per_day['failure_rate'].tolist() == [0.0, 1 / 3, 1 / 3, 0.0, 0.0]
+        stores = status_matrix.by_store(matrix)
+        assert (stores[1]['completed'], stores[1]['failed']) == (7, 1)
+        assert (stores[2]['completed'], stores[2]['failed']) == (2, 1)
+        current, longest = status_matrix.streaks(matrix)
+        assert current.tolist() == [2, 4, 0]
+        assert longest.tolist() == [2, 4, 2]
+
+    def test_matrix_follows_dto_and_journal_changes(self, dashboard):
+        from app.application.dtos import ChangeDTO
+        from app.application.services import status_matrix, change_log
+        matrix = status_matrix.build(dashboard, status_matrix.day_columns(5), 'daily_status_map')
+
+        char = dashboard[1].game_accounts[0].characters[0]
+        char.daily_status_map[5] = 1
+        status_matrix.refresh_row(matrix, char, 'daily_status_map')
+        applied = status_matrix.apply_changes(matrix, [
+            ChangeDTO(change_log.ALCHEMY_STATUS, 1, 9, "5", -1),
+            ChangeDTO(change_log.ALCHEMY_STATUS, 1, 8, "5", 1),  # otro evento
+        ], change_log.ALCHEMY_STATUS, 9)
+
+        assert applied == 1
+        assert matrix.values[:, 4].tolist() == [-1, 0, 1]
+
+    def test_matrix_has_one_row_per_rendered_account(self, dashboard):
+        from app.application.dtos import AlchemyCharacterDTO
+        from app.application.services import status_matrix
+        # Personaje extra de la cuenta: la grilla solo pinta el primero
+        dashboard[0].game_accounts[0].characters.append(
+            AlchemyCharacterDTO(id=99, name="Extra", daily_status_map={1: -1, 2: -1}))
+        matrix = status_matrix.build(dashboard, status_matrix.day_columns(5), 'daily_status_map')
+
+        assert matrix.row_ids == [1, 2, 3]
+        assert matrix.store_rows == {1: (0, 2), 2: (2, 3)}
+        assert status_matrix.totals(matrix).failed == 2
+
+
+class TestChartRenderer:
+    """Graficos por evento: cache por version del journal, render solo si cambian los datos."""
+
+    @pytest.fixture
+    def renderer(self, test_db):
+        from app.application.services.analytics_service import AnalyticsService
+        from app.presentation.chart_renderer import ChartRenderer
+        renderer = ChartRenderer(lambda: AnalyticsService(test_db), cache_size=16)
+        yield renderer
+        renderer.shutdown(wait=True)
+
+    def test_chart_data_comes_from_aggregates(self, alchemy_ctrl, test_db, seed_data):
+        from app.application.services.analytics_service import AnalyticsService
+        event = AlchemyEvent(server_id=seed_data["server"].id, name="Graficos", total_days=5)
+        test_db.add(event)
+        test_db.commit()
+        alchemy_ctrl.update_daily_status(seed_data["character"].id, 1, 1, event.id)
+        alchemy_ctrl.update_daily_cords(seed_data["game_account"].id, event.id, 2, 7)
+        alchemy_ctrl.update_alchemy_count(event.id, "diamante", 3)
+
+        data = AnalyticsService(test_db).get_chart_data('alchemy', event.id)
+
+        assert (data.total_days, data.participants) == (5, 1)
+        assert data.days[1].completed == 1 and data.days[2].cords == 7
+        assert data.stores[seed_data["store"].email].cords == 7
+        assert data.counters == {"diamante": 3}
+        assert data.version == AnalyticsService(test_db).get_data_version('alchemy', event.id) > 0
+
+    def test_participants_count_one_character_per_account(self, test_db, seed_data):
+        from app.application.services.analytics_service import AnalyticsService
+        event = AlchemyEvent(server_id=seed_data["server"].id, name="Multi", total_days=5)
+        test_db.add_all([event, Character(game_account_id=seed_data["game_account"].id, name="Segundo")])
+        test_db.commit()
+
+        assert AnalyticsService(test_db).get_chart_data('alchemy', event.id).participants == 1
+
+    def test_renders_once_per_data_version(self, renderer, alchemy_ctrl, test_db, seed_data):
+        event = AlchemyEvent(server_id=seed_data["server"].id, name="Cache", total_days=5)
+        test_db.add(event)
+        test_db.commit()
+        alchemy_ctrl.update_daily_status(seed_data["character"].id, 1, 1, event.id)
+
+        version, images = renderer.submit('alchemy', event.id).result(timeout=30)
+        assert set(images) == {'completion', 'cords_by_day', 'stores', 'counters'}
+        assert all(png.startswith(b'\x89PNG') for png in images.values())
+        assert renderer.renders == 4
+
+        assert renderer.render('alchemy', event.id) == (version, images)
+        assert renderer.renders == 4  # sin cambios: servido de cache
+
+        alchemy_ctrl.update_daily_status(seed_data["character"].id, 2, -1, event.id)
+        new_version, _ = renderer.render('alchemy', event.id)
+        assert new_version > version and renderer.renders == 8
+
+    def test_missing_event_renders_nothing(self, renderer):
+        assert renderer.render('alchemy', 9999) is None
+        assert renderer.renders == 0
+
+
+class TestEventExport:
+    """Exportacion del evento a .csv/.xlsx por lotes, con progreso y cancelacion."""
+
+    def _event(self, alchemy_ctrl, test_db, seed_data):
+        event = alchemy_ctrl.create_alchemy_event(seed_data['server'].id, "Exportable", 5)
+        char_id = seed_data['character'].id
+        for day, status in [(1, 1), (2, -1), (4, 1)]:
+            alchemy_ctrl.update_daily_status(char_id, day, status, event.id)
+        alchemy_ctrl.update_daily_cords(seed_data['game_account'].id, event.id, 1, 5)
+        alchemy_ctrl.update_alchemy_count(event.id, "diamante", 3)
+        return event
+
+    def _add_characters(self, test_db, seed_data, count):
+        test_db.add_all([Character(game_account_id=seed_data['game_account'].id, name=f"Extra{i}")
+                         for i in range(count)])
+        test_db.commit()
+
+    def test_csv_has_statuses_cords_and_counters(self, alchemy_ctrl, test_db, seed_data, tmp_path):
+        import csv
+        from app.application.services.export_service import ExportService
+        event = self._event(alchemy_ctrl, test_db, seed_data)
+        path = tmp_path / "evento.csv"
+
+        result = ExportService(test_db).export_event('alchemy', event.id, str(path))
+
+        assert result.rows == 3 and not result.cancelled
+        rows = list(csv.reader(path.open(encoding='utf-8-sig')))
+        account = [seed_data['store'].email, seed_data['game_account'].username]
+        assert rows[0] == ["# Estados"]
+        assert rows[2] == account + [seed_data['character'].name, "Hecho", "Fallido", "", "Hecho", ""]
+        assert rows[6] == account + ["5", "0", "0", "0", "0", "5"]
+        assert rows[-1] == ["diamante", "3"]
+        assert not list(tmp_path.glob("*.tmp*"))
+
+    def test_xlsx_matches_archived_event(self, alchemy_ctrl, test_db, seed_data, tmp_path):
+        import openpyxl
+        from app.application.services.archive_service import ArchiveService
+        from app.application.services.export_service import ExportService
+        event = self._event(alchemy_ctrl, test_db, seed_data)
+        live = ExportService(test_db).export_event('alchemy', event.id, str(tmp_path / "vivo.xlsx"))
+        ArchiveService(test_db).archive_event('alchemy', event.id)
+        archived = ExportService(test_db).export_event('alchemy', event.id, str(tmp_path / "archivo.xlsx"))
+
+        sheets = []
+        for result in (live, archived):
+            workbook = openpyxl.load_workbook(result.path, read_only=True)
+            assert workbook.sheetnames == ["Estados", "Cords", "Contadores"]
+            sheets.append({name: [list(r) for r in workbook[name].iter_rows(values_only=True)]
+                           for name in workbook.sheetnames})
+            workbook.close()
+        assert sheets[0] == sheets[1]
+        assert sheets[0]["Estados"][1][3:] == ["Hecho", "Fallido", None, "Hecho", None]
+
+    def test_progress_is_reported_per_batch(self, alchemy_ctrl, test_db, seed_data, tmp_path, monkeypatch):
+        from app.application.services.export_service import ExportService
+        from app.utils.config import Config
+        monkeypatch.setattr(Config, 'EXPORT_BATCH_SIZE', 2)
+        event = self._event(alchemy_ctrl, test_db, seed_data)
+        self._add_characters(test_db, seed_data, 4)
+        calls = []
+
+        result = ExportService(test_db).export_event('alchemy', event.id, str(tmp_path / "e.csv"),
+                                                     progress=lambda done, total: calls.append((done, total)))
+
+        # 5 personajes + 1 cuenta en la hoja de cords
+        assert calls == [(2, 6), (4, 6), (6, 6), (6, 6)]
+        assert result.rows == 7
+
+    def test_cancel_leaves_no_file(self, alchemy_ctrl, test_db, seed_data, tmp_path, monkeypatch):
+        import threading
+        from app.application.services.export_service import ExportService
+        from app.utils.config import Config
+        monkeypatch.setattr(Config, 'EXPORT_BATCH_SIZE', 1)
+        event = self._event(alchemy_ctrl, test_db, seed_data)
+        self._add_characters(test_db, seed_data, 3)
+        cancel = threading.Event()
+
+        result = ExportService(test_db).export_event('alchemy', event.id, str(tmp_path / "e.xlsx"),
+                                                     progress=lambda done, total: cancel.set(), cancel=cancel)
+
+        assert result.cancelled
+        assert list(tmp_path.iterdir()) == []
+
+    def test_unsupported_format_returns_none(self, alchemy_ctrl, test_db, seed_data, tmp_path):
+        from app.application.services.export_service import ExportService
+        event = self._event(alchemy_ctrl, test_db, seed_data)
+        assert ExportService(test_db).export_event('alchemy', event.id, str(tmp_path / "e.pdf")) is None
+        assert ExportService(test_db).export_event('alchemy', 9999, str(tmp_path / "e.csv")) is None
+
+
+class TestDashboardPrefetcher:
+    """Precarga de eventos y dashboard por defecto desde la seleccion de feature."""
+
+    @pytest.fixture
+    def prefetcher(self, test_db, alchemy_ctrl):
+        from app.application.services.fishing_service import FishingService
+        from app.application.services.prefetcher import DashboardPrefetcher
+        from app.application.services.tombola_service import TombolaService
+        self.clock = [0.0]
+        services = {'dailies': lambda: alchemy_ctrl, 'fishing': lambda: FishingService(test_db),
+                    'tombola': lambda: TombolaService(test_db)}
+        return DashboardPrefetcher(services, ttl_seconds=30, clock=lambda: self.clock[0])
+
+    def test_prefetch_loads_enabled_features_once(self, prefetcher, alchemy_ctrl, seed_data):
+        server_id = seed_data["server"].id
+        event = alchemy_ctrl.create_alchemy_event(server_id, "Precarga", 30)
+
+        futures = prefetcher.prefetch(server_id, {'has_dailies': True, 'has_fishing': False, 'has_tombola': False})
+        [f.result() for f in futures]
+
+        prefetched = prefetcher.take(server_id, 'dailies')
+        assert prefetched.scope_id == event.id
+        assert [e.id for e in prefetched.events] == [event.id]
+        assert prefetched.dashboard.store_accounts
+        # Se consume una sola vez y no se precargan features deshabilitadas
+        assert prefetcher.take(server_id, 'dailies') is None
+        assert prefetcher.take(server_id, 'fishing') is None
+        prefetcher.shutdown(wait=True)
+
+    def test_expired_prefetch_is_discarded(self, prefetcher, alchemy_ctrl, seed_data):
+        server_id = seed_data["server"].id
+        alchemy_ctrl.create_alchemy_event(server_id, "Precarga", 30)
+        [f.result() for f in prefetcher.prefetch(server_id, {'has_dailies': True})]
+
+        self.clock[0] += 31
+        assert prefetcher.take(server_id, 'dailies') is None
+        prefetcher.shutdown(wait=True)
+
+    def test_prefetch_version_lets_poller_catch_up(self, prefetcher, alchemy_ctrl, seed_data):
+        server_id = seed_data["server"].id
+        event = alchemy_ctrl.create_alchemy_event(server_id, "Precarga", 30)
+        prefetched = prefetcher.load(server_id, 'dailies')
+
+        # Un cambio posterior a la precarga aparece en el journal desde su version
+        alchemy_ctrl.update_daily_status(seed_data["character"].id, event.id, 1, 1)
+        changes = alchemy_ctrl.get_changes_since(server_id, prefetched.version).changes
+        assert [(c.owner_id, c.value) for c in changes] == [(seed_data["character"].id, 1)]
@@ -9,7 +9,7 @@ def mock_session():
 
 @pytest.fixture
 def controller(mock_session):
-    with patch('app.application.services.base_service.create_engine'), \
+    with patch('app.application.services.base_service.create_db_engine'), \
          patch('app.application.services.base_service.sessionmaker'):
         ctrl = AlchemyService()
         ctrl.get_session = MagicMock(return_value=mock_session) # Use get_session returning mock
@@ -0,0 +1,133 @@
+"""
+Tests del backup por servidor: ida y vuelta completa, ids remapeados y clonado a otra base.
+"""
+import gzip
+import json
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.domain.base import Base
+from app.domain.models import (
+    Server, StoreAccount, GameAccount, Character, CharacterType, FishingActivity,
+    DailyCorActivity, TombolaActivity
+)
+from app.application.services.alchemy_service import AlchemyService
+from app.application.services.archive_service import ArchiveService
+from app.application.services.backup_service import BackupService
+from app.application.services.fishing_service import FishingService
+from app.application.services.tombola_service import TombolaService
+
+
+@pytest.fixture
+def populated(test_db, seed_data):
+    server_id = seed_data['server'].id
+    char_id, account_id = seed_data['character'].id, seed_data['game_account'].id
+    alchemy = AlchemyService(test_db)
+    event = alchemy.create_alchemy_event(server_id, "Alquimia", 5)
+    alchemy.update_daily_status(char_id, 1, 1, event.id)
+    alchemy.update_daily_status(char_id, 2, -1, event.id)
+    alchemy.update_daily_cords(account_id, event.id, 1, 7)
+    alchemy.update_alchemy_count(event.id, "diamante", 3)
+    archived = alchemy.create_alchemy_event(server_id, "Archivada", 3)
+    alchemy.update_daily_status(char_id, 3, 1, archived.id)
+    ArchiveService(test_db).archive_event('alchemy', archived.id)
+
+    tombola = TombolaService(test_db)
+    tombola_event = tombola.create_tombola_event(server_id, "Tombola")
+    tombola.update_daily_status(char_id, 2, 1, tombola_event.id)
+    tombola.update_tombola_item_count(tombola_event.id, "cofre", 4)
+    FishingService(test_db).update_fishing_status(char_id, 2025, 3, 2, 1)
+
+    # Otro servidor que no debe entrar en el backup
+    other = Server(name="Otro")
+    test_db.add(other)
+    test_db.flush()
+    test_db.add(GameAccount(username="Ajeno", server_id=other.id))
+    test_db.commit()
+    return {'event': event, 'archived': archived, 'tombola_event': tombola_event, **seed_data}
+
+
+def _dashboard(service, server_id, event_id):
+    dto = service.get_alchemy_dashboard_data(server_id, event_id=event_id)
+    char = dto.store_accounts[0].game_accounts[0].characters[0]
+    return dict(char.daily_status_map), service.get_all_daily_cords(event_id)
+
+
+def test_backup_writes_only_the_server(test_db, populated, tmp_path):
+    path = tmp_path / "servidor.ndjson.gz"
+    rows = BackupService(test_db).backup_server(populated['server'].id, str(path))
+
+    lines = [json.loads(line) for line in gzip.open(path, 'rt', encoding='utf-8')]
+    assert lines[0]['format'] == 'metinforge-server' and lines[0]['server'] == "TestServer"
+    assert lines[-1] == {'end': True, 'rows': rows}
+    sections = {line['table']: i for i, line in enumerate(lines) if isinstance(line, dict) and 'table' in line}
+    accounts = lines[sections['game_accounts'] + 1:sections['characters']]
+    assert [row[1] for row in accounts] == ["TestUser"]
+
+
+@pytest.mark.parametrize("returning", [True, False], ids=["returning", "lastrowid"])
+def test_restore_same_database_remaps_ids(test_db, populated, tmp_path, monkeypatch, returning):
+    # Sin RETURNING (como MySQL) los ids se leen fila por fila
+    monkeypatch.setattr(test_db.get_bind().dialect, 'insert_executemany_returning_sort_by_parameter_order',
+                        returning)
+    path = tmp_path / "servidor.ndjson.gz"
+    service = BackupService(test_db)
+    service.backup_server(populated['server'].id, str(path))
+
+    assert service.restore_server(str(path)) is None  # el nombre ya existe
+    new_id = service.restore_server(str(path), server_name="Copia")
+
+    assert new_id != populated['server'].id
+    assert test_db.query(StoreAccount).count() == 1  # la tienda se reutiliza por email
+    account = test_db.query(GameAccount).filter_by(server_id=new_id).one()
+    assert account.store_account_id == populated['store'].id
+    char = test_db.query(Character).filter_by(game_account_id=account.id).one()
+    assert char.char_type == CharacterType.ALCHEMIST and char.id != populated['character'].id
+    assert test_db.query(FishingActivity).filter_by(character_id=char.id).count() == 1
+    assert test_db.query(TombolaActivity).filter_by(character_id=char.id).count() == 1
+
+    alchemy = AlchemyService(test_db)
+    events = {e.name: e for e in alchemy.get_alchemy_events(new_id, include_archived=True)}
+    assert _dashboard(alchemy, new_id, events["Alquimia"].id) == ({1: 1, 2: -1}, {account.id: {1: 7}})
+    assert _dashboard(alchemy, new_id, events["Archivada"].id)[0] == {3: 1}
+    assert alchemy.get_event_totals(events["Alquimia"].id).cords == 7
+    assert alchemy.get_event_totals(events["Archivada"].id).completed == 1
+
+
+def test_clone_into_empty_database(test_db, populated, tmp_path):
+    path = tmp_path / "servidor.ndjson.gz"
+    rows = BackupService(test_db).backup_server(populated['server'].id, str(path))
+    target = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(target)
+
+    server_id = BackupService.bound_to(target)().restore_server(str(path))
+
+    session = sessionmaker(bind=target)()
+    try:
+        assert session.get(Server, server_id).name == "TestServer"
+        assert session.query(GameAccount).count() == 1
+        assert session.query(DailyCorActivity).count() == 2
+        copy = BackupService(session).backup_server(server_id, str(tmp_path / "copia.ndjson.gz"))
+        assert copy == rows
+    finally:
+        session.close()
+        target.dispose()
+
+
+def test_truncated_backup_restores_nothing(test_db, populated, tmp_path):
+    path = tmp_path / "servidor.ndjson.gz"
+    BackupService(test_db).backup_server(populated['server'].id, str(path))
+    lines = gzip.open(path, 'rt', encoding='utf-8').read().splitlines()
+    truncated = tmp_path / "cortado.ndjson.gz"
+    with gzip.open(truncated, 'wt', encoding='utf-8') as out:
+        out.write('\n'.join(lines[:-3]) + '\n')
+    target = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(target)
+
+    assert BackupService.bound_to(target)().restore_server(str(truncated)) is None
+
+    session = sessionmaker(bind=target)()
+    assert session.query(Server).count() == 0 and session.query(GameAccount).count() == 0
+    session.close()
+    target.dispose()
@@ -19,7 +19,7 @@ def test_get_session_injected(service, mock_session):
 
 def test_get_session_creates_new():
     """Sin session inyectada, crea una nueva."""
-    with patch('app.application.services.base_service.create_engine') as mock_engine, \
+    with patch('app.application.services.base_service.create_db_engine') as mock_engine, \
          patch('app.application.services.base_service.sessionmaker') as mock_maker:
         svc = BaseService()
         session = svc.get_session()
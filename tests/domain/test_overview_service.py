@@ -0,0 +1,133 @@
+"""
+Tests del resumen de servidores: totales por feature, consultas fijas y refresco incremental.
+"""
+import pytest
+from sqlalchemy import event
+from app.domain.models import Server, GameAccount, Character, CharacterType
+from app.application.services.alchemy_service import AlchemyService
+from app.application.services.archive_service import ArchiveService
+from app.application.services.fishing_service import FishingService
+from app.application.services.overview_service import OverviewService
+from app.application.services.tombola_service import TombolaService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def populated(test_db, seed_data):
+    server_id = seed_data['server'].id
+    char_id, account_id = seed_data['character'].id, seed_data['game_account'].id
+    alchemy = AlchemyService(test_db)
+    archived = alchemy.create_alchemy_event(server_id, "Vieja", 3)
+    alchemy.update_daily_status(char_id, 1, 1, archived.id)
+    ArchiveService(test_db).archive_event('alchemy', archived.id)
+    event_ = alchemy.create_alchemy_event(server_id, "Activa", 5)
+    alchemy.update_daily_status(char_id, 1, 1, event_.id)
+    alchemy.update_daily_status(char_id, 2, -1, event_.id)
+    alchemy.update_daily_cords(account_id, event_.id, 1, 7)
+    alchemy.update_alchemy_count(event_.id, "diamante", 3)
+
+    tombola = TombolaService(test_db)
+    tombola_event = tombola.create_tombola_event(server_id, "Tombola")
+    tombola.update_daily_status(char_id, 2, 1, tombola_event.id)
+    tombola.update_tombola_item_count(tombola_event.id, "cofre", 4)
+    FishingService(test_db).update_fishing_status(char_id, 2025, 3, 2, 1)
+
+    # Segundo servidor sin eventos ni pesca
+    other = Server(name="Otro", has_dailies=True, has_fishing=False, has_tombola=True)
+    test_db.add(other)
+    test_db.flush()
+    account = GameAccount(username="Ajeno", server_id=other.id)
+    test_db.add(account)
+    test_db.flush()
+    test_db.add(Character(name="AjenoChar", char_type=CharacterType.ALCHEMIST, game_account_id=account.id))
+    test_db.commit()
+    return {'event': event_, 'tombola_event': tombola_event, 'other': other, **seed_data}
+
+
+def _by_name(overview):
+    return {server.name: server for server in overview.servers}
+
+
+def test_totals_per_server_and_feature(test_db, populated):
+    servers = _by_name(OverviewService(test_db).get_overview(2025))
+
+    main = servers["TestServer"]
+    assert (main.accounts, main.characters) == (1, 1)
+    alchemy = main.features['alchemy']
+    assert alchemy.scope_id == populated['event'].id and alchemy.name == "Activa"
+    assert (alchemy.completed, alchemy.failed, alchemy.pending, alchemy.cords) == (1, 1, 3, 7)
+    assert alchemy.counters == {"diamante": 3}
+    tombola = main.features['tombola']
+    assert (tombola.completed, tombola.pending, tombola.counters) == (1, 30, {"cofre": 4})
+    fishing = main.features['fishing']
+    assert (fishing.scope_id, fishing.completed, fishing.pending) == (2025, 1, 47)
+
+    other = servers["Otro"]
+    assert set(other.features) == {'alchemy', 'tombola'}
+    assert other.features['alchemy'].scope_id is None and other.features['alchemy'].pending == 0
+
+
+def test_pending_counts_one_character_per_account(test_db, populated):
+    # Las grillas solo muestran (y registran) el primer personaje de cada cuenta
+    test_db.add(Character(name="Segundo", char_type=CharacterType.ALCHEMIST,
+                          game_account_id=populated['game_account'].id))
+    test_db.commit()
+
+    main = _by_name(OverviewService(test_db).get_overview(2025))["TestServer"]
+    assert main.characters == 2
+    alchemy, tombola = main.features['alchemy'], main.features['tombola']
+    assert (alchemy.characters, alchemy.completed, alchemy.failed, alchemy.pending) == (1, 1, 1, 3)
+    assert (tombola.characters, tombola.completed, tombola.pending) == (1, 1, 30)
+    fishing = main.features['fishing']
+    assert (fishing.characters, fishing.completed, fishing.pending) == (1, 1, 47)
+
+
+def test_query_count_does_not_grow_with_servers(test_db, populated):
+    statements = []
+
+    def count(*args):
+        statements.append(args)
+
+    bind = test_db.get_bind()
+    event.listen(bind, 'before_cursor_execute', count)
+    try:
+        OverviewService(test_db).get_overview(2025)
+        few = len(statements)
+        for i in range(5):
+            server = Server(name=f"Extra {i}")
+            test_db.add(server)
+            test_db.flush()
+            AlchemyService(test_db).create_alchemy_event(server.id, f"Evento {i}", 3)
+        statements.clear()
+        OverviewService(test_db).get_overview(2025)
+        assert len(statements) == few
+    finally:
+        event.remove(bind, 'before_cursor_execute', count)
+
+
+def test_refresh_recomputes_only_changed_servers(test_db, populated):
+    clock = FakeClock()
+    service = OverviewService(test_db, clock=clock)
+    first = service.get_overview(2025)
+    assert service.get_overview(2025) is first
+
+    AlchemyService(test_db).update_daily_status(populated['character'].id, 3, 1, populated['event'].id)
+    second = service.get_overview(2025)
+    assert second.version > first.version
+    assert _by_name(second)["TestServer"].features['alchemy'].completed == 2
+    # El servidor sin cambios se reutiliza tal cual
+    assert _by_name(second)["Otro"] is _by_name(first)["Otro"]
+
+    # Lo que no pasa por el journal aparece en la recarga completa
+    test_db.add(GameAccount(username="Nueva", server_id=populated['other'].id))
+    test_db.commit()
+    assert _by_name(service.get_overview(2025))["Otro"].accounts == 1
+    clock.now += 3600
+    assert _by_name(service.get_overview(2025))["Otro"].accounts == 2
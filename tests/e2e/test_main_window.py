@@ -17,8 +17,8 @@ def test_app_launch(qtbot):
     # Wait for window to be exposed
     qtbot.waitForWindowShown(window)
     
-    # Check if central widget is MainMenuView
-    assert isinstance(window.centralWidget(), MainMenuView)
+    # Check if current view is MainMenuView
+    assert isinstance(window.current_view(), MainMenuView)
     
     # Check title
     assert window.windowTitle() == "MetinForge Manager v1.0"
@@ -45,7 +45,7 @@ def test_navigation_to_server_selection(qtbot):
         window.show()
         
         # Get Main Menu
-        main_menu = window.centralWidget()
+        main_menu = window.current_view()
         assert isinstance(main_menu, MainMenuView)
         
         # Find the 'GESTIONAR SERVIDORES' button
@@ -61,8 +61,8 @@ def test_navigation_to_server_selection(qtbot):
         # Click the button
         qtbot.mouseClick(server_btn, Qt.MouseButton.LeftButton)
         
-        # Check if central widget changed to ServerSelectionView
-        assert isinstance(window.centralWidget(), ServerSelectionView)
+        # Check if current view changed to ServerSelectionView
+        assert isinstance(window.current_view(), ServerSelectionView)
 
 
 def test_back_from_server_selection(qtbot):
@@ -77,7 +77,7 @@ def test_back_from_server_selection(qtbot):
         qtbot.addWidget(window)
         window.show()
         
-        main_menu = window.centralWidget()
+        main_menu = window.current_view()
         buttons = main_menu.findChildren(QPushButton)
         server_btn = None
         for btn in buttons:
@@ -87,10 +87,10 @@ def test_back_from_server_selection(qtbot):
         
         assert server_btn is not None
         qtbot.mouseClick(server_btn, Qt.MouseButton.LeftButton)
-        assert isinstance(window.centralWidget(), ServerSelectionView)
+        assert isinstance(window.current_view(), ServerSelectionView)
         
         # Find back button
-        server_view = window.centralWidget()
+        server_view = window.current_view()
         back_buttons = server_view.findChildren(QPushButton)
         back_btn = None
         for btn in back_buttons:
@@ -100,7 +100,7 @@ def test_back_from_server_selection(qtbot):
         
         if back_btn:
             qtbot.mouseClick(back_btn, Qt.MouseButton.LeftButton)
-            assert isinstance(window.centralWidget(), MainMenuView)
+            assert isinstance(window.current_view(), MainMenuView)
 
 
 def test_feature_selection_navigation(qtbot):
@@ -123,7 +123,7 @@ def test_feature_selection_navigation(qtbot):
         window.show()
         
         # Navigate to server selection
-        main_menu = window.centralWidget()
+        main_menu = window.current_view()
         buttons = main_menu.findChildren(QPushButton)
         server_btn = None
         for btn in buttons:
@@ -135,7 +135,7 @@ def test_feature_selection_navigation(qtbot):
         qtbot.mouseClick(server_btn, Qt.MouseButton.LeftButton)
         
         # Verify we're in ServerSelectionView and it has the right signals
-        server_view = window.centralWidget()
+        server_view = window.current_view()
         assert isinstance(server_view, ServerSelectionView)
         assert hasattr(server_view, 'serverSelected')
         assert hasattr(server_view, 'backRequested')
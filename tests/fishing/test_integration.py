@@ -4,6 +4,7 @@ Tests de integración para Fishing: flujos CRUD completos y lógica de semanas p
 import pytest
 from app.application.services.fishing_service import FishingService
 from app.domain.models import FishingActivity, Character
+from app.utils.config import Config
 
 class SessionProxy:
     """Proxy que delega todo a la sesión de SQLAlchemy excepto close()."""
@@ -90,3 +91,56 @@ class TestFishingIntegration:
         
         assert char_dto.fishing_activity_map['1_1'] == 1
         assert char_dto.fishing_activity_map['1_2'] == -1
+
+    def test_get_fishing_data_with_matrix(self, fishing_ctrl, test_db, seed_data):
+        from app.application.services import status_matrix
+        char_id = seed_data['character'].id
+        fishing_ctrl.update_fishing_status(char_id, 2026, 1, 1, 1)
+        fishing_ctrl.update_fishing_status(char_id, 2026, 3, 2, -1)
+
+        data, matrix = fishing_ctrl.get_fishing_data(seed_data['server'].id, 2026, with_matrix=True)
+
+        assert matrix.values.shape == (1, 48)
+        row = matrix.row_index[char_id]
+        assert matrix.values[row, matrix.column_index['1_1']] == 1
+        assert matrix.values[row, matrix.column_index['3_2']] == -1
+        totals = status_matrix.totals(matrix)
+        assert (totals.completed, totals.failed, status_matrix.pending(matrix)) == (1, 1, 46)
+
+
+class TestSparseStorage:
+    """Modo disperso: pendiente = sin fila."""
+
+    @pytest.fixture(autouse=True)
+    def sparse(self, monkeypatch):
+        monkeypatch.setattr(Config, 'SPARSE_ACTIVITIES', True)
+
+    def test_pending_deletes_row(self, fishing_ctrl, test_db, seed_data):
+        char_id = seed_data["character"].id
+        fishing_ctrl.update_fishing_status(char_id, 2026, 2, 1, 1)
+        assert fishing_ctrl.update_fishing_status(char_id, 2026, 2, 1, 0) is True
+
+        assert test_db.query(FishingActivity).filter_by(character_id=char_id, year=2026).count() == 0
+        assert fishing_ctrl.get_year_totals(seed_data["server"].id, 2026).completed == 0
+
+    def test_compaction_removes_legacy_zero_rows(self, test_db, seed_data):
+        from app.application.services.archive_service import ArchiveService
+        char_id = seed_data["character"].id
+        test_db.add_all([
+            FishingActivity(character_id=char_id, year=2025, month=m, week=1, status_code=0) for m in range(1, 6)
+        ] + [FishingActivity(character_id=char_id, year=2025, month=6, week=1, status_code=1)])
+        test_db.commit()
+
+        deleted = ArchiveService(test_db).compact_pending_rows(chunk_size=2)
+
+        assert deleted['fishing_activities'] == 5
+        assert test_db.query(FishingActivity).filter_by(character_id=char_id, year=2025).count() == 1
+
+    def test_compaction_is_skipped_without_sparse_mode(self, test_db, seed_data, monkeypatch):
+        from app.application.services.archive_service import ArchiveService
+        monkeypatch.setattr(Config, 'SPARSE_ACTIVITIES', False)
+        test_db.add(FishingActivity(character_id=seed_data["character"].id, year=2025, month=1, week=1, status_code=0))
+        test_db.commit()
+
+        assert ArchiveService(test_db).compact_pending_rows() == {}
+        assert test_db.query(FishingActivity).filter_by(year=2025).count() == 1
@@ -10,7 +10,7 @@ def mock_session():
 
 @pytest.fixture
 def service(mock_session):
-    with patch('app.application.services.base_service.create_engine'), \
+    with patch('app.application.services.base_service.create_db_engine'), \
          patch('app.application.services.base_service.sessionmaker'):
         svc = FishingService()
         svc.get_session = MagicMock(return_value=mock_session)
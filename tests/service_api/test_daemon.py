@@ -0,0 +1,235 @@
+"""
+Tests del demonio local de servicios: JSON-RPC en localhost, cache compartida y adaptador del cliente.
+"""
+import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.domain.base import Base
+from app.domain.models import Server, StoreAccount, GameAccount, Character, CharacterType
+from app.application.dtos import BatchWriteResultDTO, DayStatusMap, EventTotalsDTO
+from app.application.services.alchemy_service import AlchemyService
+from app.application.services.base_service import BaseService
+from app.application.services.fishing_service import FishingService
+from app.application.services.tombola_service import TombolaService
+from app.service_api import codec
+from app.service_api.client import RemoteService, RpcError, ServiceClient, ServiceUnavailable
+from app.service_api.daemon import ResponseCache, ServiceDaemon
+from app.utils.db_engine import create_db_engine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'daemon.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    server = Server(name="RpcServer")
+    store = StoreAccount(email="rpc@store.com")
+    session.add_all([server, store])
+    session.flush()
+    account = GameAccount(username="RpcUser", store_account_id=store.id, server_id=server.id)
+    session.add(account)
+    session.flush()
+    session.add(Character(name="RpcChar", char_type=CharacterType.ALCHEMIST, game_account_id=account.id))
+    session.commit()
+    session.close()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def local(engine):
+    return {'alchemy': AlchemyService.bound_to(engine)(), 'fishing': FishingService.bound_to(engine)(),
+            'tombola': TombolaService.bound_to(engine)()}
+
+
+@pytest.fixture
+def daemon(local):
+    daemon = ServiceDaemon(local, host='127.0.0.1', port=0, cache=ResponseCache(size=32, ttl=60), token='')
+    daemon.start()
+    yield daemon
+    daemon.stop()
+
+
+@pytest.fixture
+def client(daemon):
+    client = ServiceClient(daemon.url, timeout=5, token='')
+    yield client
+    client.close()
+
+
+def test_codec_round_trips_service_results():
+    value = {
+        'dto': BatchWriteResultDTO(versions={(1, 2): 3}, conflicts=[(4, 5)]),
+        'map': DayStatusMap({1: 1, 3: -1}),
+        'by_day': {1: EventTotalsDTO(completed=2)},
+        'when': (datetime.date(2025, 1, 2), datetime.datetime(2025, 1, 2, 3, 4)),
+        'kind': CharacterType.FISHERMAN,
+        'matrix': np.array([[1, -1], [0, 1]], dtype=np.int8),
+    }
+    decoded = codec.loads(codec.dumps(value))
+
+    assert decoded['dto'].versions == {(1, 2): 3} and decoded['dto'].conflicts == [(4, 5)]
+    assert isinstance(decoded['map'], DayStatusMap) and dict(decoded['map']) == {1: 1, 3: -1}
+    assert decoded['by_day'][1].completed == 2
+    assert decoded['when'] == value['when'] and decoded['kind'] is CharacterType.FISHERMAN
+    assert decoded['matrix'].dtype == np.int8 and (decoded['matrix'] == value['matrix']).all()
+
+
+def test_remote_service_matches_local(daemon, client, local):
+    remote = RemoteService('alchemy', AlchemyService, client)
+    server = remote.get_servers()[0]
+    event = remote.create_alchemy_event(server.id, "Remoto", 5)
+    char_id = local['alchemy'].get_alchemy_dashboard_data(server.id, event_id=event.id) \
+        .store_accounts[0].game_accounts[0].characters[0].id
+
+    assert remote.update_daily_status(char_id, 2, 1, event.id) is True
+    result = remote.update_daily_status_batch(event.id, [(char_id, 3, -1, None)])
+    assert (char_id, 3) in result.versions
+
+    dashboard = remote.get_alchemy_dashboard_data(server.id, event_id=event.id)
+    character = dashboard.store_accounts[0].game_accounts[0].characters[0]
+    assert server.name == "RpcServer"
+    assert dict(character.daily_status_map) == {2: 1, 3: -1}
+    assert remote.get_event_totals(event.id) == local['alchemy'].get_event_totals(event.id)
+
+
+def test_reads_are_cached_until_data_changes(daemon, client, local):
+    remote = RemoteService('alchemy', AlchemyService, client)
+    server_id = remote.get_servers()[0].id
+    event = local['alchemy'].create_alchemy_event(server_id, "Cache", 5)
+    calls = daemon.calls
+
+    first = remote.get_alchemy_dashboard_data(server_id, event_id=event.id)
+    remote.get_alchemy_dashboard_data(server_id, event_id=event.id)
+    assert daemon.calls == calls + 1 and daemon.cache.hits >= 1
+
+    # Un cambio de otro puesto (directo a la base) mueve el journal: la cache ya no vale
+    char_id = first.store_accounts[0].game_accounts[0].characters[0].id
+    local['alchemy'].update_daily_status(char_id, 1, 1, event.id)
+    fresh = remote.get_alchemy_dashboard_data(server_id, event_id=event.id)
+    assert daemon.calls == calls + 2
+    assert fresh.store_accounts[0].game_accounts[0].characters[0].daily_status_map[1] == 1
+
+    # Una escritura por el demonio vacia la cache
+    remote.create_alchemy_event(server_id, "Otro", 3)
+    assert len(remote.get_alchemy_events(server_id)) == 2
+
+
+def test_identical_concurrent_reads_hit_the_database_once(engine):
+    class SlowService(BaseService):
+        runs = 0
+
+        def get_slow(self, value):
+            SlowService.runs += 1
+            time.sleep(0.2)
+            return value * 2
+
+    daemon = ServiceDaemon({'slow': SlowService.bound_to(engine)()}, host='127.0.0.1', port=0,
+                           cache=ResponseCache(size=8, ttl=60), token='')
+    daemon.start()
+    try:
+        client = ServiceClient(daemon.url, timeout=5, token='')
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: client.call('slow.get_slow', {'value': 21}), range(4)))
+        assert results == [42] * 4
+        assert SlowService.runs == 1
+    finally:
+        daemon.stop()
+
+
+def test_only_public_service_methods_are_exposed(daemon, client):
+    for method in ("alchemy.session_scope", "alchemy._delete_in_chunks", "alchemy.nada", "timer.get_timers"):
+        with pytest.raises(RpcError) as error:
+            client.call(method)
+        assert error.value.code == -32601
+    with pytest.raises(RpcError) as error:
+        client.call("alchemy.get_alchemy_events", {'nope': 1})
+    assert error.value.code == -32602
+    assert client.health()['status'] == 'ok'
+
+
+def test_token_is_required_when_configured(local):
+    daemon = ServiceDaemon(local, host='127.0.0.1', port=0, token='secreto')
+    daemon.start()
+    try:
+        with pytest.raises(RpcError):
+            ServiceClient(daemon.url, timeout=5, token='').call('alchemy.get_servers')
+        assert ServiceClient(daemon.url, timeout=5, token='secreto').call('alchemy.get_servers')[0].name == "RpcServer"
+    finally:
+        daemon.stop()
+
+
+def test_falls_back_to_local_service_when_daemon_is_down(engine):
+    daemon = ServiceDaemon({}, host='127.0.0.1', port=0)
+    daemon.start()
+    url = daemon.url
+    daemon.stop()  # puerto libre: nadie escucha
+    client = ServiceClient(url, timeout=1, token='')
+
+    with pytest.raises(ServiceUnavailable):
+        RemoteService('alchemy', AlchemyService, client).get_servers()
+    remote = RemoteService('alchemy', AlchemyService, client, fallback=AlchemyService.bound_to(engine))
+    assert remote.get_servers()[0].name == "RpcServer"
+
+
+def test_writes_with_unknown_outcome_are_not_repeated_locally(engine):
+    import socket
+    # El demonio acepta la conexion pero no responde: timeout con la llamada ya enviada
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen()
+    client = ServiceClient(f"http://127.0.0.1:{listener.getsockname()[1]}", timeout=0.2, token='')
+    remote = RemoteService('alchemy', AlchemyService, client, fallback=AlchemyService.bound_to(engine))
+    local = AlchemyService.bound_to(engine)()
+    try:
+        event = local.create_alchemy_event(local.get_servers()[0].id, "Timeout", 5)
+        char_id = local.get_alchemy_dashboard_data(event.server_id, event_id=event.id) \
+            .store_accounts[0].game_accounts[0].characters[0].id
+
+        with pytest.raises(ServiceUnavailable):
+            remote.update_daily_status(char_id, 1, 1, event.id)
+        assert local.get_event_totals(event.id).completed == 0
+        # Las lecturas si se resuelven contra la base
+        assert remote.get_servers()[0].name == "RpcServer"
+    finally:
+        client.close()
+        listener.close()
+
+
+def test_cut_connections_retry_reads_but_not_writes():
+    import socket
+    # El demonio lee cada peticion y corta sin responder: no se sabe si se aplico
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen()
+    listener.settimeout(0.1)
+    received, stop = [], []
+
+    def serve():
+        while not stop:
+            try:
+                conn, _ = listener.accept()
+            except socket.timeout:
+                continue
+            with conn:
+                received.append(conn.recv(65536))
+
+    client = ServiceClient(f"http://127.0.0.1:{listener.getsockname()[1]}", timeout=2, token='')
+    with ThreadPoolExecutor(1) as pool:
+        pool.submit(serve)
+        try:
+            with pytest.raises(ServiceUnavailable) as write_error:
+                client.call('alchemy.update_daily_status', {'char_id': 1, 'day_index': 1,
+                                                            'new_status': 1, 'event_id': 1})
+            assert not write_error.value.refused and len(received) == 1
+
+            with pytest.raises(ServiceUnavailable):
+                client.call('alchemy.get_servers')
+            assert len(received) == 3
+        finally:
+            stop.append(True)
+            client.close()
+    listener.close()
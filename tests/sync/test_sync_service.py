@@ -0,0 +1,167 @@
+import datetime
+import pytest
+from sqlalchemy.orm import sessionmaker
+from app.domain.base import Base
+from app.domain.models import (
+    Server, StoreAccount, GameAccount, Character, CharacterType, AlchemyEvent,
+    DailyCorActivity, ChangeLog
+)
+from app.application.services.alchemy_service import AlchemyService
+from app.application.services.change_log import record_change, ALCHEMY_STATUS
+from app.application.services.sync_service import SyncService
+from app.utils.config import Config
+from app.utils.db_engine import create_db_engine
+
+
+@pytest.fixture
+def remote_engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'remote.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    server = Server(name="SyncServer")
+    store = StoreAccount(email="sync@store.com")
+    session.add_all([server, store])
+    session.flush()
+    ga = GameAccount(username="SyncUser", store_account_id=store.id, server_id=server.id)
+    session.add(ga)
+    session.flush()
+    session.add(Character(name="SyncChar", char_type=CharacterType.ALCHEMIST, game_account_id=ga.id))
+    session.add(AlchemyEvent(server_id=server.id, name="Evento", total_days=7))
+    session.commit()
+    session.close()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def local_engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'local.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _status(engine, day):
+    session = sessionmaker(bind=engine)()
+    try:
+        row = session.query(DailyCorActivity).filter_by(character_id=1, event_id=1, day_index=day).first()
+        return row.status_code if row else None
+    finally:
+        session.close()
+
+
+def _remote_write(engine, day, value, origin, changed_at):
+    session = sessionmaker(bind=engine)()
+    session.add(DailyCorActivity(character_id=1, event_id=1, day_index=day, status_code=value))
+    record_change(session, ALCHEMY_STATUS, 1, 1, 1, day, value, origin=origin, changed_at=changed_at)
+    session.commit()
+    session.close()
+
+
+def test_bootstrap_copies_remote_state(local_engine, remote_engine):
+    sync = SyncService(local_engine, remote_engine, origin=Config.CLIENT_ID)
+    assert sync.needs_bootstrap()
+
+    copied = sync.bootstrap()
+
+    assert copied >= 5
+    assert not sync.needs_bootstrap()
+    session = sessionmaker(bind=local_engine)()
+    assert session.query(Character).filter_by(name="SyncChar").count() == 1
+    session.close()
+
+
+def test_push_sends_local_writes(local_engine, remote_engine):
+    sync = SyncService(local_engine, remote_engine, origin=Config.CLIENT_ID)
+    sync.bootstrap()
+
+    service = AlchemyService.bound_to(local_engine)()
+    service.update_daily_status(1, 2, 1, 1)
+
+    pushed, _ = sync.sync_once()
+
+    assert pushed == 1
+    assert _status(remote_engine, 2) == 1
+    # Un segundo ciclo no reenvia nada
+    assert sync.sync_once() == (0, 0)
+
+
+def test_pull_applies_changes_from_other_clients(local_engine, remote_engine):
+    sync = SyncService(local_engine, remote_engine, origin=Config.CLIENT_ID)
+    sync.bootstrap()
+
+    _remote_write(remote_engine, 3, -1, "puesto-b", datetime.datetime.utcnow())
+
+    _, pulled = sync.sync_once()
+
+    assert pulled == 1
+    assert _status(local_engine, 3) == -1
+
+
+def test_last_writer_wins_on_conflict(local_engine, remote_engine):
+    sync = SyncService(local_engine, remote_engine, origin=Config.CLIENT_ID)
+    sync.bootstrap()
+
+    # Escritura local offline, posterior a la remota
+    service = AlchemyService.bound_to(local_engine)()
+    service.update_daily_status(1, 4, 1, 1)
+    _remote_write(remote_engine, 4, -1, "puesto-b", datetime.datetime.utcnow() - datetime.timedelta(minutes=5))
+
+    sync.sync_once()
+
+    assert _status(local_engine, 4) == 1
+    assert _status(remote_engine, 4) == 1
+    session = sessionmaker(bind=local_engine)()
+    # La entrada remota perdedora no se copia al journal local
+    assert session.query(ChangeLog).filter_by(slot="4").count() == 1
+    session.close()
+
+
+def test_offline_counter_increments_are_added(local_engine, remote_engine, monkeypatch):
+    sync = SyncService(local_engine, remote_engine, origin="puesto-a")
+    sync.bootstrap()
+    local = AlchemyService.bound_to(local_engine)()
+    remote = AlchemyService.bound_to(remote_engine)()
+
+    # Ambos puestos parten de 5 y suman offline: 2 aca, 3 en el otro
+    monkeypatch.setattr(Config, 'CLIENT_ID', "puesto-b")
+    remote.update_alchemy_count(1, "diamante", 5)
+    sync.sync_once()
+    remote.update_alchemy_count(1, "diamante", 8)
+    monkeypatch.setattr(Config, 'CLIENT_ID', "puesto-a")
+    local.increment_alchemy(1, "diamante", 2)
+
+    sync.sync_once()
+    assert sync.sync_once() == (0, 0)
+
+    assert local.get_alchemy_counters(1)["diamante"] == 10
+    assert remote.get_alchemy_counters(1)["diamante"] == 10
+
+
+def test_bootstrap_refuses_to_overwrite_unpushed_changes(local_engine, remote_engine):
+    sync = SyncService(local_engine, remote_engine, origin=Config.CLIENT_ID)
+    sync.bootstrap()
+    AlchemyService.bound_to(local_engine)().update_daily_status(1, 3, 1, 1)
+    assert sync.unpushed_count() == 1
+
+    with pytest.raises(RuntimeError):
+        sync.bootstrap()
+    assert _status(local_engine, 3) == 1
+
+    sync.sync_once()
+    assert sync.unpushed_count() == 0
+    sync.bootstrap()
+    assert _status(local_engine, 3) == 1
+
+
+def test_structural_writes_are_blocked_on_the_replica(local_engine, remote_engine, monkeypatch):
+    SyncService(local_engine, remote_engine, origin=Config.CLIENT_ID).bootstrap()
+    monkeypatch.setattr(Config, 'DB_BACKEND', 'replica')
+    service = AlchemyService.bound_to(local_engine)()
+
+    assert service.create_server("Local") is False
+    assert service.create_game_account(1, "Nueva", store_email="sync@store.com") is False
+    assert service.update_game_account(1, "Renombrada", 1) is False
+    assert service.create_alchemy_event(1, "Local", 5) is None
+    assert [s.name for s in service.get_servers()] == ["SyncServer"]
+    # Los estados pasan por el journal: siguen permitidos
+    assert service.update_daily_status(1, 2, 1, 1) is True
@@ -0,0 +1,127 @@
+"""
+Tests de CountdownService y de la restauracion de temporizadores flotantes.
+"""
+import datetime
+import pytest
+from PyQt6.QtWidgets import QApplication
+from app.application.dtos import CountdownTimerDTO
+from app.application.services.countdown_service import CountdownService
+from app.presentation.views.widgets.floating_countdown import SingleTimerWidget
+from app.utils.tick_scheduler import TickScheduler
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+@pytest.fixture
+def countdown_ctrl(test_db):
+    return CountdownService(test_db, owner="puesto-1")
+
+
+def test_save_timers_replaces_station_state(countdown_ctrl, test_db):
+    deadline = datetime.datetime(2026, 1, 1, 12, 5, 0)
+    countdown_ctrl.save_timers([CountdownTimerDTO(300, 300000), CountdownTimerDTO(60, 0)])
+    countdown_ctrl.save_timers([CountdownTimerDTO(120, 90000, deadline_at=deadline)])
+
+    timers = countdown_ctrl.get_timers()
+    assert [(t.duration_seconds, t.remaining_ms, t.deadline_at) for t in timers] == [(120, 90000, deadline)]
+    # Otro puesto no ve estos temporizadores
+    assert CountdownService(test_db, owner="puesto-2").get_timers() == []
+
+
+def test_load_preset_replaces_timers_in_order(countdown_ctrl):
+    durations = [60 * (i + 1) for i in range(20)]
+    preset = countdown_ctrl.save_preset("Bosses", durations)
+    countdown_ctrl.save_timers([CountdownTimerDTO(5, 5000)])
+
+    loaded = countdown_ctrl.load_preset(preset.id)
+
+    assert [t.duration_seconds for t in loaded] == durations
+    stored = countdown_ctrl.get_timers()
+    assert [t.duration_seconds for t in stored] == durations
+    assert all(t.remaining_ms == t.duration_seconds * 1000 and t.deadline_at is None for t in stored)
+
+
+def test_save_preset_with_same_name_overwrites(countdown_ctrl):
+    countdown_ctrl.save_preset("Farm", [60, 120])
+    countdown_ctrl.save_preset("Farm", [30])
+
+    presets = countdown_ctrl.get_presets()
+    assert [(p.name, p.durations) for p in presets] == [("Farm", [30])]
+    assert countdown_ctrl.load_preset(9999) is None
+
+
+def test_running_timer_restores_from_wall_clock_deadline(qapp):
+    clock = {'ms': 1000}
+    scheduler = TickScheduler(clock=lambda: clock['ms'])
+    now_utc = datetime.datetime(2026, 1, 1, 12, 0, 0)
+    dto = CountdownTimerDTO(300, 300000, deadline_at=now_utc + datetime.timedelta(seconds=90))
+
+    widget = SingleTimerWidget(None, scheduler=scheduler)
+    widget.restore(dto, now_utc)
+
+    assert widget.is_running
+    assert widget.current_remaining_ms() == 90000
+    assert widget.time_label.text() == "00:01:30"
+    clock['ms'] += 30000
+    snapshot = widget.snapshot(now_utc + datetime.timedelta(seconds=30))
+    assert snapshot.remaining_ms == 60000
+    assert snapshot.deadline_at == dto.deadline_at
+    widget.halt()
+
+
+def test_timer_expired_while_closed_restores_finished(qapp):
+    scheduler = TickScheduler(clock=lambda: 0)
+    now_utc = datetime.datetime(2026, 1, 1, 12, 0, 0)
+    dto = CountdownTimerDTO(300, 300000, deadline_at=now_utc - datetime.timedelta(minutes=5))
+
+    widget = SingleTimerWidget(None, scheduler=scheduler)
+    widget.restore(dto, now_utc)
+
+    assert not widget.is_running and not widget.is_alarming()
+    assert widget.remaining_ms == 0
+    assert not scheduler.is_subscribed(widget.on_tick)
+
+
+def test_failed_timer_save_reports_error_instead_of_raising(qapp, test_db):
+    from concurrent.futures import Future
+    from app.application.services.timer_service import TimerService
+    from app.presentation.views.widgets.floating_timer import FloatingTimer
+    widget = FloatingTimer(controller=TimerService(test_db), scheduler=TickScheduler())
+    widget.recordSaveFinished.disconnect()
+    received = []
+    widget.recordSaveFinished.connect(lambda name, ok: received.append((name, ok)))
+
+    future = Future()
+    future.set_exception(RuntimeError("base caida"))
+    widget._emit_saved("Run", future)
+
+    assert received == [("Run", False)]
+    widget.close()
+
+
+def test_countdown_changes_are_saved_once_off_the_gui_thread(qapp, qtbot, countdown_ctrl):
+    from app.presentation.views.widgets.floating_countdown import FloatingCountdown
+    saves = []
+
+    class RecordingService:
+        def get_timers(self):
+            return []
+
+        def save_timers_async(self, timers):
+            saves.append(len(timers))
+            return countdown_ctrl.save_timers_async(timers)
+
+    widget = FloatingCountdown(controller=RecordingService(), scheduler=TickScheduler())
+    widget.add_timer()
+    widget.add_timer()
+    assert saves == []
+
+    qtbot.waitUntil(lambda: bool(saves), timeout=2000)
+    assert saves == [3]
+    widget.flush_persist().result(timeout=5)
+    assert len(countdown_ctrl.get_timers()) == 3
+    widget.close()
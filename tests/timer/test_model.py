@@ -0,0 +1,50 @@
+import datetime
+import pytest
+from unittest.mock import MagicMock
+from PyQt6.QtCore import QModelIndex
+from PyQt6.QtWidgets import QApplication
+
+from app.application.dtos import TimerRecordDTO, TimerPageDTO
+from app.presentation.models.timer_history_model import TimerHistoryModel
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+
+def _record(i):
+    return TimerRecordDTO(id=i, name=f"T{i}", elapsed_seconds=3661, created_at=datetime.datetime(2026, 1, 1))
+
+
+def test_fetch_more_appends_pages_until_exhausted(qapp):
+    controller = MagicMock()
+    controller.get_records_page.side_effect = [
+        TimerPageDTO(records=[_record(3), _record(2)], next_cursor=("c", 2)),
+        TimerPageDTO(records=[_record(1)], next_cursor=None),
+    ]
+    model = TimerHistoryModel(controller, page_size=2)
+
+    model.reload()
+    assert model.rowCount() == 2
+    assert model.canFetchMore(QModelIndex())
+
+    model.fetchMore(QModelIndex())
+    assert model.rowCount() == 3
+    assert not model.canFetchMore(QModelIndex())
+    controller.get_records_page.assert_called_with(("c", 2), 2)
+    assert model.data(model.index(2, 1)) == "01:01:01"
+
+
+def test_remove_record(qapp):
+    controller = MagicMock()
+    controller.get_records_page.return_value = TimerPageDTO(records=[_record(1), _record(2)])
+    model = TimerHistoryModel(controller)
+    model.reload()
+
+    assert model.remove_record(1) is True
+    assert model.rowCount() == 1
+    assert model.data(model.index(0, 0)) == "T2"
@@ -0,0 +1,65 @@
+"""
+Tests de integración para TimerService: paginacion keyset y agregados por nombre.
+"""
+import datetime
+import pytest
+from app.application.services.timer_service import TimerService
+from app.domain.models import TimerRecord
+
+@pytest.fixture
+def timer_ctrl(test_db):
+    return TimerService(test_db)
+
+@pytest.fixture
+def records(test_db):
+    base = datetime.datetime(2026, 1, 1, 12, 0, 0)
+    rows = [
+        TimerRecord(name="Boss" if i % 2 else "Dungeon", elapsed_seconds=60 + i,
+                    # Dos registros por segundo: el desempate por id tiene que funcionar
+                    created_at=base + datetime.timedelta(seconds=i // 2))
+        for i in range(7)
+    ]
+    test_db.add_all(rows)
+    test_db.commit()
+    return rows
+
+
+def test_pages_cover_all_records_newest_first(timer_ctrl, records):
+    seen, cursor = [], None
+    while True:
+        page = timer_ctrl.get_records_page(cursor, limit=3)
+        seen.extend(page.records)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert len(seen) == 7
+    assert len({r.id for r in seen}) == 7
+    keys = [(r.created_at, r.id) for r in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_stats_by_name(timer_ctrl, records):
+    stats = {s.name: s for s in timer_ctrl.get_stats_by_name()}
+    boss = stats["Boss"]
+    assert boss.count == 3
+    assert boss.best_seconds == 61
+    assert boss.total_seconds == 61 + 63 + 65
+    assert boss.average_seconds == pytest.approx(63)
+
+
+def test_save_and_delete_record(timer_ctrl, test_db):
+    dto = timer_ctrl.save_record("  Run  ", 42)
+    assert dto.name == "Run"
+    assert timer_ctrl.save_record("", 10) is None
+
+    assert timer_ctrl.delete_record(dto.id) is True
+    assert test_db.query(TimerRecord).count() == 0
+
+
+def test_save_record_async_persists_off_thread(timer_ctrl, test_db):
+    future = timer_ctrl.save_record_async("Async", 30)
+    dto = future.result(timeout=5)
+
+    assert dto is not None
+    assert test_db.query(TimerRecord).filter_by(name="Async").count() == 1
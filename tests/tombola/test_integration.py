@@ -78,3 +78,18 @@ class TestTombolaIntegration:
         game_acc_dto = store_dto.game_accounts[0]
         char_dto = game_acc_dto.characters[0]
         assert char_dto.daily_status_map[1] == 1
+
+    def test_archive_keeps_last_grid_day(self, tombola_ctrl, test_db, seed_data):
+        from app.application.services.archive_service import ArchiveService
+        from app.presentation.delegates.tombola_grid_delegate import TombolaGridDelegate
+        server_id = seed_data['server'].id
+        char_id = seed_data['character'].id
+        event = tombola_ctrl.create_tombola_event(server_id, "Mes largo")
+        last_day = TombolaGridDelegate.TOTAL_DAYS
+
+        tombola_ctrl.update_daily_status(char_id, last_day, 1, event.id)
+        ArchiveService(test_db).archive_event('tombola', event.id)
+
+        data = tombola_ctrl.get_tombola_dashboard_data(server_id, event.id)
+        char_dto = data.store_accounts[0].game_accounts[0].characters[0]
+        assert char_dto.daily_status_map[last_day] == 1
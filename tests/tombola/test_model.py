@@ -91,3 +91,38 @@ class TestTombolaModelWithData:
         
         model.set_data([], 1)
         assert model.rowCount(QModelIndex()) == 0
+
+
+class TestTombolaModelApplyChanges:
+    def _model(self):
+        from app.application.dtos import StoreAccountDTO, GameAccountDTO, TombolaCharacterDTO
+        char = TombolaCharacterDTO(id=7, name="Tombola1", daily_status_map={1: 1})
+        account = GameAccountDTO(id=3, username="TestUser", server_id=1, characters=[char])
+        model = TombolaModel()
+        model.set_data([StoreAccountDTO(id=1, email="t@mail.com", game_accounts=[account])], 5)
+        return model, char
+
+    def test_patches_only_changed_cell(self, qapp):
+        from app.application.dtos import ChangeDTO
+        model, char = self._model()
+        emitted = []
+        model.dataChanged.connect(lambda tl, br, roles: emitted.append((tl.row(), tl.column())))
+
+        touched = model.apply_changes([ChangeDTO("tombola_status", 7, 5, "2", -1)])
+
+        assert touched == 1
+        assert char.daily_status_map == {1: 1, 2: -1}
+        assert emitted == [(0, 2)]
+
+    def test_ignores_other_events_and_unknown_chars(self, qapp):
+        from app.application.dtos import ChangeDTO
+        model, char = self._model()
+
+        touched = model.apply_changes([
+            ChangeDTO("tombola_status", 7, 99, "2", -1),
+            ChangeDTO("tombola_status", 123, 5, "2", -1),
+            ChangeDTO("tombola_counter", None, 5, "Cofre", 3),
+        ])
+
+        assert touched == 0
+        assert char.daily_status_map == {1: 1}
@@ -0,0 +1,56 @@
+import threading
+import pytest
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from app.application.dtos import ChangeDTO, ChangeSetDTO
+from app.utils.change_poller import ChangePoller
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+
+def test_poll_fetches_on_worker_and_delivers_on_ui_thread(qapp, qtbot):
+    parent = QWidget()
+    qtbot.addWidget(parent)
+    release = threading.Event()
+    threads, received = [], []
+
+    def fetch(version):
+        threads.append(threading.current_thread())
+        release.wait(3)
+        return ChangeSetDTO(version=version + 1, changes=[ChangeDTO("alchemy_status", 1, 1, "2", 1)])
+
+    poller = ChangePoller(parent, fetch, lambda changes: received.append((threading.current_thread(), changes)))
+    poller.version = 4
+    poller.poll()  # retorna aunque la consulta siga bloqueada
+    assert received == [] and poller.version == 4
+
+    release.set()
+    qtbot.waitUntil(lambda: bool(received), timeout=3000)
+    assert threads[0] is not threading.main_thread()
+    assert received[0][0] is threading.main_thread() and len(received[0][1]) == 1
+    assert poller.version == 5
+
+
+def test_result_of_stale_poll_is_discarded(qapp, qtbot):
+    parent = QWidget()
+    qtbot.addWidget(parent)
+    release = threading.Event()
+    received = []
+
+    def fetch(version):
+        release.wait(3)
+        return ChangeSetDTO(version=version + 1, changes=[ChangeDTO("alchemy_status", 1, 1, "2", 1)])
+
+    poller = ChangePoller(parent, fetch, received.append)
+    poller.version = 1
+    poller.poll()
+    poller.version = 10  # carga completa mientras la consulta estaba en vuelo
+    release.set()
+    qtbot.waitUntil(lambda: poller._pending is None, timeout=3000)
+    assert received == [] and poller.version == 10
@@ -0,0 +1,116 @@
+"""
+Tests de la linea de comandos: subcomandos sobre servicios con la sesion de pruebas y sin Qt.
+"""
+import io
+import json
+import subprocess
+import sys
+import pytest
+from app.cli import main
+from app.application.services.alchemy_service import AlchemyService
+from app.application.services.archive_service import ArchiveService
+from app.application.services.export_service import ExportService
+from app.application.services.fishing_service import FishingService
+from app.application.services.tombola_service import TombolaService
+from app.domain.models import GameAccount, Character, DailyCorActivity, TombolaActivity
+
+
+@pytest.fixture
+def services(test_db):
+    class Services:
+        alchemy_service = staticmethod(lambda: AlchemyService(test_db))
+        tombola_service = staticmethod(lambda: TombolaService(test_db))
+        fishing_service = staticmethod(lambda: FishingService(test_db))
+        export_service = staticmethod(lambda: ExportService(test_db))
+        archive_service = staticmethod(lambda: ArchiveService(test_db))
+    return Services
+
+
+def run(services, *argv):
+    out = io.StringIO()
+    return main(list(argv), services=services, out=out), out.getvalue()
+
+
+def test_cli_does_not_import_qt():
+    code = ("import sys, app.cli; app.cli.build_parser(); import app.container; "
+            "from app.application.services import export_service, archive_service; "
+            "print(any(m.startswith('PyQt6') for m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip().endswith("False")
+
+
+def test_import_several_files(services, test_db, seed_data, tmp_path):
+    files = []
+    for i in range(2):
+        path = tmp_path / f"tienda{i}.csv"
+        path.write_text(f"tienda{i}@mail.com\nCuenta,Slots,Pj\ncuenta{i},5,Pj{i}\n", encoding='utf-8')
+        files.append(str(path))
+
+    code, output = run(services, "import", "--server", "TestServer", *files)
+
+    assert code == 0 and output.count("OK") == 2
+    assert test_db.query(GameAccount).filter(GameAccount.username.in_(["cuenta0", "cuenta1"])).count() == 2
+
+
+def test_mark_store_day_in_batches(services, test_db, seed_data, monkeypatch):
+    from app.utils.config import Config
+    monkeypatch.setattr(Config, 'CLI_BATCH_SIZE', 2)
+    accounts = [GameAccount(username=f"cuenta{i}", server_id=seed_data['server'].id,
+                            store_account_id=seed_data['store'].id) for i in range(4)]
+    test_db.add_all(accounts)
+    test_db.flush()
+    test_db.add_all([Character(name=f"PJ{i}", game_account_id=account.id) for i, account in enumerate(accounts)])
+    # Segundo personaje de una cuenta: la grilla no lo muestra, no se marca
+    extra = Character(name="Extra", game_account_id=seed_data['game_account'].id)
+    test_db.add(extra)
+    test_db.commit()
+    event = AlchemyService(test_db).create_alchemy_event(seed_data['server'].id, "Cron", 10)
+
+    code, output = run(services, "mark", "--server", "TestServer", "--feature", "alchemy",
+                       "--day", "3", "--store", "test@store.com")
+
+    assert code == 0 and "en 5 de 5" in output
+    assert test_db.query(DailyCorActivity).filter_by(event_id=event.id, day_index=3, status_code=1).count() == 5
+    assert test_db.query(DailyCorActivity).filter_by(event_id=event.id, character_id=extra.id).count() == 0
+    assert AlchemyService(test_db).get_event_totals(event.id).completed == 5
+
+
+def test_mark_tombola_uses_batch(services, test_db, seed_data):
+    event = TombolaService(test_db).create_tombola_event(seed_data['server'].id, "Tombola")
+
+    code, _ = run(services, "mark", "--server", str(seed_data['server'].id), "--feature", "tombola",
+                  "--event", str(event.id), "--day", "2", "--status", "-1")
+
+    assert code == 0
+    assert test_db.query(TombolaActivity).filter_by(event_id=event.id, day_index=2, status_code=-1).count() == 1
+    assert TombolaService(test_db).get_event_totals(event.id).failed == 1
+
+
+def test_report_json_by_store(services, test_db, seed_data):
+    alchemy = AlchemyService(test_db)
+    event = alchemy.create_alchemy_event(seed_data['server'].id, "Reporte", 5)
+    alchemy.update_daily_status(seed_data['character'].id, 1, 1, event.id)
+    alchemy.update_daily_cords(seed_data['game_account'].id, event.id, 1, 4)
+
+    code, output = run(services, "report", "--server", "TestServer", "--feature", "alchemy",
+                       "--by", "store", "--json")
+
+    data = json.loads(output)
+    assert code == 0 and data['name'] == "Reporte"
+    assert data['totals']["test@store.com"] == {'completed': 1, 'failed': 0, 'cords': 4}
+
+
+def test_export_and_archive(services, test_db, seed_data, tmp_path):
+    event = AlchemyService(test_db).create_alchemy_event(seed_data['server'].id, "Exportar", 5)
+    path = tmp_path / "evento.csv"
+
+    code, output = run(services, "export", "--server", "TestServer", "--feature", "alchemy", "--quiet", str(path))
+    assert code == 0 and path.exists() and "Exportar" in output
+
+    code, _ = run(services, "archive", "--feature", "alchemy", "--event", str(event.id))
+    assert code == 0
+    assert AlchemyService(test_db).get_alchemy_events(seed_data['server'].id) == []
+
+
+def test_unknown_server_is_an_error(services, seed_data):
+    assert run(services, "report", "--server", "Nada", "--feature", "fishing")[0] == 2
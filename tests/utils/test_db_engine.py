@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy import text
+from app.utils.db_engine import create_db_engine, engine_options
+from app.application.services.alchemy_service import AlchemyService
+from app.domain.base import Base
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'sub' / 'test.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_sqlite_pragmas_applied(sqlite_engine):
+    with sqlite_engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("PRAGMA cache_size")).scalar() < 0
+        assert conn.execute(text("PRAGMA mmap_size")).scalar() > 0
+
+
+def test_mysql_options_keep_pool_recycle():
+    assert engine_options("mysql+pymysql://u:p@h/db") == {"pool_recycle": 3600}
+
+
+def test_service_bound_to_sqlite_engine(sqlite_engine):
+    """Un servicio ligado al engine SQLite persiste con commit real."""
+    Base.metadata.create_all(sqlite_engine)
+    service = AlchemyService.bound_to(sqlite_engine)()
+    assert service.create_server("SqliteServer") is True
+    assert [s.name for s in service.get_servers()] == ["SqliteServer"]
+    # El engine global del servicio base no se ve afectado
+    assert AlchemyService._engine is not sqlite_engine
@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
+from app.utils.db_setup import upgrade_schema
+
+
+def test_upgrade_schema_adds_missing_columns(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        # Tabla creada por una version anterior, sin columna de version
+        conn.execute(text(
+            "CREATE TABLE daily_cor_records (id INTEGER PRIMARY KEY, game_account_id INTEGER, "
+            "event_id INTEGER, day_index INTEGER NOT NULL, cords_count INTEGER)"
+        ))
+        conn.execute(text("INSERT INTO daily_cor_records (day_index, cords_count) VALUES (1, 5)"))
+
+    added = upgrade_schema(engine)
+
+    assert added == 1
+    columns = {c['name'] for c in inspect(engine).get_columns('daily_cor_records')}
+    assert 'version' in columns
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT version FROM daily_cor_records")).scalar() == 1
+    # Idempotente
+    assert upgrade_schema(engine) == 0
+
+
+def test_upgrade_schema_creates_missing_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE timer_records (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, "
+            "elapsed_seconds INTEGER NOT NULL, created_at DATETIME)"
+        ))
+
+    upgrade_schema(engine)
+
+    indexes = {i['name'] for i in inspect(engine).get_indexes('timer_records')}
+    assert 'ix_timer_records_created' in indexes
+
+
+def test_upgrade_schema_adds_unique_cell_constraint_dropping_duplicates(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        # Version anterior: sin restriccion unica, con la misma celda guardada dos veces
+        conn.execute(text(
+            "CREATE TABLE daily_cor_activities (id INTEGER PRIMARY KEY, day_index INTEGER NOT NULL, "
+            "status_code INTEGER, character_id INTEGER, event_id INTEGER, version INTEGER NOT NULL DEFAULT 1)"
+        ))
+        conn.execute(text("INSERT INTO daily_cor_activities (day_index, status_code, character_id, event_id) "
+                          "VALUES (1, 1, 7, 3), (1, -1, 7, 3), (2, 1, 7, 3)"))
+
+    upgrade_schema(engine)
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT day_index, status_code FROM daily_cor_activities ORDER BY day_index")).all()
+    assert rows == [(1, -1), (2, 1)]
+    assert 'uq_daily_cor_activity' in {i['name'] for i in inspect(engine).get_indexes('daily_cor_activities')}
+    with pytest.raises(IntegrityError), engine.begin() as conn:
+        conn.execute(text("INSERT INTO daily_cor_activities (day_index, status_code, character_id, event_id) "
+                          "VALUES (2, 1, 7, 3)"))
+    upgrade_schema(engine)  # idempotente
@@ -0,0 +1,72 @@
+"""
+Tests de los DTOs compactos (slots + mapas de estado en arrays) y de su huella de memoria.
+"""
+import pickle
+import pytest
+from app.application.dtos import (
+    AlchemyCharacterDTO, FishingCharacterDTO, GameAccountDTO,
+    DayStatusMap, DayVersionMap, WeekStatusMap,
+)
+from app.utils.benchmark import run_memory
+
+
+def test_status_maps_behave_like_dicts():
+    statuses = DayStatusMap({1: 1, 3: -1})
+    statuses[2] = 0
+
+    assert statuses == {1: 1, 2: 0, 3: -1}
+    assert statuses.get(2) == 0 and statuses.get(4, 0) == 0 and statuses.get("x") is None
+    assert 2 in statuses and 4 not in statuses
+    assert list(statuses.items()) == [(1, 1), (2, 0), (3, -1)]
+    del statuses[2]
+    assert len(statuses) == 2
+    with pytest.raises(KeyError):
+        statuses[2]
+
+    versions = DayVersionMap()
+    versions[30] = 2 ** 40
+    assert versions == {30: 2 ** 40}
+
+    weeks = WeekStatusMap({"3_2": 1})
+    weeks["12_4"] = -1
+    assert dict(weeks) == {"3_2": 1, "12_4": -1}
+    with pytest.raises(KeyError):
+        weeks["13_1"] = 1
+
+
+def test_slot_map_base_is_abstract():
+    from app.application.dtos.status_maps import _SlotMap
+
+    with pytest.raises(TypeError):
+        _SlotMap()
+
+
+def test_dtos_are_slotted_and_compact_dict_inputs():
+    char = AlchemyCharacterDTO(id=1, name="PJ", daily_status_map={1: 1})
+    fisher = FishingCharacterDTO(id=2, name="Pescador")
+
+    assert not hasattr(char, '__dict__')
+    assert isinstance(char.daily_status_map, DayStatusMap)
+    assert isinstance(char.daily_version_map, DayVersionMap)
+    assert isinstance(fisher.fishing_activity_map, WeekStatusMap)
+    with pytest.raises(AttributeError):
+        GameAccountDTO(id=1, username="u", server_id=1).extra = True
+
+
+def test_slotted_dtos_survive_pickle():
+    account = GameAccountDTO(id=1, username="u", server_id=1, characters=[
+        AlchemyCharacterDTO(id=3, name="PJ", daily_status_map={1: 1, 2: -1}, daily_version_map={1: 4})
+    ])
+
+    restored = pickle.loads(pickle.dumps(account))
+
+    assert restored == account
+    assert isinstance(restored.characters[0].daily_status_map, DayStatusMap)
+
+
+def test_dashboard_memory_per_account_is_bounded():
+    result = run_memory(sizes=(1000,))[1000]
+
+    # Mismo grafo de 30 dias de estado + version: menos de la mitad que con los mapas como dicts
+    assert result["dto"] < result["dict_maps"] / 2
+    assert result["dto"] < 1500
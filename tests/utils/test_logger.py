@@ -18,6 +18,13 @@ class TestSetupLogger:
         result = setup_logger("LevelTest")
         assert result.level == logging.INFO
 
+    def test_invalid_log_level_falls_back_to_info(self, caplog):
+        from app.utils.config import Config
+        with patch.object(Config, 'LOG_LEVEL', 'LOUD'), caplog.at_level(logging.WARNING):
+            result = setup_logger("InvalidLevelTest")
+        assert result.level == logging.INFO
+        assert "LOG_LEVEL invalido ('LOUD')" in caplog.text
+
     def test_default_logger_exists(self):
         assert logger is not None
         assert isinstance(logger, logging.Logger)
@@ -75,3 +82,44 @@ class TestLogUserAction:
             log_user_action("change_event", context="Evento Febrero")
             msg = mock_info.call_args[0][0]
             assert "Evento Febrero" in msg
+
+
+class TestQueueLogging:
+    def test_records_are_written_by_listener_thread(self, tmp_path):
+        import io
+        import logging.handlers
+        import queue
+        from app.utils.logger import DeferredQueueHandler, build_handlers
+        q = queue.SimpleQueue()
+        stream = io.StringIO()
+        listener = logging.handlers.QueueListener(q, *build_handlers(str(tmp_path / "app.log"), stream))
+        listener.start()
+        lg = logging.getLogger("QueueTest")
+        lg.propagate = False
+        lg.addHandler(DeferredQueueHandler(q))
+        lg.setLevel(logging.INFO)
+
+        lg.info("Cords actualizado: Account %s, Day %s -> %s", 1, 2, 3)
+        listener.stop()
+
+        assert "Cords actualizado: Account 1, Day 2 -> 3" in stream.getvalue()
+        assert "Cords actualizado" in (tmp_path / "app.log").read_text(encoding="utf-8")
+        for h in listener.handlers:
+            h.close()
+
+    def test_parse_levels_ignores_invalid_entries(self):
+        from app.utils.logger import parse_levels
+        levels = parse_levels("MetinForge.alchemy=debug, sqlalchemy.engine=INFO,roto=NOPE,,sinnivel")
+        assert levels == {"MetinForge.alchemy": logging.DEBUG, "sqlalchemy.engine": logging.INFO}
+
+    def test_parse_levels_reports_invalid_entries(self):
+        from app.utils.logger import parse_levels
+        invalid = []
+        parse_levels("MetinForge.alchemy=debug,roto=NOPE,,sinnivel", invalid)
+        assert invalid == ["roto=NOPE", "sinnivel"]
+
+    def test_module_logger_is_child_of_app_logger(self):
+        from app.utils.logger import get_logger
+        child = get_logger("alchemy")
+        assert child.name == "MetinForge.alchemy"
+        assert child.parent is logger
@@ -0,0 +1,62 @@
+import json
+import pytest
+from sqlalchemy import text
+from app.utils import perf_log
+from app.utils.config import Config
+from scripts.analyze_perf import load_entries, summarize
+
+
+@pytest.fixture
+def perf_file(tmp_path, monkeypatch):
+    path = tmp_path / "perf.jsonl"
+    monkeypatch.setattr(Config, "PERF_LOG_ENABLED", True)
+    monkeypatch.setattr(Config, "PERF_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(Config, "PERF_LOG_PATH", str(path))
+    yield path
+    perf_log.shutdown()
+
+
+def _read(path):
+    perf_log.shutdown()
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class _Service:
+    server_id = 9
+
+    @perf_log.timed("test.load", ids=("server_id", "event_id"), rows=len)
+    def load(self, event_id, session):
+        session.execute(text("SELECT 1"))
+        session.execute(text("SELECT 2"))
+        return [1, 2, 3]
+
+
+def test_timed_records_ids_rows_and_queries(perf_file, test_db):
+    assert _Service().load(4, test_db) == [1, 2, 3]
+
+    [entry] = _read(perf_file)
+    assert entry["op"] == "test.load"
+    assert (entry["server_id"], entry["event_id"], entry["rows"], entry["queries"]) == (9, 4, 3, 2)
+    assert entry["ms"] >= 0
+
+
+def test_nothing_is_written_when_not_sampled(perf_file, monkeypatch):
+    monkeypatch.setattr(Config, "PERF_SAMPLE_RATE", 0.0)
+    with perf_log.measure("test.block") as fields:
+        fields["rows"] = 1
+    perf_log.shutdown()
+    assert not perf_file.exists() or perf_file.read_text() == ""
+
+
+def test_analyzer_builds_percentiles_per_operation(tmp_path):
+    path = tmp_path / "perf.jsonl"
+    lines = [json.dumps({"op": "a", "ms": float(ms), "queries": 2, "rows": 10}) for ms in range(1, 101)]
+    lines += [json.dumps({"op": "b", "ms": 5.0}), '{"op": "b", "ms": 6']  # linea cortada
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+    table = summarize(load_entries([str(path)]))
+    assert table["a"]["n"] == 100
+    assert table["a"]["p50"] == pytest.approx(50.5)
+    assert table["a"]["p99"] == pytest.approx(99.01)
+    assert table["a"]["queries"] == 2 and table["a"]["rows"] == 10
+    assert table["b"]["n"] == 1 and table["b"]["queries"] is None
@@ -0,0 +1,56 @@
+import datetime
+import json
+import pickle
+from app.application.dtos import (PrefetchedDashboardDTO, AlchemyDashboardDTO, AlchemyEventDTO,
+                                  StoreAccountDTO, GameAccountDTO, AlchemyCharacterDTO)
+from app.utils import session_state
+from app.utils.session_state import SessionState
+
+
+def _snapshot(event_id=7):
+    char = AlchemyCharacterDTO(id=3, name="Mezclador", daily_status_map={1: 1, 2: -1})
+    store = StoreAccountDTO(id=1, email="a@b.com", game_accounts=[
+        GameAccountDTO(id=2, username="cuenta", server_id=1, characters=[char])
+    ])
+    event = AlchemyEventDTO(id=event_id, server_id=1, name="Evento", total_days=30,
+                            created_at=datetime.date(2026, 1, 1))
+    return PrefetchedDashboardDTO('dailies', 1, event_id, 42, events=[event],
+                                  dashboard=AlchemyDashboardDTO(store_accounts=[store]))
+
+
+def test_state_roundtrip(tmp_path):
+    path = str(tmp_path / "session.json")
+    session_state.save_state(SessionState(1, "Server", "dailies", scope_id=7, store_id=1), path)
+
+    assert session_state.load_state(path) == SessionState(1, "Server", "dailies", 7, 1)
+    assert session_state.load_state(str(tmp_path / "missing.json")) is None
+
+
+def test_snapshot_roundtrip_keeps_dto_types(tmp_path):
+    path = str(tmp_path / "last.snapshot")
+    session_state.save_snapshot(_snapshot(), path)
+
+    loaded = session_state.load_snapshot(SessionState(1, "Server", "dailies", scope_id=7), path)
+    assert loaded.version == 42
+    char = loaded.dashboard.store_accounts[0].game_accounts[0].characters[0]
+    assert isinstance(char, AlchemyCharacterDTO)
+    assert char.daily_status_map == {1: 1, 2: -1}
+    assert loaded.events[0].created_at == datetime.date(2026, 1, 1)
+    # Texto JSON, como el archivo de estado: no se ejecuta nada al leerlo
+    with open(path, 'r', encoding='utf-8') as f:
+        assert json.load(f)['format'] == session_state.SNAPSHOT_FORMAT
+
+
+def test_snapshot_for_another_event_or_corrupt_file_is_ignored(tmp_path):
+    path = str(tmp_path / "last.snapshot")
+    session_state.save_snapshot(_snapshot(event_id=7), path)
+    assert session_state.load_snapshot(SessionState(1, "Server", "dailies", scope_id=8), path) is None
+
+    with open(path, 'wb') as f:
+        f.write(b"basura")
+    assert session_state.load_snapshot(SessionState(1, "Server", "dailies", scope_id=7), path) is None
+
+    # Snapshot de una version anterior (pickle)
+    with open(path, 'wb') as f:
+        pickle.dump((2, _snapshot(event_id=7)), f)
+    assert session_state.load_snapshot(SessionState(1, "Server", "dailies", scope_id=7), path) is None
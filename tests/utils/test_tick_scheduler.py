@@ -0,0 +1,63 @@
+import pytest
+from PyQt6.QtWidgets import QApplication
+
+from app.utils.tick_scheduler import TickScheduler
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+
+class FakeClock:
+    def __init__(self):
+        self.ms = 0
+
+    def __call__(self):
+        return self.ms
+
+
+def test_timer_runs_only_with_subscribers(qapp):
+    scheduler = TickScheduler(clock=FakeClock())
+    calls = []
+    scheduler.subscribe(calls.append)
+    assert scheduler.timer.isActive()
+
+    scheduler.tick()
+    scheduler.unsubscribe(calls.append)
+    assert calls == [0]
+    assert not scheduler.timer.isActive()
+
+
+def test_slows_down_when_nothing_is_visible(qapp):
+    from PyQt6.QtWidgets import QWidget
+    scheduler = TickScheduler(clock=FakeClock())
+    hidden = QWidget()
+    scheduler.subscribe(lambda now: None, hidden)
+
+    scheduler.tick()
+    assert scheduler.timer.interval() == TickScheduler.IDLE_MS
+    scheduler.timer.stop()
+
+
+def test_countdown_uses_deadline_not_tick_count(qapp):
+    from app.presentation.views.widgets.floating_countdown import SingleTimerWidget
+    clock = FakeClock()
+    scheduler = TickScheduler(clock=clock)
+    widget = SingleTimerWidget(parent_manager=None, initial_seconds=10, scheduler=scheduler)
+
+    widget.toggle_play_pause()
+    # Un solo tick despues de 7.5 s (p. ej. ventana minimizada): no se pierde tiempo
+    clock.ms = 7500
+    scheduler.tick()
+    assert widget.remaining_ms == 2500
+    assert widget.time_label.text() == "00:00:02"
+
+    clock.ms = 10000
+    scheduler.tick()
+    assert widget.is_alarming()
+    widget.halt()
+    assert not scheduler.timer.isActive()
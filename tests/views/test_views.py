@@ -71,6 +71,23 @@ class TestFeatureSelectionView:
             view.backRequested.emit()
 
 
+class TestFeatureRegistry:
+    """Tests para el registro de features."""
+
+    def test_server_flags_map_to_registry_entries(self):
+        from app.presentation import feature_registry
+        flags = {"has_dailies": False, "has_fishing": True, "has_tombola": True}
+        assert [s.key for s in feature_registry.enabled_features(flags)] == ["fishing", "tombola"]
+        assert feature_registry.get("unknown") is None
+
+    def test_view_class_is_resolved_on_demand(self):
+        from app.presentation.feature_registry import FeatureSpec
+        spec = FeatureSpec("extra", "has_extra", "Extra", "extra.png",
+                           "app.presentation.views.widgets.view_stack:ViewStack", "extra_service")
+        from app.presentation.views.widgets.view_stack import ViewStack
+        assert spec.load_view_class() is ViewStack
+
+
 class TestServerSelectionView:
     """Tests para ServerSelectionView."""
 
@@ -144,3 +161,157 @@ class TestAlchemyViewInit:
                 
             MockParse.assert_called_once()
 
+
+
+class TestViewStack:
+    """Tests para la cache LRU de vistas de MainWindow."""
+
+    class _View(QWidget):
+        def __init__(self):
+            super().__init__()
+            self.resumed = 0
+            self.suspended = 0
+
+        def suspend(self):
+            self.suspended += 1
+
+        def resume(self):
+            self.resumed += 1
+
+    def test_cached_view_is_reused_and_resumed(self, qapp):
+        from app.presentation.views.widgets.view_stack import ViewStack
+        stack = ViewStack(capacity=2)
+        built = []
+        factory = lambda: built.append(1) or self._View()
+
+        first = stack.show_view((1, "dailies"), factory)
+        stack.show_transient(QWidget())
+        again = stack.show_view((1, "dailies"), factory)
+
+        assert again is first and len(built) == 1
+        assert first.suspended == 1 and first.resumed == 1
+        # La vista transitoria se descarta al salir
+        assert stack.count() == 1
+
+    def test_least_recently_used_view_is_evicted(self, qapp):
+        from app.presentation.views.widgets.view_stack import ViewStack
+        stack = ViewStack(capacity=2)
+        a = stack.show_view("a", self._View)
+        stack.show_view("b", self._View)
+        stack.show_view("a", self._View)
+        stack.show_view("c", self._View)
+
+        assert stack.cached_keys() == ["a", "c"]
+        assert stack.current_view() is not a
+        assert stack.count() == 2
+
+
+class TestAnalyticsPanel:
+    """Ventana de graficos: carga los PNG que entrega el worker sin bloquear la UI."""
+
+    def test_panel_shows_rendered_charts_and_skips_same_version(self, qapp, qtbot):
+        from concurrent.futures import ThreadPoolExecutor
+        from app.presentation.chart_renderer import CHARTS
+        from app.presentation.views.widgets.analytics_panel import AnalyticsPanel
+        from PyQt6.QtGui import QImage
+        from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
+
+        image = QImage(4, 4, QImage.Format.Format_RGB32)
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        image.save(buffer, "PNG")
+        png = bytes(data)
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        renderer = MagicMock()
+        renderer.submit.side_effect = lambda feature, event_id: executor.submit(
+            lambda: (1, {chart: png for chart in CHARTS[feature]}))
+
+        panel = AnalyticsPanel('tombola', renderer, poll_interval_ms=60000)
+        qtbot.addWidget(panel)
+        panel.set_event(5)
+        qtbot.waitUntil(lambda: panel.version == 1, timeout=3000)
+
+        assert all(not label.pixmap().isNull() for label in panel.labels.values())
+        panel.refresh()
+        qtbot.waitUntil(lambda: panel._pending is None, timeout=3000)
+        assert panel.version == 1 and renderer.submit.call_count == 2
+        executor.shutdown(wait=True)
+
+
+class TestExportDialog:
+    """Dialogo de exportacion: corre el servicio en un worker y muestra su progreso."""
+
+    def test_dialog_reports_progress_and_result(self, qapp, qtbot):
+        from app.application.dtos import ExportResultDTO
+        from app.presentation.views.dialogs.export_dialog import ExportDialog
+
+        def export_event(feature, event_id, file_path, progress, cancel):
+            progress(50, 100)
+            return ExportResultDTO(path=file_path, rows=100)
+
+        service = MagicMock()
+        service.export_event.side_effect = export_event
+        dialog = ExportDialog(service, 'alchemy', 3, "/tmp/evento.csv")
+        qtbot.addWidget(dialog)
+        with qtbot.waitSignal(dialog.finished_export, timeout=3000):
+            dialog.start()
+
+        assert dialog.result.rows == 100
+        assert dialog.maximum() == 100
+        service.export_event.assert_called_once()
+
+    def test_cancel_sets_event_for_service(self, qapp, qtbot):
+        from app.application.dtos import ExportResultDTO
+        from app.presentation.views.dialogs.export_dialog import ExportDialog
+
+        def export_event(feature, event_id, file_path, progress, cancel):
+            cancel.wait(3)
+            return ExportResultDTO(path=file_path, cancelled=cancel.is_set())
+
+        service = MagicMock()
+        service.export_event.side_effect = export_event
+        dialog = ExportDialog(service, 'tombola', 3, "/tmp/evento.xlsx")
+        qtbot.addWidget(dialog)
+        dialog.start()
+        with qtbot.waitSignal(dialog.finished_export, timeout=5000):
+            dialog.canceled.emit()  # boton "Cancelar"
+
+        assert dialog.result.cancelled
+
+
+class TestOverviewView:
+    """Resumen de servidores: pinta el arbol y repinta solo los servidores que cambiaron."""
+
+    def _overview(self, version, completed):
+        from app.application.dtos import FeatureOverviewDTO, ServerOverviewDTO, OverviewDTO
+        alchemy = FeatureOverviewDTO(feature='alchemy', scope_id=1, name="Evento", total_days=5, characters=2,
+                                     completed=completed, pending=10 - completed, cords=7, counters={"diamante": 3})
+        return OverviewDTO(version=version, year=2025, servers=[
+            ServerOverviewDTO(server_id=1, name="Alfa", accounts=1, characters=2, features={'alchemy': alchemy}),
+            ServerOverviewDTO(server_id=2, name="Beta", accounts=3, characters=0),
+        ])
+
+    def test_view_paints_and_updates_changed_servers(self, qapp, qtbot):
+        from app.presentation.views.overview_view import OverviewView
+
+        controller = MagicMock()
+        controller.get_overview.return_value = self._overview(1, 4)
+        view = OverviewView(controller=controller, interval_ms=60000)
+        qtbot.addWidget(view)
+
+        assert view.tree.topLevelItemCount() == 2
+        alfa = view.tree.topLevelItem(0)
+        assert alfa.text(0) == "Alfa" and alfa.child(0).text(3) == "4"
+        assert alfa.child(0).text(6) == "40%" and alfa.child(0).text(8) == "diamante 3"
+        beta = view.tree.topLevelItem(1)
+
+        controller.get_overview.return_value = self._overview(2, 6)
+        view.refresh()
+        assert view.tree.topLevelItem(0).child(0).text(3) == "6"
+        assert view.tree.topLevelItem(1) is beta
+
+        with qtbot.waitSignal(view.serverSelected) as blocker:
+            view.on_item_double_clicked(view.tree.topLevelItem(0).child(0), 0)
+        assert blocker.args == [1, "Alfa"]